@@ -78,6 +78,7 @@ except Exception as e:
 
 # Import the iFlow generator API
 from iflow_generator_api import generate_iflow_from_markdown, IFlowGeneratorAPI
+from boomi_blueprint_synthesizer import FAST_PATH_ENABLED, synthesize_from_xml
 
 # Import the SAP BTP integration module
 from sap_btp_integration import SapBtpIntegration
@@ -220,10 +221,13 @@ def generate_iflow(job_id=None):
     Request body:
     {
         "markdown": "# API Documentation...",
-        "iflow_name": "MyIFlow" (optional)
+        "iflow_name": "MyIFlow" (optional),
+        "boomi_xml": [{"name": "Process.xml", "content": "<?xml ..."}] (optional)
     }
 
     Or if job_id is provided, it will fetch the markdown from the job.
+    Simple Boomi processes are converted from their XML by rules, without the LLM;
+    without boomi_xml, the XML of the job is fetched from the main API.
     """
     # Handle OPTIONS request for CORS preflight
     if request.method == 'OPTIONS':
@@ -244,6 +248,7 @@ def generate_iflow(job_id=None):
 
         # Get markdown from request body first (prioritize direct markdown over fetching)
         data = request.json
+        boomi_xml = data.get('boomi_xml') if data else None
         
         # DEBUG: Log incoming request details
         logger.info(f"📥 Incoming request to generate-iflow:")
@@ -364,7 +369,7 @@ def generate_iflow(job_id=None):
         # Start processing in background
         thread = threading.Thread(
             target=process_iflow_generation,
-            args=(iflow_job_id, markdown_content, iflow_name)
+            args=(iflow_job_id, markdown_content, iflow_name, boomi_xml)
         )
         thread.daemon = True
         thread.start()
@@ -387,7 +392,53 @@ def generate_iflow(job_id=None):
             'message': f'Error starting iFlow generation: {str(e)}'
         }), 500
 
-def process_iflow_generation(job_id, markdown_content, iflow_name=None):
+def fetch_boomi_xml(main_job_id):
+    """Boomi XML files of a main API job as [{"name", "content"}], or None if it has none"""
+    try:
+        import requests
+
+        main_api_url = os.getenv('MAIN_API_URL', 'http://localhost:5000')
+        response = requests.get(f"{main_api_url}/api/docs/{main_job_id}/boomi_xml", timeout=30)
+        if response.status_code != 200:
+            logger.info(f"No Boomi XML for job {main_job_id}: {response.status_code}")
+            return None
+        return response.json().get('files')
+    except Exception as e:
+        logger.warning(f"⚠️ Could not fetch Boomi XML for job {main_job_id}: {str(e)}")
+        return None
+
+
+def rule_based_blueprint(job_id, boomi_xml, job_result_dir):
+    """
+    Blueprint built by rules from the Boomi XML of the job, or None if the
+    process needs the GenAI analysis (or there is no Boomi XML)
+
+    Args:
+        job_id: Job ID to identify the job
+        boomi_xml: Boomi XML files from the request, or None to fetch them from the main API
+        job_result_dir: Directory the synthesis result is saved in
+    """
+    if not FAST_PATH_ENABLED:
+        return None
+    main_job_id = jobs[job_id].get('original_job_id')
+    if boomi_xml is None and main_job_id and jobs[job_id].get('source_type') != 'uploaded_documentation':
+        boomi_xml = fetch_boomi_xml(main_job_id)
+    if not boomi_xml:
+        return None
+
+    result = synthesize_from_xml(boomi_xml)
+    with open(os.path.join(job_result_dir, 'boomi_fast_path.json'), 'w') as f:
+        json.dump(result.as_dict(), f, indent=2)
+    for reason in result.reasons:
+        logger.info(f"⚡ Fast path: {reason}")
+    if not result.accepted:
+        logger.info(f"⚡ Rule-based blueprint confidence {result.confidence:.2f} is too low - using GenAI analysis")
+        return None
+    logger.info(f"⚡ Rule-based blueprint with confidence {result.confidence:.2f} - skipping GenAI analysis")
+    return result.blueprint
+
+
+def process_iflow_generation(job_id, markdown_content, iflow_name=None, boomi_xml=None):
     """
     Process the markdown content to generate an iFlow in a background thread
 
@@ -395,6 +446,7 @@ def process_iflow_generation(job_id, markdown_content, iflow_name=None):
         job_id: Job ID to identify the job
         markdown_content: Markdown content to process
         iflow_name: Name of the iFlow (optional)
+        boomi_xml: Boomi XML files of the job (optional, fetched from the main API if not given)
     """
     try:
         # Create output directory in the job results folder
@@ -419,8 +471,27 @@ def process_iflow_generation(job_id, markdown_content, iflow_name=None):
         if iflow_name is None:
             iflow_name = f"GeneratedIFlow_{job_id[:8]}"
 
+        # Simple Boomi processes are converted by rules; the rest goes to the LLM
+        blueprint = rule_based_blueprint(job_id, boomi_xml, job_result_dir)
+        if blueprint is not None:
+            jobs[job_id].update({
+                'status': 'processing',
+                'message': 'Generating iFlow from the Boomi process without GenAI analysis...'
+            })
+            save_jobs(jobs)
+            result = generate_iflow_from_markdown(
+                markdown_content=markdown_content,
+                api_key=ANTHROPIC_API_KEY,
+                output_dir=job_result_dir,
+                iflow_name=iflow_name,
+                job_id=job_id,
+                use_converter=False,
+                blueprint=blueprint
+            )
+            result['generation_method'] = 'Rule-based (Boomi process)'
+
         # Check if RAG generation is enabled
-        if USE_RAG_GENERATION:
+        elif USE_RAG_GENERATION:
             logger.info(f"🤖 Using RAG API for iFlow generation: {RAG_API_URL}")
 
             try:
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the BPMN diagram layout on large iFlows
+
+Builds a synthetic flow graph with a chain of steps between StartEvent_2 and
+EndEvent_2, a router with two routes and a join every tenth step and a loop
+back every hundredth step, then times layout_flow_graph on it and checks that
+no two shapes overlap.
+
+Usage:
+    python benchmark_bpmn_layout.py [--steps 1000] [--repeat 5]
+"""
+import sys
+import time
+import argparse
+
+from bpmn_layout import ACTIVITY, EVENT, GATEWAY, layout_flow_graph
+
+
+def build_graph(steps):
+    """Nodes and flows of a synthetic process with the given number of steps"""
+    nodes = [("StartEvent_2", EVENT)]
+    flows = []
+    previous = "StartEvent_2"
+    for i in range(steps):
+        if i % 10 == 5:
+            router, join = f"Router_{i}", f"Join_{i}"
+            nodes.extend([(router, GATEWAY), (f"Route_{i}_a", ACTIVITY), (f"Route_{i}_b", ACTIVITY), (join, GATEWAY)])
+            flows.extend([
+                (f"SequenceFlow_{i}", previous, router),
+                (f"SequenceFlow_{i}_a", router, f"Route_{i}_a"),
+                (f"SequenceFlow_{i}_b", router, f"Route_{i}_b"),
+                (f"SequenceFlow_{i}_a_join", f"Route_{i}_a", join),
+                (f"SequenceFlow_{i}_b_join", f"Route_{i}_b", join),
+            ])
+            previous = join
+        else:
+            step_id = f"CallActivity_{i}"
+            nodes.append((step_id, ACTIVITY))
+            flows.append((f"SequenceFlow_{i}", previous, step_id))
+            if i % 100 == 99:
+                flows.append((f"SequenceFlow_{i}_retry", step_id, f"CallActivity_{i - 3}"))
+            previous = step_id
+    nodes.append(("EndEvent_2", EVENT))
+    flows.append(("SequenceFlow_End", previous, "EndEvent_2"))
+    return nodes, flows
+
+
+def count_overlaps(layout):
+    """Pairs of overlapping shapes (shapes sorted by x, so only close neighbours are compared)"""
+    shapes = sorted(layout.shapes.values(), key=lambda bounds: bounds.x)
+    overlaps = 0
+    for i, bounds in enumerate(shapes):
+        for other in shapes[i + 1:]:
+            if other.x >= bounds.right:
+                break
+            if bounds.overlaps(other):
+                overlaps += 1
+    return overlaps
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the BPMN diagram layout')
+    parser.add_argument('--steps', type=int, default=1000, help='Steps in the synthetic process')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement, best is reported')
+    args = parser.parse_args()
+
+    nodes, flows = build_graph(args.steps)
+    best = float('inf')
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        layout = layout_flow_graph(nodes, flows)
+        best = min(best, time.perf_counter() - start)
+
+    box = layout.container()
+    print(f"process: {len(nodes)} nodes, {len(flows)} flows")
+    print(f"layout_flow_graph: {best * 1000:.1f}ms (best of {args.repeat})")
+    print(f"diagram: {box.width:.0f} x {box.height:.0f}, overlapping shapes: {count_overlaps(layout)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark for IFlowSanitizer on large generated iFlows
+
+Builds a synthetic iFlow with a chain of steps between StartEvent_2 and
+EndEvent_2 and the defects the sanitizer repairs (orphaned, duplicate and
+empty-reference flows, flows without diagram edges, a disconnected step),
+then times sanitize_iflow on it.
+
+Usage:
+    python benchmark_iflow_sanitizer.py [--steps 500] [--repeat 5]
+"""
+import io
+import sys
+import time
+import argparse
+import contextlib
+
+from iflow_sanitizer import IFlowSanitizer
+
+
+def build_iflow(steps):
+    """Synthetic iFlow XML with the given number of steps"""
+    components = ['<bpmn2:startEvent id="StartEvent_2" name="Start"/>']
+    flows = []
+    edges = []
+    previous = "StartEvent_2"
+    for i in range(steps):
+        step_id = f"CallActivity_{i}"
+        components.append(f'''<bpmn2:callActivity id="{step_id}" name="Step {i}">
+                <bpmn2:extensionElements>
+                    <ifl:property><key>activityType</key><value>Enricher</value></ifl:property>
+                </bpmn2:extensionElements>
+            </bpmn2:callActivity>''')
+        flows.append(f'<bpmn2:sequenceFlow id="SequenceFlow_{i}" sourceRef="{previous}" targetRef="{step_id}" isImmediate="true"/>')
+        # Every third flow already has its diagram edge
+        if i % 3 == 0:
+            edges.append(f'''<bpmndi:BPMNEdge bpmnElement="SequenceFlow_{i}" id="BPMNEdge_SequenceFlow_{i}">
+                    <di:waypoint x="0" y="0"/>
+                </bpmndi:BPMNEdge>''')
+        if i % 50 == 10:
+            # Duplicate connection under another id, and an exact copy of a flow
+            flows.append(f'<bpmn2:sequenceFlow id="SequenceFlow_{i}_copy" sourceRef="{previous}" targetRef="{step_id}"/>')
+            flows.append(flows[-2])
+        if i % 50 == 20:
+            flows.append(f'<bpmn2:sequenceFlow id="Orphan_{i}" sourceRef="{step_id}" targetRef="Missing_{i}"/>')
+        if i % 50 == 30:
+            flows.append(f'<bpmn2:sequenceFlow id="Empty_{i}" sourceRef=""/>')
+        previous = step_id
+    flows.append(f'<bpmn2:sequenceFlow id="SequenceFlow_End" sourceRef="{previous}" targetRef="EndEvent_2"/>')
+    components.append('<bpmn2:serviceTask id="ServiceTask_Disconnected" name="Disconnected"></bpmn2:serviceTask>')
+    components.append('<bpmn2:endEvent id="EndEvent_2" name="End"/>')
+
+    return f'''<?xml version="1.0" encoding="UTF-8"?>
+<bpmn2:definitions xmlns:bpmn2="http://www.omg.org/spec/BPMN/20100524/MODEL" xmlns:bpmndi="http://www.omg.org/spec/BPMN/20100524/DI" xmlns:di="http://www.omg.org/spec/DD/20100524/DI" xmlns:ifl="http:///com.sap.ifl.model/Ifl.xsd">
+    <bpmn2:collaboration id="Collaboration_1" name="Default Collaboration"/>
+    <bpmn2:process id="Process_1" name="Integration Process">
+            {"""
+            """.join(components + flows)}
+    </bpmn2:process>
+    <bpmndi:BPMNDiagram id="BPMNDiagram_1" name="Default Collaboration Diagram">
+        <bpmndi:BPMNPlane bpmnElement="Collaboration_1" id="BPMNPlane_1">
+                {"""
+                """.join(edges)}
+        </bpmndi:BPMNPlane>
+    </bpmndi:BPMNDiagram>
+</bpmn2:definitions>
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark IFlowSanitizer')
+    parser.add_argument('--steps', type=int, default=500, help='Steps in the synthetic iFlow')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement, best is reported')
+    args = parser.parse_args()
+
+    iflow_xml = build_iflow(args.steps)
+    sanitizer = IFlowSanitizer()
+    best = float('inf')
+    for _ in range(args.repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            sanitized_xml = sanitizer.sanitize_iflow(iflow_xml)
+            best = min(best, time.perf_counter() - start)
+
+    print(f"iFlow: {args.steps} steps, {len(iflow_xml) / 1024:.0f} KB")
+    print(f"sanitize_iflow: {best * 1000:.1f}ms (best of {args.repeat})")
+    print(f"issues: {len(sanitizer.issues_found)}, fixes: {len(sanitizer.fixes_applied)}, "
+          f"output: {len(sanitized_xml) / 1024:.0f} KB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the blueprint schema validation on large blueprints
+
+Builds a synthetic blueprint with one endpoint, the given number of components
+of the common types and a sequence flow between each pair of neighbours, then
+times validate_json_schema on it, on the same blueprint with one invalid
+component (which goes through the auto-fix), and validate_component on each
+component as the streaming validator calls it.
+
+Usage:
+    python benchmark_schema_validator.py [--components 2000] [--repeat 5]
+"""
+import sys
+import time
+import argparse
+
+from json_schema_validator import SAPIFlowSchemaValidator
+
+
+def build_blueprint(count):
+    """Blueprint with count components chained from StartEvent_2 to EndEvent_2"""
+    templates = [
+        ("content_modifier", {"headers": {"Content-Type": "application/json"}}),
+        ("gateway", {"routing_conditions": [{"condition": "${property.type} == 'a'"}, {"condition": "default"}]}),
+        ("script", {"script": "return message;"}),
+        ("request_reply", {"url": "https://example.com/api", "method": "GET"}),
+        ("odata", {"operation": "Query", "service_url": "https://example.com/odata", "entity_set": "Orders"}),
+    ]
+    components = []
+    for i in range(count):
+        comp_type, config = templates[i % len(templates)]
+        components.append({"type": comp_type, "id": f"{comp_type}_{i}", "name": f"Step {i}", "config": dict(config)})
+    ids = ["StartEvent_2"] + [component["id"] for component in components] + ["EndEvent_2"]
+    flows = [{"id": f"flow_{i}", "source_ref": source, "target_ref": target}
+             for i, (source, target) in enumerate(zip(ids, ids[1:]))]
+    return {"endpoints": [{"id": "bench", "name": "Benchmark", "components": components, "sequence_flows": flows}]}
+
+
+def best_time(repeat, run):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the blueprint schema validation')
+    parser.add_argument('--components', type=int, default=2000, help='Components in the synthetic blueprint')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement, best is reported')
+    args = parser.parse_args()
+
+    validator = SAPIFlowSchemaValidator()
+    blueprint = build_blueprint(args.components)
+    per_component = 1e6 / args.components
+
+    elapsed, result = best_time(args.repeat, lambda: validator.validate_json_schema(blueprint))
+    print(f"valid blueprint: {elapsed * 1000:.2f}ms, {elapsed * per_component:.2f}us per component "
+          f"(valid: {result.is_valid}, warnings: {len(result.warnings)})")
+
+    invalid = build_blueprint(args.components)
+    invalid["endpoints"][0]["components"][args.components // 2]["type"] = "unknown"
+    elapsed, result = best_time(args.repeat, lambda: validator.validate_json_schema(invalid))
+    print(f"invalid blueprint with auto-fix: {elapsed * 1000:.2f}ms "
+          f"(valid: {result.is_valid}, first error at {result.error_paths[0]})")
+
+    components = blueprint["endpoints"][0]["components"]
+    elapsed, _ = best_time(args.repeat, lambda: [validator.validate_component(component, 0, i, strict=False)
+                                                 for i, component in enumerate(components)])
+    print(f"validate_component: {elapsed * per_component:.2f}us per component")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,441 @@
+"""
+Rule-based iFlow blueprints for simple Boomi processes
+
+BlueprintSynthesizer maps the shapes of the processes parsed by BoomiXMLProcessor
+to the blueprint JSON the generator builds iFlows from (the schema checked by
+SAPIFlowSchemaValidator), without calling an LLM. Every shape gets a confidence
+score for how faithfully its rule maps it; the blueprint's confidence is the
+lowest of them. Processes with shapes there are no rules for (decisions,
+branches, process calls, scripting, ...), or that are not a single chain from
+the start shape to the end, get confidence 0 and are left to the GenAI analysis.
+So does every blueprint with a part the rules can only fill in with a
+placeholder: maps with field mappings, document properties set from dynamic
+values, message parameters, and connectors whose address is not in the
+connection components.
+"""
+
+import os
+import re
+from urllib.parse import urlsplit
+from xml.sax.saxutils import escape
+
+from boomi_xml_processor import BoomiXMLProcessor
+from json_schema_validator import SAPIFlowSchemaValidator
+
+# Try the rule-based blueprint before the GenAI analysis of Boomi XML
+FAST_PATH_ENABLED = os.getenv('BOOMI_FAST_PATH', 'true').lower() == 'true'
+
+# Lowest blueprint confidence used without the GenAI analysis
+MIN_CONFIDENCE = float(os.getenv('BOOMI_FAST_PATH_MIN_CONFIDENCE', '0.8'))
+
+# Confidence of the rule for each supported shape type
+SHAPE_CONFIDENCE = {
+    'start': 1.0,
+    'stop': 1.0,
+    'returndocuments': 1.0,
+    'map': 0.9,
+    'message': 0.95,
+    'documentproperties': 0.95,
+    'notify': 0.9,
+    'connectoraction': 0.95,
+}
+
+# Confidence of a placeholder (a part the rules cannot convert): always below
+# MIN_CONFIDENCE, so the process is left to the GenAI analysis
+PLACEHOLDER_CONFIDENCE = 0.0
+
+# Document properties set from anything else (profiles, connectors, dates, ...) are dynamic
+STATIC_VALUE_TYPES = {'', 'static'}
+
+# Confidence of the rule for each connector type (others fall back to a generic HTTP call)
+CONNECTOR_CONFIDENCE = {
+    'http': 0.95,
+    'rest': 0.95,
+    'wss': 0.95,
+    'sftp': 0.95,
+    'odata': 0.9,
+    'salesforce': 0.85,
+}
+DEFAULT_CONNECTOR_CONFIDENCE = 0.6
+
+# Shapes ending the process; notes are annotations outside the flow
+END_SHAPES = {'stop', 'returndocuments'}
+IGNORED_SHAPES = {'note'}
+
+# Boomi connector actions and the HTTP methods and SFTP operations they correspond to
+HTTP_METHODS = {
+    'get': 'GET', 'query': 'GET', 'listen': 'POST', 'send': 'POST', 'create': 'POST',
+    'upsert': 'POST', 'execute': 'POST', 'update': 'PATCH', 'delete': 'DELETE',
+}
+SFTP_OPERATIONS = {'get': 'GET', 'query': 'GET', 'listen': 'GET', 'delete': 'DELETE'}
+
+SALESFORCE_API_PATH = "/services/data/v52.0/sobjects"
+PLACEHOLDER_URL = "https://example.com"
+
+NAME_PATTERN = re.compile(r'[^A-Za-z0-9]+')
+HOST_PATTERN = re.compile(r'^[A-Za-z0-9-]+(\.[A-Za-z0-9-]+)+$')
+# Boomi message parameters ({1}, {2}, ...) are filled in from the document at run time
+MESSAGE_PARAMETER_PATTERN = re.compile(r'(?<!\')\{\d+\}')
+
+
+def _identifier(text, fallback):
+    """Name usable as a component name or id: words joined by underscores"""
+    return NAME_PATTERN.sub('_', text or '').strip('_') or fallback
+
+
+def _property_name(property_id, fallback):
+    """Exchange property name of a Boomi document property (the part after 'dynamicdocument.')"""
+    return _identifier(property_id.split('.')[-1] or fallback, "property")
+
+
+def _mapping_script(function_name, mapping):
+    """
+    Groovy script for a Boomi map: sets the mapped document properties as headers
+    and lists the field mappings of the map to implement.
+    """
+    functions = {func['key']: func for func in mapping['functions']} if mapping else {}
+    lines = []
+    for field in (mapping['mappings'] if mapping else []):
+        target = field['to_name_path'] or field['to_key']
+        func = functions.get(field['from_function']) if field['from_type'] == 'function' else None
+        if func and func.get('property_id'):
+            lines.append(f"    // {target} <- document property {_property_name(func['property_id'], func['property_name'])}")
+        elif func:
+            lines.append(f"    // {target} <- {func['name']} ({func['type']})")
+        else:
+            lines.append(f"    // {target} <- {field['from_key']}")
+    properties = sorted({_property_name(func['property_id'], func['property_name'])
+                         for func in functions.values() if func.get('property_id')})
+    setters = [f'    message.setHeader("{name}", message.getProperty("{name}"));' for name in properties]
+    return f"""import com.sap.gateway.ip.core.customdev.util.Message;
+
+// Converted from Boomi map: {mapping['name'] if mapping else function_name}
+def Message processData(Message message) {{
+    def body = message.getBody(String.class);
+
+    // Field mappings of the Boomi map
+{chr(10).join(lines) or "    // (no field mappings found)"}
+{chr(10).join(setters)}
+
+    message.setBody(body);
+    return message;
+}}
+"""
+
+
+def _connection_url(connection):
+    """http(s) URL of a connection component, or None"""
+    url = (connection or {}).get('url', '').strip()
+    parts = urlsplit(url)
+    if parts.scheme in ('http', 'https') and parts.netloc:
+        return url.rstrip('/')
+    return None
+
+
+def _connection_host(connection):
+    """Host name of a connection component, or None (placeholder texts are not host names)"""
+    host = (connection or {}).get('host', '').strip()
+    return host if HOST_PATTERN.match(host) else None
+
+
+def _property_row(name, value):
+    """Escaped propertyTable row creating a constant exchange property"""
+    row = (f"<row><cell id='Action'>Create</cell><cell id='Type'>constant</cell>"
+           f"<cell id='Value'>{escape(value)}</cell><cell id='Default'></cell>"
+           f"<cell id='Name'>{escape(name)}</cell><cell id='Datatype'>java.lang.String</cell></row>")
+    return escape(row)
+
+
+class SynthesisResult:
+    """Blueprint built by the rules, its confidence and the reasons for any deductions"""
+
+    __slots__ = ('blueprint', 'confidence', 'reasons')
+
+    def __init__(self, blueprint, confidence, reasons):
+        self.blueprint = blueprint
+        self.confidence = confidence
+        self.reasons = reasons
+
+    @property
+    def accepted(self):
+        """True if the blueprint can be used without the GenAI analysis"""
+        return self.blueprint is not None and self.confidence >= MIN_CONFIDENCE
+
+    def as_dict(self):
+        return {
+            "confidence": round(self.confidence, 3),
+            "min_confidence": MIN_CONFIDENCE,
+            "accepted": self.accepted,
+            "reasons": self.reasons,
+            "blueprint": self.blueprint,
+        }
+
+
+class BlueprintSynthesizer:
+    """Builds iFlow blueprints from the components parsed by BoomiXMLProcessor"""
+
+    def __init__(self):
+        self.validator = SAPIFlowSchemaValidator()
+
+    def synthesize(self, components):
+        """
+        Blueprint with one endpoint per Boomi process
+
+        Args:
+            components (list): Components parsed by BoomiXMLProcessor
+
+        Returns:
+            SynthesisResult: The blueprint (None if no process could be mapped) and its confidence
+        """
+        processes = [comp for comp in components if comp['type'] == 'process' and comp.get('shapes')]
+        if not processes:
+            return SynthesisResult(None, 0.0, ["No process with shapes found"])
+
+        referenced = {comp['id']: comp for comp in components if comp['id']}
+        endpoints = []
+        reasons = []
+        confidence = 1.0
+        for process in processes:
+            endpoint, process_confidence, process_reasons = self._synthesize_process(process, referenced)
+            reasons.extend(f"{process['name']}: {reason}" for reason in process_reasons)
+            confidence = min(confidence, process_confidence)
+            if endpoint is None:
+                return SynthesisResult(None, 0.0, reasons)
+            endpoints.append(endpoint)
+
+        blueprint = {"endpoints": endpoints}
+        validation = self.validator.validate_json_schema(blueprint)
+        if not validation.is_valid:
+            return SynthesisResult(None, 0.0, reasons + [f"Schema: {error}" for error in validation.errors])
+        return SynthesisResult(blueprint, confidence, reasons)
+
+    def _synthesize_process(self, process, referenced):
+        """Endpoint for one process as (endpoint or None, confidence, reasons)"""
+        chain, reasons = self._shape_chain(process['shapes'])
+        if chain is None:
+            return None, 0.0, reasons
+
+        components = []
+        confidence = 1.0
+        type_counts = {}
+        for shape in chain:
+            mapped = self._map_shape(shape, referenced)
+            if mapped is None:
+                return None, 0.0, reasons + [f"No rule for {shape['type']} shape {shape['name']}"]
+            component, shape_confidence, reason = mapped
+            if reason:
+                reasons.append(f"{shape['name']}: {reason}")
+            confidence = min(confidence, shape_confidence)
+            if component is None:
+                continue
+            type_counts[component['type']] = type_counts.get(component['type'], 0) + 1
+            components.append(dict(component, id=f"{component['type']}_{type_counts[component['type']]}"))
+
+        if not components:
+            return None, 0.0, reasons + ["Process has no steps to map"]
+
+        flow = [component['id'] for component in components]
+        refs = ["StartEvent_2"] + flow + ["EndEvent_2"]
+        sequence_flows = []
+        for source, target in zip(refs, refs[1:]):
+            if source == "StartEvent_2" or target == "EndEvent_2":
+                flow_id = f"flow_{source}_to_{target}"
+            else:
+                flow_id = f"SequenceFlow_{source}_to_{target}"
+            sequence_flows.append({"id": flow_id, "source_ref": source, "target_ref": target})
+
+        endpoint = {
+            "id": _identifier(process['name'], 'boomi_process').lower(),
+            "name": process['name'] or "Boomi Process",
+            "description": process['description'] or f"Converted from Boomi process {process['name']}",
+            "components": components,
+            "flow": flow,
+            "sequence_flows": sequence_flows,
+        }
+        return endpoint, confidence, reasons
+
+    def _shape_chain(self, shapes):
+        """
+        Shapes from the start shape to the end shape as (list or None, reasons);
+        None unless the process is one linear chain covering all of its shapes.
+        """
+        by_name = {shape['name']: shape for shape in shapes if shape['type'] not in IGNORED_SHAPES}
+        starts = [shape for shape in by_name.values() if shape['type'] == 'start']
+        if len(starts) != 1:
+            return None, [f"Expected one start shape, found {len(starts)}"]
+
+        chain = []
+        visited = set()
+        shape = starts[0]
+        while True:
+            chain.append(shape)
+            visited.add(shape['name'])
+            targets = [name for name in shape['to_shapes'] if name]
+            if len(targets) > 1:
+                return None, [f"Shape {shape['name']} ({shape['type']}) has {len(targets)} outgoing paths"]
+            if not targets:
+                break
+            if targets[0] in visited:
+                return None, [f"Shape {shape['name']} loops back to {targets[0]}"]
+            if targets[0] not in by_name:
+                return None, [f"Shape {shape['name']} connects to unknown shape {targets[0]}"]
+            shape = by_name[targets[0]]
+
+        unreachable = sorted(set(by_name) - visited)
+        if unreachable:
+            return None, [f"Shapes not on the main path: {', '.join(unreachable)}"]
+        return chain, []
+
+    def _map_shape(self, shape, referenced):
+        """
+        Blueprint component for a shape as (component or None, confidence, reason),
+        or None if there is no rule for the shape.
+        """
+        shape_type = shape['type']
+        if shape_type not in SHAPE_CONFIDENCE:
+            return None
+        confidence = SHAPE_CONFIDENCE[shape_type]
+        label = shape['user_label']
+
+        if shape_type in END_SHAPES or shape_type == 'notify':
+            return None, confidence, ""
+
+        if shape_type == 'start':
+            action = shape['action_type'].lower()
+            if not shape['connector_type'] or action == 'listen':
+                # Listeners and "no data" starts are the trigger of the iFlow, not a step
+                return None, confidence, ""
+            return self._map_connector(shape, referenced)
+
+        if shape_type == 'connectoraction':
+            return self._map_connector(shape, referenced)
+
+        if shape_type == 'map':
+            # Boomi maps become Groovy scripts, as in the GenAI analysis. The script
+            # only copies document properties to headers; field mappings are left as
+            # comments, so a map with field mappings is a placeholder.
+            mapping = referenced.get(shape['map_id'])
+            name = _identifier(label or (mapping['name'] if mapping else ''), "Transform_Data")
+            script_file = f"{name}.groovy"
+            component = {
+                "type": "script",
+                "name": name,
+                "config": {
+                    "script": script_file,
+                    "script_file": script_file,
+                    "script_content": _mapping_script(name, mapping),
+                },
+            }
+            if mapping is None:
+                return component, PLACEHOLDER_CONFIDENCE, f"map {shape['map_id']} not in the Boomi files"
+            if mapping['mappings']:
+                return component, PLACEHOLDER_CONFIDENCE, \
+                    f"{len(mapping['mappings'])} field mappings of map {mapping['name']} are not implemented"
+            return component, confidence, ""
+
+        if shape_type == 'documentproperties':
+            properties = {}
+            dynamic = []
+            for prop in shape['properties']:
+                name = _property_name(prop['property_id'], prop['name'])
+                properties[name] = prop['default_value']
+                if not set(prop['value_types']) <= STATIC_VALUE_TYPES:
+                    dynamic.append(name)
+            component = {
+                "type": "content_modifier",
+                "name": _identifier(label, "Set_Properties"),
+                "config": {
+                    "headers": properties,
+                    "property_table": ''.join(_property_row(name, value) for name, value in properties.items()),
+                },
+            }
+            if dynamic:
+                return component, PLACEHOLDER_CONFIDENCE, \
+                    f"dynamic values of {', '.join(dynamic)} would become empty constants"
+            return component, confidence, ""
+
+        # message
+        if MESSAGE_PARAMETER_PATTERN.search(shape['message']):
+            confidence, reason = PLACEHOLDER_CONFIDENCE, "message parameters are filled in at run time"
+        else:
+            reason = ""
+        component = {
+            "type": "content_modifier",
+            "name": _identifier(label, "Set_Message"),
+            "config": {
+                "headers": {},
+                "body_type": "constant",
+                "body_content": shape['message'],
+                "content": escape(shape['message']),
+            },
+        }
+        return component, confidence, reason
+
+    def _map_connector(self, shape, referenced):
+        """
+        Component for a connector shape as (component, confidence, reason). The
+        address comes from the connection component of the shape; without one
+        the component gets a placeholder address.
+        """
+        connector = shape['connector_type'].lower()
+        action = shape['action_type'].lower()
+        operation = referenced.get(shape['operation_id'])
+        connection = (referenced.get(shape['connection_id']) or {}).get('connection')
+        name = _identifier(shape['user_label'] or (operation['name'] if operation else ''),
+                           f"{connector.title()}_{shape['action_type']}")
+        confidence = CONNECTOR_CONFIDENCE.get(connector, DEFAULT_CONNECTOR_CONFIDENCE)
+        reason = "" if connector in CONNECTOR_CONFIDENCE else f"no rule for {connector} connector, mapped to HTTP"
+        missing_address = f"connection {shape['connection_id'] or '(none)'} has no usable address"
+
+        if connector == 'sftp':
+            host = _connection_host(connection)
+            config = {"operation": SFTP_OPERATIONS.get(action, 'PUT')}
+            if host is None:
+                confidence, reason = PLACEHOLDER_CONFIDENCE, missing_address
+            else:
+                config.update(host=host, port=connection.get('port') or '22')
+            return {"type": "sftp", "name": name, "config": config}, confidence, reason
+
+        url = _connection_url(connection)
+        if connector == 'odata':
+            config = {"operation": HTTP_METHODS.get(action, 'GET')}
+            if url is None:
+                confidence, reason = PLACEHOLDER_CONFIDENCE, missing_address
+            else:
+                config["service_url"] = url
+            return {"type": "odata", "name": name, "config": config}, confidence, reason
+
+        method = HTTP_METHODS.get(action, 'POST')
+        if connector == 'salesforce':
+            sf_operations = [op for op in (operation or {}).get('operations', []) if op['type'] == 'salesforce']
+            if not sf_operations:
+                return ({"type": "request_reply", "name": name, "config": {"url": PLACEHOLDER_URL, "method": method}},
+                        PLACEHOLDER_CONFIDENCE, f"operation {shape['operation_id']} not in the Boomi files")
+            method = HTTP_METHODS.get(sf_operations[0]['object_action'].lower(), method)
+            if url is not None:
+                parts = urlsplit(url)
+                url = f"{parts.scheme}://{parts.netloc}{SALESFORCE_API_PATH}/{sf_operations[0]['object_name']}"
+        if url is None:
+            url = f"{PLACEHOLDER_URL}/{connector or 'api'}"
+            confidence, reason = PLACEHOLDER_CONFIDENCE, missing_address
+        component = {
+            "type": "request_reply",
+            "name": name,
+            "config": {"url": url, "method": method},
+        }
+        return component, confidence, reason
+
+
+def synthesize_from_xml(documents):
+    """
+    Rule-based blueprint for Boomi XML files sent as text
+
+    Args:
+        documents (list): Files as {"name": ..., "content": ...} dictionaries
+
+    Returns:
+        SynthesisResult: The blueprint and its confidence
+    """
+    processor = BoomiXMLProcessor()
+    processor.process_xml_documents(documents)
+    return BlueprintSynthesizer().synthesize(processor.components)
@@ -10,6 +10,9 @@ import tempfile
 import shutil
 from typing import List, Dict, Any
 
+# Settings of a connection component that make up its address
+CONNECTION_FIELDS = ('url', 'host', 'port')
+
 class BoomiXMLProcessor:
     """Process Boomi XML files and extract meaningful information for conversion"""
     
@@ -50,13 +53,35 @@ class BoomiXMLProcessor:
             
             # Generate markdown representation
             return self._generate_markdown()
-    
+
+    def process_xml_documents(self, documents: List[Dict[str, str]]) -> str:
+        """
+        Process Boomi XML files sent as text, e.g. with an iFlow generation request
+
+        Args:
+            documents (list): Files as {"name": ..., "content": ...} dictionaries
+
+        Returns:
+            str: Markdown representation of the Boomi process
+        """
+        print(f"📄 Received {len(documents)} XML files")
+        for document in documents:
+            self._process_xml_content(document.get('content') or '', document.get('name', ''))
+        return self._generate_markdown()
+
     def _process_xml_file(self, xml_path: str):
         """Process a single Boomi XML file (may contain multiple XML documents)"""
         try:
             with open(xml_path, 'r', encoding='utf-8') as f:
                 content = f.read()
+        except Exception as e:
+            print(f"❌ Error processing {xml_path}: {e}")
+            return
+        self._process_xml_content(content, xml_path)
 
+    def _process_xml_content(self, content: str, source: str):
+        """Process the text of a Boomi XML file (may contain multiple XML documents)"""
+        try:
             # Split content by XML declaration to handle multiple documents
             xml_documents = self._split_xml_documents(content)
 
@@ -71,12 +96,12 @@ class BoomiXMLProcessor:
                         if component_info:
                             self.components.append(component_info)
                             print(f"✅ Processed component {i+1}: {component_info['name']} ({component_info['type']})")
-                    except ET.XMLSyntaxError as e:
+                    except ET.ParseError as e:
                         print(f"⚠️ XML parsing error in document {i+1}: {e}")
                         continue
 
         except Exception as e:
-            print(f"❌ Error processing {xml_path}: {e}")
+            print(f"❌ Error processing {source}: {e}")
 
     def _split_xml_documents(self, content: str) -> List[str]:
         """Split content into separate XML documents"""
@@ -115,6 +140,8 @@ class BoomiXMLProcessor:
             'mappings': [],
             'operations': [],
             'functions': [],
+            'shapes': [],
+            'connection': {},
             'raw_content': raw_content
         }
         
@@ -128,6 +155,10 @@ class BoomiXMLProcessor:
             self._extract_map_info(root, component_info)
         elif component_info['type'] == 'connector-action':
             self._extract_connector_info(root, component_info)
+        elif component_info['type'] == 'process':
+            self._extract_process_shapes(root, component_info)
+        elif component_info['type'] == 'connector-settings':
+            self._extract_connection_info(root, component_info)
         
         return component_info
     
@@ -191,6 +222,70 @@ class BoomiXMLProcessor:
             
             component_info['operations'].append(operation_info)
     
+    def _extract_connection_info(self, root: ET.Element, component_info: Dict[str, Any]):
+        """Extract the address of a connection component (url, host and port)"""
+
+        connection = component_info['connection']
+        for elem in root.iter():
+            # Generic connectors keep settings in <field id="..." value="..."/>, others in attributes
+            if elem.tag == 'field':
+                if elem.get('id') in CONNECTION_FIELDS and elem.get('value'):
+                    connection.setdefault(elem.get('id'), elem.get('value'))
+                continue
+            for name in CONNECTION_FIELDS:
+                if elem.get(name):
+                    connection.setdefault(name, elem.get(name))
+
+    def _extract_process_shapes(self, root: ET.Element, component_info: Dict[str, Any]):
+        """Extract the shapes of a process component and the connections between them"""
+        
+        process = root.find('.//process')
+        if process is None:
+            return
+        
+        for shape in process.findall('./shapes/shape'):
+            shape_info = {
+                'name': shape.get('name', ''),
+                'type': shape.get('shapetype', ''),
+                'user_label': shape.get('userlabel', ''),
+                'connector_type': '',
+                'action_type': '',
+                'operation_id': '',
+                'connection_id': '',
+                'map_id': '',
+                'properties': [],
+                'message': '',
+                'to_shapes': [dragpoint.get('toShape', '') for dragpoint in shape.findall('./dragpoints/dragpoint')]
+            }
+            
+            configuration = shape.find('configuration')
+            if configuration is not None:
+                connector_action = configuration.find('connectoraction')
+                if connector_action is not None:
+                    shape_info['connector_type'] = connector_action.get('connectorType', '')
+                    shape_info['action_type'] = connector_action.get('actionType', '')
+                    shape_info['operation_id'] = connector_action.get('operationId', '')
+                    shape_info['connection_id'] = connector_action.get('connectionId', '')
+                
+                map_elem = configuration.find('map')
+                if map_elem is not None:
+                    shape_info['map_id'] = map_elem.get('mapId', '')
+                
+                # Document properties and the kinds of values they are set from
+                for doc_prop in configuration.findall('./documentproperties/documentproperty'):
+                    shape_info['properties'].append({
+                        'name': doc_prop.get('name', ''),
+                        'property_id': doc_prop.get('propertyId', ''),
+                        'default_value': doc_prop.get('defaultValue', ''),
+                        'value_types': [value.get('valueType', '') for value in doc_prop.findall('./sourcevalues/parametervalue')]
+                    })
+                
+                msg_txt = configuration.find('./message/msgTxt')
+                if msg_txt is not None:
+                    shape_info['message'] = msg_txt.text or ''
+            
+            component_info['shapes'].append(shape_info)
+    
     def _generate_markdown(self) -> str:
         """Generate markdown representation of the Boomi process"""
         
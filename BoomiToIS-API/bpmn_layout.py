@@ -0,0 +1,387 @@
+"""
+Layered layout of the BPMN diagram of an integration process
+
+layout_flow_graph takes the flow nodes of a process (id and kind, in document
+order) and its sequence flows, and returns the bounds of every shape and the
+waypoints of every edge:
+
+- flows that close a loop are found with one depth-first search and laid out
+  as back edges, the rest form an acyclic graph
+- each node is placed in the layer after its furthest predecessor (longest
+  path over a topological order), layers are columns from left to right
+- lanes are rows: a node continues the lane of its predecessor, the second and
+  further routes of a router or gateway open new lanes below, and a join goes
+  back to the lowest lane of its incoming branches
+- edges run from the right side of the source to the left side of the target,
+  with one vertical segment in the gap between columns when the lanes differ;
+  back edges, and edges that would cross another shape of their lane, go round
+  through the gap below the lanes
+
+Every step visits each node and flow a constant number of times, so laying out
+an iFlow takes O(V + E) time. shape_xml and edge_xml write the results as
+BPMNShape and BPMNEdge elements.
+"""
+
+import re
+from collections import deque
+
+# Kinds of flow nodes and their shape sizes (width, height)
+EVENT = 'event'
+GATEWAY = 'gateway'
+ACTIVITY = 'activity'
+NODE_SIZES = {
+    EVENT: (32.0, 32.0),
+    GATEWAY: (40.0, 40.0),
+    ACTIVITY: (100.0, 60.0),
+}
+
+# Columns are as wide as the widest shape, lanes as high as the highest shape;
+# the spacings add the gaps that edges are routed through
+COLUMN_WIDTH = 100.0
+LANE_HEIGHT = 60.0
+LAYER_SPACING = 150.0
+LANE_SPACING = 100.0
+
+# Distance of a bend from the shape it leaves or enters
+BEND_OFFSET = 20.0
+
+SHAPE_PATTERN = re.compile(r'<bpmndi:BPMNShape\b[^>]*?\bbpmnElement="([^"]+)"[^>]*>\s*<dc:Bounds\b([^>]*?)/?>')
+ATTRIBUTE_PATTERN = re.compile(r'(\w+)="([^"]*)"')
+
+
+def node_kind(name):
+    """Kind of a flow node from its BPMN tag (startEvent, exclusiveGateway, ...) or id"""
+    lowered = (name or "").lower()
+    if 'event' in lowered:
+        return EVENT
+    if 'gateway' in lowered:
+        return GATEWAY
+    return ACTIVITY
+
+
+def _number(value):
+    """Coordinate as written in the diagram"""
+    return f"{float(value):.1f}"
+
+
+class Bounds:
+    """Position and size of a shape"""
+
+    __slots__ = ('x', 'y', 'width', 'height')
+
+    def __init__(self, x, y, width, height):
+        self.x = float(x)
+        self.y = float(y)
+        self.width = float(width)
+        self.height = float(height)
+
+    @property
+    def right(self):
+        return self.x + self.width
+
+    @property
+    def bottom(self):
+        return self.y + self.height
+
+    @property
+    def center(self):
+        return (self.x + self.width / 2, self.y + self.height / 2)
+
+    def overlaps(self, other):
+        return (self.x < other.right and other.x < self.right and
+                self.y < other.bottom and other.y < self.bottom)
+
+    def as_dict(self):
+        return {"x": self.x, "y": self.y, "width": self.width, "height": self.height}
+
+
+class EdgeRoute:
+    """Waypoints of the edge of one flow"""
+
+    __slots__ = ('flow_id', 'source', 'target', 'waypoints')
+
+    def __init__(self, flow_id, source, target, waypoints):
+        self.flow_id = flow_id
+        self.source = source
+        self.target = target
+        self.waypoints = waypoints
+
+
+class DiagramLayout:
+    """Shape bounds by node id (in document order) and the edge routes of the flows"""
+
+    __slots__ = ('shapes', 'edges')
+
+    def __init__(self, shapes, edges):
+        self.shapes = shapes
+        self.edges = edges
+
+    def container(self, padding=0.0, min_width=0.0, min_height=0.0):
+        """
+        Bounds around all shapes, such as the integration process participant.
+
+        The container starts padding to the left of and above the shapes and is
+        at least min_width by min_height.
+        """
+        if not self.shapes:
+            return Bounds(0.0, 0.0, min_width, min_height)
+        left = min(bounds.x for bounds in self.shapes.values())
+        top = min(bounds.y for bounds in self.shapes.values())
+        right = max(bounds.right for bounds in self.shapes.values())
+        bottom = max(bounds.bottom for bounds in self.shapes.values())
+        return Bounds(left - padding, top - padding,
+                      max(right - left + 2 * padding, min_width),
+                      max(bottom - top + 2 * padding, min_height))
+
+
+def route_edge(source, target):
+    """
+    Waypoints of an edge between two shapes.
+
+    Forward edges leave the right side of the source and enter the left side of
+    the target. When the shapes are at different heights the edge turns once:
+    right after the source when it goes down (into a branch) and right before
+    the target when it goes up (out of a branch), so the horizontal segment
+    runs along the lane of the branch. Edges to a shape on the left or above
+    the source loop round below both shapes.
+
+    Args:
+        source (Bounds): Bounds of the source shape
+        target (Bounds): Bounds of the target shape
+
+    Returns:
+        list: (x, y) waypoints
+    """
+    source_x, source_y = source.right, source.y + source.height / 2
+    target_x, target_y = target.x, target.y + target.height / 2
+
+    if target_x > source_x:
+        if source_y == target_y:
+            return [(source_x, source_y), (target_x, target_y)]
+        offset = min(BEND_OFFSET, (target_x - source_x) / 2)
+        bend_x = source_x + offset if target_y > source_y else target_x - offset
+        return [(source_x, source_y), (bend_x, source_y), (bend_x, target_y), (target_x, target_y)]
+
+    below = max(source.bottom, target.bottom) + BEND_OFFSET
+    out_x = source_x + BEND_OFFSET
+    in_x = target_x - BEND_OFFSET
+    return [(source_x, source_y), (out_x, source_y), (out_x, below),
+            (in_x, below), (in_x, target_y), (target_x, target_y)]
+
+
+def layout_flow_graph(nodes, flows, origin_x=0.0, origin_y=0.0):
+    """
+    Shapes and edges of a process diagram.
+
+    Args:
+        nodes (iterable): (node id, kind) pairs in document order; a repeated id is ignored
+        flows (iterable): (flow id, source id, target id) triples in document order;
+            flows with an end that is not a node get no edge
+        origin_x (float): Left side of the first column
+        origin_y (float): Top of the first lane
+
+    Returns:
+        DiagramLayout: Shape bounds and edge routes
+    """
+    index = {}
+    kinds = []
+    for node_id, kind in nodes:
+        if node_id not in index:
+            index[node_id] = len(kinds)
+            kinds.append(kind)
+    ids = list(index)
+    count = len(ids)
+
+    # Adjacency lists of flow indexes, in document order
+    edges = []
+    outgoing = [[] for _ in range(count)]
+    incoming_count = [0] * count
+    for flow_id, source_id, target_id in flows:
+        source = index.get(source_id)
+        target = index.get(target_id)
+        if source is None or target is None:
+            continue
+        outgoing[source].append(len(edges))
+        incoming_count[target] += 1
+        edges.append((flow_id, source, target))
+
+    # Back edges: flows to a node on the current depth-first search path, searching
+    # from the nodes without incoming flows first and then from any node left over
+    back = [False] * len(edges)
+    state = [0] * count  # 0 not visited, 1 on the search path, 2 done
+    roots = [node for node in range(count) if incoming_count[node] == 0]
+    roots.extend(range(count))
+    for root in roots:
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, 0)]
+        while stack:
+            node, position = stack[-1]
+            if position == len(outgoing[node]):
+                state[node] = 2
+                stack.pop()
+                continue
+            stack[-1] = (node, position + 1)
+            edge = outgoing[node][position]
+            target = edges[edge][2]
+            if state[target] == 1:
+                back[edge] = True
+            elif state[target] == 0:
+                state[target] = 1
+                stack.append((target, 0))
+
+    # Topological order of the forward flows; each node goes one layer after its furthest predecessor
+    remaining = [0] * count
+    for edge, (_, _, target) in enumerate(edges):
+        if not back[edge]:
+            remaining[target] += 1
+    layer = [0] * count
+    queue = deque(node for node in range(count) if remaining[node] == 0)
+    order = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for edge in outgoing[node]:
+            if back[edge]:
+                continue
+            target = edges[edge][2]
+            layer[target] = max(layer[target], layer[node] + 1)
+            remaining[target] -= 1
+            if remaining[target] == 0:
+                queue.append(target)
+
+    # Lanes, assigned layer by layer: the first forward flow of a node passes its lane
+    # on, further flows ask for another lane; a node takes the lowest lane passed to it,
+    # or another lane if none was passed or another node holds that lane in its layer.
+    # A lane is free again after its last node: a node without forward flows, or one
+    # whose lane was not taken by the node it was passed to (the join of a branch).
+    by_layer = [[] for _ in range(max(layer, default=0) + 1)]
+    for node in order:
+        by_layer[layer[node]].append(node)
+    lane = [None] * count
+    lane_offered = [None] * count
+    offered_by = [[] for _ in range(count)]
+    occupied = set()
+    next_lane = 0
+    free_lanes = []  # most recently freed last
+    freed_after = [[] for _ in range(len(by_layer) + 1)]  # lanes free from the next layer on
+    for current, layer_nodes in enumerate(by_layer):
+        free_lanes.extend(freed_after[current])
+        for node in layer_nodes:
+            assigned = lane_offered[node]
+            if assigned is None or (current, assigned) in occupied:
+                if free_lanes and (current, free_lanes[-1]) not in occupied:
+                    assigned = free_lanes.pop()
+                else:
+                    assigned = next_lane
+                    next_lane += 1
+            lane[node] = assigned
+            occupied.add((current, assigned))
+            for predecessor in offered_by[node]:
+                if lane[predecessor] != assigned:
+                    free_lanes.append(lane[predecessor])
+
+            heir = None
+            for edge in outgoing[node]:
+                if not back[edge]:
+                    heir = edges[edge][2]
+                    break
+            if heir is None:
+                freed_after[current + 1].append(assigned)
+            else:
+                offered_by[heir].append(node)
+                if lane_offered[heir] is None or assigned < lane_offered[heir]:
+                    lane_offered[heir] = assigned
+
+    shapes = {}
+    for node in range(count):
+        width, height = NODE_SIZES.get(kinds[node], NODE_SIZES[ACTIVITY])
+        x = origin_x + layer[node] * LAYER_SPACING + (COLUMN_WIDTH - width) / 2
+        y = origin_y + lane[node] * LANE_SPACING + (LANE_HEIGHT - height) / 2
+        shapes[ids[node]] = Bounds(x, y, width, height)
+
+    # Nodes of each lane from left to right, and the position of each node in its lane
+    lane_nodes = [[] for _ in range(next_lane)]
+    lane_position = [0] * count
+    for layer_nodes in by_layer:
+        for node in layer_nodes:
+            lane_position[node] = len(lane_nodes[lane[node]])
+            lane_nodes[lane[node]].append(node)
+
+    def lane_clear(node, from_layer, to_layer):
+        """True if no other node of the lane of node lies strictly between the two layers"""
+        nodes_in_lane = lane_nodes[lane[node]]
+        position = lane_position[node]
+        if layer[node] == from_layer:
+            following = nodes_in_lane[position + 1] if position + 1 < len(nodes_in_lane) else None
+            return following is None or layer[following] >= to_layer
+        preceding = nodes_in_lane[position - 1] if position > 0 else None
+        return preceding is None or layer[preceding] <= from_layer
+
+    gap_x = (LAYER_SPACING - COLUMN_WIDTH) / 2
+    gap_y = (LANE_SPACING - LANE_HEIGHT) / 2
+    routes = []
+    for edge, (flow_id, source, target) in enumerate(edges):
+        source_bounds = shapes[ids[source]]
+        target_bounds = shapes[ids[target]]
+        source_point = (source_bounds.right, source_bounds.y + source_bounds.height / 2)
+        target_point = (target_bounds.x, target_bounds.y + target_bounds.height / 2)
+        # Vertical segments run in the gaps between columns, next to the source or the target
+        out_x = origin_x + layer[source] * LAYER_SPACING + COLUMN_WIDTH + gap_x
+        in_x = origin_x + layer[target] * LAYER_SPACING - gap_x
+
+        if back[edge]:
+            clear = False
+        elif lane[source] == lane[target]:
+            clear = lane_clear(source, layer[source], layer[target])
+        elif lane[target] > lane[source]:
+            # Into a branch: down next to the source, then along the lane of the target
+            clear = lane_clear(target, layer[source], layer[target])
+        else:
+            # Out of a branch: along the lane of the source, then up next to the target
+            clear = lane_clear(source, layer[source], layer[target])
+
+        if not clear:
+            # Round the shapes in the way (or back to an earlier layer) below both lanes
+            below = origin_y + (max(lane[source], lane[target]) + 1) * LANE_SPACING - gap_y
+            waypoints = [source_point, (out_x, source_point[1]), (out_x, below),
+                         (in_x, below), (in_x, target_point[1]), target_point]
+        elif source_point[1] == target_point[1]:
+            waypoints = [source_point, target_point]
+        else:
+            bend_x = out_x if lane[target] > lane[source] else in_x
+            waypoints = [source_point, (bend_x, source_point[1]), (bend_x, target_point[1]), target_point]
+        routes.append(EdgeRoute(flow_id, ids[source], ids[target], waypoints))
+
+    return DiagramLayout(shapes, routes)
+
+
+def parse_shape_bounds(xml):
+    """Bounds of the BPMNShape elements of a diagram, by element id"""
+    shapes = {}
+    for match in SHAPE_PATTERN.finditer(xml):
+        attributes = dict(ATTRIBUTE_PATTERN.findall(match.group(2)))
+        try:
+            shapes.setdefault(match.group(1), Bounds(attributes['x'], attributes['y'],
+                                                     attributes['width'], attributes['height']))
+        except (KeyError, ValueError):
+            continue
+    return shapes
+
+
+def shape_xml(element_id, bounds, indent=""):
+    """BPMNShape element of a shape"""
+    return (f'{indent}<bpmndi:BPMNShape bpmnElement="{element_id}" id="BPMNShape_{element_id}">\n'
+            f'{indent}    <dc:Bounds height="{_number(bounds.height)}" width="{_number(bounds.width)}" '
+            f'x="{_number(bounds.x)}" y="{_number(bounds.y)}"/>\n'
+            f'{indent}</bpmndi:BPMNShape>')
+
+
+def edge_xml(flow_id, source_id, target_id, waypoints, indent=""):
+    """BPMNEdge element of a flow between two shapes"""
+    points = "".join(f'\n{indent}    <di:waypoint x="{_number(x)}" xsi:type="dc:Point" y="{_number(y)}"/>'
+                     for x, y in waypoints)
+    return (f'{indent}<bpmndi:BPMNEdge bpmnElement="{flow_id}" id="BPMNEdge_{flow_id}" '
+            f'sourceElement="BPMNShape_{source_id}" targetElement="BPMNShape_{target_id}">{points}\n'
+            f'{indent}</bpmndi:BPMNEdge>')
@@ -0,0 +1,31 @@
+"""Shared fixtures for the BoomiToIS-API tests"""
+import subprocess
+import types
+from functools import lru_cache
+from pathlib import Path
+
+import pytest
+
+SERVICE_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SERVICE_DIR.parent
+# Rewritten modules are checked against their version at this commit
+BASELINE_COMMIT = '91a9791'
+
+
+@lru_cache(maxsize=None)
+def load_baseline(module_name):
+    """A module of this service as of the baseline commit, read from git"""
+    try:
+        source = subprocess.run(['git', 'show', f'{BASELINE_COMMIT}:{SERVICE_DIR.name}/{module_name}.py'],
+                                cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        pytest.skip(f"baseline {module_name} is not available from git")
+    module = types.ModuleType(f'baseline_{module_name}')
+    exec(compile(source, f'baseline_{module_name}.py', 'exec'), module.__dict__)
+    return module
+
+
+@pytest.fixture
+def baseline():
+    """Loader of baseline modules: baseline('iflow_sanitizer')"""
+    return load_baseline
@@ -0,0 +1,144 @@
+"""
+Job-scoped debug artifacts for the GenAI iFlow generator
+
+Every generation writes its debug files into its own genai_debug/<job_id>/
+directory, so concurrent jobs never read or overwrite each other's output.
+Stages hand data to each other in memory; files are only written for
+troubleshooting, in the background and capped in size.
+"""
+
+import os
+import re
+import json
+import shutil
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Root directory for all job artifact directories
+DEBUG_ROOT = os.getenv("GENAI_DEBUG_DIR", "genai_debug")
+
+# Larger artifacts are truncated (raw LLM responses and iFlow XML can be several MB)
+MAX_ARTIFACT_CHARS = int(os.getenv("GENAI_DEBUG_MAX_CHARS", str(2 * 1024 * 1024)))
+
+# Number of job directories kept when old ones are pruned
+KEEP_JOB_DIRECTORIES = int(os.getenv("GENAI_DEBUG_KEEP_JOBS", "50"))
+
+# Shared by all jobs - debug writes never block the generation thread
+_writer_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="genai-debug")
+
+
+def _safe_dir_name(name):
+    """Make a job id safe to use as a directory name"""
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', str(name))[:100] or "job"
+
+
+class DebugArtifacts:
+    """Debug files and in-memory stage results for a single generation job"""
+
+    def __init__(self, job_id=None, root=DEBUG_ROOT, max_chars=MAX_ARTIFACT_CHARS):
+        """
+        Args:
+            job_id (str, optional): Job ID; a unique run id is generated when not given
+            root (str): Root directory holding the per-job directories
+            max_chars (int): Maximum size of a single artifact before truncation
+        """
+        self.job_id = job_id or f"run_{uuid.uuid4().hex[:12]}"
+        self.root = root
+        self.directory = os.path.join(root, _safe_dir_name(self.job_id))
+        self.max_chars = max_chars
+        self._stages = {}
+        self._pending = []
+        self._lock = threading.Lock()
+
+    # In-memory hand-off between generation stages
+
+    def put(self, key, value):
+        """Keep a stage result in memory for later stages of the same job"""
+        self._stages[key] = value
+
+    def get(self, key, default=None):
+        """Get a stage result stored with put()"""
+        return self._stages.get(key, default)
+
+    # Background file writing
+
+    def path(self, name):
+        """Path of an artifact inside this job's directory"""
+        return os.path.join(self.directory, name)
+
+    def write_text(self, name, content):
+        """
+        Queue a text artifact for writing and return its path
+
+        Args:
+            name (str): File name inside the job directory
+            content (str): Text to write (truncated to max_chars)
+
+        Returns:
+            str: Path the artifact will be written to
+        """
+        content = content if isinstance(content, str) else str(content)
+        if len(content) > self.max_chars:
+            content = content[:self.max_chars] + f"\n\n... [truncated {len(content) - self.max_chars} characters]\n"
+
+        future = _writer_pool.submit(self._write, name, content)
+        with self._lock:
+            self._pending = [f for f in self._pending if not f.done()]
+            self._pending.append(future)
+        return self.path(name)
+
+    def write_json(self, name, data):
+        """
+        Queue a JSON artifact for writing and return its path.
+        Data is serialized immediately so later changes by the generator are not captured.
+        """
+        return self.write_text(name, json.dumps(data, indent=2, default=str))
+
+    def flush(self, timeout=None):
+        """Wait until all queued artifacts of this job have been written"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if pending:
+            wait(pending, timeout=timeout)
+
+    def list_files(self):
+        """
+        Get all artifacts written for this job
+
+        Returns:
+            dict: Mapping of file name to path
+        """
+        self.flush()
+        if not os.path.isdir(self.directory):
+            return {}
+        return {name: self.path(name) for name in sorted(os.listdir(self.directory))}
+
+    def prune_old_jobs(self, keep_latest=KEEP_JOB_DIRECTORIES):
+        """Remove the oldest job directories under the root in the background, never this job's"""
+        _writer_pool.submit(_prune_job_directories, self.root, keep_latest, self.directory)
+
+    def _write(self, name, content):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.path(name), "w", encoding="utf-8") as f:
+                f.write(content)
+        except Exception as e:
+            print(f"Warning: Could not write debug artifact {name}: {e}")
+
+
+def _prune_job_directories(root, keep_latest, current_directory):
+    """Delete all but the newest keep_latest job directories"""
+    try:
+        if not os.path.isdir(root):
+            return
+        job_dirs = []
+        for entry in os.scandir(root):
+            if entry.is_dir() and os.path.abspath(entry.path) != os.path.abspath(current_directory):
+                job_dirs.append((entry.stat().st_mtime, entry.path))
+        job_dirs.sort(reverse=True)
+        for _, path in job_dirs[max(keep_latest - 1, 0):]:
+            shutil.rmtree(path, ignore_errors=True)
+            print(f"🗑️  Cleaned up old debug artifacts: {os.path.basename(path)}")
+    except Exception as e:
+        print(f"Error during debug artifact cleanup: {e}")
@@ -13,8 +13,26 @@ import zipfile
 import argparse
 import datetime
 import uuid
+import time
+from concurrent.futures import ThreadPoolExecutor
 from enhanced_iflow_templates import EnhancedIFlowTemplates
+from iflow_template_engine import fill
 from boomi_xml_processor import BoomiXMLProcessor
+from boomi_blueprint_synthesizer import BlueprintSynthesizer, FAST_PATH_ENABLED
+from streaming_json_validator import IncrementalBlueprintValidator, StreamingValidationError
+from debug_artifacts import DebugArtifacts
+from iflow_cache import get_iflow_cache, blueprint_hash
+from genai_prompt import AnalysisPrompt, CallMetrics, compact_markdown, estimate_tokens, prompt_text, user_content
+from iflow_document import IFlowDocument, FLOW_NODE_TAGS, rewire_flow_references
+from bpmn_layout import ACTIVITY, Bounds, layout_flow_graph, node_kind, route_edge, shape_xml, edge_xml
+from iflow_postprocess import postprocess_iflow
+
+# Post-processing of generated iFlows: sanitizer rules and re-indenting are opt-in
+IFLOW_SANITIZE = os.getenv('IFLOW_SANITIZE', 'false').lower() == 'true'
+IFLOW_PRETTY_PRINT = os.getenv('IFLOW_PRETTY_PRINT', 'false').lower() == 'true'
+
+# Workers creating the components of the endpoints of a blueprint (1 creates them one by one)
+ENDPOINT_WORKERS = int(os.getenv('IFLOW_ENDPOINT_WORKERS', '4'))
 
 class EnhancedGenAIIFlowGenerator:
     """
@@ -24,6 +42,18 @@ class EnhancedGenAIIFlowGenerator:
     VERSION_ID = "BoomiTOIS-API-v1.0"
     FILE_PATH = __file__
 
+    # Simple system prompt for JSON generation
+    CLAUDE_SYSTEM_PROMPT = """
+                You are an expert in SAP Integration Suite and iFlow development.
+                Your task is to analyze the provided content and respond according to the user's request.
+                
+                IMPORTANT: 
+                - If asked for JSON, generate ONLY valid JSON
+                - If asked for descriptions, generate ONLY plain text
+                - Do NOT generate XML unless specifically requested
+                - Follow the user's prompt exactly
+                """
+
     def __init__(self, api_key=None, model="claude-sonnet-4-20250514", provider="claude", use_converter=False):
         """
         Initialize the generator
@@ -55,6 +85,18 @@ class EnhancedGenAIIFlowGenerator:
         # Job status tracking
         self.jobs = {}
 
+        # Debug files and stage results of the current job (replaced per generate_iflow call)
+        self.debug_artifacts = DebugArtifacts()
+
+        # Tokens and latency of the most recent LLM call (CallMetrics)
+        self.last_call_metrics = None
+
+        # True while generating from a rule-based blueprint, which makes no LLM calls
+        self.rule_based_blueprint = False
+
+        # Blueprints and rendered iFlows of earlier jobs (None if IFLOW_CACHE is off)
+        self.iflow_cache = get_iflow_cache()
+
         # Initialize OpenAI if needed
         if provider == "openai" and api_key:
             try:
@@ -76,63 +118,53 @@ class EnhancedGenAIIFlowGenerator:
 
     def _call_llm_api(self, prompt):
         """
-        Call the LLM API with the given prompt
+        Call the LLM API with the given prompt. Tokens and latency of the call
+        are kept in self.last_call_metrics.
 
         Args:
-            prompt (str): The prompt for the LLM
+            prompt (str or AnalysisPrompt): The prompt for the LLM
 
         Returns:
             str: The response from the LLM
         """
+        started = time.perf_counter()
         if self.provider == "openai":
             # Use OpenAI API
             response = self.openai.ChatCompletion.create(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are an expert in SAP Integration Suite and API design."},
-                    {"role": "user", "content": prompt}
+                    {"role": "user", "content": prompt_text(prompt)}
                 ],
                 temperature=0.2,  # Lower temperature for more deterministic output
                 max_tokens=4000
             )
 
+            self.last_call_metrics = CallMetrics.from_usage(
+                "openai", self.model, time.perf_counter() - started, getattr(response, "usage", None))
             return response.choices[0].message.content
 
         elif self.provider == "claude":
             # Use Claude API with the Anthropic client
             try:
-                # Simple system prompt for JSON generation
-                system_prompt = """
-                You are an expert in SAP Integration Suite and iFlow development.
-                Your task is to analyze the provided content and respond according to the user's request.
-                
-                IMPORTANT: 
-                - If asked for JSON, generate ONLY valid JSON
-                - If asked for descriptions, generate ONLY plain text
-                - Do NOT generate XML unless specifically requested
-                - Follow the user's prompt exactly
-                """
-
                 message = self.anthropic_client.messages.create(
                     model=self.model,
                     max_tokens=8000,
                     temperature=0.1,  # Low temperature for deterministic output
-                    system=system_prompt,
+                    system=self.CLAUDE_SYSTEM_PROMPT,
                     messages=[
                         {
                             "role": "user",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": prompt
-                                }
-                            ]
+                            # Instructions and documentation are separate, cached blocks
+                            "content": user_content(prompt)
                         }
                     ]
                 )
 
                 # Extract the text content from the response
                 response_content = message.content[0].text
+                self.last_call_metrics = CallMetrics.from_usage(
+                    "claude", self.model, time.perf_counter() - started, getattr(message, "usage", None))
                 return response_content
 
             except Exception as e:
@@ -144,102 +176,189 @@ class EnhancedGenAIIFlowGenerator:
         else:
             # Use a local LLM (placeholder) - try to extract JSON from the prompt
             print("Using local LLM (placeholder)")
+            response = self._local_llm_response(prompt_text(prompt))
+            self.last_call_metrics = CallMetrics.estimate("local", None, time.perf_counter() - started, prompt, response)
+            return response
 
-            # Try to extract JSON from the prompt/markdown
-            try:
-                import json
-                import re
+    def _local_llm_response(self, prompt):
+        """
+        Response of the local LLM placeholder: JSON found in the prompt, or a simple example
 
-                # Look for JSON in the prompt - try multiple patterns
-                json_patterns = [
-                    r'```json\s*(\{[\s\S]*?\})\s*```',  # JSON in code blocks
-                    r'```\s*(\{[\s\S]*?\})\s*```',  # JSON in generic code blocks
-                    r'"process_name":\s*"[^"]*"[\s\S]*?\}',  # Look for process_name as anchor
-                    r'\{[\s\S]*?"process_name"[\s\S]*?\}',  # JSON containing process_name
-                    r'\{[\s\S]*\}',  # Basic JSON pattern (last resort)
-                ]
+        Args:
+            prompt (str): The prompt text
 
-                # Also try to find JSON by looking for the specific structure from the test
-                if '"process_name"' in prompt and '"endpoints"' in prompt:
-                    # Try to extract the JSON structure more carefully
-                    start_idx = prompt.find('{')
-                    if start_idx != -1:
-                        # Find the matching closing brace
-                        brace_count = 0
-                        end_idx = start_idx
-                        for i, char in enumerate(prompt[start_idx:], start_idx):
-                            if char == '{':
-                                brace_count += 1
-                            elif char == '}':
-                                brace_count -= 1
-                                if brace_count == 0:
-                                    end_idx = i + 1
-                                    break
+        Returns:
+            str: The response
+        """
+        # Try to extract JSON from the prompt/markdown
+        try:
+            import json
+            import re
+
+            # Look for JSON in the prompt - try multiple patterns
+            json_patterns = [
+                r'```json\s*(\{[\s\S]*?\})\s*```',  # JSON in code blocks
+                r'```\s*(\{[\s\S]*?\})\s*```',  # JSON in generic code blocks
+                r'"process_name":\s*"[^"]*"[\s\S]*?\}',  # Look for process_name as anchor
+                r'\{[\s\S]*?"process_name"[\s\S]*?\}',  # JSON containing process_name
+                r'\{[\s\S]*\}',  # Basic JSON pattern (last resort)
+            ]
 
-                        if brace_count == 0:  # Found matching braces
-                            json_str = prompt[start_idx:end_idx]
-                            try:
-                                parsed_json = json.loads(json_str)
-                                print(f"✅ Local LLM extracted JSON by brace matching: {parsed_json.get('process_name', 'Unknown Process')}")
-                                return json.dumps(parsed_json, indent=2)
-                            except json.JSONDecodeError as e:
-                                print(f"❌ Brace matching found JSON but couldn't parse it: {e}")
-                                # Continue to try other patterns
-
-                for pattern in json_patterns:
-                    json_match = re.search(pattern, prompt, re.MULTILINE | re.DOTALL)
-                    if json_match:
-                        # Extract the JSON string (use group 1 if it exists, otherwise group 0)
-                        json_str = json_match.group(1) if json_match.groups() else json_match.group(0)
+            # Also try to find JSON by looking for the specific structure from the test
+            if '"process_name"' in prompt and '"endpoints"' in prompt:
+                # Try to extract the JSON structure more carefully
+                start_idx = prompt.find('{')
+                if start_idx != -1:
+                    # Find the matching closing brace
+                    brace_count = 0
+                    end_idx = start_idx
+                    for i, char in enumerate(prompt[start_idx:], start_idx):
+                        if char == '{':
+                            brace_count += 1
+                        elif char == '}':
+                            brace_count -= 1
+                            if brace_count == 0:
+                                end_idx = i + 1
+                                break
 
+                    if brace_count == 0:  # Found matching braces
+                        json_str = prompt[start_idx:end_idx]
                         try:
                             parsed_json = json.loads(json_str)
-                            print(f"✅ Local LLM extracted JSON from input: {parsed_json.get('process_name', 'Unknown Process')}")
+                            print(f"✅ Local LLM extracted JSON by brace matching: {parsed_json.get('process_name', 'Unknown Process')}")
                             return json.dumps(parsed_json, indent=2)
                         except json.JSONDecodeError as e:
-                            print(f"❌ Found JSON-like content but couldn't parse it: {e}")
-                            # Try to clean up the JSON and parse again
-                            try:
-                                # Remove any trailing commas and fix common issues
-                                cleaned_json = re.sub(r',\s*}', '}', json_str)
-                                cleaned_json = re.sub(r',\s*]', ']', cleaned_json)
-                                parsed_json = json.loads(cleaned_json)
-                                print(f"✅ Local LLM extracted JSON after cleanup: {parsed_json.get('process_name', 'Unknown Process')}")
-                                return json.dumps(parsed_json, indent=2)
-                            except json.JSONDecodeError:
-                                print(f"❌ Still couldn't parse JSON after cleanup")
-                                continue
+                            print(f"❌ Brace matching found JSON but couldn't parse it: {e}")
+                            # Continue to try other patterns
+
+            for pattern in json_patterns:
+                json_match = re.search(pattern, prompt, re.MULTILINE | re.DOTALL)
+                if json_match:
+                    # Extract the JSON string (use group 1 if it exists, otherwise group 0)
+                    json_str = json_match.group(1) if json_match.groups() else json_match.group(0)
+
+                    try:
+                        parsed_json = json.loads(json_str)
+                        print(f"✅ Local LLM extracted JSON from input: {parsed_json.get('process_name', 'Unknown Process')}")
+                        return json.dumps(parsed_json, indent=2)
+                    except json.JSONDecodeError as e:
+                        print(f"❌ Found JSON-like content but couldn't parse it: {e}")
+                        # Try to clean up the JSON and parse again
+                        try:
+                            # Remove any trailing commas and fix common issues
+                            cleaned_json = re.sub(r',\s*}', '}', json_str)
+                            cleaned_json = re.sub(r',\s*]', ']', cleaned_json)
+                            parsed_json = json.loads(cleaned_json)
+                            print(f"✅ Local LLM extracted JSON after cleanup: {parsed_json.get('process_name', 'Unknown Process')}")
+                            return json.dumps(parsed_json, indent=2)
+                        except json.JSONDecodeError:
+                            print(f"❌ Still couldn't parse JSON after cleanup")
+                            continue
+
+            # If no JSON found, return a simple default
+            print("⚠️  No JSON found in input, using default structure")
+
+        except Exception as e:
+            print(f"❌ Error in local LLM JSON extraction: {e}")
+
+        # Fallback to simple example
+        return """
+        {
+            "api_name": "Example API",
+            "base_url": "/api/v1",
+            "endpoints": [
+                {
+                    "method": "GET",
+                    "path": "/test",
+                    "purpose": "Test endpoint",
+                    "components": [
+                        {
+                            "type": "enricher",
+                            "name": "Test Component",
+                            "id": "test_1",
+                            "config": {}
+                        }
+                    ],
+                    "sequence": ["StartEvent_2", "test_1", "EndEvent_2"]
+                }
+            ]
+        }
+        """
+    def _stream_llm_api(self, prompt):
+        """
+        Call the LLM API and validate the JSON blueprint while the response streams in.
+        The stream is abandoned at the first structural or schema error, so a bad
+        attempt costs only the tokens generated up to that point.
+
+        Args:
+            prompt (str or AnalysisPrompt): The prompt for the LLM
+
+        Returns:
+            tuple: (response_text, validator) - validator.error is set if the response was rejected,
+                   otherwise validator.document holds the parsed blueprint
+        """
+        validator = IncrementalBlueprintValidator()
+
+        if self.provider == "claude":
+            started = time.perf_counter()
+            try:
+                with self.anthropic_client.messages.stream(
+                    model=self.model,
+                    max_tokens=8000,
+                    temperature=0.1,  # Low temperature for deterministic output
+                    system=self.CLAUDE_SYSTEM_PROMPT,
+                    messages=[
+                        {
+                            "role": "user",
+                            # Instructions and documentation are separate, cached blocks
+                            "content": user_content(prompt)
+                        }
+                    ]
+                ) as stream:
+                    try:
+                        for text in stream.text_stream:
+                            if validator.feed(text):
+                                # Root object closed - anything after it is not needed
+                                break
+                    finally:
+                        self.last_call_metrics = self._stream_metrics(stream, started, validator.buffer)
+                validator.finish()
+                return validator.buffer, validator
 
-                # If no JSON found, return a simple default
-                print("⚠️  No JSON found in input, using default structure")
+            except StreamingValidationError as e:
+                print(f"⏹️  Aborted streamed response after {len(validator.buffer)} characters: {e}")
+                return validator.buffer, validator
 
             except Exception as e:
-                print(f"❌ Error in local LLM JSON extraction: {e}")
+                print(f"Error streaming from Claude API: {e}")
+                # Fall back to a single blocking call for this attempt
+                validator.reset()
 
-            # Fallback to simple example
-            return """
-            {
-                "api_name": "Example API",
-                "base_url": "/api/v1",
-                "endpoints": [
-                    {
-                        "method": "GET",
-                        "path": "/test",
-                        "purpose": "Test endpoint",
-                        "components": [
-                            {
-                                "type": "enricher",
-                                "name": "Test Component",
-                                "id": "test_1",
-                                "config": {}
-                            }
-                        ],
-                        "sequence": ["StartEvent_2", "test_1", "EndEvent_2"]
-                    }
-                ]
-            }
-            """
-    def generate_iflow(self, markdown_content, output_path, iflow_name, job_id=None):
+        # Providers without streaming: validate the complete response in one go
+        response = self._call_llm_api(prompt)
+        try:
+            validator.feed(response)
+            validator.finish()
+        except StreamingValidationError as e:
+            print(f"❌ Response rejected by incremental validator: {e}")
+        return response, validator
+
+    def _stream_metrics(self, stream, started, response_text):
+        """
+        Tokens and latency of a streamed Claude call, also when the stream was abandoned.
+        Input and cache usage arrive with the first event; the output count is only
+        final at the end of the stream, so what was received is estimated instead.
+        """
+        try:
+            usage = stream.current_message_snapshot.usage
+        except Exception:
+            usage = None
+        metrics = CallMetrics.from_usage("claude", self.model, time.perf_counter() - started, usage)
+        metrics.output_tokens = max(metrics.output_tokens, estimate_tokens(response_text))
+        return metrics
+
+    def generate_iflow(self, markdown_content, output_path, iflow_name, job_id=None, debug_artifacts=None,
+                       blueprint=None):
         """
         Generate an iFlow from markdown content
 
@@ -248,10 +367,14 @@ class EnhancedGenAIIFlowGenerator:
             output_path (str): Path to save the generated iFlow
             iflow_name (str): Name of the iFlow
             job_id (str, optional): Job ID for progress tracking
+            debug_artifacts (DebugArtifacts, optional): Artifact store to reuse; a new job-scoped one by default
+            blueprint (dict, optional): Rule-based blueprint to use instead of analyzing the markdown
 
         Returns:
             str: Path to the generated iFlow ZIP file
         """
+        self.debug_artifacts = debug_artifacts or DebugArtifacts(job_id)
+        self.rule_based_blueprint = blueprint is not None
         self._update_job_status(job_id, "processing", "Starting iFlow generation...")
 
         # Step 1: Use GenAI to analyze the markdown and determine components (skip for template-based approach)
@@ -259,8 +382,17 @@ class EnhancedGenAIIFlowGenerator:
         # The only difference is which generation method is used after getting the JSON
         print(f"🔍 DEBUG: Content analysis - use_converter={self.use_converter}")
         
+        if blueprint is not None:
+            print("⚡ Using rule-based blueprint - skipping GenAI analysis")
+            components = blueprint
+            self.debug_artifacts.put("final_components", {
+                "timestamp": datetime.datetime.now().isoformat(),
+                "iflow_name": iflow_name,
+                "components": components
+            })
+            self.debug_artifacts.write_json("final_components.json", components)
         # Check if we have JSON in the markdown content (from UI conversion)
-        if markdown_content and markdown_content.strip().startswith('{'):
+        elif markdown_content and markdown_content.strip().startswith('{'):
             try:
                 import json
                 parsed_content = json.loads(markdown_content)
@@ -294,9 +426,33 @@ class EnhancedGenAIIFlowGenerator:
             # For both converter and template approaches, use GenAI to analyze markdown documentation
             components = self._analyze_with_genai(markdown_content, job_id=job_id)
 
-        # Step 2: Generate the iFlow files
-        self._update_job_status(job_id, "processing", "Generating iFlow XML and configuration files...")
-        iflow_files = self._generate_iflow_files(components, iflow_name, markdown_content)
+        # Step 2: Generate the iFlow files, or reuse the files rendered from the same blueprint
+        rendered_key = None
+        rendered = None
+        if self.iflow_cache is not None:
+            rendered_key = blueprint_hash(components, iflow_name, self.VERSION_ID, self.use_converter,
+                                          IFLOW_SANITIZE, IFLOW_PRETTY_PRINT)
+            rendered = self.iflow_cache.get_rendered(rendered_key)
+        if rendered is not None:
+            print(f"♻️ Reusing the iFlow rendered from the same blueprint ({rendered_key[:12]})")
+            iflow_files = rendered["files"]
+            # The description in metainfo.prop comes from the markdown, not the blueprint
+            iflow_files["metainfo.prop"] = self._generate_metainfo_content(iflow_name, markdown_content)
+            # The job still gets the debug artifacts of the iFlow it packages
+            self.generation_approach = rendered["generation_approach"]
+            self.generation_details = rendered["generation_details"]
+            iflow_path = f"src/main/resources/scenarioflows/integrationflow/{iflow_name}.iflw"
+            self._write_iflow_debug_artifacts(iflow_name, rendered["raw_iflow"], iflow_files[iflow_path])
+        else:
+            self._update_job_status(job_id, "processing", "Generating iFlow XML and configuration files...")
+            iflow_files = self._generate_iflow_files(components, iflow_name, markdown_content)
+            if rendered_key is not None and all(isinstance(content, str) for content in iflow_files.values()):
+                self.iflow_cache.put_rendered(rendered_key, {
+                    "files": iflow_files,
+                    "raw_iflow": self.debug_artifacts.get("raw_iflow"),
+                    "generation_approach": self.generation_approach,
+                    "generation_details": self.generation_details,
+                })
 
         # Step 3: Create the ZIP file
         self._update_job_status(job_id, "processing", "Creating final iFlow package...")
@@ -391,13 +547,28 @@ class EnhancedGenAIIFlowGenerator:
         print(f"✅ Extracted Boomi process information ({len(markdown_content)} characters)")
 
         # Save the extracted markdown for debugging
-        os.makedirs("genai_debug", exist_ok=True)
-        with open("genai_debug/boomi_extracted_markdown.md", "w", encoding="utf-8") as f:
-            f.write(markdown_content)
-        print("📄 Saved extracted markdown to genai_debug/boomi_extracted_markdown.md")
+        debug_artifacts = DebugArtifacts()
+        markdown_path = debug_artifacts.write_text("boomi_extracted_markdown.md", markdown_content)
+        print(f"📄 Saved extracted markdown to {markdown_path}")
+
+        # Step 2: Build the blueprint with rules when the process is simple enough
+        blueprint = None
+        if FAST_PATH_ENABLED:
+            started = time.perf_counter()
+            result = BlueprintSynthesizer().synthesize(processor.components)
+            debug_artifacts.write_json("boomi_fast_path.json", result.as_dict())
+            for reason in result.reasons:
+                print(f"⚡ Fast path: {reason}")
+            if result.accepted:
+                print(f"⚡ Rule-based blueprint with confidence {result.confidence:.2f} "
+                      f"in {(time.perf_counter() - started) * 1000:.1f}ms")
+                blueprint = result.blueprint
+            else:
+                print(f"⚡ Rule-based blueprint confidence {result.confidence:.2f} is too low - using GenAI analysis")
 
-        # Step 2: Use the standard iFlow generation process
-        return self.generate_iflow(markdown_content, output_path, iflow_name)
+        # Step 3: Use the standard iFlow generation process
+        return self.generate_iflow(markdown_content, output_path, iflow_name, debug_artifacts=debug_artifacts,
+                                   blueprint=blueprint)
 
     def _analyze_with_genai(self, markdown_content, max_retries=5, job_id=None):
         """
@@ -405,29 +576,56 @@ class EnhancedGenAIIFlowGenerator:
         """
         self._update_job_status(job_id, "processing", "Analyzing integration requirements with AI...")
 
+        cache_model = f"{self.provider}:{self.model}"
+        if self.iflow_cache is not None:
+            components = self.iflow_cache.get_blueprint(markdown_content, cache_model)
+            if components is not None:
+                print("♻️ Reusing the blueprint analyzed from the same documentation - skipping GenAI analysis")
+                self.debug_artifacts.put("final_components", {
+                    "timestamp": datetime.datetime.now().isoformat(),
+                    "iflow_name": f"IFlow_{uuid.uuid4().hex[:8]}",
+                    "components": components
+                })
+                self.debug_artifacts.write_json("final_components.json", components)
+                return components
+
         prompt = self._create_detailed_analysis_prompt(markdown_content)
+        instruction_tokens, document_tokens, _ = prompt.estimated_tokens()
+        print(f"📏 Prompt: ~{instruction_tokens} instruction tokens (cached), ~{document_tokens} documentation tokens "
+              f"(markdown ~{estimate_tokens(markdown_content)} tokens before compaction)")
+        attempt_metrics = []
         attempt = 0
         while attempt < max_retries:
             self._update_job_status(job_id, "processing", f"AI Analysis attempt {attempt + 1}/{max_retries}...")
 
-            response = self._call_llm_api(prompt)
-            os.makedirs("genai_debug", exist_ok=True)
-            with open(f"genai_debug/raw_analysis_response_attempt{attempt+1}.txt", "w", encoding="utf-8") as f:
-                f.write(response)
-            print(f"Saved raw analysis response to genai_debug/raw_analysis_response_attempt{attempt+1}.txt")
-            is_valid, message = self._validate_genai_response(response)
+            self.last_call_metrics = None
+            response, stream_validator = self._stream_llm_api(prompt)
+            if self.last_call_metrics is not None:
+                print(f"📊 Attempt {attempt+1}: {self.last_call_metrics.summary()}")
+                attempt_metrics.append(dict(self.last_call_metrics.as_dict(), attempt=attempt + 1))
+                self.debug_artifacts.write_json("llm_metrics.json", attempt_metrics)
+            debug_path = self.debug_artifacts.write_text(f"raw_analysis_response_attempt{attempt+1}.txt", response)
+            print(f"Saved raw analysis response to {debug_path}")
+            if stream_validator.error is None:
+                is_valid, message = True, "Valid JSON response"
+            else:
+                # Give the retry prompt the exact location and the text around it
+                is_valid = False
+                message = (f"{stream_validator.error.describe()}. "
+                           f"Text near the error: {stream_validator.error_context()!r}")
             if is_valid:
                 self._update_job_status(job_id, "processing", "AI analysis successful, parsing components...")
                 try:
-                    components = self._parse_llm_response(response)
+                    # The validator already parsed the exact JSON span - no regex extraction needed
+                    components = self._normalize_parsed_components(stream_validator.document)
+                    for warning in stream_validator.warnings[:10]:
+                        print(f"⚠️  Schema warning: {warning}")
 
                     # Check if components have meaningful content
                     if self._has_meaningful_components(components):
-                        with open("genai_debug/parsed_components.json", "w", encoding="utf-8") as f:
-                            import json
-                            json.dump(components, f, indent=2)
+                        debug_path = self.debug_artifacts.write_json("parsed_components.json", components)
                         print("✅ Successfully parsed components with meaningful content")
-                        print("Saved parsed components to genai_debug/parsed_components.json")
+                        print(f"Saved parsed components to {debug_path}")
 
                         components = self._generate_transformation_scripts(components)
                         # DISABLED: _create_intelligent_connections was overriding GenAI sequence flows
@@ -441,25 +639,26 @@ class EnhancedGenAIIFlowGenerator:
                             "components": components
                         }
                         
-                        # Save with timestamp
-                        with open("genai_debug/final_components.json", "w", encoding="utf-8") as f:
-                            json.dump(timestamped_components, f, indent=2)
-                        print(f"Saved final components to genai_debug/final_components.json with timestamp: {timestamped_components['timestamp']}")
+                        # Hand the result to later stages in memory; the file is for debugging only
+                        self.debug_artifacts.put("final_components", timestamped_components)
+                        debug_path = self.debug_artifacts.write_json("final_components.json", timestamped_components)
+                        print(f"Saved final components to {debug_path} with timestamp: {timestamped_components['timestamp']}")
                         
-                        # Clean up old JSON files to prevent confusion
+                        # Clean up artifact directories of old jobs
                         self._cleanup_old_json_files()
+
+                        if self.iflow_cache is not None:
+                            self.iflow_cache.put_blueprint(markdown_content, components, cache_model)
                         
                         return components
                     else:
                         print(f"❌ Attempt {attempt+1} failed: Parsed components lack meaningful content")
-                        with open(f"genai_debug/empty_components_attempt{attempt+1}.json", "w", encoding="utf-8") as f:
-                            import json
-                            json.dump(components, f, indent=2)
+                        self.debug_artifacts.write_json(f"empty_components_attempt{attempt+1}.json", components)
 
                         attempt += 1
                         if attempt < max_retries:
                             print("Retrying with more explicit prompt...")
-                            prompt = self._create_more_explicit_prompt(markdown_content, "Empty components detected")
+                            prompt = self._create_more_explicit_prompt(prompt, "Empty components detected")
                         continue
 
                 except Exception as e:
@@ -468,12 +667,11 @@ class EnhancedGenAIIFlowGenerator:
                     attempt += 1
                     if attempt < max_retries:
                         print("Retrying with more explicit prompt...")
-                        prompt = self._create_more_explicit_prompt(markdown_content, f"JSON parsing error: {e}")
+                        prompt = self._create_more_explicit_prompt(prompt, f"JSON parsing error: {e}")
                     continue
             else:
                 print(f"❌ Attempt {attempt+1} failed: {message}")
-                with open(f"genai_debug/invalid_response_attempt{attempt+1}.txt", "w", encoding="utf-8") as f:
-                    f.write(response)
+                self.debug_artifacts.write_text(f"invalid_response_attempt{attempt+1}.txt", response)
 
                 # Show a snippet of the problematic response for debugging
                 response_snippet = response[:200] + "..." if len(response) > 200 else response
@@ -484,20 +682,23 @@ class EnhancedGenAIIFlowGenerator:
                 # On retry, use the more explicit prompt
                 if attempt < max_retries:
                     print("Retrying with more explicit prompt...")
-                    prompt = self._create_more_explicit_prompt(markdown_content, message)
+                    prompt = self._create_more_explicit_prompt(prompt, message)
         # If all attempts fail, FAIL THE PROCESS - NO FALLBACK
         error_message = f"🚨 CRITICAL FAILURE: All {max_retries} GenAI attempts failed to generate valid JSON."
         print(error_message)
         print("❌ NO FALLBACK ALLOWED - Process must fail to ensure data quality.")
 
         # Save debug information
-        with open("genai_debug/failure_summary.txt", "w", encoding="utf-8") as f:
-            f.write(f"GenAI Analysis Failed After {max_retries} Attempts\n")
-            f.write("=" * 50 + "\n")
-            f.write(f"Last error: {message if 'message' in locals() else 'Unknown error'}\n")
-            f.write(f"Markdown content length: {len(markdown_content)} characters\n")
-            f.write("\nAll attempts failed to generate valid JSON.\n")
-            f.write("Manual intervention required.\n")
+        self.debug_artifacts.write_text(
+            "failure_summary.txt",
+            f"GenAI Analysis Failed After {max_retries} Attempts\n"
+            + "=" * 50 + "\n"
+            + f"Last error: {message if 'message' in locals() else 'Unknown error'}\n"
+            + f"Markdown content length: {len(markdown_content)} characters\n"
+            + "\nAll attempts failed to generate valid JSON.\n"
+            + "Manual intervention required.\n"
+        )
+        self.debug_artifacts.flush()
 
         # Raise exception to fail the process
         raise Exception(f"Failed to generate valid JSON after {max_retries} attempts. Last error: {message if 'message' in locals() else 'Unknown error'}")
@@ -526,16 +727,25 @@ class EnhancedGenAIIFlowGenerator:
 
         return False
 
-    def _get_latest_json_by_timestamp(self, debug_dir="genai_debug"):
+    def _get_latest_json_by_timestamp(self, debug_dir=None):
         """
-        Find the latest JSON file by timestamp to ensure we use the most recent data
+        Find the latest JSON file by timestamp to ensure we use the most recent data.
+        The current job's in-memory result is used first; files are only searched in
+        this job's own artifact directory, never in other jobs' directories.
         
         Args:
-            debug_dir (str): Directory to search for JSON files
+            debug_dir (str, optional): Directory to search for JSON files (defaults to this job's directory)
             
         Returns:
             dict: The latest components data, or None if no valid files found
         """
+        if debug_dir is None:
+            latest = self.debug_artifacts.get("final_components")
+            if latest is not None:
+                return latest.get("components", latest)
+            self.debug_artifacts.flush()
+            debug_dir = self.debug_artifacts.directory
+
         try:
             if not os.path.exists(debug_dir):
                 print(f"Debug directory {debug_dir} not found")
@@ -591,67 +801,32 @@ class EnhancedGenAIIFlowGenerator:
             print(f"Error finding latest JSON: {e}")
             return None
 
-    def _cleanup_old_json_files(self, debug_dir="genai_debug", keep_latest=3):
+    def _cleanup_old_json_files(self, keep_latest=None):
         """
-        Clean up old JSON files to prevent confusion and ensure we only work with recent data
+        Clean up artifact directories of old jobs so the debug folder does not grow without bound.
+        Each job only ever reads its own directory, so this never affects a running job.
         
         Args:
-            debug_dir (str): Directory to clean up
-            keep_latest (int): Number of latest files to keep
+            keep_latest (int, optional): Number of job directories to keep (defaults to GENAI_DEBUG_KEEP_JOBS)
         """
-        try:
-            if not os.path.exists(debug_dir):
-                return
-                
-            # Find all JSON files with timestamps
-            json_files = []
-            for filename in os.listdir(debug_dir):
-                if filename.endswith('.json') and 'final_components' in filename:
-                    filepath = os.path.join(debug_dir, filename)
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            
-                        if isinstance(data, dict) and 'timestamp' in data:
-                            json_files.append({
-                                'filepath': filepath,
-                                'timestamp': data['timestamp']
-                            })
-                    except:
-                        continue
-            
-            if len(json_files) <= keep_latest:
-                return
-                
-            # Sort by timestamp and remove old files
-            json_files.sort(key=lambda x: x['timestamp'], reverse=True)
-            
-            for old_file in json_files[keep_latest:]:
-                try:
-                    os.remove(old_file['filepath'])
-                    print(f"🗑️  Cleaned up old JSON: {os.path.basename(old_file['filepath'])}")
-                except Exception as e:
-                    print(f"Error removing {old_file['filepath']}: {e}")
-                    
-        except Exception as e:
-            print(f"Error during cleanup: {e}")
+        if keep_latest is None:
+            self.debug_artifacts.prune_old_jobs()
+        else:
+            self.debug_artifacts.prune_old_jobs(keep_latest)
 
-    def _create_more_explicit_prompt(self, markdown_content, previous_error):
+    def _create_more_explicit_prompt(self, prompt, previous_error):
         """
         Create a more explicit prompt after a failed attempt.
-        This includes the FULL context from the detailed prompt to maintain consistency.
+        The instructions and documentation of the detailed prompt are kept unchanged
+        (and stay cached); only the error context is added after them.
 
         Args:
-            markdown_content (str): The markdown content to analyze
+            prompt (AnalysisPrompt): The prompt of the previous attempt
             previous_error (str): The error from the previous attempt
 
         Returns:
-            str: A more explicit prompt with full context
+            AnalysisPrompt: The same prompt with the error context as its retry note
         """
-        # Start with the detailed prompt but add error context at the top
-        base_prompt = self._create_detailed_analysis_prompt(markdown_content)
-
-        # Insert the error context at the beginning
         error_context = f"""
         🚨 CRITICAL: The previous attempt failed with error: {previous_error}
 
@@ -674,8 +849,7 @@ class EnhancedGenAIIFlowGenerator:
 
         """
 
-        # Combine error context with the full detailed prompt
-        return error_context + base_prompt
+        return prompt.with_retry_note(error_context)
     def _create_detailed_analysis_prompt(self, markdown_content):
         """
         Create a detailed prompt for analyzing the markdown content
@@ -684,7 +858,7 @@ class EnhancedGenAIIFlowGenerator:
             markdown_content (str): The markdown content to analyze
 
         Returns:
-            str: The prompt for analyzing the markdown content
+            AnalysisPrompt: Static instructions, compacted documentation and final instruction
         """
         prompt = """
         🚨 CRITICAL INSTRUCTION: You MUST respond with ONLY valid JSON in the exact format specified below.
@@ -1104,8 +1278,12 @@ class EnhancedGenAIIFlowGenerator:
         Analyze the following Dell Boomi process documentation and convert it to SAP Integration Suite equivalent:
         """
 
-        # Append the markdown content to the prompt  
-        return prompt + "\n\nBoomi Documentation:\n" + markdown_content + "\n\n🚨 FINAL INSTRUCTION: RESPOND WITH ONLY JSON - NO XML, NO EXPLANATIONS, NO MARKDOWN. \n🚨 MUST include both 'flow' array AND 'sequence_flows' array for each endpoint.\n🚨 The 'flow' array defines execution order, 'sequence_flows' defines connections.\n🚨 START WITH { AND END WITH }."
+        # The instructions are the same for every job; the documentation follows them as its own block
+        return AnalysisPrompt(
+            prompt,
+            "Boomi Documentation:\n" + compact_markdown(markdown_content),
+            "🚨 FINAL INSTRUCTION: RESPOND WITH ONLY JSON - NO XML, NO EXPLANATIONS, NO MARKDOWN. \n🚨 MUST include both 'flow' array AND 'sequence_flows' array for each endpoint.\n🚨 The 'flow' array defines execution order, 'sequence_flows' defines connections.\n🚨 START WITH { AND END WITH }."
+        )
 
     def _validate_genai_response(self, response):
         """
@@ -1304,26 +1482,7 @@ class EnhancedGenAIIFlowGenerator:
                 # Try parsing again after cleaning
                 components = json.loads(json_str)
 
-            # Validate the structure
-            if not isinstance(components, dict):
-                raise ValueError("Response is not a valid JSON object")
-
-            # Ensure required fields are present
-            if "endpoints" not in components:
-                components["endpoints"] = []
-
-            # Add default endpoint if none are specified
-            if not components["endpoints"]:
-                components["endpoints"] = [{
-                    "method": "GET",
-                    "path": "/",
-                    "purpose": "Default endpoint",
-                    "components": [],
-                    "connections": [],
-                    "transformations": []
-                }]
-
-            return components
+            return self._normalize_parsed_components(components)
 
         except Exception as e:
             print(f"Error parsing LLM response: {e}")
@@ -1343,6 +1502,38 @@ class EnhancedGenAIIFlowGenerator:
                 ],
                 "parameters": []
             }
+
+    def _normalize_parsed_components(self, components):
+        """
+        Ensure a parsed LLM blueprint has the fields the rest of the generator relies on
+
+        Args:
+            components (dict): The parsed JSON blueprint
+
+        Returns:
+            dict: The blueprint with an 'endpoints' list (a default endpoint if it was empty)
+        """
+        # Validate the structure
+        if not isinstance(components, dict):
+            raise ValueError("Response is not a valid JSON object")
+
+        # Ensure required fields are present
+        if "endpoints" not in components:
+            components["endpoints"] = []
+
+        # Add default endpoint if none are specified
+        if not components["endpoints"]:
+            components["endpoints"] = [{
+                "method": "GET",
+                "path": "/",
+                "purpose": "Default endpoint",
+                "components": [],
+                "connections": [],
+                "transformations": []
+            }]
+
+        return components
+
     def _create_intelligent_connections(self, components):
         """
         Create intelligent connections between components based on their purpose and position in the flow
@@ -1658,6 +1849,31 @@ def Message {transformation_name}(Message message) {{
         )
         
         return script_name
+
+    def _create_all_endpoint_components(self, endpoints, templates):
+        """
+        Create the components of every endpoint, on a pool of workers.
+
+        Endpoints are independent until they are merged into the collaboration
+        and the process, so each one is created by a worker. The results are
+        returned in endpoint order and merged by the caller in that order, so the
+        generated iFlow does not depend on which endpoint finishes first.
+
+        Args:
+            endpoints (list): Endpoint information from the blueprint
+            templates (EnhancedIFlowTemplates): Templates library
+
+        Returns:
+            list: Components of each endpoint, as returned by _create_endpoint_components
+        """
+        workers = min(ENDPOINT_WORKERS, len(endpoints))
+        if workers <= 1:
+            return [self._create_endpoint_components(endpoint, templates) for endpoint in endpoints]
+
+        print(f"Creating components of {len(endpoints)} endpoints with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="iflow-endpoint") as pool:
+            return list(pool.map(lambda endpoint: self._create_endpoint_components(endpoint, templates), endpoints))
+
     def _create_endpoint_components(self, endpoint, templates):
         """
         Create components for an endpoint with enhanced support for various component types
@@ -2764,13 +2980,13 @@ def Message processError(Message message) {{
                 ))
 
                 # Add the HTTPS sender
-                endpoint_components["message_flows"].append(templates.https_sender_template(
+                endpoint_components["message_flows"].append(fill(templates.https_sender_template(
                     id=component["id"],
                     name=component_name,
                     url_path=component_config.get("url_path", "/"),  # Default path to "/"
                     sender_auth=component_config.get("sender_auth", "None"),
                     user_role=component_config.get("user_role", "ESBMessaging.send")
-                ).replace("{{source_ref}}", sender_participant_id).replace("{{target_ref}}", "Participant_Process_1"))
+                ), source_ref=sender_participant_id, target_ref="Participant_Process_1"))
 
             elif component_type == "http_receiver" or component_type == "https_receiver":
                 # Add a participant for the receiver
@@ -2787,13 +3003,13 @@ def Message processError(Message message) {{
                 actual_url = component_config.get("url", component_config.get("address", component_config.get("endpoint_path", "https://example.com")))
                 print(f"🔧 Using HTTP receiver URL: {actual_url}")
                 
-                endpoint_components["message_flows"].append(templates.http_receiver_template(
+                endpoint_components["message_flows"].append(fill(templates.http_receiver_template(
                     id=component["id"],
                     name=component_name,
                     address=actual_url,  # Use actual URL from JSON
                     auth_method=component_config.get("auth_method", "None"),
                     credential_name=component_config.get("credential_name", "")
-                ).replace("{{source_ref}}", "Participant_Process_1").replace("{{target_ref}}", receiver_participant_id))
+                ), source_ref="Participant_Process_1", target_ref=receiver_participant_id))
 
             elif component_type == "content_modifier":
                 # Add a content modifier to the process
@@ -3541,13 +3757,11 @@ def Message processError(Message message) {{
                 # Create the service task (process component)
                 request_reply = templates.request_reply_template(
                     id=component["id"],
-                    name=component_name
+                    name=component_name,
+                    incoming_flow=incoming_flow_id,
+                    outgoing_flow=outgoing_flow_id
                 )
 
-                # Replace the incoming and outgoing flow placeholders
-                request_reply = request_reply.replace("{{incoming_flow}}", incoming_flow_id)
-                request_reply = request_reply.replace("{{outgoing_flow}}", outgoing_flow_id)
-
                 endpoint_components["process_components"].append(request_reply)
 
                 # Determine the receiver type and create appropriate participant and message flow
@@ -4849,20 +5063,17 @@ def Message processMessage(Message message) {{
                         endpoint["sequence_flows"].append(end_flow)
                         print(f"✅ Added EndEvent_2 flow: {end_flow['id']}")
         
-        # Save the fixed components to debug folder
-        debug_dir = os.path.join(os.path.dirname(__file__), "genai_debug")
-        os.makedirs(debug_dir, exist_ok=True)
-        
-        # Save fixed components alongside final_components.json
-        fixed_file = os.path.join(debug_dir, f"fixed_components_{iflow_name}.json")
-        with open(fixed_file, "w", encoding="utf-8") as f:
-            json.dump(fixed_components, f, indent=2)
+        # Save the fixed components to this job's debug folder
+        fixed_file = self.debug_artifacts.write_json(f"fixed_components_{iflow_name}.json", fixed_components)
         print(f"✅ Saved fixed components to {fixed_file}")
         
         # Also save as final_components.json for consistency
-        final_file = os.path.join(debug_dir, "final_components.json")
-        with open(final_file, "w", encoding="utf-8") as f:
-            json.dump(fixed_components, f, indent=2)
+        self.debug_artifacts.put("final_components", {
+            "timestamp": datetime.datetime.now().isoformat(),
+            "iflow_name": iflow_name,
+            "components": fixed_components
+        })
+        final_file = self.debug_artifacts.write_json("final_components.json", fixed_components)
         print(f"✅ Saved final components to {final_file}")
         
         return fixed_components
@@ -4904,11 +5115,7 @@ def Message processMessage(Message message) {{
         print(f"🎯 POST-VALIDATION: Final validation completed")
         
         # Save the input components for debugging (after fixing)
-        debug_dir = os.path.join(os.path.dirname(__file__), "genai_debug")
-        os.makedirs(debug_dir, exist_ok=True)
-        debug_file = os.path.join(debug_dir, f"iflow_input_components_{iflow_name}.json")
-        with open(debug_file, "w", encoding="utf-8") as f:
-            json.dump(components, f, indent=2)
+        debug_file = self.debug_artifacts.write_json(f"iflow_input_components_{iflow_name}.json", components)
         print(f"Saved input components to {debug_file}")
 
         # Default to template-based approach
@@ -4926,7 +5133,7 @@ def Message processMessage(Message message) {{
         # We'll use GenAI only for specific enhancements if needed
         genai_enhancements = {}
 
-        if self.provider != "local" and not self.use_converter:
+        if self.provider != "local" and not self.use_converter and not self.rule_based_blueprint:
             # Use GenAI to generate descriptions or other metadata (only for converter approach)
             try:
                 # Update generation approach to indicate GenAI is being used
@@ -4952,10 +5159,8 @@ def Message processMessage(Message message) {{
                 description = self._call_llm_api(prompt)
 
                 # Save the raw response for debugging
-                os.makedirs("genai_debug", exist_ok=True)
-                with open(f"genai_debug/raw_description_{iflow_name}.txt", "w", encoding="utf-8") as f:
-                    f.write(description)
-                print(f"Saved raw GenAI response to genai_debug/raw_description_{iflow_name}.txt")
+                debug_path = self.debug_artifacts.write_text(f"raw_description_{iflow_name}.txt", description)
+                print(f"Saved raw GenAI response to {debug_path}")
 
                 # Clean up the response
                 description = description.strip()
@@ -5006,30 +5211,31 @@ def Message processMessage(Message message) {{
         participants.append(process_participant)
 
         # Add default HTTPS message flow
-        https_flow = templates.https_sender_template(
+        https_flow = fill(templates.https_sender_template(
             id="MessageFlow_10",
             name="HTTPS",
             url_path="/test",  # Ensure URL path is not empty
             sender_auth="RoleBased",
             user_role="ESBMessaging.send"
-        ).replace("{{source_ref}}", "Participant_1").replace("{{target_ref}}", "StartEvent_2")
+        ), source_ref="Participant_1", target_ref="StartEvent_2")
         message_flows.append(https_flow)
 
         # Add start event
-        start_event = templates.message_start_event_template(
+        start_event = fill(templates.message_start_event_template(
             id="StartEvent_2",
             name="Start"
-        ).replace("{{outgoing_flow}}", "SequenceFlow_Start")
+        ), outgoing_flow="SequenceFlow_Start")
         process_components.append(start_event)
         used_ids.add("StartEvent_2")
 
         # Process each endpoint
-        print(f"🔍 DEBUG: Found {len(components.get('endpoints', []))} endpoints in JSON")
-        for i, endpoint in enumerate(components.get("endpoints", [])):
+        endpoints = components.get("endpoints", [])
+        print(f"🔍 DEBUG: Found {len(endpoints)} endpoints in JSON")
+        # Create the components of all endpoints, then merge them in endpoint order
+        all_endpoint_components = self._create_all_endpoint_components(endpoints, templates)
+        for i, (endpoint, endpoint_components) in enumerate(zip(endpoints, all_endpoint_components)):
             print(f"🔍 DEBUG: Processing endpoint {i+1}: {endpoint.get('name', 'Unknown')}")
             print(f"🔍 DEBUG: Endpoint has {len(endpoint.get('components', []))} components")
-            # Create components for the endpoint
-            endpoint_components = self._create_endpoint_components(endpoint, templates)
 
             # Add participants and message flows
             participants.extend(endpoint_components.get("participants", []))
@@ -5063,10 +5269,10 @@ def Message processMessage(Message message) {{
             sequence_flows.extend(endpoint_flows)
 
         # Add end event
-        end_event = templates.message_end_event_template(
+        end_event = fill(templates.message_end_event_template(
             id="EndEvent_2",
             name="End"
-        ).replace("{{incoming_flow}}", "SequenceFlow_End")
+        ), incoming_flow="SequenceFlow_End")
         process_components.append(end_event)
         used_ids.add("EndEvent_2")
 
@@ -5107,10 +5313,10 @@ def Message processMessage(Message message) {{
                 # Create a default component definition based on the ID
                 if "RequestReply" in component_id:
                     # Add a Request-Reply component
-                    new_component = templates.request_reply_template(
+                    new_component = fill(templates.request_reply_template(
                         id=component_id,
                         name=component_id
-                    ).replace("{{incoming_flow}}", "").replace("{{outgoing_flow}}", "")
+                    ), incoming_flow="", outgoing_flow="")
                     process_components.append(new_component)
                     print(f"Added missing Request-Reply component: {component_id}")
 
@@ -5256,18 +5462,6 @@ def Message processMessage(Message message) {{
                     sequence_flows.append(end_flow)
                     print(f"✅ Added sequence flow from {last_component_id} to EndEvent_2 with ID {end_flow_id}")
 
-                    # Update the EndEvent to reference the correct incoming flow
-                    for i, component in enumerate(process_components):
-                        if 'id="EndEvent_2"' in component:
-                            # Replace the hardcoded SequenceFlow_End with the actual flow ID
-                            updated_component = component.replace(
-                                "<bpmn2:incoming>SequenceFlow_End</bpmn2:incoming>",
-                                f"<bpmn2:incoming>{end_flow_id}</bpmn2:incoming>"
-                            )
-                            process_components[i] = updated_component
-                            print(f"✅ Updated EndEvent_2 incoming reference to {end_flow_id}")
-                            break
-
         # Check if flow array has been processed - if so, skip automatic start flow creation
         if getattr(self, 'flow_array_processed', False):
             print(f" FLOW ARRAY ALREADY PROCESSED - SKIPPING AUTOMATIC START FLOW CREATION")
@@ -5343,30 +5537,8 @@ def Message processMessage(Message message) {{
                 else:
                     actual_flow_id = None
 
-        # Update the StartEvent outgoing reference if we have a flow ID (generic placeholder replacement)
-        if actual_flow_id:
-            for i, component in enumerate(process_components):
-                if 'id="StartEvent_2"' in component:
-                    # Use generic placeholder replacement function
-                    updated_component = self._replace_placeholders_in_component(
-                        component,
-                        {"outgoing_flow": actual_flow_id}
-                    )
-                    # Also handle direct replacement of hardcoded values
-                    updated_component = updated_component.replace(
-                        "<bpmn2:outgoing>SequenceFlow_Start</bpmn2:outgoing>",
-                        f"<bpmn2:outgoing>{actual_flow_id}</bpmn2:outgoing>"
-                    )
-                    # Replace any remaining placeholder patterns
-                    updated_component = re.sub(
-                        r'<bpmn2:outgoing>\{+\{?outgoing_flow\}\}?</bpmn2:outgoing>',
-                        f'<bpmn2:outgoing>{actual_flow_id}</bpmn2:outgoing>',
-                        updated_component
-                    )
-                    process_components[i] = updated_component
-                    print(f"✅ Updated StartEvent_2 outgoing reference to {actual_flow_id}")
-                    break
-        else:
+        # StartEvent_2 gets its outgoing reference when the process is serialized
+        if not actual_flow_id:
             # Only create direct flow if there are truly no components between start and end
             # Check if we have any intermediate components
             has_intermediate_components = any(
@@ -5404,19 +5576,7 @@ def Message processMessage(Message message) {{
                 target_ref=dummy_component_id
             )
             sequence_flows.append(start_to_dummy)
-            
-            # Update the StartEvent to reference the correct outgoing flow
-            for i, component in enumerate(process_components):
-                if 'id="StartEvent_2"' in component:
-                    # Replace the hardcoded SequenceFlow_Start with the actual flow ID
-                    updated_component = component.replace(
-                        "<bpmn2:outgoing>SequenceFlow_Start</bpmn2:outgoing>",
-                        f"<bpmn2:outgoing>{start_flow_id}</bpmn2:outgoing>"
-                    )
-                    process_components[i] = updated_component
-                    print(f"✅ Updated StartEvent_2 outgoing reference to {start_flow_id} (fallback case)")
-                    break
-            
+
             # Connect dummy component to end event
             end_flow_id = f"flow_{dummy_component_id}_to_EndEvent_2_end"
             dummy_to_end = templates.sequence_flow_template(
@@ -5424,18 +5584,6 @@ def Message processMessage(Message message) {{
                 source_ref=dummy_component_id,
                 target_ref="EndEvent_2"
             )
-
-            # Update the EndEvent to reference the correct incoming flow
-            for i, component in enumerate(process_components):
-                if 'id="EndEvent_2"' in component:
-                    # Replace the hardcoded SequenceFlow_End with the actual flow ID
-                    updated_component = component.replace(
-                        "<bpmn2:incoming>SequenceFlow_End</bpmn2:incoming>",
-                        f"<bpmn2:incoming>{end_flow_id}</bpmn2:incoming>"
-                    )
-                    process_components[i] = updated_component
-                    print(f"✅ Updated EndEvent_2 incoming reference to {end_flow_id} (fallback case)")
-                    break
             sequence_flows = [start_to_dummy, dummy_to_end]
 
         # Validate that all components referenced in sequence flows are defined
@@ -5545,9 +5693,15 @@ def Message processMessage(Message message) {{
         collaboration_content += "\n" + "\n".join(participants)
         collaboration_content += "\n" + "\n".join(message_flows)
 
-        # Create the process content with proper indentation
-        process_content_formatted = "\n            " + "\n            ".join(process_components)
-        process_content_formatted += "\n            " + "\n            ".join(sequence_flows)
+        # Wire the incoming/outgoing references of the flow nodes from the sequence flows
+        # and serialize the process once, with proper indentation
+        process = IFlowDocument(wired_tags=FLOW_NODE_TAGS)
+        for component in process_components:
+            process.add_component(component)
+        for flow in sequence_flows:
+            process.add_flow(flow)
+        process_components = process.component_fragments()
+        process_content_formatted = "\n            " + process.serialize()
 
         # Check if process_content is provided directly in the JSON
         if "process_content" in components and components["process_content"]:
@@ -5564,12 +5718,11 @@ def Message processMessage(Message message) {{
         )
 
         # Replace the template placeholder with our unique placeholder
-        process_template = process_template.replace("{{process_content}}", unique_placeholder)
+        process_template = fill(process_template, process_content=unique_placeholder)
 
         # Collect additional processes from all endpoints
         additional_processes = []
-        for endpoint in components.get("endpoints", []):
-            endpoint_components = self._create_endpoint_components(endpoint, templates)
+        for endpoint_components in all_endpoint_components:
             if "additional_processes" in endpoint_components:
                 additional_processes.extend(endpoint_components["additional_processes"])
 
@@ -5583,9 +5736,9 @@ def Message processMessage(Message message) {{
         else:
             print(f"Warning: Unique placeholder '{unique_placeholder}' not found in template XML")
             # As a fallback, try the original placeholder format
-            if "{process_content}" in template_xml:
-                template_xml = template_xml.replace("{process_content}", process_content_formatted)
-                print("Replaced {process_content} placeholder as fallback")
+            if "{{process_content}}" in template_xml:
+                template_xml = fill(template_xml, process_content=process_content_formatted)
+                print("Replaced {{process_content}} placeholder as fallback")
 
         # Add proper BPMN diagram layout
         final_iflow_xml = self._add_bpmn_diagram_layout(template_xml, participants, message_flows, process_components)
@@ -5604,10 +5757,8 @@ def Message processMessage(Message message) {{
         """
         # Save the raw response for debugging if iflow_name is provided
         if iflow_name:
-            os.makedirs("genai_debug", exist_ok=True)
-            with open(f"genai_debug/raw_xml_{iflow_name}.txt", "w", encoding="utf-8") as f:
-                f.write(xml_response)
-            print(f"Saved raw XML response to genai_debug/raw_xml_{iflow_name}.txt")
+            debug_path = self.debug_artifacts.write_text(f"raw_xml_{iflow_name}.txt", xml_response)
+            print(f"Saved raw XML response to {debug_path}")
 
         # Remove markdown code block formatting if present
         xml_response = re.sub(r'^```xml\s*', '', xml_response, flags=re.MULTILINE)
@@ -5619,9 +5770,8 @@ def Message processMessage(Message message) {{
 
         # Save the cleaned response for debugging if iflow_name is provided
         if iflow_name:
-            with open(f"genai_debug/cleaned_xml_{iflow_name}.xml", "w", encoding="utf-8") as f:
-                f.write(xml_response)
-            print(f"Saved cleaned XML response to genai_debug/cleaned_xml_{iflow_name}.xml")
+            debug_path = self.debug_artifacts.write_text(f"cleaned_xml_{iflow_name}.xml", xml_response)
+            print(f"Saved cleaned XML response to {debug_path}")
 
         # Basic validation: Check that it's well-formed XML
         try:
@@ -6224,270 +6374,27 @@ def Message processMessage(Message message) {{
             sanitized = "Receiver"
         return sanitized
 
-    def _build_component_flow_references(self, sequence_flows):
-        """
-        Build comprehensive flow reference maps from all sequence flows (generic).
-        
-        Args:
-            sequence_flows (list): List of sequence flow XML strings
-            
-        Returns:
-            tuple: (component_incoming, component_outgoing) dictionaries
-        """
-        component_incoming = {}  # {comp_id: [flow_id1, flow_id2, ...]}
-        component_outgoing = {}   # {comp_id: [flow_id1, flow_id2, ...]}
-        
-        for flow in sequence_flows:
-            # Extract sourceRef, targetRef, flow_id generically
-            source_match = re.search(r'sourceRef="([^"]+)"', flow)
-            target_match = re.search(r'targetRef="([^"]+)"', flow)
-            flow_id_match = re.search(r'id="([^"]+)"', flow)
-            
-            if source_match and target_match and flow_id_match:
-                source_id = source_match.group(1)
-                target_id = target_match.group(1)
-                flow_id = flow_id_match.group(1)
-                
-                # Build outgoing map
-                if source_id not in component_outgoing:
-                    component_outgoing[source_id] = []
-                component_outgoing[source_id].append(flow_id)
-                
-                # Build incoming map
-                if target_id not in component_incoming:
-                    component_incoming[target_id] = []
-                component_incoming[target_id].append(flow_id)
-        
-        return component_incoming, component_outgoing
-    
-    def _replace_placeholders_in_component(self, component_xml, placeholders_dict):
-        """
-        Replace placeholders in component XML generically.
-        
-        Args:
-            component_xml (str): Component XML with placeholders
-            placeholders_dict (dict): Mapping of placeholder name -> actual value
-            
-        Returns:
-            str: Updated component XML with placeholders replaced
-        """
-        result = component_xml
-        # Handle both {{placeholder}} and {placeholder} patterns
-        for placeholder, value in placeholders_dict.items():
-            # Replace {{placeholder}} (double braces - template format)
-            result = result.replace(f"{{{{{placeholder}}}}}", value)
-            # Replace {placeholder} (single braces - escaped format)
-            result = result.replace(f"{{{placeholder}}}", value)
-        return result
-    
-    def _update_component_flow_references(self, component_xml, comp_id, incoming_flows, outgoing_flows):
-        """
-        Update incoming/outgoing flow references in component XML generically.
-        
-        Args:
-            component_xml (str): Component XML
-            comp_id (str): Component ID
-            incoming_flows (list): List of incoming flow IDs
-            outgoing_flows (list): List of outgoing flow IDs
-            
-        Returns:
-            str: Updated component XML with correct incoming/outgoing references
-        """
-        # Remove ALL existing incoming/outgoing elements (they may be wrong)
-        # Pattern matches any content between tags, including whitespace and newlines
-        result = re.sub(r'<bpmn2:incoming>[^<]*</bpmn2:incoming>', '', component_xml, flags=re.DOTALL)
-        result = re.sub(r'<bpmn2:outgoing>[^<]*</bpmn2:outgoing>', '', result, flags=re.DOTALL)
-        
-        # Also remove placeholder patterns
-        result = re.sub(r'<bpmn2:outgoing>\{+\{?outgoing_flow\}\}?</bpmn2:outgoing>', '', result)
-        result = re.sub(r'<bpmn2:incoming>\{+\{?incoming_flow\}\}?</bpmn2:incoming>', '', result)
-        
-        # Build new incoming/outgoing elements
-        new_elements = ""
-        for flow_id in incoming_flows:
-            new_elements += f"\n            <bpmn2:incoming>{flow_id}</bpmn2:incoming>"
-        for flow_id in outgoing_flows:
-            new_elements += f"\n            <bpmn2:outgoing>{flow_id}</bpmn2:outgoing>"
-        
-        if not new_elements:
-            # No flows to add, just return cleaned XML
-            return result
-        
-        # Always insert after extensionElements closes, not before closing tag
-        # Pattern: find </bpmn2:extensionElements> and insert after it
-        extension_elements_pattern = r'(</bpmn2:extensionElements>)'
-        match = re.search(extension_elements_pattern, result)
-        
-        if match:
-            # Insert incoming and outgoing elements AFTER extensionElements closes
-            insert_position = match.end()
-            # Match the indentation of the closing extensionElements tag
-            indent_match = re.search(r'(\s*)</bpmn2:extensionElements>', component_xml)
-            indent = indent_match.group(1) if indent_match else "            "
-            # Build new elements with proper indentation
-            new_elements_indented = ""
-            for flow_id in incoming_flows:
-                new_elements_indented += f"\n{indent}<bpmn2:incoming>{flow_id}</bpmn2:incoming>"
-            for flow_id in outgoing_flows:
-                new_elements_indented += f"\n{indent}<bpmn2:outgoing>{flow_id}</bpmn2:outgoing>"
-            result = result[:insert_position] + new_elements_indented + result[insert_position:]
-        else:
-            # Last resort: append before any closing tag
-            # Find last > before closing tag
-            last_tag_match = re.search(r'(>[\s]*)$', result)
-            if last_tag_match:
-                insert_position = last_tag_match.start()
-                result = result[:insert_position] + new_elements + "\n        " + result[insert_position:]
-            else:
-                # If all else fails, append at end
-                result = result.rstrip() + new_elements + "\n        "
-        
-        return result
-
     def _fix_all_component_flow_references_in_xml(self, xml_content):
         """
         Comprehensive fixer: Update all component incoming/outgoing references in final XML.
-        
-        Args:
-            xml_content (str): The XML content to fix
-            
-        Returns:
-            str: The fixed XML content
-        """
-        try:
-            # Extract all sequence flows from XML
-            sequence_flow_pattern = r'<bpmn2:sequenceFlow[^>]*id="([^"]+)"[^>]*sourceRef="([^"]+)"[^>]*targetRef="([^"]+)"'
-            sequence_flows_xml = []
-            for match in re.finditer(sequence_flow_pattern, xml_content):
-                flow_id = match.group(1)
-                source_id = match.group(2)
-                target_id = match.group(3)
-                # Reconstruct flow XML for flow map builder
-                flow_xml = f'<bpmn2:sequenceFlow id="{flow_id}" sourceRef="{source_id}" targetRef="{target_id}">'
-                sequence_flows_xml.append(flow_xml)
-            
-            if not sequence_flows_xml:
-                return xml_content
-            
-            # Build flow reference maps
-            component_incoming, component_outgoing = self._build_component_flow_references(sequence_flows_xml)
-            
-            # Fix each component in the XML
-            for comp_id in component_incoming.keys() | component_outgoing.keys():
-                incoming_list = component_incoming.get(comp_id, [])
-                outgoing_list = component_outgoing.get(comp_id, [])
-                
-                # Find component in XML using regex
-                # Match component opening tag through closing tag
-                comp_pattern = rf'(<bpmn2:(?:callActivity|serviceTask|exclusiveGateway|startEvent|endEvent)[^>]*id="{re.escape(comp_id)}"[^>]*>.*?</bpmn2:(?:callActivity|serviceTask|exclusiveGateway|startEvent|endEvent)>)'
-                comp_match = re.search(comp_pattern, xml_content, re.DOTALL)
-                
-                if comp_match:
-                    component_xml = comp_match.group(1)
-                    updated_xml = self._update_component_flow_references(
-                        component_xml,
-                        comp_id,
-                        incoming_list,
-                        outgoing_list
-                    )
-                    # Replace in full XML
-                    xml_content = xml_content[:comp_match.start()] + updated_xml + xml_content[comp_match.end():]
-                    print(f"Fixed {comp_id}: {len(incoming_list)} incoming, {len(outgoing_list)} outgoing")
-            
-            return xml_content
-            
-        except Exception as e:
-            print(f"Error in _fix_all_component_flow_references_in_xml: {e}")
-            import traceback
-            traceback.print_exc()
-            return xml_content
 
-    def _fix_iflow_xml_issues(self, xml_content):
-        """
-        Fix common issues in iFlow XML generated by GenAI
+        The sequence flows and flow nodes are each scanned once and the XML is
+        rebuilt once, so large iFlows are fixed in linear time.
 
         Args:
             xml_content (str): The XML content to fix
 
         Returns:
-            str: The fixed XML content, or empty string if unfixable
+            str: The fixed XML content
         """
         try:
-            # First, comprehensively fix all component flow references
-            xml_content = self._fix_all_component_flow_references_in_xml(xml_content)
-            
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(xml_content)
-
-            # Find the process element
-            process_elem = None
-            for elem in root.findall('.//{http://www.omg.org/spec/BPMN/20100524/MODEL}process'):
-                process_elem = elem
-                break
-
-            if not process_elem:
-                print("No process element found in the XML")
-                return xml_content
-
-            # Find all sequence flows
-            sequence_flows = []
-            for elem in process_elem.findall('.//{http://www.omg.org/spec/BPMN/20100524/MODEL}sequenceFlow'):
-                source_ref = elem.get('sourceRef')
-                target_ref = elem.get('targetRef')
-                if source_ref and target_ref:
-                    sequence_flows.append((elem, source_ref, target_ref))
-
-            # Find all component IDs in the process
-            component_ids = set()
-            component_elems = {}
-            for elem in process_elem.findall('.//*[@id]'):
-                if elem.tag.endswith('}sequenceFlow'):
-                    continue  # Skip sequence flows
-                component_id = elem.get('id')
-                component_ids.add(component_id)
-                component_elems[component_id] = elem
-
-            # Check for missing components referenced in sequence flows
-            missing_components = set()
-            for _, source_ref, target_ref in sequence_flows:
-                if source_ref not in component_ids and not source_ref.startswith("MessageFlow_"):
-                    missing_components.add(source_ref)
-                if target_ref not in component_ids and not target_ref.startswith("MessageFlow_"):
-                    missing_components.add(target_ref)
-
-            # If there are missing components, we can't fix the XML
-            if missing_components:
-                print(f"Missing component definitions: {', '.join(missing_components)}")
-                return xml_content
-
-            # Check for generic sequence flow IDs
-            generic_flow_ids = []
-            for elem, _, _ in sequence_flows:
-                flow_id = elem.get('id')
-                if flow_id in ['SequenceFlow_1', 'SequenceFlow_2', 'SequenceFlow_3']:
-                    generic_flow_ids.append(flow_id)
-
-            # If there are generic sequence flow IDs, we can't fix the XML
-            if len(generic_flow_ids) > 3:  # Allow a few generic IDs
-                print(f"Too many generic sequence flow IDs: {', '.join(generic_flow_ids)}")
-                return xml_content
-
-            # Check for BPMN diagram issues
-            bpmn_diagram = root.find('.//{http://www.omg.org/spec/BPMN/20100524/DI}BPMNDiagram')
-            if bpmn_diagram:
-                bpmn_plane = bpmn_diagram.find('.//{http://www.omg.org/spec/BPMN/20100524/DI}BPMNPlane')
-                if bpmn_plane:
-                    # Count the number of shapes in the diagram
-                    shapes = bpmn_plane.findall('.//{http://www.omg.org/spec/BPMN/20100524/DI}BPMNShape')
-                    if len(shapes) < len(component_ids) - 5:  # Allow some margin
-                        print(f"BPMN diagram does not include all components: {len(shapes)} shapes for {len(component_ids)} components")
-                        # This is not a critical issue, we can still use the XML
-
-            # The XML seems valid enough to use
+            xml_content, fixed_count = rewire_flow_references(xml_content)
+            if fixed_count:
+                print(f"Fixed incoming/outgoing references of {fixed_count} components")
             return xml_content
 
         except Exception as e:
-            print(f"Error fixing iFlow XML: {e}")
+            print(f"Error in _fix_all_component_flow_references_in_xml: {e}")
             import traceback
             traceback.print_exc()
             return xml_content
@@ -6496,6 +6403,11 @@ def Message processMessage(Message message) {{
         """
         Add proper BPMN diagram layout to the iFlow XML
 
+        The process components and the sequence flows between them are laid out
+        by bpmn_layout: one column per step, with router and gateway branches in
+        lanes of their own. The integration process participant is sized to hold
+        the layout, senders are placed on its left and receivers on its right.
+
         Args:
             iflow_xml (str): The iFlow XML content
             participants (list): List of participant XML strings
@@ -6505,352 +6417,26 @@ def Message processMessage(Message message) {{
         Returns:
             str: The iFlow XML with proper BPMN diagram layout
         """
-        # Extract component IDs
         component_shapes = []
         component_edges = []
-        component_positions = {}
 
-        # Extract all component IDs from process components
-        component_ids = []
+        # Flow nodes of the process components, in document order
+        nodes = []
+        component_ids = set()
         for component in process_components:
             id_match = re.search(r'id="([^"]+)"', component)
-            if id_match:
-                component_ids.append(id_match.group(1))
-
-        # Create a mapping to track all sequence flows in the XML
-        sequence_flows_map = {}
+            if id_match and id_match.group(1) not in component_ids:
+                component_id = id_match.group(1)
+                tag_match = re.search(r'<bpmn2:(\w+)', component)
+                component_ids.add(component_id)
+                nodes.append((component_id, node_kind(tag_match.group(1) if tag_match else component_id)))
 
-        # Extract all sequence flows from the XML (including router routes)
-        # Use more flexible pattern to match any attribute order
+        # Sequence flows between the components (including router routes), without duplicates
+        flows = []
+        flow_connections = set()
         sequence_flow_pattern = r'<bpmn2:sequenceFlow[^>]*id="([^"]+)"[^>]*sourceRef="([^"]+)"[^>]*targetRef="([^"]+)"'
         for match in re.finditer(sequence_flow_pattern, iflow_xml):
-            flow_id = match.group(1)
-            source_id = match.group(2)
-            target_id = match.group(3)
-            sequence_flows_map[flow_id] = {
-                'id': flow_id,
-                'sourceRef': source_id,
-                'targetRef': target_id
-            }
-            print(f"Found sequence flow in XML: {flow_id} from {source_id} to {target_id}")
-
-        # Add shape for each participant
-        x_pos = 100
-        for participant in participants:
-            id_match = re.search(r'id="([^"]+)"', participant)
-            name_match = re.search(r'name="([^"]+)"', participant)
-
-            if id_match:
-                participant_id = id_match.group(1)
-                participant_name = name_match.group(1) if name_match else participant_id
-
-                # Use different dimensions for different participant types
-                if "Process" in participant_id:
-                    # Integration Process participant (larger rectangle)
-                    position = {"x": x_pos, "y": 150, "width": 957, "height": 294}
-                    shape = f'''<bpmndi:BPMNShape bpmnElement="{participant_id}" id="BPMNShape_{participant_id}">
-    <dc:Bounds height="{position['height']}" width="{position['width']}" x="{position['x']}" y="{position['y']}"/>
-</bpmndi:BPMNShape>'''
-                    component_shapes.append(shape)
-                    print(f"Created process participant shape for {participant_id}")
-
-                elif "Receiver" in participant or "Endpoint" in participant_id:
-                    # Check if this is an OData participant
-                    is_odata_participant = (("InboundProduct" in participant or "OData" in participant) and
-                                          "EndpointRecevier" in participant) or "Participant_OData_" in participant_id
-
-                    if is_odata_participant:
-                        # Position OData participants to the right of the process
-                        position = {"x": 850, "y": 150}
-                        result = self._create_odata_receiver_participant(participant_id, participant_name, position)
-                        component_shapes.append(result["shape"])
-                        print(f"Created OData participant shape for {participant_id} at x=850 y=150")
-                    else:
-                        # Regular receiver participant (positioned below the process)
-                        position = {"x": x_pos, "y": 400}
-                        shape = f'''<bpmndi:BPMNShape bpmnElement="{participant_id}" id="BPMNShape_{participant_id}">
-    <dc:Bounds height="140.0" width="100.0" x="{position['x']}" y="{position['y']}"/>
-</bpmndi:BPMNShape>'''
-                        component_shapes.append(shape)
-                        print(f"Created receiver participant shape for {participant_id}")
-                else:
-                    # Regular participant (sender)
-                    position = {"x": x_pos, "y": 100}
-                    shape = f'''<bpmndi:BPMNShape bpmnElement="{participant_id}" id="BPMNShape_{participant_id}">
-    <dc:Bounds height="140.0" width="100.0" x="{position['x']}" y="{position['y']}"/>
-</bpmndi:BPMNShape>'''
-                    component_shapes.append(shape)
-                    print(f"Created shape for specific component {participant_id} at x={position['x']}, y={position['y']}")
-
-                x_pos += 120
-
-        # Add shapes for process components
-        standard_positions = {
-            "StartEvent": {"x": 263, "y": 126, "width": 32, "height": 32},
-            "EndEvent": {"x": 950, "y": 112, "width": 32, "height": 32},
-            "JSONtoXMLConverter": {"x": 362, "y": 110, "width": 100, "height": 60},
-            "ContentModifier": {"x": 509, "y": 110, "width": 100, "height": 60},
-            "RequestReply": {"x": 803, "y": 110, "width": 100, "height": 60}
-        }
-
-        x_pos = 300
-        y_pos = 140
-
-        for component in process_components:
-            id_match = re.search(r'id="([^"]+)"', component)
-            name_match = re.search(r'name="([^"]+)"', component)
-
-            if id_match:
-                component_id = id_match.group(1)
-                name = name_match.group(1) if name_match else component_id
-
-                # Determine the position based on component type
-                position = None
-                for component_type, pos in standard_positions.items():
-                    if component_type in component_id:
-                        position = pos
-                        break
-
-                if position:
-                    # Use the standard position for this component type
-                    component_positions[component_id] = position
-
-                    # Create shape based on component type
-                    if "StartEvent" in component_id:
-                        result = self._create_start_event(component_id, name, position)
-                        component_shapes.append(result["shape"])
-                    elif "EndEvent" in component_id:
-                        result = self._create_end_event(component_id, name, position)
-                        component_shapes.append(result["shape"])
-                    elif "RequestReply" in component_id or "ServiceTask" in component_id:
-                        result = self._create_service_task(component_id, name, position)
-                        component_shapes.append(result["shape"])
-                    elif "ContentEnricher" in component_id or "Enricher" in component_id:
-                        result = self._create_content_enricher(component_id, name, None, position)
-                        component_shapes.append(result["shape"])
-                    elif "ContentModifier" in component_id:
-                        result = self._create_content_modifier(component_id, name, None, position)
-                        component_shapes.append(result["shape"])
-                    elif "JSONtoXMLConverter" in component_id or "JsonToXml" in component_id:
-                        result = self._create_json_to_xml_converter(component_id, name, position)
-                        component_shapes.append(result["shape"])
-                    elif "callActivity" in component or "CallActivity" in component_id:
-                        # Handle callActivity components (like LIP process calls)
-                        shape = f'''<bpmndi:BPMNShape bpmnElement="{component_id}" id="BPMNShape_{component_id}">
-    <dc:Bounds height="60.0" width="100.0" x="{position['x']}" y="{position['y']}"/>
-</bpmndi:BPMNShape>'''
-                        component_shapes.append(shape)
-                    else:
-                        # Generic shape for other components
-                        shape = f'''<bpmndi:BPMNShape bpmnElement="{component_id}" id="BPMNShape_{component_id}">
-    <dc:Bounds height="{position['height']}" width="{position['width']}" x="{position['x']}" y="{position['y']}"/>
-</bpmndi:BPMNShape>'''
-                        component_shapes.append(shape)
-
-                    print(f"Created shape with standard position for {component_id} at x={position['x']}, y={position['y']}")
-                else:
-                    # Use default positioning for other components
-                    position = {"x": x_pos, "y": y_pos, "width": 100, "height": 60}
-
-                    if "StartEvent" in component_id or "EndEvent" in component_id:
-                        position["width"] = 32
-                        position["height"] = 32
-                        position["y"] = y_pos - 14  # Adjust for smaller height
-
-                    component_positions[component_id] = position
-
-                    # Create shape based on component type
-                    if "StartEvent" in component_id:
-                        result = self._create_start_event(component_id, name, position)
-                        component_shapes.append(result["shape"])
-                    elif "EndEvent" in component_id:
-                        result = self._create_end_event(component_id, name, position)
-                        component_shapes.append(result["shape"])
-                    elif "RequestReply" in component_id or "ServiceTask" in component_id:
-                        result = self._create_service_task(component_id, name, position)
-                        component_shapes.append(result["shape"])
-                    elif "ContentEnricher" in component_id or "Enricher" in component_id:
-                        result = self._create_content_enricher(component_id, name, None, position)
-                        component_shapes.append(result["shape"])
-                    elif "ContentModifier" in component_id:
-                        result = self._create_content_modifier(component_id, name, None, position)
-                        component_shapes.append(result["shape"])
-                    elif "JSONtoXMLConverter" in component_id or "JsonToXml" in component_id:
-                        result = self._create_json_to_xml_converter(component_id, name, position)
-                        component_shapes.append(result["shape"])
-                    elif "callActivity" in component or "CallActivity" in component_id:
-                        # Handle callActivity components (like LIP process calls)
-                        shape = f'''<bpmndi:BPMNShape bpmnElement="{component_id}" id="BPMNShape_{component_id}">
-    <dc:Bounds height="60.0" width="100.0" x="{position['x']}" y="{position['y']}"/>
-</bpmndi:BPMNShape>'''
-                        component_shapes.append(shape)
-                    else:
-                        # Generic shape for other components
-                        shape = f'''<bpmndi:BPMNShape bpmnElement="{component_id}" id="BPMNShape_{component_id}">
-    <dc:Bounds height="{position['height']}" width="{position['width']}" x="{position['x']}" y="{position['y']}"/>
-</bpmndi:BPMNShape>'''
-                        component_shapes.append(shape)
-
-                    print(f"Created default shape for {component_id} at x={position['x']}, y={position['y']}")
-                    x_pos += 120
-
-        # Extract message flow IDs
-        message_flow_ids = []
-        for flow in message_flows:
-            id_match = re.search(r'id="([^"]+)"', flow)
-            if id_match:
-                message_flow_ids.append(id_match.group(1))
-
-        # Add edges for message flows
-        for flow_id in message_flow_ids:
-            # Find source and target components for this message flow
-            source_ref = None
-            target_ref = None
-            is_odata = False
-
-            for flow in message_flows:
-                if f'id="{flow_id}"' in flow:
-                    source_match = re.search(r'sourceRef="([^"]+)"', flow)
-                    target_match = re.search(r'targetRef="([^"]+)"', flow)
-
-                    # Check if this is an OData message flow
-                    is_odata = ('name="OData"' in flow or
-                               '<value>HCIOData</value>' in flow or
-                               'MessageFlow_OData_' in flow_id)
-
-                    if source_match and target_match:
-                        source_ref = source_match.group(1)
-                        target_ref = target_match.group(1)
-                        break
-
-            # Default waypoints if we can't find the components
-            source_x = 150
-            source_y = 170
-            target_x = 250
-            target_y = 170
-
-            # If we found the source and target, calculate better waypoints
-            if source_ref and source_ref in component_ids:
-                source_index = component_ids.index(source_ref)
-                source_x = 250 + (source_index * 120) + 50
-                source_y = 142
-
-            if target_ref and "Participant" in target_ref:
-                # For participants, use a vertical connection
-                target_y = 300  # Position below the process
-
-                # For OData message flows, ALWAYS include sourceElement and targetElement attributes
-                # This is CRITICAL for SAP Integration Suite to properly display the message flow
-                if is_odata:
-                    # For OData, use our specialized helper method
-                    print(f"Creating OData message flow edge from {source_ref} to {target_ref}")
-
-                    # Extract OData properties from the message flow
-                    operation = "Query(GET)"
-                    address = "https://example.com/odata/service"
-                    resource_path = "Products"
-
-                    for flow in message_flows:
-                        if f'id="{flow_id}"' in flow:
-                            operation_match = re.search(r'<key>operation</key>\s*<value>([^<]+)</value>', flow)
-                            address_match = re.search(r'<key>address</key>\s*<value>([^<]+)</value>', flow)
-                            resource_path_match = re.search(r'<key>resourcePath</key>\s*<value>([^<]+)</value>', flow)
-
-                            if operation_match:
-                                operation = operation_match.group(1)
-                            if address_match:
-                                address = address_match.group(1)
-                            if resource_path_match:
-                                resource_path = resource_path_match.group(1)
-                            break
-
-                    # Make sure the service task has a position
-                    if source_ref not in component_positions:
-                        service_task_position = {"x": 707, "y": 110}
-                        service_task_shape = f'''<bpmndi:BPMNShape bpmnElement="{source_ref}" id="BPMNShape_{source_ref}">
-    <dc:Bounds height="60.0" width="100.0" x="{service_task_position['x']}" y="{service_task_position['y']}"/>
-</bpmndi:BPMNShape>'''
-                        component_shapes.append(service_task_shape)
-                        component_positions[source_ref] = service_task_position
-                        print(f"Created OData service task shape for {source_ref}")
-
-                    # Make sure the OData participant has a position
-                    if target_ref not in component_positions:
-                        participant_position = {"x": 850, "y": 150}
-                        participant_shape = f'''<bpmndi:BPMNShape bpmnElement="{target_ref}" id="BPMNShape_{target_ref}">
-    <dc:Bounds height="140.0" width="100.0" x="{participant_position['x']}" y="{participant_position['y']}"/>
-</bpmndi:BPMNShape>'''
-                        component_shapes.append(participant_shape)
-                        component_positions[target_ref] = participant_position
-                        print(f"Created OData participant shape for {target_ref}")
-
-                    result = self._create_odata_message_flow(flow_id, source_ref, target_ref, operation, address, resource_path)
-                    edge = result["edge"]
-                    print(f"Created OData message flow edge from {source_ref} to {target_ref} with sourceElement=BPMNShape_{source_ref} targetElement=BPMNShape_{target_ref}")
-                else:
-                    # For non-OData message flows, still include sourceElement and targetElement
-                    # to ensure consistent behavior in SAP Integration Suite
-                    # Ensure consistent IDs between the flow and the edge
-                    edge_id = f"BPMNEdge_{flow_id}"
-                    source_element = f"BPMNShape_{source_ref}"
-                    target_element = f"BPMNShape_{target_ref}"
-
-                    edge = f'''
-                    <bpmndi:BPMNEdge bpmnElement="{flow_id}" id="{edge_id}" sourceElement="{source_element}" targetElement="{target_element}">
-                        <di:waypoint x="{source_x}" xsi:type="dc:Point" y="{source_y}"/>
-                        <di:waypoint x="{source_x}" xsi:type="dc:Point" y="{target_y}"/>
-                    </bpmndi:BPMNEdge>'''
-
-                    print(f"Created non-OData message flow edge with consistent IDs: bpmnElement='{flow_id}', id='{edge_id}', sourceElement='{source_element}', targetElement='{target_element}'")
-            else:
-                # For other connections, still try to include sourceElement and targetElement if possible
-                if source_ref and target_ref:
-                    # Ensure consistent IDs between the flow and the edge
-                    edge_id = f"BPMNEdge_{flow_id}"
-                    source_element = f"BPMNShape_{source_ref}"
-                    target_element = f"BPMNShape_{target_ref}"
-
-                    edge = f'''
-                    <bpmndi:BPMNEdge bpmnElement="{flow_id}" id="{edge_id}" sourceElement="{source_element}" targetElement="{target_element}">
-                        <di:waypoint x="{source_x}" xsi:type="dc:Point" y="{source_y}"/>
-                        <di:waypoint x="{target_x}" xsi:type="dc:Point" y="{target_y}"/>
-                    </bpmndi:BPMNEdge>'''
-
-                    print(f"Created other message flow edge with consistent IDs: bpmnElement='{flow_id}', id='{edge_id}', sourceElement='{source_element}', targetElement='{target_element}'")
-                else:
-                    # Fallback if we don't have source/target refs
-                    edge_id = f"BPMNEdge_{flow_id}"
-
-                    edge = f'''
-                    <bpmndi:BPMNEdge bpmnElement="{flow_id}" id="{edge_id}">
-                        <di:waypoint x="{source_x}" xsi:type="dc:Point" y="{source_y}"/>
-                        <di:waypoint x="{target_x}" xsi:type="dc:Point" y="{target_y}"/>
-                    </bpmndi:BPMNEdge>'''
-
-                    print(f"Created fallback message flow edge: bpmnElement='{flow_id}', id='{edge_id}'")
-
-            component_edges.append(edge)
-
-        # Now process all sequence flows from the XML
-        # This ensures we create BPMNEdge elements for ALL sequence flows, not just those in process_components
-
-        # Define standard positions for sequence flow waypoints
-        standard_waypoints = {
-            "SequenceFlow_1": {"source_x": 295, "source_y": 142, "target_x": 362, "target_y": 140},
-            "SequenceFlow_2": {"source_x": 462, "source_y": 140, "target_x": 509, "target_y": 140},
-            "SequenceFlow_3": {"source_x": 609, "source_y": 140, "target_x": 656, "target_y": 140},
-            "SequenceFlow_4": {"source_x": 756, "source_y": 140, "target_x": 803, "target_y": 140},
-            "SequenceFlow_5": {"source_x": 903, "source_y": 140, "target_x": 950, "target_y": 128}
-        }
-
-        # Process all sequence flows from the XML
-        print(f"Processing {len(sequence_flows_map)} sequence flows from XML")
-
-        # Initialize a dictionary to track flow connections and avoid duplicates
-        flow_connections = {}
-        for flow_id, flow in sequence_flows_map.items():
-            source_id = flow['sourceRef']
-            target_id = flow['targetRef']
+            flow_id, source_id, target_id = match.groups()
 
             # Skip invalid flows that reference non-existent components
             if source_id not in component_ids or target_id not in component_ids:
@@ -6858,168 +6444,95 @@ def Message processMessage(Message message) {{
                 continue
 
             # Skip duplicate flows with the same source and target
-            # Router routes from same gateway have different targets, so connection_key is unique
-            connection_key = f"{source_id}->{target_id}"
+            connection_key = (source_id, target_id)
             if connection_key in flow_connections:
-                print(f"Skipping duplicate flow {flow_id} for connection {connection_key}")
+                print(f"Skipping duplicate flow {flow_id} for connection {source_id}->{target_id}")
                 continue
-            flow_connections[connection_key] = flow_id
-
-            # Get positions from component_positions map with default values
-            default_source = {"x": 300, "y": 150, "width": 100, "height": 60}
-            default_target = {"x": 450, "y": 150, "width": 100, "height": 60}
+            flow_connections.add(connection_key)
+            flows.append((flow_id, source_id, target_id))
 
-            # Get positions with defaults
-            source_position = component_positions.get(source_id, default_source)
-            target_position = component_positions.get(target_id, default_target)
-
-            if not source_position or not target_position:
-                print(f"Missing position for source {source_id} or target {target_id} in flow {flow_id}")
+        # Message flows; the service task of an OData flow gets a shape even if it is not a process component
+        parsed_message_flows = []
+        for flow in message_flows:
+            id_match = re.search(r'id="([^"]+)"', flow)
+            if not id_match:
+                continue
+            source_match = re.search(r'sourceRef="([^"]+)"', flow)
+            target_match = re.search(r'targetRef="([^"]+)"', flow)
+            source_ref = source_match.group(1) if source_match else None
+            target_ref = target_match.group(1) if target_match else None
+            is_odata = ('name="OData"' in flow or
+                        '<value>HCIOData</value>' in flow or
+                        'MessageFlow_OData_' in id_match.group(1))
+            if is_odata and source_ref and target_ref and source_ref not in component_ids:
+                component_ids.add(source_ref)
+                nodes.append((source_ref, ACTIVITY))
+                print(f"Created OData service task shape for {source_ref}")
+            parsed_message_flows.append((id_match.group(1), source_ref, target_ref))
+
+        layout = layout_flow_graph(nodes, flows, origin_x=290.0, origin_y=190.0)
+        print(f"Laid out {len(layout.shapes)} components and {len(layout.edges)} sequence flows")
+
+        # Integration process participant around the layout, at least its default size
+        process_x, process_y = 250.0, 150.0
+        layout_box = layout.container(padding=40.0)
+        process_bounds = Bounds(process_x, process_y,
+                                max(957.0, layout_box.right - process_x),
+                                max(294.0, layout_box.bottom - process_y))
+
+        # Shapes of all elements by id, for the message flow edges
+        shapes = {}
+        sender_y = receiver_y = process_y
+        for participant in participants:
+            id_match = re.search(r'id="([^"]+)"', participant)
+            if not id_match:
                 continue
+            participant_id = id_match.group(1)
 
-            # Ensure source_position has all required keys
-            if 'width' not in source_position:
-                source_position['width'] = 100 if "Event" not in source_id else 32
-            if 'height' not in source_position:
-                source_position['height'] = 60 if "Event" not in source_id else 32
-
-            # Ensure target_position has all required keys
-            if 'width' not in target_position:
-                target_position['width'] = 100 if "Event" not in target_id else 32
-            if 'height' not in target_position:
-                target_position['height'] = 60 if "Event" not in target_id else 32
-
-            # Check if this is a router route (GatewayRoute) - needs special branching waypoints
-            is_router_route = False
-            # Check in the iflow_xml for this sequence flow to see if it's a GatewayRoute
-            flow_pattern = rf'<bpmn2:sequenceFlow[^>]*id="{re.escape(flow_id)}"[^>]*>.*?cname::GatewayRoute'
-            if re.search(flow_pattern, iflow_xml, re.DOTALL):
-                is_router_route = True
-            
-            # Calculate waypoints based on component positions
-            if "Event" in source_id:
-                # For events (circles), connect from the right edge
-                source_x = source_position['x'] + source_position['width']
-                source_y = source_position['y'] + (source_position['height'] / 2)
-            elif "exclusiveGateway" in source_id or "gateway" in source_id.lower():
-                # For gateways (diamonds), connect from the right edge
-                source_x = source_position['x'] + source_position['width']
-                source_y = source_position['y'] + (source_position['height'] / 2)
+            if "Process" in participant_id:
+                bounds = process_bounds
+            elif "Receiver" in participant or "Endpoint" in participant_id:
+                bounds = Bounds(process_bounds.right + 60.0, receiver_y, 100.0, 140.0)
+                receiver_y += 160.0
             else:
-                # For activities (rectangles), connect from the right edge
-                source_x = source_position['x'] + source_position['width']
-                source_y = source_position['y'] + (source_position['height'] / 2)
-
-            if "Event" in target_id:
-                # For events (circles), connect to the left edge
-                target_x = target_position['x']
-                target_y = target_position['y'] + (target_position['height'] / 2)
+                bounds = Bounds(100.0, sender_y, 100.0, 140.0)
+                sender_y += 160.0
+            shapes[participant_id] = bounds
+            component_shapes.append(shape_xml(participant_id, bounds))
+
+        # Receivers of message flows without a participant of their own
+        for flow_id, source_ref, target_ref in parsed_message_flows:
+            if target_ref and "Participant" in target_ref and target_ref not in shapes and target_ref not in layout.shapes:
+                bounds = Bounds(process_bounds.right + 60.0, receiver_y, 100.0, 140.0)
+                receiver_y += 160.0
+                shapes[target_ref] = bounds
+                component_shapes.append(shape_xml(target_ref, bounds))
+                print(f"Created participant shape for {target_ref}")
+
+        for component_id, bounds in layout.shapes.items():
+            shapes[component_id] = bounds
+            component_shapes.append(shape_xml(component_id, bounds))
+
+        # Edges for message flows
+        for flow_id, source_ref, target_ref in parsed_message_flows:
+            source_bounds = shapes.get(source_ref)
+            target_bounds = shapes.get(target_ref)
+            if source_bounds and target_bounds:
+                waypoints = route_edge(source_bounds, target_bounds)
             else:
-                # For activities (rectangles), connect to the left edge
-                target_x = target_position['x']
-                target_y = target_position['y'] + (target_position['height'] / 2)
-            
-            # Special handling for router routes: create branching waypoints
-            if is_router_route:
-                # Router routes branch vertically or at angles from gateway
-                # If multiple routes from same gateway, branch them vertically
-                # Find all routes from this gateway
-                gateway_routes = [fid for fid, f in sequence_flows_map.items() 
-                                if f['sourceRef'] == source_id]
-                route_index = gateway_routes.index(flow_id) if flow_id in gateway_routes else 0
-                
-                # Branch vertically: first route goes straight, others branch down
-                if route_index == 0:
-                    # Default/first route goes straight horizontally
-                    mid_x = source_x + (target_x - source_x) / 2
-                    mid_y = source_y
-                    # Create edge with branching waypoint
-                    edge_id = f"BPMNEdge_{flow_id}"
-                    source_element = f"BPMNShape_{source_id}"
-                    target_element = f"BPMNShape_{target_id}"
-                    edge = f'''
-                    <bpmndi:BPMNEdge bpmnElement="{flow_id}" id="{edge_id}" sourceElement="{source_element}" targetElement="{target_element}">
-                        <di:waypoint x="{source_x}" xsi:type="dc:Point" y="{source_y}"/>
-                        <di:waypoint x="{mid_x}" xsi:type="dc:Point" y="{mid_y}"/>
-                        <di:waypoint x="{target_x}" xsi:type="dc:Point" y="{target_y}"/>
-                    </bpmndi:BPMNEdge>'''
-                    component_edges.append(edge)
-                    print(f"Created router route edge {flow_id}: branching at ({mid_x}, {mid_y})")
-                    continue  # Skip normal edge creation for router routes
-                else:
-                    # Other routes branch down then right
-                    branch_offset_y = 40 * route_index  # Branch 40px down per route
-                    mid_x = source_x + 20
-                    mid_y = source_y + branch_offset_y
-                    # Create edge with branching waypoint
-                    edge_id = f"BPMNEdge_{flow_id}"
-                    source_element = f"BPMNShape_{source_id}"
-                    target_element = f"BPMNShape_{target_id}"
-                    edge = f'''
-                    <bpmndi:BPMNEdge bpmnElement="{flow_id}" id="{edge_id}" sourceElement="{source_element}" targetElement="{target_element}">
-                        <di:waypoint x="{source_x}" xsi:type="dc:Point" y="{source_y}"/>
-                        <di:waypoint x="{mid_x}" xsi:type="dc:Point" y="{mid_y}"/>
-                        <di:waypoint x="{target_x}" xsi:type="dc:Point" y="{target_y}"/>
-                    </bpmndi:BPMNEdge>'''
-                    component_edges.append(edge)
-                    print(f"Created router route edge {flow_id}: branching at ({mid_x}, {mid_y})")
-                    continue  # Skip normal edge creation for router routes
-
-            # Check if this is a standard flow with predefined waypoints
-            is_standard_flow = False
-            for std_id, waypoints in standard_waypoints.items():
-                if std_id in flow_id:
-                    source_x = waypoints['source_x']
-                    source_y = waypoints['source_y']
-                    target_x = waypoints['target_x']
-                    target_y = waypoints['target_y']
-                    is_standard_flow = True
-                    break
+                print(f"Missing shape for source {source_ref} or target {target_ref} of message flow {flow_id}")
+                waypoints = [(150.0, 170.0), (250.0, 170.0)]
+
+            if source_ref and target_ref:
+                component_edges.append(edge_xml(flow_id, source_ref, target_ref, waypoints))
+            else:
+                # Fallback if we don't have source/target refs
+                points = "".join(f'\n    <di:waypoint x="{x}" xsi:type="dc:Point" y="{y}"/>' for x, y in waypoints)
+                component_edges.append(f'<bpmndi:BPMNEdge bpmnElement="{flow_id}" id="BPMNEdge_{flow_id}">{points}\n</bpmndi:BPMNEdge>')
 
-            # Check if this is a root-specific flow
-            is_root_flow = "_root" in flow_id
-
-            # Special handling for root flows
-            if is_root_flow and not is_standard_flow:
-                # For root-specific flows, use specific waypoints based on component types
-                if "StartEvent" in source_id:
-                    source_x = 295  # End of start event
-                    source_y = 142  # Middle of start event
-                elif "JSONtoXMLConverter" in source_id:
-                    source_x = 462  # End of JSON converter
-                    source_y = 140  # Middle of JSON converter
-                elif "ContentModifier" in source_id and "headers" in source_id:
-                    source_x = 756  # End of content modifier headers
-                    source_y = 140  # Middle of content modifier
-                elif "ContentModifier" in source_id:
-                    source_x = 609  # End of content modifier
-                    source_y = 140  # Middle of content modifier
-                elif "RequestReply" in source_id:
-                    source_x = 903  # End of request reply
-                    source_y = 140  # Middle of request reply
-
-                if "JSONtoXMLConverter" in target_id:
-                    target_x = 362  # Start of JSON converter
-                    target_y = 140  # Middle of JSON converter
-                elif "ContentModifier" in target_id and "headers" in target_id:
-                    target_x = 656  # Start of content modifier headers
-                    target_y = 140  # Middle of content modifier
-                elif "ContentModifier" in target_id:
-                    target_x = 509  # Start of content modifier
-                    target_y = 140  # Middle of content modifier
-                elif "RequestReply" in target_id:
-                    target_x = 803  # Start of request reply
-                    target_y = 140  # Middle of request reply
-                elif "EndEvent" in target_id:
-                    target_x = 950  # Start of end event
-                    target_y = 128  # Middle of end event
-
-            # Use our helper method to create the sequence flow edge
-            result = self._create_sequence_flow(flow_id, source_id, target_id, component_positions)
-            edge = result["edge"]
-
-            print(f"Created BPMNEdge for {flow_id} from {source_id} to {target_id}")
-            component_edges.append(edge)
+        # Edges for sequence flows
+        for route in layout.edges:
+            component_edges.append(edge_xml(route.flow_id, route.source, route.target, route.waypoints))
 
         # We've already handled duplicate flows during the BPMNEdge creation,
         # but let's do a final check for any remaining duplicates in the XML
@@ -7061,12 +6574,11 @@ def Message processMessage(Message message) {{
         # Remove duplicate sequence flows
         if duplicate_flows:
             print(f"Removing {len(duplicate_flows)} duplicate sequence flows")
-            for flow_id in duplicate_flows:
-                # Create a pattern to match the entire sequence flow element
-                pattern = re.compile(f'<bpmn2:sequenceFlow\\s+id="{re.escape(flow_id)}".*?/>\\s*', re.DOTALL)
-                # Remove the duplicate flow
-                iflow_xml = pattern.sub('', iflow_xml)
-                print(f"Removed duplicate flow: {flow_id}")
+            # One pattern matching the entire element of any duplicate flow
+            duplicate_ids = "|".join(re.escape(flow_id) for flow_id in sorted(duplicate_flows))
+            pattern = re.compile(f'<bpmn2:sequenceFlow\\s+id="(?:{duplicate_ids})".*?/>\\s*', re.DOTALL)
+            iflow_xml = pattern.sub('', iflow_xml)
+            print(f"Removed duplicate flows: {', '.join(sorted(duplicate_flows))}")
 
         return iflow_xml
     def _generate_iflw_content_with_templates(self, components, iflow_name):
@@ -7124,27 +6636,27 @@ def Message processMessage(Message message) {{
         participants.append(process_participant)
 
         # Add default HTTPS message flow
-        https_flow = templates.https_sender_template(
+        https_flow = fill(templates.https_sender_template(
             id="MessageFlow_10",
             name="HTTPS",
             url_path="/",  # Ensure URL path is not empty
             sender_auth="RoleBased",
             user_role="ESBMessaging.send"
-        ).replace("{{source_ref}}", "Participant_1").replace("{{target_ref}}", "StartEvent_2")
+        ), source_ref="Participant_1", target_ref="StartEvent_2")
         message_flows.append(https_flow)
 
         # Add start event
-        start_event = templates.message_start_event_template(
+        start_event = fill(templates.message_start_event_template(
             id="StartEvent_2",
             name="Start"
-        ).replace("{{outgoing_flow}}", "SequenceFlow_Start")
+        ), outgoing_flow="SequenceFlow_Start")
         process_components.append(start_event)
         used_ids.add("StartEvent_2")
 
-        # Process each endpoint
-        for i, endpoint in enumerate(components.get("endpoints", [])):
-            # Create components for the endpoint
-            endpoint_components = self._create_endpoint_components(endpoint, templates)
+        # Process each endpoint: create the components of all endpoints, then merge them in endpoint order
+        endpoints = components.get("endpoints", [])
+        all_endpoint_components = self._create_all_endpoint_components(endpoints, templates)
+        for i, endpoint_components in enumerate(all_endpoint_components):
 
             # Add participants and message flows
             participants.extend(endpoint_components.get("participants", []))
@@ -7185,10 +6697,10 @@ def Message processMessage(Message message) {{
                     sequence_flows.append(flow_str)
 
         # Add end event
-        end_event = templates.message_end_event_template(
+        end_event = fill(templates.message_end_event_template(
             id="EndEvent_2",
             name="End"
-        ).replace("{{incoming_flow}}", "SequenceFlow_End")
+        ), incoming_flow="SequenceFlow_End")
         process_components.append(end_event)
         used_ids.add("EndEvent_2")
 
@@ -7277,29 +6789,7 @@ def Message processMessage(Message message) {{
             # Log the sequence flow creation
             print(f"Creating sequence flow: {seq_flow_id} from {source_id} to {target_id}")
 
-            # Add outgoing reference to source component
-            source_comp = component_map[source_id]
-            if "<bpmn2:outgoing>" not in source_comp:
-                # Add outgoing flow reference
-                source_comp = re.sub(
-                    r'(</bpmn2:extensionElements>)',
-                    r'\1\n                <bpmn2:outgoing>' + seq_flow_id + '</bpmn2:outgoing>',
-                    source_comp
-                )
-                component_map[source_id] = source_comp
-
-            # Add incoming reference to target component
-            target_comp = component_map[target_id]
-            if "<bpmn2:incoming>" not in target_comp:
-                # Add incoming flow reference
-                target_comp = re.sub(
-                    r'(</bpmn2:extensionElements>)',
-                    r'\1\n                <bpmn2:incoming>' + seq_flow_id + '</bpmn2:incoming>',
-                    target_comp
-                )
-                component_map[target_id] = target_comp
-
-        # Update process_components with the modified components
+        # One component per id; references are wired when the process is serialized
         process_components = list(component_map.values())
 
         # Validate that all components referenced in sequence flows are defined
@@ -7431,196 +6921,78 @@ def Message processMessage(Message message) {{
         collaboration_content += "\n" + "\n".join(participants)
         collaboration_content += "\n" + "\n".join(message_flows)
 
-        # Create the process content with all components
-        # First, ensure all components have proper incoming and outgoing flow references
-        component_map = {}
+        # Index the components and sequence flows of the process; the incoming/outgoing
+        # references of every component are wired from the flows when it is serialized
+        process = IFlowDocument()
         for component in process_components:
-            id_match = re.search(r'id="([^"]+)"', component)
-            if id_match:
-                component_id = id_match.group(1)
-                component_map[component_id] = component
-
-        # Build comprehensive flow reference maps using generic function
-        component_incoming, component_outgoing = self._build_component_flow_references(sequence_flows)
-        
-        # Debug: Print flow maps for troubleshooting
-        print(f"DEBUG: Built flow reference maps from {len(sequence_flows)} sequence flows")
-        print(f"DEBUG: Components with incoming flows: {list(component_incoming.keys())}")
-        print(f"DEBUG: Components with outgoing flows: {list(component_outgoing.keys())}")
-        for comp_id in ['enricher_1', 'script_1', 'gateway_1', 'script_2']:
-            if comp_id in component_incoming:
-                print(f"DEBUG: {comp_id} incoming: {component_incoming[comp_id]}")
-            if comp_id in component_outgoing:
-                print(f"DEBUG: {comp_id} outgoing: {component_outgoing[comp_id]}")
-        
-        # Track connections for flow validation (for backward compatibility)
-        flow_connections = {}
-        incoming_flows = {}
-        for comp_id, flow_ids in component_outgoing.items():
-            if comp_id not in flow_connections:
-                flow_connections[comp_id] = []
-            for flow_id in flow_ids:
-                # Find target from sequence flow
-                for flow in sequence_flows:
-                    if flow_id in flow:
-                        target_match = re.search(r'targetRef="([^"]+)"', flow)
-                        if target_match:
-                            flow_connections[comp_id].append((target_match.group(1), flow_id))
-                            break
-        
-        for comp_id, flow_ids in component_incoming.items():
-            incoming_flows[comp_id] = []
-            for flow_id in flow_ids:
-                # Find source from sequence flow
-                for flow in sequence_flows:
-                    if flow_id in flow:
-                        source_match = re.search(r'sourceRef="([^"]+)"', flow)
-                        if source_match:
-                            incoming_flows[comp_id].append((source_match.group(1), flow_id))
-                            break
-        
-        # Update ALL components with correct incoming/outgoing using generic function
-        # This removes wrong references and adds correct ones for every component
-        for comp_id in component_map:
-            incoming_list = component_incoming.get(comp_id, [])
-            outgoing_list = component_outgoing.get(comp_id, [])
-            
-            component_xml = component_map[comp_id]
-            updated_xml = self._update_component_flow_references(
-                component_xml,
-                comp_id,
-                incoming_list,
-                outgoing_list
-            )
-            component_map[comp_id] = updated_xml
-            if incoming_list or outgoing_list:
-                print(f"✅ Updated {comp_id}: {len(incoming_list)} incoming, {len(outgoing_list)} outgoing")
-            else:
-                # Even if no flows, still remove wrong references
-                print(f"✅ Cleaned {comp_id}: removed wrong references (no flows mapped)")
-
-        # Update process_components with the modified components
-        process_components = list(component_map.values())
+            process.add_component(component)
+        for flow in sequence_flows:
+            process.add_flow(flow)
+        print(f"DEBUG: Indexed {len(process.components)} components and {len(process.sequence_flows)} sequence flows")
+        print(f"DEBUG: Components with incoming flows: {list(process.incoming.keys())}")
+        print(f"DEBUG: Components with outgoing flows: {list(process.outgoing.keys())}")
 
         # Identify start and end events
         start_event_id = None
         end_event_id = None
-        for component in process_components:
+        for component_id, component in process.components.items():
             if "StartEvent" in component:
-                start_event_id = re.search(r'id="([^"]+)"', component).group(1)
+                start_event_id = component_id
             elif "EndEvent" in component:
-                end_event_id = re.search(r'id="([^"]+)"', component).group(1)
+                end_event_id = component_id
 
         # If start event doesn't have outgoing flow, add a default one
-        if start_event_id and start_event_id not in flow_connections:
+        if start_event_id and start_event_id not in process.outgoing:
             # Find first component that's not start or end event
             first_component_id = None
-            for component_id in component_map:
+            for component_id in process.components:
                 if "StartEvent" not in component_id and "EndEvent" not in component_id:
                     first_component_id = component_id
                     break
 
             if first_component_id:
                 # Add sequence flow from start event to first component
-                start_flow_id = f"SequenceFlow_{start_event_id}_{first_component_id}"
-                start_flow = templates.sequence_flow_template(
-                    id=start_flow_id,
+                process.add_flow(templates.sequence_flow_template(
+                    id=f"SequenceFlow_{start_event_id}_{first_component_id}",
                     source_ref=start_event_id,
                     target_ref=first_component_id
-                )
-                sequence_flows.append(start_flow)
-
-                # Update start event with outgoing flow
-                start_comp = component_map[start_event_id]
-                start_comp = re.sub(
-                    r'(</bpmn2:extensionElements>)',
-                    r'\1\n                <bpmn2:outgoing>' + start_flow_id + '</bpmn2:outgoing>',
-                    start_comp
-                )
-                component_map[start_event_id] = start_comp
-
-                # Update first component with incoming flow
-                first_comp = component_map[first_component_id]
-                first_comp = re.sub(
-                    r'(</bpmn2:extensionElements>)',
-                    r'\1\n                <bpmn2:incoming>' + start_flow_id + '</bpmn2:incoming>',
-                    first_comp
-                )
-                component_map[first_component_id] = first_comp
-
-                # Track this connection
-                if start_event_id not in flow_connections:
-                    flow_connections[start_event_id] = []
-                flow_connections[start_event_id].append((first_component_id, start_flow_id))
-
-                if first_component_id not in incoming_flows:
-                    incoming_flows[first_component_id] = []
-                incoming_flows[first_component_id].append((start_event_id, start_flow_id))
+                ))
 
         # If end event doesn't have incoming flow, add a default one
-        if end_event_id and end_event_id not in incoming_flows:
+        if end_event_id and end_event_id not in process.incoming:
             # Find last component that's not start or end event
             last_component_id = None
-            for component_id in component_map:
+            for component_id in process.components:
                 if "StartEvent" not in component_id and "EndEvent" not in component_id:
                     # Prefer components that have no outgoing flows
-                    if component_id not in flow_connections:
+                    if component_id not in process.outgoing:
                         last_component_id = component_id
                         break
 
             # If no component without outgoing flows, pick any component
             if not last_component_id:
-                for component_id in component_map:
+                for component_id in process.components:
                     if "StartEvent" not in component_id and "EndEvent" not in component_id:
                         last_component_id = component_id
                         break
 
             if last_component_id:
                 # Add sequence flow from last component to end event
-                end_flow_id = f"SequenceFlow_{last_component_id}_{end_event_id}"
-                end_flow = templates.sequence_flow_template(
-                    id=end_flow_id,
+                process.add_flow(templates.sequence_flow_template(
+                    id=f"SequenceFlow_{last_component_id}_{end_event_id}",
                     source_ref=last_component_id,
                     target_ref=end_event_id
-                )
-                sequence_flows.append(end_flow)
-
-                # Update last component with outgoing flow
-                last_comp = component_map[last_component_id]
-                last_comp = re.sub(
-                    r'(</bpmn2:extensionElements>)',
-                    r'\1\n                <bpmn2:outgoing>' + end_flow_id + '</bpmn2:outgoing>',
-                    last_comp
-                )
-                component_map[last_component_id] = last_comp
-
-                # Update end event with incoming flow
-                end_comp = component_map[end_event_id]
-                end_comp = re.sub(
-                    r'(</bpmn2:extensionElements>)',
-                    r'\1\n                <bpmn2:incoming>' + end_flow_id + '</bpmn2:incoming>',
-                    end_comp
-                )
-                component_map[end_event_id] = end_comp
-
-                # Track this connection
-                if last_component_id not in flow_connections:
-                    flow_connections[last_component_id] = []
-                flow_connections[last_component_id].append((end_event_id, end_flow_id))
-
-                if end_event_id not in incoming_flows:
-                    incoming_flows[end_event_id] = []
-                incoming_flows[end_event_id].append((last_component_id, end_flow_id))
+                ))
 
         # Connect any disconnected components
         disconnected_components = []
-        for component_id in component_map:
+        for component_id in process.components:
             if component_id != start_event_id and component_id != end_event_id:
-                if component_id not in flow_connections and component_id not in incoming_flows:
+                if component_id not in process.outgoing and component_id not in process.incoming:
                     disconnected_components.append(component_id)
 
         # If there are disconnected components, connect them in a chain
-        if disconnected_components and len(disconnected_components) > 0:
+        if disconnected_components:
             print(f"Found {len(disconnected_components)} disconnected components. Connecting them...")
 
             # Sort disconnected components to ensure consistent ordering
@@ -7629,97 +7001,36 @@ def Message processMessage(Message message) {{
             # Connect the first disconnected component to the start event
             if start_event_id:
                 first_disconnected = disconnected_components[0]
-                start_flow_id = f"SequenceFlow_{start_event_id}_{first_disconnected}"
-                start_flow = templates.sequence_flow_template(
-                    id=start_flow_id,
+                process.add_flow(templates.sequence_flow_template(
+                    id=f"SequenceFlow_{start_event_id}_{first_disconnected}",
                     source_ref=start_event_id,
                     target_ref=first_disconnected
-                )
-                sequence_flows.append(start_flow)
-
-                # Update start event with outgoing flow
-                start_comp = component_map[start_event_id]
-                start_comp = re.sub(
-                    r'(</bpmn2:extensionElements>)',
-                    r'\1\n                <bpmn2:outgoing>' + start_flow_id + '</bpmn2:outgoing>',
-                    start_comp
-                )
-                component_map[start_event_id] = start_comp
-
-                # Update first disconnected component with incoming flow
-                first_comp = component_map[first_disconnected]
-                first_comp = re.sub(
-                    r'(</bpmn2:extensionElements>)',
-                    r'\1\n                <bpmn2:incoming>' + start_flow_id + '</bpmn2:incoming>',
-                    first_comp
-                )
-                component_map[first_disconnected] = first_comp
+                ))
 
             # Connect disconnected components in a chain
             for i in range(len(disconnected_components) - 1):
                 source_id = disconnected_components[i]
                 target_id = disconnected_components[i + 1]
-
-                flow_id = f"SequenceFlow_{source_id}_{target_id}"
-                flow = templates.sequence_flow_template(
-                    id=flow_id,
+                process.add_flow(templates.sequence_flow_template(
+                    id=f"SequenceFlow_{source_id}_{target_id}",
                     source_ref=source_id,
                     target_ref=target_id
-                )
-                sequence_flows.append(flow)
-
-                # Update source component with outgoing flow
-                source_comp = component_map[source_id]
-                source_comp = re.sub(
-                    r'(</bpmn2:extensionElements>)',
-                    r'\1\n                <bpmn2:outgoing>' + flow_id + '</bpmn2:outgoing>',
-                    source_comp
-                )
-                component_map[source_id] = source_comp
-
-                # Update target component with incoming flow
-                target_comp = component_map[target_id]
-                target_comp = re.sub(
-                    r'(</bpmn2:extensionElements>)',
-                    r'\1\n                <bpmn2:incoming>' + flow_id + '</bpmn2:incoming>',
-                    target_comp
-                )
-                component_map[target_id] = target_comp
+                ))
 
             # Connect the last disconnected component to the end event
             if end_event_id:
                 last_disconnected = disconnected_components[-1]
-                end_flow_id = f"SequenceFlow_{last_disconnected}_{end_event_id}"
-                end_flow = templates.sequence_flow_template(
-                    id=end_flow_id,
+                process.add_flow(templates.sequence_flow_template(
+                    id=f"SequenceFlow_{last_disconnected}_{end_event_id}",
                     source_ref=last_disconnected,
                     target_ref=end_event_id
-                )
-                sequence_flows.append(end_flow)
-
-                # Update last disconnected component with outgoing flow
-                last_comp = component_map[last_disconnected]
-                last_comp = re.sub(
-                    r'(</bpmn2:extensionElements>)',
-                    r'\1\n                <bpmn2:outgoing>' + end_flow_id + '</bpmn2:outgoing>',
-                    last_comp
-                )
-                component_map[last_disconnected] = last_comp
-
-                # Update end event with incoming flow
-                end_comp = component_map[end_event_id]
-                end_comp = re.sub(
-                    r'(</bpmn2:extensionElements>)',
-                    r'\1\n                <bpmn2:incoming>' + end_flow_id + '</bpmn2:incoming>',
-                    end_comp
-                )
-                component_map[end_event_id] = end_comp
+                ))
 
-        # Update process_components with the modified components
-        process_components = list(component_map.values())
+        # Serialize the components with their references, then the sequence flows
+        process_components = process.component_fragments()
 
         # Format the process content with proper indentation
-        real_process_content = "\n            ".join([str(comp) for comp in process_components]) + "\n            " + "\n            ".join([str(flow) for flow in sequence_flows])
+        real_process_content = process.serialize()
 
         # Generate the process template with proper structure
         process_template = templates.process_template(
@@ -7727,15 +7038,14 @@ def Message processMessage(Message message) {{
             name="Integration Process"
         )
 
-        # Replace the process content placeholder - IMPORTANT: Use double curly braces to escape them in f-strings
-        process_content_with_components = process_template.replace("{{process_content}}", real_process_content)
+        # Fill the process content placeholder
+        process_content_with_components = fill(process_template, process_content=real_process_content)
 
         # Collect additional processes from all endpoints
         additional_processes = []
-        print(f"🔍 DEBUG: Starting to collect additional processes from {len(components.get('endpoints', []))} endpoints")
-        for i, endpoint in enumerate(components.get("endpoints", [])):
+        print(f"🔍 DEBUG: Starting to collect additional processes from {len(endpoints)} endpoints")
+        for i, (endpoint, endpoint_components) in enumerate(zip(endpoints, all_endpoint_components)):
             print(f"🔍 DEBUG: Processing endpoint {i+1}: {endpoint.get('name', 'Unknown')}")
-            endpoint_components = self._create_endpoint_components(endpoint, templates)
             if "additional_processes" in endpoint_components:
                 additional_processes.extend(endpoint_components["additional_processes"])
                 print(f"🔍 DEBUG: Found {len(endpoint_components['additional_processes'])} additional processes in endpoint {i+1}")
@@ -7753,7 +7063,7 @@ def Message processMessage(Message message) {{
         if "{{process_content}}" in iflow_xml:
             print("Warning: process_content placeholder was not replaced!")
             # Try a direct replacement as a fallback
-            iflow_xml = iflow_xml.replace("{{process_content}}", real_process_content)
+            iflow_xml = fill(iflow_xml, process_content=real_process_content)
 
         # Add proper BPMN diagram layout for ALL components including additional processes
         all_process_components = process_components + additional_processes
@@ -7967,6 +7277,51 @@ def Message processMessage(Message message) {{
         except Exception:
             return components
 
+    def _write_iflow_debug_artifacts(self, iflow_name, raw_iflw_content, iflw_content):
+        """
+        Save the raw and final iFlow XML, the generation approach and a README
+        with the generation details to the debug artifacts of the job
+
+        Args:
+            iflow_name (str): Name of the iFlow
+            raw_iflw_content (str): iFlow XML as generated, before post-processing
+            iflw_content (str): iFlow XML as packaged
+        """
+        # Save the raw generated iFlow XML and a copy of the final one for debugging
+        raw_iflow_path = self.debug_artifacts.write_text(f"raw_iflow_{iflow_name}.xml", raw_iflw_content)
+        print(f"Saved raw iFlow XML to {raw_iflow_path}")
+        final_iflow_path = self.debug_artifacts.write_text(f"final_iflow_{iflow_name}.xml", iflw_content)
+        print(f"Saved final iFlow XML to {final_iflow_path}")
+
+        # Save the generation approach information
+        approach_path = self.debug_artifacts.write_json(f"generation_approach_{iflow_name}.json", self.generation_details)
+        print(f"Saved generation approach information to {approach_path}")
+
+        # Create a README.md file with generation details
+        readme_content = f"""# iFlow Generation Details
+
+## {iflow_name}
+- **Generation Approach**: {self.generation_approach}
+- **Timestamp**: {self.generation_details.get('timestamp', 'N/A')}
+- **Model**: {self.generation_details.get('model', 'N/A')}
+- **Reason**: {self.generation_details.get('reason', 'N/A')}
+
+## Implementation Notes
+- OData components are implemented with proper EndpointRecevier participants
+- Message flows connect service tasks to OData participants
+- BPMN diagram layout includes proper positioning of all components
+- Sequence flows connect components in the correct order
+
+## Troubleshooting
+If the iFlow is not visible in SAP Integration Suite after import:
+1. Check that all OData participants have type="EndpointRecevier"
+2. Verify that message flows connect service tasks to participants
+3. Ensure all components have corresponding BPMNShape elements
+4. Confirm that all connections have corresponding BPMNEdge elements
+"""
+        readme_path = self.debug_artifacts.write_text("README.md", readme_content)
+        print(f"Saved README.md with generation details to {readme_path}")
+
     def _generate_iflow_files(self, components, iflow_name, markdown_content):
         """
         Generate the iFlow files based on the components
@@ -8009,38 +7364,26 @@ def Message processMessage(Message message) {{
             print(f"Generating iFlow XML for {iflow_name} using template-based approach...")
             iflw_content = self._generate_iflw_content(components, iflow_name)
 
-        # Create debug directory
-        os.makedirs("genai_debug", exist_ok=True)
+        # Keep the raw generated iFlow XML for debugging
+        raw_iflw_content = iflw_content
+        self.debug_artifacts.put("raw_iflow", raw_iflw_content)
 
-        # Save the raw generated iFlow XML for debugging
-        raw_iflow_path = f"genai_debug/raw_iflow_{iflow_name}.xml"
-        with open(raw_iflow_path, "w", encoding="utf-8") as f:
-            f.write(iflw_content)
-        print(f"Saved raw iFlow XML to {raw_iflow_path}")
-
-        # Fix the iFlow XML using comprehensive fixer first, then iflow_fixer
+        # Post-process the iFlow XML in one pipeline: flow references, escaping and the
+        # SAP Integration Suite fixes on a single parse of the document
+        print("Post-processing iFlow XML to ensure compatibility with SAP Integration Suite...")
         try:
-            # First, use comprehensive fixer to fix all component flow references
-            print("Fixing all component flow references in iFlow XML...")
-            iflw_content = self._fix_all_component_flow_references_in_xml(iflw_content)
-            
-            from iflow_fixer import preprocess_xml, fix_iflow_xml
-            print("Fixing iFlow XML to ensure compatibility with SAP Integration Suite...")
-
-            # Pre-process the XML to fix common issues
-            iflw_content = preprocess_xml(iflw_content)
-
-            # Fix the XML structure
-            fixed_xml, success, changes = fix_iflow_xml(iflw_content)
-
-            if success:
+            result = postprocess_iflow(iflw_content, sanitize=IFLOW_SANITIZE, pretty=IFLOW_PRETTY_PRINT)
+            iflw_content = result.xml
+            if result.success:
                 print("iFlow XML fixed successfully!")
                 print("Changes made:")
-                print(changes)
-                iflw_content = fixed_xml
+                print(result.change_summary())
+                for issue in result.issues:
+                    print(f"Issue: {issue}")
             else:
                 print("Warning: Could not fix iFlow XML automatically. Using original XML.")
-                print(f"Error: {changes}")
+                print(f"Error: {result.error}")
+            result.print_timings()
         except Exception as e:
             print(f"Warning: Error while fixing iFlow XML: {str(e)}")
             print("Using original XML content.")
@@ -8049,42 +7392,7 @@ def Message processMessage(Message message) {{
         iflow_path = f"src/main/resources/scenarioflows/integrationflow/{iflow_name}.iflw"
         iflow_files[iflow_path] = iflw_content
 
-        # Save a copy of the final iFlow XML for debugging
-        final_iflow_path = f"genai_debug/final_iflow_{iflow_name}.xml"
-        with open(final_iflow_path, "w", encoding="utf-8") as f:
-            f.write(iflw_content)
-        print(f"Saved final iFlow XML to {final_iflow_path}")
-
-        # Save the generation approach information
-        with open(f"genai_debug/generation_approach_{iflow_name}.json", "w", encoding="utf-8") as f:
-            json.dump(self.generation_details, f, indent=2)
-        print(f"Saved generation approach information to genai_debug/generation_approach_{iflow_name}.json")
-
-        # Create a README.md file with generation details
-        readme_content = f"""# iFlow Generation Details
-
-## {iflow_name}
-- **Generation Approach**: {self.generation_approach}
-- **Timestamp**: {self.generation_details.get('timestamp', 'N/A')}
-- **Model**: {self.generation_details.get('model', 'N/A')}
-- **Reason**: {self.generation_details.get('reason', 'N/A')}
-
-## Implementation Notes
-- OData components are implemented with proper EndpointRecevier participants
-- Message flows connect service tasks to OData participants
-- BPMN diagram layout includes proper positioning of all components
-- Sequence flows connect components in the correct order
-
-## Troubleshooting
-If the iFlow is not visible in SAP Integration Suite after import:
-1. Check that all OData participants have type="EndpointRecevier"
-2. Verify that message flows connect service tasks to participants
-3. Ensure all components have corresponding BPMNShape elements
-4. Confirm that all connections have corresponding BPMNEdge elements
-"""
-        with open(f"genai_debug/README.md", "w", encoding="utf-8") as f:
-            f.write(readme_content)
-        print(f"Saved README.md with generation details to genai_debug/README.md")
+        self._write_iflow_debug_artifacts(iflow_name, raw_iflw_content, iflw_content)
 
         # Generate the manifest.xml file with enhanced content
         manifest_content = self._generate_enhanced_manifest_content(iflow_name)
@@ -6,7 +6,9 @@ based on analysis of real-world iFlow files. It includes detailed configuration
 options and supports a wide range of component types.
 
 Each template is parameterized with placeholders that can be replaced
-with actual values when generating the iFlow.
+with actual values when generating the iFlow. Templates are compiled once, at
+import, in the shared iflow_template_engine registry; placeholders filled
+later (source_ref, incoming_flow, process_content, ...) stay as {{name}}.
 """
 
 import uuid
@@ -14,6 +16,8 @@ import xml.dom.minidom
 import re
 from typing import Dict, List, Optional, Union, Any
 
+from iflow_template_engine import TEMPLATES
+
 class EnhancedIFlowTemplates:
     """
     A comprehensive collection of templates for SAP Integration Suite components.
@@ -39,44 +43,8 @@ class EnhancedIFlowTemplates:
         Returns:
             str: XML template for iFlow configuration
         """
-        return f'''<bpmn2:extensionElements>
-            <ifl:property>
-                <key>namespaceMapping</key>
-                <value>{namespace_mapping}</value>
-            </ifl:property>
-            <ifl:property>
-                <key>httpSessionHandling</key>
-                <value>None</value>
-            </ifl:property>
-            <ifl:property>
-                <key>returnExceptionToSender</key>
-                <value>false</value>
-            </ifl:property>
-            <ifl:property>
-                <key>log</key>
-                <value>{log_level}</value>
-            </ifl:property>
-            <ifl:property>
-                <key>corsEnabled</key>
-                <value>false</value>
-            </ifl:property>
-            <ifl:property>
-                <key>componentVersion</key>
-                <value>1.2</value>
-            </ifl:property>
-            <ifl:property>
-                <key>ServerTrace</key>
-                <value>false</value>
-            </ifl:property>
-            <ifl:property>
-                <key>xsrfProtection</key>
-                <value>{csrf_protection}</value>
-            </ifl:property>
-            <ifl:property>
-                <key>cmdVariantUri</key>
-                <value>ctype::IFlowVariant/cname::IFlowConfiguration/version::1.2.4</value>
-            </ifl:property>
-        </bpmn2:extensionElements>'''
+        return TEMPLATES.render('iflow_configuration',
+            namespace_mapping=namespace_mapping, log_level=log_level, csrf_protection=csrf_protection)
 
     # ===== Participant Templates =====
 
@@ -95,20 +63,9 @@ class EnhancedIFlowTemplates:
         """
         auth_element = ""
         if type == "EndpointSender":
-            auth_element = f'''
-                <ifl:property>
-                    <key>enableBasicAuthentication</key>
-                    <value>{enable_basic_auth}</value>
-                </ifl:property>'''
+            auth_element = TEMPLATES.render('participant_basic_auth', enable_basic_auth=enable_basic_auth)
 
-        return f'''<bpmn2:participant id="{id}" ifl:type="{type}" name="{name}">
-            <bpmn2:extensionElements>{auth_element}
-                <ifl:property>
-                    <key>ifl:type</key>
-                    <value>{type}</value>
-                </ifl:property>
-            </bpmn2:extensionElements>
-        </bpmn2:participant>'''
+        return TEMPLATES.render('participant', id=id, type=type, name=name, auth_element=auth_element)
 
     def integration_process_participant_template(self, id, name, process_ref):
         """
@@ -122,37 +79,11 @@ class EnhancedIFlowTemplates:
         Returns:
             str: XML template for Integration Process Participant
         """
-        return f'''<bpmn2:participant id="{id}" ifl:type="IntegrationProcess" name="{name}" processRef="{process_ref}">
-            <bpmn2:extensionElements/>
-        </bpmn2:participant>'''
+        return TEMPLATES.render('integration_process_participant', id=id, name=name, process_ref=process_ref)
 
     # ===== Adapter Templates =====
 
-    def odata_receiver_template(self, id, name, service_url, entity_set="", auth_method="None", credential_name="", timeout="60000", system="", operation="Query(GET)", resource_path=""):
-        """
-        Template for OData Receiver Adapter with enhanced SAP Integration Suite compatibility
-
-        Args:
-            id (str): Component ID
-            name (str): Component name
-            service_url (str): OData service URL
-            entity_set (str): Entity set name
-            auth_method (str): Authentication method
-            credential_name (str): Credential name
-            timeout (str): Request timeout
-            system (str): System name
-            operation (str): OData operation (Query(GET), Create(POST), etc.)
-            resource_path (str): Resource path for the OData call
-        """
-        # Ensure serviceUrl has a default value
-        if not service_url:
-            service_url = "https://example.com/odata/service"
-
-        # Use entity_set as resource_path if resource_path is not provided
-        if not resource_path and entity_set:
-            resource_path = entity_set
-
-        return f'''<bpmn2:messageFlow id="{id}" name="{name}" sourceRef="{{{{source_ref}}}}" targetRef="{{{{target_ref}}}}">
+    ODATA_RECEIVER_TEMPLATE = TEMPLATES.register('odata_receiver', '''<bpmn2:messageFlow id="{{id}}" name="{{name}}" sourceRef="{{source_ref}}" targetRef="{{target_ref}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>ComponentType</key>
@@ -160,7 +91,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>Description</key>
-                    <value>OData connection to {entity_set}</value>
+                    <value>OData connection to {{entity_set}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>Name</key>
@@ -168,15 +99,15 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>address</key>
-                    <value>{service_url}</value>
+                    <value>{{service_url}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>resourcePath</key>
-                    <value>{resource_path}</value>
+                    <value>{{resource_path}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>operation</key>
-                    <value>{operation}</value>
+                    <value>{{operation}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>ComponentNS</key>
@@ -196,15 +127,15 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>authenticationMethod</key>
-                    <value>{auth_method}</value>
+                    <value>{{auth_method}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>credentialName</key>
-                    <value>{credential_name}</value>
+                    <value>{{credential_name}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>httpRequestTimeout</key>
-                    <value>{timeout}</value>
+                    <value>{{timeout}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>TransportProtocol</key>
@@ -220,7 +151,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>system</key>
-                    <value>{system}</value>
+                    <value>{{system}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>ComponentSWCVName</key>
@@ -251,7 +182,36 @@ class EnhancedIFlowTemplates:
                     <value>default</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-        </bpmn2:messageFlow>'''
+        </bpmn2:messageFlow>''')
+
+    def odata_receiver_template(self, id, name, service_url, entity_set="", auth_method="None", credential_name="", timeout="60000", system="", operation="Query(GET)", resource_path=""):
+        """
+        Template for OData Receiver Adapter with enhanced SAP Integration Suite compatibility
+
+        Args:
+            id (str): Component ID
+            name (str): Component name
+            service_url (str): OData service URL
+            entity_set (str): Entity set name
+            auth_method (str): Authentication method
+            credential_name (str): Credential name
+            timeout (str): Request timeout
+            system (str): System name
+            operation (str): OData operation (Query(GET), Create(POST), etc.)
+            resource_path (str): Resource path for the OData call
+        """
+        # Ensure serviceUrl has a default value
+        if not service_url:
+            service_url = "https://example.com/odata/service"
+
+        # Use entity_set as resource_path if resource_path is not provided
+        if not resource_path and entity_set:
+            resource_path = entity_set
+
+        return self.ODATA_RECEIVER_TEMPLATE.render(
+            id=id, name=name, entity_set=entity_set, service_url=service_url, resource_path=resource_path,
+            operation=operation, auth_method=auth_method, credential_name=credential_name, timeout=timeout,
+            system=system)
 
     def edmx_template(self, namespace, entity_type_name, properties):
         """
@@ -294,26 +254,7 @@ class EnhancedIFlowTemplates:
   </edmx:DataServices>
 </edmx:Edmx>'''
 
-    def http_receiver_template(self, id, name, address, auth_method="None", credential_name="",
-                              timeout="60000", throw_exception="true", system="", http_method="POST"):
-        """
-        Template for HTTP Receiver Adapter
-
-        Args:
-            id (str): Component ID
-            name (str): Component name
-            address (str): HTTP endpoint address
-            auth_method (str): Authentication method
-            credential_name (str): Credential name
-            timeout (str): Request timeout in milliseconds
-            throw_exception (str): Throw exception on failure ("true"/"false")
-            system (str): System name
-            http_method (str): HTTP method (GET, POST, PUT, DELETE)
-
-        Returns:
-            str: XML template for HTTP Receiver Adapter
-        """
-        return f'''<bpmn2:messageFlow id="{id}" name="{name}" sourceRef="{{{{source_ref}}}}" targetRef="{{{{target_ref}}}}">
+    HTTP_RECEIVER_TEMPLATE = TEMPLATES.register('http_receiver', '''<bpmn2:messageFlow id="{{id}}" name="{{name}}" sourceRef="{{source_ref}}" targetRef="{{target_ref}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>Description</key>
@@ -321,7 +262,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>httpMethod</key>
-                    <value>{http_method}</value>
+                    <value>{{http_method}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>ComponentType</key>
@@ -329,7 +270,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>httpRequestTimeout</key>
-                    <value>{timeout}</value>
+                    <value>{{timeout}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>TransportProtocol</key>
@@ -337,11 +278,11 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>authenticationMethod</key>
-                    <value>{auth_method}</value>
+                    <value>{{auth_method}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>credentialName</key>
-                    <value>{credential_name}</value>
+                    <value>{{credential_name}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>MessageProtocol</key>
@@ -349,7 +290,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>httpAddressWithoutQuery</key>
-                    <value define="true">{address}</value>
+                    <value define="true">{{address}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>direction</key>
@@ -357,11 +298,11 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>throwExceptionOnFailure</key>
-                    <value>{throw_exception}</value>
+                    <value>{{throw_exception}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>system</key>
-                    <value>{system}</value>
+                    <value>{{system}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>componentVersion</key>
@@ -372,17 +313,32 @@ class EnhancedIFlowTemplates:
                     <value>ctype::AdapterVariant/cname::sap:HTTP/tp::HTTP/mp::None/direction::Receiver/version::1.15.0</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-        </bpmn2:messageFlow>'''
+        </bpmn2:messageFlow>''')
 
-    def https_sender_template(self, id, name, url_path, sender_auth="None", user_role="ESBMessaging.send", csrf_protection="false", client_certificates=""):
+    def http_receiver_template(self, id, name, address, auth_method="None", credential_name="",
+                              timeout="60000", throw_exception="true", system="", http_method="POST"):
         """
-        Template for HTTPS Sender Adapter with default values for empty properties
+        Template for HTTP Receiver Adapter
+
+        Args:
+            id (str): Component ID
+            name (str): Component name
+            address (str): HTTP endpoint address
+            auth_method (str): Authentication method
+            credential_name (str): Credential name
+            timeout (str): Request timeout in milliseconds
+            throw_exception (str): Throw exception on failure ("true"/"false")
+            system (str): System name
+            http_method (str): HTTP method (GET, POST, PUT, DELETE)
+
+        Returns:
+            str: XML template for HTTP Receiver Adapter
         """
-        # Ensure url_path has a default value
-        if not url_path:
-            url_path = "/"
+        return self.HTTP_RECEIVER_TEMPLATE.render(
+            id=id, name=name, http_method=http_method, timeout=timeout, auth_method=auth_method,
+            credential_name=credential_name, address=address, throw_exception=throw_exception, system=system)
 
-        return f'''<bpmn2:messageFlow id="{id}" name="HTTPS" sourceRef="{{{{source_ref}}}}" targetRef="{{{{target_ref}}}}">
+    HTTPS_SENDER_TEMPLATE = TEMPLATES.register('https_sender', '''<bpmn2:messageFlow id="{{id}}" name="HTTPS" sourceRef="{{source_ref}}" targetRef="{{target_ref}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>ComponentType</key>
@@ -406,7 +362,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>urlPath</key>
-                    <value>{url_path}</value>
+                    <value>{{url_path}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>Name</key>
@@ -426,7 +382,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>xsrfProtection</key>
-                    <value>{csrf_protection}</value>
+                    <value>{{csrf_protection}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>TransportProtocol</key>
@@ -438,11 +394,11 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>userRole</key>
-                    <value>{user_role}</value>
+                    <value>{{user_role}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>senderAuthType</key>
-                    <value>{sender_auth}</value>
+                    <value>{{sender_auth}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>MessageProtocol</key>
@@ -462,32 +418,25 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>clientCertificates</key>
-                    <value>{client_certificates}</value>
+                    <value>{{client_certificates}}</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-        </bpmn2:messageFlow>'''
+        </bpmn2:messageFlow>''')
 
-
-    def soap_receiver_template(self, id, name, address, auth_method="None", credential_name="",
-                              timeout="60000", system="", compress_message="false", location_id=""):
+    def https_sender_template(self, id, name, url_path, sender_auth="None", user_role="ESBMessaging.send", csrf_protection="false", client_certificates=""):
         """
-        Template for SOAP Receiver Adapter
+        Template for HTTPS Sender Adapter with default values for empty properties
+        """
+        # Ensure url_path has a default value
+        if not url_path:
+            url_path = "/"
 
-        Args:
-            id (str): Component ID
-            name (str): Component name
-            address (str): SOAP endpoint address
-            auth_method (str): Authentication method
-            credential_name (str): Credential name
-            timeout (str): Request timeout in milliseconds
-            system (str): System name
-            compress_message (str): Compress message ("true"/"false")
-            location_id (str): Location ID
+        return self.HTTPS_SENDER_TEMPLATE.render(
+            id=id, url_path=url_path, csrf_protection=csrf_protection, user_role=user_role,
+            sender_auth=sender_auth, client_certificates=client_certificates)
 
-        Returns:
-            str: XML template for SOAP Receiver Adapter
-        """
-        return f'''<bpmn2:messageFlow id="{id}" name="{name}" sourceRef="{{{{source_ref}}}}" targetRef="{{{{target_ref}}}}">
+
+    SOAP_RECEIVER_TEMPLATE = TEMPLATES.register('soap_receiver', '''<bpmn2:messageFlow id="{{id}}" name="{{name}}" sourceRef="{{source_ref}}" targetRef="{{target_ref}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>cleanupHeaders</key>
@@ -503,7 +452,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>location_id</key>
-                    <value>{location_id}</value>
+                    <value>{{location_id}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>TransportProtocolVersion</key>
@@ -515,7 +464,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>CompressMessage</key>
-                    <value>{compress_message}</value>
+                    <value>{{compress_message}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>MessageProtocol</key>
@@ -523,7 +472,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>requestTimeout</key>
-                    <value>{timeout}</value>
+                    <value>{{timeout}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>direction</key>
@@ -531,7 +480,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>authentication</key>
-                    <value>{auth_method}</value>
+                    <value>{{auth_method}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>ComponentType</key>
@@ -539,7 +488,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>address</key>
-                    <value>{address}</value>
+                    <value>{{address}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>allowChunking</key>
@@ -555,7 +504,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>system</key>
-                    <value>{system}</value>
+                    <value>{{system}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>TransportProtocol</key>
@@ -567,14 +516,37 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>credentialName</key>
-                    <value>{credential_name}</value>
+                    <value>{{credential_name}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>MessageProtocolVersion</key>
                     <value>1.10.0</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-        </bpmn2:messageFlow>'''
+        </bpmn2:messageFlow>''')
+
+    def soap_receiver_template(self, id, name, address, auth_method="None", credential_name="",
+                              timeout="60000", system="", compress_message="false", location_id=""):
+        """
+        Template for SOAP Receiver Adapter
+
+        Args:
+            id (str): Component ID
+            name (str): Component name
+            address (str): SOAP endpoint address
+            auth_method (str): Authentication method
+            credential_name (str): Credential name
+            timeout (str): Request timeout in milliseconds
+            system (str): System name
+            compress_message (str): Compress message ("true"/"false")
+            location_id (str): Location ID
+
+        Returns:
+            str: XML template for SOAP Receiver Adapter
+        """
+        return self.SOAP_RECEIVER_TEMPLATE.render(
+            id=id, name=name, location_id=location_id, compress_message=compress_message, timeout=timeout,
+            auth_method=auth_method, address=address, system=system, credential_name=credential_name)
 
     def process_direct_template(self, id, name, address, system=""):
         """
@@ -589,66 +561,7 @@ class EnhancedIFlowTemplates:
         Returns:
             str: XML template for ProcessDirect Adapter
         """
-        return f'''<bpmn2:messageFlow id="{id}" name="ProcessDirect" sourceRef="{{{{source_ref}}}}" targetRef="{{{{target_ref}}}}">
-            <bpmn2:extensionElements>
-                <ifl:property>
-                    <key>ComponentType</key>
-                    <value>ProcessDirect</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>Description</key>
-                    <value/>
-                </ifl:property>
-                <ifl:property>
-                    <key>address</key>
-                    <value>{address}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>ComponentNS</key>
-                    <value>sap</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>Vendor</key>
-                    <value>SAP</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>componentVersion</key>
-                    <value>1.1</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>TransportProtocolVersion</key>
-                    <value>1.1.2</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>ComponentSWCVName</key>
-                    <value>external</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>system</key>
-                    <value>{system}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>TransportProtocol</key>
-                    <value>Not Applicable</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>cmdVariantUri</key>
-                    <value>ctype::AdapterVariant/cname::ProcessDirect/vendor::SAP/tp::Not Applicable/mp::Not Applicable/direction::Receiver/version::1.1.1</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>MessageProtocol</key>
-                    <value>Not Applicable</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>MessageProtocolVersion</key>
-                    <value>1.1.2</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>direction</key>
-                    <value>Receiver</value>
-                </ifl:property>
-            </bpmn2:extensionElements>
-        </bpmn2:messageFlow>'''
+        return TEMPLATES.render('process_direct', id=id, address=address, system=system)
 
     # ===== Process Component Templates =====
 
@@ -665,40 +578,7 @@ class EnhancedIFlowTemplates:
         Returns:
             str: XML template for Enricher
         """
-        return f'''<bpmn2:callActivity id="{id}" name="{name}">
-            <bpmn2:extensionElements>
-                <ifl:property>
-                    <key>bodyType</key>
-                    <value>{body_type}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>propertyTable</key>
-                    <value>[]</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>headerTable</key>
-                    <value>[]</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>wrapContent</key>
-                    <value>{wrap_content}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>componentVersion</key>
-                    <value>1.5</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>activityType</key>
-                    <value>Enricher</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>cmdVariantUri</key>
-                    <value>ctype::FlowstepVariant/cname::Enricher/version::1.5.1</value>
-                </ifl:property>
-            </bpmn2:extensionElements>
-            <bpmn2:incoming>SequenceFlow_1</bpmn2:incoming>
-            <bpmn2:outgoing>SequenceFlow_2</bpmn2:outgoing>
-        </bpmn2:callActivity>'''
+        return TEMPLATES.render('enricher', id=id, name=name, body_type=body_type, wrap_content=wrap_content)
 
     def content_modifier_template(self, id, name, property_table="", header_table="", body_type="expression", wrap_content="", content=""):
         """
@@ -716,44 +596,9 @@ class EnhancedIFlowTemplates:
         Returns:
             str: XML template for Content Modifier
         """
-        return f'''<bpmn2:callActivity id="{id}" name="{name}">
-            <bpmn2:extensionElements>
-                <ifl:property>
-                    <key>bodyType</key>
-                    <value>{body_type}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>propertyTable</key>
-                    <value>{property_table}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>headerTable</key>
-                    <value>{header_table}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>wrapContent</key>
-                    <value>{wrap_content}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>componentVersion</key>
-                    <value>1.5</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>activityType</key>
-                    <value>Enricher</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>cmdVariantUri</key>
-                    <value>ctype::FlowstepVariant/cname::Enricher/version::1.5.0</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>bodyContent</key>
-                    <value>{content}</value>
-                </ifl:property>
-            </bpmn2:extensionElements>
-            <bpmn2:incoming>SequenceFlow_1</bpmn2:incoming>
-            <bpmn2:outgoing>SequenceFlow_2</bpmn2:outgoing>
-        </bpmn2:callActivity>'''
+        return TEMPLATES.render('content_modifier',
+            id=id, name=name, body_type=body_type, property_table=property_table, header_table=header_table,
+            wrap_content=wrap_content, content=content)
 
     def content_enricher_template(self, id, name, property_table="", header_table="", body_type="expression", body_content="", wrap_content=""):
         """
@@ -771,46 +616,38 @@ class EnhancedIFlowTemplates:
         Returns:
             str: XML template for Content Enricher
         """
-        return f'''<bpmn2:callActivity id="{id}" name="{name}">
+        return TEMPLATES.render('content_enricher',
+            id=id, name=name, body_type=body_type, property_table=property_table, header_table=header_table,
+            wrap_content=wrap_content, body_content=body_content)
+
+    FILTER_TEMPLATE = TEMPLATES.register('filter', '''<bpmn2:callActivity id="{{id}}" name="{{name}}">
             <bpmn2:extensionElements>
                 <ifl:property>
-                    <key>bodyType</key>
-                    <value>{body_type}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>propertyTable</key>
-                    <value>{property_table}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>headerTable</key>
-                    <value>{header_table}</value>
+                    <key>xpathType</key>
+                    <value>{{xpath_type}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>wrapContent</key>
-                    <value>{wrap_content}</value>
+                    <value>{{wrap_content|raw}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>componentVersion</key>
-                    <value>1.4</value>
+                    <value>1.1</value>
                 </ifl:property>
                 <ifl:property>
                     <key>activityType</key>
-                    <value>Enricher</value>
+                    <value>Filter</value>
                 </ifl:property>
                 <ifl:property>
                     <key>cmdVariantUri</key>
-                    <value>ctype::FlowstepVariant/cname::Enricher/version::1.4.2</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>bodyContent</key>
-                    <value>{body_content}</value>
+                    <value>ctype::FlowstepVariant/cname::Filter/version::1.1.0</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-            <bpmn2:incoming>SequenceFlow_1</bpmn2:incoming>
-            <bpmn2:outgoing>SequenceFlow_2</bpmn2:outgoing>
-        </bpmn2:callActivity>'''
+            <bpmn2:incoming>{{incoming_flow}}</bpmn2:incoming>
+            <bpmn2:outgoing>{{outgoing_flow}}</bpmn2:outgoing>
+        </bpmn2:callActivity>''')
 
-    def filter_template(self, id, name, xpath_type="Integer", wrap_content="", incoming_flow="{{incoming_flow}}", outgoing_flow="{{outgoing_flow}}"):
+    def filter_template(self, id, name, xpath_type="Integer", wrap_content="", incoming_flow=None, outgoing_flow=None):
         """
         Template for Filter component
 
@@ -825,15 +662,27 @@ class EnhancedIFlowTemplates:
         Returns:
             str: XML template for Filter
         """
-        return f'''<bpmn2:callActivity id="{id}" name="{name}">
+        return self.FILTER_TEMPLATE.render(
+            id=id, name=name, xpath_type=xpath_type, wrap_content=wrap_content, incoming_flow=incoming_flow,
+            outgoing_flow=outgoing_flow)
+
+    MESSAGE_DIGEST_TEMPLATE = TEMPLATES.register('message_digest', '''<bpmn2:callActivity id="{{id}}" name="{{name}}">
             <bpmn2:extensionElements>
                 <ifl:property>
-                    <key>xpathType</key>
-                    <value>{xpath_type}</value>
+                    <key>filter</key>
+                    <value>{{filter_value}}</value>
                 </ifl:property>
                 <ifl:property>
-                    <key>wrapContent</key>
-                    <value>{wrap_content}</value>
+                    <key>canonicalizationMethod</key>
+                    <value>{{canonicalization_method}}</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>targetHeader</key>
+                    <value>{{target_header}}</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>digestAlgorithm</key>
+                    <value>{{digest_algorithm}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>componentVersion</key>
@@ -841,18 +690,18 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>activityType</key>
-                    <value>Filter</value>
+                    <value>MessageDigest</value>
                 </ifl:property>
                 <ifl:property>
                     <key>cmdVariantUri</key>
-                    <value>ctype::FlowstepVariant/cname::Filter/version::1.1.0</value>
+                    <value>ctype::FlowstepVariant/cname::MessageDigest/version::1.1.1</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-            <bpmn2:incoming>{incoming_flow}</bpmn2:incoming>
-            <bpmn2:outgoing>{outgoing_flow}</bpmn2:outgoing>
-        </bpmn2:callActivity>'''
+            <bpmn2:incoming>{{incoming_flow}}</bpmn2:incoming>
+            <bpmn2:outgoing>{{outgoing_flow}}</bpmn2:outgoing>
+        </bpmn2:callActivity>''')
 
-    def message_digest_template(self, id, name, filter_value="", canonicalization_method="xml-c14n", target_header="SAPMessageDigest", digest_algorithm="SHA-512", incoming_flow="{{incoming_flow}}", outgoing_flow="{{outgoing_flow}}"):
+    def message_digest_template(self, id, name, filter_value="", canonicalization_method="xml-c14n", target_header="SAPMessageDigest", digest_algorithm="SHA-512", incoming_flow=None, outgoing_flow=None):
         """
         Template for Message Digest component
 
@@ -869,40 +718,31 @@ class EnhancedIFlowTemplates:
         Returns:
             str: XML template for Message Digest
         """
-        return f'''<bpmn2:callActivity id="{id}" name="{name}">
+        return self.MESSAGE_DIGEST_TEMPLATE.render(
+            id=id, name=name, filter_value=filter_value, canonicalization_method=canonicalization_method,
+            target_header=target_header, digest_algorithm=digest_algorithm, incoming_flow=incoming_flow,
+            outgoing_flow=outgoing_flow)
+
+    ROUTER_TEMPLATE = TEMPLATES.register('router', '''<bpmn2:exclusiveGateway{{default_attr|raw}} id="{{id}}" name="{{name}}">
             <bpmn2:extensionElements>
-                <ifl:property>
-                    <key>filter</key>
-                    <value>{filter_value}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>canonicalizationMethod</key>
-                    <value>{canonicalization_method}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>targetHeader</key>
-                    <value>{target_header}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>digestAlgorithm</key>
-                    <value>{digest_algorithm}</value>
-                </ifl:property>
                 <ifl:property>
                     <key>componentVersion</key>
                     <value>1.1</value>
                 </ifl:property>
                 <ifl:property>
                     <key>activityType</key>
-                    <value>MessageDigest</value>
+                    <value>ExclusiveGateway</value>
                 </ifl:property>
                 <ifl:property>
                     <key>cmdVariantUri</key>
-                    <value>ctype::FlowstepVariant/cname::MessageDigest/version::1.1.1</value>
+                    <value>ctype::FlowstepVariant/cname::ExclusiveGateway/version::1.1.2</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>throwException</key>
+                    <value>false</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-            <bpmn2:incoming>{incoming_flow}</bpmn2:incoming>
-            <bpmn2:outgoing>{outgoing_flow}</bpmn2:outgoing>
-        </bpmn2:callActivity>'''
+        </bpmn2:exclusiveGateway>''')
 
     def router_template(self, id, name, default_flow_id=None):
         """
@@ -921,26 +761,24 @@ class EnhancedIFlowTemplates:
         """
         default_attr = f' default="{default_flow_id}"' if default_flow_id else ""
         
-        return f'''<bpmn2:exclusiveGateway{default_attr} id="{id}" name="{name}">
+        return self.ROUTER_TEMPLATE.render(default_attr=default_attr, id=id, name=name)
+
+    ROUTER_CONDITION_TEMPLATE = TEMPLATES.register('router_condition', '''<bpmn2:sequenceFlow id="{{id}}" name="{{name}}" sourceRef="{{source_ref}}" targetRef="{{target_ref}}">
             <bpmn2:extensionElements>
                 <ifl:property>
-                    <key>componentVersion</key>
-                    <value>1.1</value>
+                    <key>expressionType</key>
+                    <value>{{expression_type}}</value>
                 </ifl:property>
                 <ifl:property>
-                    <key>activityType</key>
-                    <value>ExclusiveGateway</value>
+                    <key>componentVersion</key>
+                    <value>1.0</value>
                 </ifl:property>
                 <ifl:property>
                     <key>cmdVariantUri</key>
-                    <value>ctype::FlowstepVariant/cname::ExclusiveGateway/version::1.1.2</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>throwException</key>
-                    <value>false</value>
+                    <value>ctype::FlowstepVariant/cname::GatewayRoute/version::1.0.0</value>
                 </ifl:property>
-            </bpmn2:extensionElements>
-        </bpmn2:exclusiveGateway>'''
+            </bpmn2:extensionElements>{{condition_expr|raw}}
+        </bpmn2:sequenceFlow>''')
 
     def router_condition_template(self, id, name, source_ref, target_ref, expression="", expression_type="XML", raw_condition_xml: str = None):
         """
@@ -984,22 +822,9 @@ class EnhancedIFlowTemplates:
         # else: Default route → no conditionExpression
         
         # Build sequence flow XML
-        xml_content = f'''<bpmn2:sequenceFlow id="{id}" name="{name}" sourceRef="{source_ref}" targetRef="{target_ref}">
-            <bpmn2:extensionElements>
-                <ifl:property>
-                    <key>expressionType</key>
-                    <value>{expression_type}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>componentVersion</key>
-                    <value>1.0</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>cmdVariantUri</key>
-                    <value>ctype::FlowstepVariant/cname::GatewayRoute/version::1.0.0</value>
-                </ifl:property>
-            </bpmn2:extensionElements>{condition_expr}
-        </bpmn2:sequenceFlow>'''
+        xml_content = self.ROUTER_CONDITION_TEMPLATE.render(
+            id=id, name=name, source_ref=source_ref, target_ref=target_ref, expression_type=expression_type,
+            condition_expr=condition_expr)
         
         return xml_content
 
@@ -1020,24 +845,11 @@ class EnhancedIFlowTemplates:
         """
         return f'''<bpmn2:sequenceFlow id="{id}" sourceRef="{source_ref}" targetRef="{target_ref}" isImmediate="{is_immediate}"/>'''
 
-    def process_template(self, id, name, transaction_timeout="30", transactional_handling="Not Required"):
-        """
-        Template for Integration Process with correct placeholder
-
-        Args:
-            id (str): Process ID
-            name (str): Process name
-            transaction_timeout (str): Transaction timeout in seconds
-            transactional_handling (str): Transactional handling mode
-
-        Returns:
-            str: XML template for Integration Process
-        """
-        return f'''<bpmn2:process id="{id}" name="{name}" isExecutable="true">
+    PROCESS_TEMPLATE = TEMPLATES.register('process', '''<bpmn2:process id="{{id}}" name="{{name}}" isExecutable="true">
         <bpmn2:extensionElements>
             <ifl:property>
                 <key>transactionTimeout</key>
-                <value>{transaction_timeout}</value>
+                <value>{{transaction_timeout}}</value>
             </ifl:property>
             <ifl:property>
                 <key>componentVersion</key>
@@ -1049,7 +861,7 @@ class EnhancedIFlowTemplates:
             </ifl:property>
             <ifl:property>
                 <key>transactionalHandling</key>
-                <value>{transactional_handling}</value>
+                <value>{{transactional_handling}}</value>
             </ifl:property>
             <ifl:property>
                 <key>isTransactional</key>
@@ -1057,7 +869,24 @@ class EnhancedIFlowTemplates:
             </ifl:property>
         </bpmn2:extensionElements>
         {{process_content}}
-    </bpmn2:process>'''
+    </bpmn2:process>''')
+
+    def process_template(self, id, name, transaction_timeout="30", transactional_handling="Not Required"):
+        """
+        Template for Integration Process with correct placeholder
+
+        Args:
+            id (str): Process ID
+            name (str): Process name
+            transaction_timeout (str): Transaction timeout in seconds
+            transactional_handling (str): Transactional handling mode
+
+        Returns:
+            str: XML template for Integration Process
+        """
+        return self.PROCESS_TEMPLATE.render(
+            id=id, name=name, transaction_timeout=transaction_timeout,
+            transactional_handling=transactional_handling)
     # ===== Helper Methods =====
 
     def generate_unique_id(self, prefix=""):
@@ -1120,27 +949,28 @@ class EnhancedIFlowTemplates:
 
     # ===== SFTP Receiver Components =====
 
-    def sftp_receiver_participant_template(self, id="Participant_SFTP", name="SFTP_Server"):
-        """Generate an SFTP receiver participant template."""
-        definition = f'''<bpmn2:participant id="{id}" ifl:type="EndpointRecevier" name="{name}">
+    SFTP_RECEIVER_PARTICIPANT_TEMPLATE = TEMPLATES.register('sftp_receiver_participant', '''<bpmn2:participant id="{{id}}" ifl:type="EndpointRecevier" name="{{name}}">
     <bpmn2:extensionElements>
         <ifl:property>
             <key>ifl:type</key>
             <value>EndpointRecevier</value>
         </ifl:property>
     </bpmn2:extensionElements>
-</bpmn2:participant>'''
+</bpmn2:participant>''')
 
-        shape = f'''<bpmndi:BPMNShape bpmnElement="{id}" id="BPMNShape_{id}">
+    SFTP_RECEIVER_PARTICIPANT_SHAPE_TEMPLATE = TEMPLATES.register('sftp_receiver_participant_shape', '''<bpmndi:BPMNShape bpmnElement="{{id}}" id="BPMNShape_{{id}}">
     <dc:Bounds height="140.0" width="100.0" x="850" y="150"/>
-</bpmndi:BPMNShape>'''
+</bpmndi:BPMNShape>''')
+
+    def sftp_receiver_participant_template(self, id="Participant_SFTP", name="SFTP_Server"):
+        """Generate an SFTP receiver participant template."""
+        definition = self.SFTP_RECEIVER_PARTICIPANT_TEMPLATE.render(id=id, name=name)
+
+        shape = self.SFTP_RECEIVER_PARTICIPANT_SHAPE_TEMPLATE.render(id=id)
 
         return {"definition": definition, "shape": shape}
 
-    def sftp_component_template(self, id, name, host="sftp.example.com", port="22", path="/uploads", username="${sftp_username}",
-                               auth_type="Password", operation="PUT"):
-        """Generate a main SFTP component template for file operations."""
-        definition = f'''<bpmn2:serviceTask id="{id}" name="{name}">
+    SFTP_COMPONENT_TEMPLATE = TEMPLATES.register('sftp_component', '''<bpmn2:serviceTask id="{{id}}" name="{{name}}">
     <bpmn2:extensionElements>
         <ifl:property>
             <key>componentVersion</key>
@@ -1155,19 +985,22 @@ class EnhancedIFlowTemplates:
             <value>ctype::FlowstepVariant/cname::ExternalCall/version::1.0.4</value>
         </ifl:property>
     </bpmn2:extensionElements>
-</bpmn2:serviceTask>'''
+</bpmn2:serviceTask>''')
 
-        shape = f'''<bpmndi:BPMNShape bpmnElement="{id}" id="BPMNShape_{id}">
+    SFTP_COMPONENT_SHAPE_TEMPLATE = TEMPLATES.register('sftp_component_shape', '''<bpmndi:BPMNShape bpmnElement="{{id}}" id="BPMNShape_{{id}}">
     <dc:Bounds height="80.0" width="100.0" x="400" y="140"/>
-</bpmndi:BPMNShape>'''
+</bpmndi:BPMNShape>''')
+
+    def sftp_component_template(self, id, name, host="sftp.example.com", port="22", path="/uploads", username="${sftp_username}",
+                               auth_type="Password", operation="PUT"):
+        """Generate a main SFTP component template for file operations."""
+        definition = self.SFTP_COMPONENT_TEMPLATE.render(id=id, name=name)
+
+        shape = self.SFTP_COMPONENT_SHAPE_TEMPLATE.render(id=id)
 
         return {"definition": definition, "shape": shape}
 
-    def sftp_receiver_message_flow_template(self, id="MessageFlow_SFTP", name="SFTP", source_ref="ServiceTask_1", target_ref="Participant_SFTP",
-                                          host="sftp.example.com", port="22", path="/uploads", username="${sftp_username}",
-                                          auth_type="Password", operation="PUT"):
-        """Generate an SFTP receiver message flow template."""
-        definition = f'''<bpmn2:messageFlow id="{id}" name="{name}" sourceRef="{source_ref}" targetRef="{target_ref}">
+    SFTP_RECEIVER_MESSAGE_FLOW_TEMPLATE = TEMPLATES.register('sftp_receiver_message_flow', '''<bpmn2:messageFlow id="{{id}}" name="{{name}}" sourceRef="{{source_ref}}" targetRef="{{target_ref}}">
     <bpmn2:extensionElements>
         <ifl:property>
             <key>disconnect</key>
@@ -1235,7 +1068,7 @@ class EnhancedIFlowTemplates:
         </ifl:property>
         <ifl:property>
             <key>path</key>
-            <value>{path}</value>
+            <value>{{path}}</value>
         </ifl:property>
         <ifl:property>
             <key>proxyPort</key>
@@ -1243,7 +1076,7 @@ class EnhancedIFlowTemplates:
         </ifl:property>
         <ifl:property>
             <key>host</key>
-            <value>{host}</value>
+            <value>{{host}}</value>
         </ifl:property>
         <ifl:property>
             <key>connectTimeout</key>
@@ -1307,11 +1140,11 @@ class EnhancedIFlowTemplates:
         </ifl:property>
         <ifl:property>
             <key>system</key>
-            <value>{target_ref}</value>
+            <value>{{target_ref}}</value>
         </ifl:property>
         <ifl:property>
             <key>tempFileName</key>
-            <value>${{file:name}}.tmp</value>
+            <value>${file:name}.tmp</value>
         </ifl:property>
         <ifl:property>
             <key>allowDeprecatedAlgorithms</key>
@@ -1331,41 +1164,53 @@ class EnhancedIFlowTemplates:
         </ifl:property>
         <ifl:property>
             <key>username</key>
-            <value>{username}</value>
+            <value>{{username}}</value>
         </ifl:property>
     </bpmn2:extensionElements>
-</bpmn2:messageFlow>'''
+</bpmn2:messageFlow>''')
 
-        edge = f'''<bpmndi:BPMNEdge bpmnElement="{id}" id="BPMNEdge_{id}" sourceElement="BPMNShape_{source_ref}" targetElement="BPMNShape_{target_ref}">
+    SFTP_RECEIVER_MESSAGE_FLOW_EDGE_TEMPLATE = TEMPLATES.register('sftp_receiver_message_flow_edge', '''<bpmndi:BPMNEdge bpmnElement="{{id}}" id="BPMNEdge_{{id}}" sourceElement="BPMNShape_{{source_ref}}" targetElement="BPMNShape_{{target_ref}}">
     <di:waypoint x="757" xsi:type="dc:Point" y="140"/>
     <di:waypoint x="850" xsi:type="dc:Point" y="170"/>
-</bpmndi:BPMNEdge>'''
+</bpmndi:BPMNEdge>''')
+
+    def sftp_receiver_message_flow_template(self, id="MessageFlow_SFTP", name="SFTP", source_ref="ServiceTask_1", target_ref="Participant_SFTP",
+                                          host="sftp.example.com", port="22", path="/uploads", username="${sftp_username}",
+                                          auth_type="Password", operation="PUT"):
+        """Generate an SFTP receiver message flow template."""
+        definition = self.SFTP_RECEIVER_MESSAGE_FLOW_TEMPLATE.render(
+            id=id, name=name, source_ref=source_ref, target_ref=target_ref, path=path, host=host,
+            username=username)
+
+        edge = self.SFTP_RECEIVER_MESSAGE_FLOW_EDGE_TEMPLATE.render(
+            id=id, source_ref=source_ref, target_ref=target_ref)
 
         return {"definition": definition, "edge": edge}
 
     # ===== SuccessFactors OData Receiver Components =====
 
-    def successfactors_receiver_participant_template(self, id="Participant_SuccessFactors", name="SuccessFactors"):
-        """Generate a SuccessFactors receiver participant template."""
-        definition = f'''<bpmn2:participant id="{id}" ifl:type="EndpointRecevier" name="{name}">
+    SUCCESSFACTORS_RECEIVER_PARTICIPANT_TEMPLATE = TEMPLATES.register('successfactors_receiver_participant', '''<bpmn2:participant id="{{id}}" ifl:type="EndpointRecevier" name="{{name}}">
     <bpmn2:extensionElements>
         <ifl:property>
             <key>ifl:type</key>
             <value>EndpointRecevier</value>
         </ifl:property>
     </bpmn2:extensionElements>
-</bpmn2:participant>'''
+</bpmn2:participant>''')
 
-        shape = f'''<bpmndi:BPMNShape bpmnElement="{id}" id="BPMNShape_{id}">
+    SUCCESSFACTORS_RECEIVER_PARTICIPANT_SHAPE_TEMPLATE = TEMPLATES.register('successfactors_receiver_participant_shape', '''<bpmndi:BPMNShape bpmnElement="{{id}}" id="BPMNShape_{{id}}">
     <dc:Bounds height="140.0" width="100.0" x="850" y="150"/>
-</bpmndi:BPMNShape>'''
+</bpmndi:BPMNShape>''')
+
+    def successfactors_receiver_participant_template(self, id="Participant_SuccessFactors", name="SuccessFactors"):
+        """Generate a SuccessFactors receiver participant template."""
+        definition = self.SUCCESSFACTORS_RECEIVER_PARTICIPANT_TEMPLATE.render(id=id, name=name)
+
+        shape = self.SUCCESSFACTORS_RECEIVER_PARTICIPANT_SHAPE_TEMPLATE.render(id=id)
 
         return {"definition": definition, "shape": shape}
 
-    def successfactors_receiver_message_flow_template(self, id="MessageFlow_SuccessFactors", source_ref="ServiceTask_1", target_ref="Participant_SuccessFactors",
-                                                    url="https://api.successfactors.com/odata/v2/User", operation="Query(GET)", auth_method="OAuth"):
-        """Generate a SuccessFactors receiver message flow template."""
-        definition = f'''<bpmn2:messageFlow id="{id}" name="SuccessFactors" sourceRef="{source_ref}" targetRef="{target_ref}">
+    SUCCESSFACTORS_RECEIVER_MESSAGE_FLOW_TEMPLATE = TEMPLATES.register('successfactors_receiver_message_flow', '''<bpmn2:messageFlow id="{{id}}" name="SuccessFactors" sourceRef="{{source_ref}}" targetRef="{{target_ref}}">
     <bpmn2:extensionElements>
         <ifl:property>
             <key>ComponentType</key>
@@ -1381,15 +1226,15 @@ class EnhancedIFlowTemplates:
         </ifl:property>
         <ifl:property>
             <key>address</key>
-            <value>{url}</value>
+            <value>{{url}}</value>
         </ifl:property>
         <ifl:property>
             <key>operation</key>
-            <value>{operation}</value>
+            <value>{{operation}}</value>
         </ifl:property>
         <ifl:property>
             <key>authenticationMethod</key>
-            <value>{auth_method}</value>
+            <value>{{auth_method}}</value>
         </ifl:property>
         <ifl:property>
             <key>TransportProtocolVersion</key>
@@ -1420,20 +1265,28 @@ class EnhancedIFlowTemplates:
             <value>application/json</value>
         </ifl:property>
     </bpmn2:extensionElements>
-</bpmn2:messageFlow>'''
+</bpmn2:messageFlow>''')
 
-        edge = f'''<bpmndi:BPMNEdge bpmnElement="{id}" id="BPMNEdge_{id}" sourceElement="BPMNShape_{source_ref}" targetElement="BPMNShape_{target_ref}">
+    SUCCESSFACTORS_RECEIVER_MESSAGE_FLOW_EDGE_TEMPLATE = TEMPLATES.register('successfactors_receiver_message_flow_edge', '''<bpmndi:BPMNEdge bpmnElement="{{id}}" id="BPMNEdge_{{id}}" sourceElement="BPMNShape_{{source_ref}}" targetElement="BPMNShape_{{target_ref}}">
     <di:waypoint x="757" xsi:type="dc:Point" y="140"/>
     <di:waypoint x="850" xsi:type="dc:Point" y="170"/>
-</bpmndi:BPMNEdge>'''
+</bpmndi:BPMNEdge>''')
+
+    def successfactors_receiver_message_flow_template(self, id="MessageFlow_SuccessFactors", source_ref="ServiceTask_1", target_ref="Participant_SuccessFactors",
+                                                    url="https://api.successfactors.com/odata/v2/User", operation="Query(GET)", auth_method="OAuth"):
+        """Generate a SuccessFactors receiver message flow template."""
+        definition = self.SUCCESSFACTORS_RECEIVER_MESSAGE_FLOW_TEMPLATE.render(
+            id=id, source_ref=source_ref, target_ref=target_ref, url=url, operation=operation,
+            auth_method=auth_method)
+
+        edge = self.SUCCESSFACTORS_RECEIVER_MESSAGE_FLOW_EDGE_TEMPLATE.render(
+            id=id, source_ref=source_ref, target_ref=target_ref)
 
         return {"definition": definition, "edge": edge}
 
     # ===== Request-Reply Service Task Components =====
 
-    def request_reply_template(self, id, name, incoming_flow="{{incoming_flow}}", outgoing_flow="{{outgoing_flow}}"):
-        """Generate a request-reply service task template based on SAP sample."""
-        definition = f'''<bpmn2:serviceTask id="{id}" name="{name}">
+    REQUEST_REPLY_TEMPLATE = TEMPLATES.register('request_reply', '''<bpmn2:serviceTask id="{{id}}" name="{{name}}">
     <bpmn2:extensionElements>
         <ifl:property>
             <key>componentVersion</key>
@@ -1448,21 +1301,24 @@ class EnhancedIFlowTemplates:
             <value>ctype::FlowstepVariant/cname::ExternalCall/version::1.0.4</value>
         </ifl:property>
     </bpmn2:extensionElements>
-    <bpmn2:incoming>{incoming_flow}</bpmn2:incoming>
-    <bpmn2:outgoing>{outgoing_flow}</bpmn2:outgoing>
-</bpmn2:serviceTask>'''
+    <bpmn2:incoming>{{incoming_flow}}</bpmn2:incoming>
+    <bpmn2:outgoing>{{outgoing_flow}}</bpmn2:outgoing>
+</bpmn2:serviceTask>''')
+
+    def request_reply_template(self, id, name, incoming_flow=None, outgoing_flow=None):
+        """Generate a request-reply service task template based on SAP sample."""
+        definition = self.REQUEST_REPLY_TEMPLATE.render(
+            id=id, name=name, incoming_flow=incoming_flow, outgoing_flow=outgoing_flow)
 
         return definition
 
     # ===== Process Call Activity Components =====
 
-    def process_call_template(self, id, name, process_id="Process_1", incoming_flow="{{incoming_flow}}", outgoing_flow="{{outgoing_flow}}"):
-        """Generate a process call activity template for Local Integration Process."""
-        definition = f'''<bpmn2:callActivity id="{id}" name="{name}">
+    PROCESS_CALL_TEMPLATE = TEMPLATES.register('process_call', '''<bpmn2:callActivity id="{{id}}" name="{{name}}">
     <bpmn2:extensionElements>
         <ifl:property>
             <key>processId</key>
-            <value>{process_id}</value>
+            <value>{{process_id}}</value>
         </ifl:property>
         <ifl:property>
             <key>componentVersion</key>
@@ -1489,17 +1345,20 @@ class EnhancedIFlowTemplates:
             <value>30</value>
         </ifl:property>
     </bpmn2:extensionElements>
-    <bpmn2:incoming>{incoming_flow}</bpmn2:incoming>
-    <bpmn2:outgoing>{outgoing_flow}</bpmn2:outgoing>
-</bpmn2:callActivity>'''
+    <bpmn2:incoming>{{incoming_flow}}</bpmn2:incoming>
+    <bpmn2:outgoing>{{outgoing_flow}}</bpmn2:outgoing>
+</bpmn2:callActivity>''')
+
+    def process_call_template(self, id, name, process_id="Process_1", incoming_flow=None, outgoing_flow=None):
+        """Generate a process call activity template for Local Integration Process."""
+        definition = self.PROCESS_CALL_TEMPLATE.render(
+            id=id, name=name, process_id=process_id, incoming_flow=incoming_flow, outgoing_flow=outgoing_flow)
 
         return definition
 
     # ===== Local Integration Process Components =====
 
-    def local_integration_process_template(self, id="Process_1", name="Local Integration Process 1"):
-        """Generate a local integration process template."""
-        definition = f'''<bpmn2:process id="{id}" name="{name}">
+    LOCAL_INTEGRATION_PROCESS_TEMPLATE = TEMPLATES.register('local_integration_process', '''<bpmn2:process id="{{id}}" name="{{name}}">
     <bpmn2:extensionElements>
         <ifl:property>
             <key>transactionTimeout</key>
@@ -1523,19 +1382,21 @@ class EnhancedIFlowTemplates:
         </ifl:property>
     </bpmn2:extensionElements>
     {{process_content}}
-</bpmn2:process>'''
+</bpmn2:process>''')
+
+    def local_integration_process_template(self, id="Process_1", name="Local Integration Process 1"):
+        """Generate a local integration process template."""
+        definition = self.LOCAL_INTEGRATION_PROCESS_TEMPLATE.render(id=id, name=name)
 
         return definition
 
     # ===== Enhanced Groovy Script Components =====
 
-    def enhanced_groovy_script_template(self, id, name, script_name="script.groovy", script_function="processMessage", incoming_flow="{{incoming_flow}}", outgoing_flow="{{outgoing_flow}}"):
-        """Generate an enhanced Groovy script template for Local Integration Process."""
-        definition = f'''<bpmn2:callActivity id="{id}" name="{name}">
+    ENHANCED_GROOVY_SCRIPT_TEMPLATE = TEMPLATES.register('enhanced_groovy_script', '''<bpmn2:callActivity id="{{id}}" name="{{name}}">
     <bpmn2:extensionElements>
         <ifl:property>
             <key>scriptFunction</key>
-            <value>{script_function}</value>
+            <value>{{script_function}}</value>
         </ifl:property>
         <ifl:property>
             <key>scriptBundleId</key>
@@ -1559,20 +1420,24 @@ class EnhancedIFlowTemplates:
         </ifl:property>
         <ifl:property>
             <key>script</key>
-            <value>{script_name}</value>
+            <value>{{script_name}}</value>
         </ifl:property>
     </bpmn2:extensionElements>
-    <bpmn2:incoming>{incoming_flow}</bpmn2:incoming>
-    <bpmn2:outgoing>{outgoing_flow}</bpmn2:outgoing>
-</bpmn2:callActivity>'''
+    <bpmn2:incoming>{{incoming_flow}}</bpmn2:incoming>
+    <bpmn2:outgoing>{{outgoing_flow}}</bpmn2:outgoing>
+</bpmn2:callActivity>''')
+
+    def enhanced_groovy_script_template(self, id, name, script_name="script.groovy", script_function="processMessage", incoming_flow=None, outgoing_flow=None):
+        """Generate an enhanced Groovy script template for Local Integration Process."""
+        definition = self.ENHANCED_GROOVY_SCRIPT_TEMPLATE.render(
+            id=id, name=name, script_function=script_function, script_name=script_name,
+            incoming_flow=incoming_flow, outgoing_flow=outgoing_flow)
 
         return definition
 
     # ===== Enhanced Start Event Components =====
 
-    def enhanced_start_event_template(self, id="StartEvent_1", name="Start 1"):
-        """Generate an enhanced start event template for Local Integration Process."""
-        definition = f'''<bpmn2:startEvent id="{id}" name="{name}">
+    ENHANCED_START_EVENT_TEMPLATE = TEMPLATES.register('enhanced_start_event', '''<bpmn2:startEvent id="{{id}}" name="{{name}}">
     <bpmn2:extensionElements>
         <ifl:property>
             <key>cmdVariantUri</key>
@@ -1584,13 +1449,15 @@ class EnhancedIFlowTemplates:
         </ifl:property>
     </bpmn2:extensionElements>
     <bpmn2:outgoing>{{outgoing_flow}}</bpmn2:outgoing>
-</bpmn2:startEvent>'''
+</bpmn2:startEvent>''')
+
+    def enhanced_start_event_template(self, id="StartEvent_1", name="Start 1"):
+        """Generate an enhanced start event template for Local Integration Process."""
+        definition = self.ENHANCED_START_EVENT_TEMPLATE.render(id=id, name=name)
 
         return definition
 
-    def message_start_event_template(self, id="StartEvent_1", name="Start 1"):
-        """Generate a message start event template for Integration Process with message event definition."""
-        definition = f'''<bpmn2:startEvent id="{id}" name="{name}">
+    MESSAGE_START_EVENT_TEMPLATE = TEMPLATES.register('message_start_event', '''<bpmn2:startEvent id="{{id}}" name="{{name}}">
     <bpmn2:extensionElements>
         <ifl:property>
             <key>cmdVariantUri</key>
@@ -1599,15 +1466,17 @@ class EnhancedIFlowTemplates:
     </bpmn2:extensionElements>
     <bpmn2:outgoing>{{outgoing_flow}}</bpmn2:outgoing>
     <bpmn2:messageEventDefinition/>
-</bpmn2:startEvent>'''
+</bpmn2:startEvent>''')
+
+    def message_start_event_template(self, id="StartEvent_1", name="Start 1"):
+        """Generate a message start event template for Integration Process with message event definition."""
+        definition = self.MESSAGE_START_EVENT_TEMPLATE.render(id=id, name=name)
 
         return definition
 
     # ===== Enhanced End Event Components =====
 
-    def enhanced_end_event_template(self, id="EndEvent_1", name="End 1", incoming_flow="{{incoming_flow}}"):
-        """Generate an enhanced end event template for Local Integration Process."""
-        definition = f'''<bpmn2:endEvent id="{id}" name="{name}">
+    ENHANCED_END_EVENT_TEMPLATE = TEMPLATES.register('enhanced_end_event', '''<bpmn2:endEvent id="{{id}}" name="{{name}}">
     <bpmn2:extensionElements>
         <ifl:property>
             <key>cmdVariantUri</key>
@@ -1618,89 +1487,109 @@ class EnhancedIFlowTemplates:
             <value>EndEvent</value>
         </ifl:property>
     </bpmn2:extensionElements>
-    <bpmn2:incoming>{incoming_flow}</bpmn2:incoming>
-</bpmn2:endEvent>'''
+    <bpmn2:incoming>{{incoming_flow}}</bpmn2:incoming>
+</bpmn2:endEvent>''')
+
+    def enhanced_end_event_template(self, id="EndEvent_1", name="End 1", incoming_flow=None):
+        """Generate an enhanced end event template for Local Integration Process."""
+        definition = self.ENHANCED_END_EVENT_TEMPLATE.render(id=id, name=name, incoming_flow=incoming_flow)
 
         return definition
 
-    def message_end_event_template(self, id="EndEvent_1", name="End 1", incoming_flow="{{incoming_flow}}"):
-        """Generate a message end event template for Integration Process with message event definition."""
-        definition = f'''<bpmn2:endEvent id="{id}" name="{name}">
+    MESSAGE_END_EVENT_TEMPLATE = TEMPLATES.register('message_end_event', '''<bpmn2:endEvent id="{{id}}" name="{{name}}">
     <bpmn2:extensionElements>
         <ifl:property>
             <key>cmdVariantUri</key>
             <value>ctype::FlowstepVariant/cname::MessageEndEvent/version::1.1.0</value>
         </ifl:property>
     </bpmn2:extensionElements>
-    <bpmn2:incoming>{incoming_flow}</bpmn2:incoming>
+    <bpmn2:incoming>{{incoming_flow}}</bpmn2:incoming>
     <bpmn2:messageEventDefinition/>
-</bpmn2:endEvent>'''
+</bpmn2:endEvent>''')
+
+    def message_end_event_template(self, id="EndEvent_1", name="End 1", incoming_flow=None):
+        """Generate a message end event template for Integration Process with message event definition."""
+        definition = self.MESSAGE_END_EVENT_TEMPLATE.render(id=id, name=name, incoming_flow=incoming_flow)
 
         return definition
 
     # ===== Additional Templates from Supabase Activity Types =====
 
-    def variables_template(self, id, name):
-        return f'''<bpmn2:callActivity id="{id}" name="{name}">
+    VARIABLES_TEMPLATE = TEMPLATES.register('variables', '''<bpmn2:callActivity id="{{id}}" name="{{name}}">
     <bpmn2:extensionElements>
         <ifl:property><key>activityType</key><value>Variables</value></ifl:property>
         <ifl:property><key>componentVersion</key><value>1.0</value></ifl:property>
         <ifl:property><key>cmdVariantUri</key><value>ctype::FlowstepVariant/cname::Variables/version::1.0.0</value></ifl:property>
     </bpmn2:extensionElements>
-</bpmn2:callActivity>'''
+</bpmn2:callActivity>''')
 
-    def gather_template(self, id, name):
-        return f'''<bpmn2:callActivity id="{id}" name="{name}">
+    def variables_template(self, id, name):
+        return self.VARIABLES_TEMPLATE.render(id=id, name=name)
+
+    GATHER_TEMPLATE = TEMPLATES.register('gather', '''<bpmn2:callActivity id="{{id}}" name="{{name}}">
     <bpmn2:extensionElements>
         <ifl:property><key>activityType</key><value>Gather</value></ifl:property>
         <ifl:property><key>componentVersion</key><value>1.0</value></ifl:property>
         <ifl:property><key>cmdVariantUri</key><value>ctype::FlowstepVariant/cname::Gather/version::1.0.0</value></ifl:property>
     </bpmn2:extensionElements>
-</bpmn2:callActivity>'''
+</bpmn2:callActivity>''')
 
-    def dbstorage_template(self, id, name):
-        return f'''<bpmn2:callActivity id="{id}" name="{name}">
+    def gather_template(self, id, name):
+        return self.GATHER_TEMPLATE.render(id=id, name=name)
+
+    DBSTORAGE_TEMPLATE = TEMPLATES.register('dbstorage', '''<bpmn2:callActivity id="{{id}}" name="{{name}}">
     <bpmn2:extensionElements>
         <ifl:property><key>activityType</key><value>DBstorage</value></ifl:property>
         <ifl:property><key>componentVersion</key><value>1.0</value></ifl:property>
         <ifl:property><key>cmdVariantUri</key><value>ctype::FlowstepVariant/cname::DBstorage/version::1.0.0</value></ifl:property>
     </bpmn2:extensionElements>
-</bpmn2:callActivity>'''
+</bpmn2:callActivity>''')
 
-    def xml_modifier_template(self, id, name):
-        return f'''<bpmn2:callActivity id="{id}" name="{name}">
+    def dbstorage_template(self, id, name):
+        return self.DBSTORAGE_TEMPLATE.render(id=id, name=name)
+
+    XML_MODIFIER_TEMPLATE = TEMPLATES.register('xml_modifier', '''<bpmn2:callActivity id="{{id}}" name="{{name}}">
     <bpmn2:extensionElements>
         <ifl:property><key>activityType</key><value>XmlModifier</value></ifl:property>
         <ifl:property><key>componentVersion</key><value>1.0</value></ifl:property>
         <ifl:property><key>cmdVariantUri</key><value>ctype::FlowstepVariant/cname::XmlModifier/version::1.0.0</value></ifl:property>
     </bpmn2:extensionElements>
-</bpmn2:callActivity>'''
+</bpmn2:callActivity>''')
 
-    def start_error_event_template(self, id="StartEvent_Error_1", name="Error Start 1"):
-        return f'''<bpmn2:startEvent id="{id}" name="{name}">
+    def xml_modifier_template(self, id, name):
+        return self.XML_MODIFIER_TEMPLATE.render(id=id, name=name)
+
+    START_ERROR_EVENT_TEMPLATE = TEMPLATES.register('start_error_event', '''<bpmn2:startEvent id="{{id}}" name="{{name}}">
     <bpmn2:extensionElements>
         <ifl:property><key>cmdVariantUri</key><value>ctype::FlowstepVariant/cname::ErrorStartEvent</value></ifl:property>
         <ifl:property><key>activityType</key><value>StartErrorEvent</value></ifl:property>
     </bpmn2:extensionElements>
     <bpmn2:errorEventDefinition/>
-</bpmn2:startEvent>'''
+</bpmn2:startEvent>''')
 
-    def end_error_event_template(self, id="EndEvent_Error_1", name="Error End 1", incoming_flow="{{incoming_flow}}"):
-        return f'''<bpmn2:endEvent id="{id}" name="{name}">
+    def start_error_event_template(self, id="StartEvent_Error_1", name="Error Start 1"):
+        return self.START_ERROR_EVENT_TEMPLATE.render(id=id, name=name)
+
+    END_ERROR_EVENT_TEMPLATE = TEMPLATES.register('end_error_event', '''<bpmn2:endEvent id="{{id}}" name="{{name}}">
     <bpmn2:extensionElements>
         <ifl:property><key>cmdVariantUri</key><value>ctype::FlowstepVariant/cname::MessageEndEvent/version::1.1.0</value></ifl:property>
         <ifl:property><key>activityType</key><value>EndErrorEvent</value></ifl:property>
     </bpmn2:extensionElements>
-    <bpmn2:incoming>{incoming_flow}</bpmn2:incoming>
+    <bpmn2:incoming>{{incoming_flow}}</bpmn2:incoming>
     <bpmn2:messageEventDefinition/>
-</bpmn2:endEvent>'''
+</bpmn2:endEvent>''')
 
-    def direct_call_process_template(self, id="Process_Direct", name="Direct Call Process"):
-        return f'''<bpmn2:process id="{id}" name="{name}">
+    def end_error_event_template(self, id="EndEvent_Error_1", name="Error End 1", incoming_flow=None):
+        return self.END_ERROR_EVENT_TEMPLATE.render(id=id, name=name, incoming_flow=incoming_flow)
+
+    DIRECT_CALL_PROCESS_TEMPLATE = TEMPLATES.register('direct_call_process', '''<bpmn2:process id="{{id}}" name="{{name}}">
     <bpmn2:extensionElements>
         <ifl:property><key>transactionTimeout</key><value>30</value></ifl:property>
         <ifl:property><key>processType</key><value>directCall</value></ifl:property>
         <ifl:property><key>componentVersion</key><value>1.1</value></ifl:property>
         <ifl:property><key>cmdVariantUri</key><value>ctype::FlowElementVariant/cname::LocalIntegrationProcess/version::1.1.3</value></ifl:property>
     </bpmn2:extensionElements>
-</bpmn2:process>'''
+</bpmn2:process>''')
+
+    def direct_call_process_template(self, id="Process_Direct", name="Direct Call Process"):
+        return self.DIRECT_CALL_PROCESS_TEMPLATE.render(id=id, name=name)
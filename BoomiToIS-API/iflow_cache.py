@@ -0,0 +1,277 @@
+"""
+Cross-job caches for the GenAI iFlow generator
+
+Re-running a job with the same documentation (for example the same Boomi ZIP
+file) repeats the GenAI analysis and the whole iFlow rendering. IFlowCache keeps
+two tiers of results so unchanged inputs skip both:
+
+- blueprints: validated GenAI blueprints, keyed by a fingerprint of the
+  normalized markdown (line endings, trailing whitespace, blank lines and
+  timestamps do not change the fingerprint) and the model that analyzed it
+- rendered: the files of the iFlow package, with the raw iFlow XML and the
+  generation details its debug artifacts are written from, keyed by a hash of
+  the blueprint, the iFlow name and the generator options
+
+Each tier is an LRU bounded by entry count, kept in memory in front of a local
+directory or an S3 prefix that is bounded the same way. Cache errors are logged
+and treated as misses; they never fail a job.
+"""
+
+import os
+import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+try:
+    import boto3
+except ImportError:
+    boto3 = None
+
+# Cache blueprints and rendered iFlows across jobs
+IFLOW_CACHE_ENABLED = os.getenv('IFLOW_CACHE', 'true').lower() == 'true'
+
+# 'local' (a directory, next to this module unless IFLOW_CACHE_DIR is set) or 's3' (a prefix in S3_BUCKET_NAME)
+IFLOW_CACHE_BACKEND = os.getenv('IFLOW_CACHE_BACKEND', 'local').lower()
+IFLOW_CACHE_DIR = os.getenv('IFLOW_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'iflow_cache'))
+IFLOW_CACHE_S3_PREFIX = os.getenv('IFLOW_CACHE_S3_PREFIX', 'iflow-cache/')
+
+# Entries kept per tier, in memory and in storage
+BLUEPRINT_CACHE_SIZE = int(os.getenv('IFLOW_BLUEPRINT_CACHE_SIZE', '256'))
+RENDERED_CACHE_SIZE = int(os.getenv('IFLOW_RENDERED_CACHE_SIZE', '64'))
+
+# Part of every key; bump it when generator changes make cached results stale
+CACHE_VERSION = "2"
+
+TIMESTAMP_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?')
+TRAILING_SPACE_PATTERN = re.compile(r'[ \t]+$', re.MULTILINE)
+BLANK_LINES_PATTERN = re.compile(r'\n{3,}')
+
+
+def normalize_markdown(markdown):
+    """Markdown with the differences that do not change its meaning removed"""
+    text = (markdown or "").replace('\r\n', '\n').replace('\r', '\n')
+    text = TRAILING_SPACE_PATTERN.sub('', text)
+    text = TIMESTAMP_PATTERN.sub('<timestamp>', text)
+    return BLANK_LINES_PATTERN.sub('\n\n', text).strip()
+
+
+def _digest(*parts):
+    """SHA-256 of the parts, in order"""
+    sha = hashlib.sha256(CACHE_VERSION.encode('utf-8'))
+    for part in parts:
+        sha.update(b'\x00')
+        sha.update(part.encode('utf-8'))
+    return sha.hexdigest()
+
+
+def markdown_fingerprint(markdown, model=""):
+    """Key of the blueprint analyzed from markdown by a model"""
+    return _digest(model, normalize_markdown(markdown))
+
+
+def blueprint_hash(blueprint, *options):
+    """Key of the iFlow rendered from a blueprint with the given generator options"""
+    return _digest(json.dumps(blueprint, sort_keys=True, default=str), *(str(option) for option in options))
+
+
+class LocalStore:
+    """JSON entries in a directory, evicted least recently used first (file times track use)"""
+
+    def __init__(self, directory, max_entries):
+        self.directory = directory
+        self.max_entries = max_entries
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(path)
+        return text
+
+    def put(self, key, text):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(temp_path, path)
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                path = os.path.join(self.directory, name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    continue
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class S3Store:
+    """
+    JSON entries under an S3 prefix, evicted least recently used first.
+    A hit copies the object onto itself so its LastModified time tracks use.
+    """
+
+    def __init__(self, prefix, max_entries, client=None, bucket=None):
+        self.prefix = prefix
+        self.max_entries = max_entries
+        self.bucket = bucket or os.getenv('S3_BUCKET_NAME')
+        if client is None:
+            endpoint_url = os.getenv('S3_ENDPOINT_URL')
+            client = boto3.client(
+                's3',
+                region_name=os.getenv('AWS_REGION', 'us-east-1'),
+                endpoint_url=f"https://{endpoint_url}" if endpoint_url else None,
+            )
+        self.client = client
+
+    def _key(self, key):
+        return f"{self.prefix}{key}.json"
+
+    def get(self, key):
+        object_key = self._key(key)
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=object_key)
+        except self.client.exceptions.NoSuchKey:
+            return None
+        text = response['Body'].read().decode('utf-8')
+        self.client.copy_object(Bucket=self.bucket, Key=object_key, MetadataDirective='REPLACE',
+                                CopySource={'Bucket': self.bucket, 'Key': object_key},
+                                ContentType='application/json')
+        return text
+
+    def put(self, key, text):
+        self.client.put_object(Bucket=self.bucket, Key=self._key(key), Body=text.encode('utf-8'),
+                               ContentType='application/json')
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for page in self.client.get_paginator('list_objects_v2').paginate(Bucket=self.bucket, Prefix=self.prefix):
+            entries.extend((obj['LastModified'], obj['Key']) for obj in page.get('Contents', []))
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        stale = [{'Key': key} for _, key in entries[:len(entries) - self.max_entries]]
+        for i in range(0, len(stale), 1000):
+            self.client.delete_objects(Bucket=self.bucket, Delete={'Objects': stale[i:i + 1000]})
+
+
+class LRUCache:
+    """In-memory LRU of JSON values in front of a bounded store"""
+
+    def __init__(self, name, store, max_entries):
+        self.name = name
+        self.store = store
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Cached value for key (a fresh copy), or None"""
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+        if text is None and self.store is not None:
+            try:
+                text = self.store.get(key)
+            except Exception as e:
+                print(f"⚠️ {self.name} cache read failed: {e}")
+                text = None
+            if text is not None:
+                self._remember(key, text)
+        return json.loads(text) if text is not None else None
+
+    def put(self, key, value):
+        """Cache a JSON-serializable value under key"""
+        text = json.dumps(value)
+        self._remember(key, text)
+        if self.store is not None:
+            try:
+                self.store.put(key, text)
+            except Exception as e:
+                print(f"⚠️ {self.name} cache write failed: {e}")
+
+    def _remember(self, key, text):
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class IFlowCache:
+    """Validated blueprints by markdown fingerprint and rendered iFlows by blueprint hash"""
+
+    def __init__(self, backend=IFLOW_CACHE_BACKEND, blueprint_size=BLUEPRINT_CACHE_SIZE,
+                 rendered_size=RENDERED_CACHE_SIZE):
+        """
+        Args:
+            backend (str): 'local', 's3' or 'memory' (nothing stored outside the process)
+            blueprint_size (int): Blueprints kept
+            rendered_size (int): Rendered iFlows kept
+        """
+        self.blueprints = LRUCache("Blueprint", self._store(backend, "blueprints", blueprint_size), blueprint_size)
+        self.rendered = LRUCache("Rendered iFlow", self._store(backend, "rendered", rendered_size), rendered_size)
+
+    @staticmethod
+    def _store(backend, tier, max_entries):
+        if backend == 's3':
+            if boto3 is None:
+                print("boto3 package not found - iFlow cache kept in memory only. Install it with 'pip install boto3'")
+                return None
+            return S3Store(f"{IFLOW_CACHE_S3_PREFIX}{tier}/", max_entries)
+        if backend == 'local':
+            return LocalStore(os.path.join(IFLOW_CACHE_DIR, tier), max_entries)
+        return None
+
+    def get_blueprint(self, markdown, model=""):
+        return self.blueprints.get(markdown_fingerprint(markdown, model))
+
+    def put_blueprint(self, markdown, blueprint, model=""):
+        self.blueprints.put(markdown_fingerprint(markdown, model), blueprint)
+
+    def get_rendered(self, key):
+        return self.rendered.get(key)
+
+    def put_rendered(self, key, entry):
+        """Cache a rendered iFlow: its files, raw XML and generation details"""
+        self.rendered.put(key, entry)
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_iflow_cache():
+    """Cache shared by all generators of the process, or None if IFLOW_CACHE is off"""
+    global _shared_cache
+    if not IFLOW_CACHE_ENABLED:
+        return None
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            try:
+                _shared_cache = IFlowCache()
+            except Exception as e:
+                print(f"⚠️ Could not set up the {IFLOW_CACHE_BACKEND} iFlow cache, keeping it in memory: {e}")
+                _shared_cache = IFlowCache(backend='memory')
+        return _shared_cache
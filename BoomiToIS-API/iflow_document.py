@@ -0,0 +1,214 @@
+"""
+In-memory model of the process content of a generated iFlow
+
+Process components are kept as XML fragments indexed by id and sequence flows
+as adjacency lists (flow ids per source and per target component). Generators
+add components and flows to the model; the <bpmn2:incoming> and
+<bpmn2:outgoing> references of each component are written once, when the
+process is serialized, instead of patching the XML after every new flow.
+
+rewire_flow_references does the same for a complete iFlow document in a single
+pass over the XML.
+"""
+import re
+
+# Flow nodes whose references are rewritten in complete documents; other
+# elements (sub-processes, tasks) may contain nested flow nodes of their own
+FLOW_NODE_TAGS = ('callActivity', 'serviceTask', 'exclusiveGateway', 'startEvent', 'endEvent')
+
+ID_PATTERN = re.compile(r'id="([^"]+)"')
+SOURCE_REF_PATTERN = re.compile(r'sourceRef="([^"]+)"')
+TARGET_REF_PATTERN = re.compile(r'targetRef="([^"]+)"')
+SEQUENCE_FLOW_PATTERN = re.compile(
+    r'<bpmn2:sequenceFlow[^>]*id="([^"]+)"[^>]*sourceRef="([^"]+)"[^>]*targetRef="([^"]+)"')
+FLOW_REFERENCE_PATTERN = re.compile(
+    r'<bpmn2:incoming>[^<]*</bpmn2:incoming>|<bpmn2:outgoing>[^<]*</bpmn2:outgoing>')
+EXTENSION_ELEMENTS_END_PATTERN = re.compile(r'(\s*)</bpmn2:extensionElements>')
+CLOSING_TAG_PATTERN = re.compile(r'\s*</bpmn2:\w+>\s*$')
+ROOT_TAG_PATTERN = re.compile(r'\s*<bpmn2:(\w+)')
+FLOW_NODE_START_PATTERN = re.compile(rf'<bpmn2:(?:{"|".join(FLOW_NODE_TAGS)})[^>]*>')
+FLOW_NODE_END_PATTERN = re.compile(rf'</bpmn2:(?:{"|".join(FLOW_NODE_TAGS)})>')
+
+
+def with_flow_references(component_xml, incoming_flows, outgoing_flows):
+    """
+    Component XML with its incoming/outgoing references replaced.
+
+    All existing references are removed (they may be wrong or placeholders).
+    The new ones go right after </bpmn2:extensionElements>, at its
+    indentation, or before the closing tag of components without extension
+    elements.
+
+    Args:
+        component_xml (str): Component XML
+        incoming_flows (list): Incoming flow IDs
+        outgoing_flows (list): Outgoing flow IDs
+
+    Returns:
+        str: Updated component XML
+    """
+    result = FLOW_REFERENCE_PATTERN.sub('', component_xml)
+    if not incoming_flows and not outgoing_flows:
+        return result
+
+    match = EXTENSION_ELEMENTS_END_PATTERN.search(result)
+    indent = match.group(1) if match else "            "
+    new_elements = "".join(f"\n{indent}<bpmn2:incoming>{flow_id}</bpmn2:incoming>" for flow_id in incoming_flows)
+    new_elements += "".join(f"\n{indent}<bpmn2:outgoing>{flow_id}</bpmn2:outgoing>" for flow_id in outgoing_flows)
+
+    if match:
+        insert_position = match.end()
+    else:
+        closing_match = CLOSING_TAG_PATTERN.search(result)
+        if not closing_match:
+            # Self-closing or unterminated fragment: append at the end
+            return result.rstrip() + new_elements + "\n        "
+        insert_position = closing_match.start()
+    return result[:insert_position] + new_elements + result[insert_position:]
+
+
+def parse_sequence_flow(flow_xml):
+    """(flow id, source id, target id) of a sequence flow XML string, or None"""
+    flow_id_match = ID_PATTERN.search(flow_xml)
+    source_match = SOURCE_REF_PATTERN.search(flow_xml)
+    target_match = TARGET_REF_PATTERN.search(flow_xml)
+    if not (flow_id_match and source_match and target_match):
+        return None
+    return flow_id_match.group(1), source_match.group(1), target_match.group(1)
+
+
+class IFlowDocument:
+    """Components and sequence flows of one integration process, indexed by id"""
+
+    def __init__(self, wired_tags=None):
+        """
+        Args:
+            wired_tags (tuple, optional): Root tags of the components whose references are
+                written on serialization; every component when None
+        """
+        self.wired_tags = wired_tags
+        self.components = {}      # component id -> XML fragment
+        self.sequence_flows = []  # sequence flow XML strings, in order
+        self.outgoing = {}        # component id -> [flow ids]
+        self.incoming = {}        # component id -> [flow ids]
+        self.flow_ends = {}       # flow id -> (source id, target id)
+        # Component ids, and (None, fragment) for fragments without an id, in document order
+        self._order = []
+
+    def __contains__(self, component_id):
+        return component_id in self.components
+
+    def add_component(self, component_xml):
+        """
+        Add a component; a component with the id of an existing one replaces it
+        in place.
+
+        Returns:
+            str: Component id, or None for fragments without an id
+        """
+        id_match = ID_PATTERN.search(component_xml)
+        if not id_match:
+            self._order.append((None, component_xml))
+            return None
+        component_id = id_match.group(1)
+        if component_id not in self.components:
+            self._order.append((component_id, None))
+        self.components[component_id] = component_xml
+        return component_id
+
+    def add_flow(self, flow_xml):
+        """
+        Add a sequence flow given as XML and index its source and target.
+
+        Returns:
+            str: Flow id, or None if the flow has no id, sourceRef or targetRef
+        """
+        self.sequence_flows.append(flow_xml)
+        parsed = parse_sequence_flow(flow_xml)
+        if parsed is None:
+            return None
+        flow_id, source_id, target_id = parsed
+        self.outgoing.setdefault(source_id, []).append(flow_id)
+        self.incoming.setdefault(target_id, []).append(flow_id)
+        self.flow_ends[flow_id] = (source_id, target_id)
+        return flow_id
+
+    def root_tag(self, component_id):
+        """BPMN tag of a component, e.g. 'callActivity'"""
+        match = ROOT_TAG_PATTERN.match(self.components[component_id])
+        return match.group(1) if match else None
+
+    def component_xml(self, component_id):
+        """Component XML with incoming/outgoing references from the flows of the model"""
+        component_xml = self.components[component_id]
+        if self.wired_tags is not None and self.root_tag(component_id) not in self.wired_tags:
+            return component_xml
+        return with_flow_references(
+            component_xml,
+            self.incoming.get(component_id, []),
+            self.outgoing.get(component_id, [])
+        )
+
+    def component_fragments(self):
+        """All component XML fragments with their references, in document order"""
+        return [self.component_xml(component_id) if component_id is not None else fragment
+                for component_id, fragment in self._order]
+
+    def serialize(self, separator="\n            "):
+        """Process content: the components followed by the sequence flows"""
+        return separator.join(self.component_fragments()) + separator + separator.join(self.sequence_flows)
+
+
+def rewire_flow_references(xml_content):
+    """
+    Rewrite the incoming/outgoing references of the flow nodes of a complete
+    iFlow document from its sequence flows.
+
+    The document is scanned once for sequence flows and once for flow nodes;
+    each flow node with flows is rewritten in place and the document is
+    joined back together once, so the cost grows linearly with its size.
+
+    Args:
+        xml_content (str): iFlow XML
+
+    Returns:
+        tuple: (updated XML, number of flow nodes rewritten)
+    """
+    incoming = {}
+    outgoing = {}
+    for match in SEQUENCE_FLOW_PATTERN.finditer(xml_content):
+        flow_id, source_id, target_id = match.groups()
+        outgoing.setdefault(source_id, []).append(flow_id)
+        incoming.setdefault(target_id, []).append(flow_id)
+    if not incoming and not outgoing:
+        return xml_content, 0
+
+    parts = []
+    position = 0
+    rewritten = set()
+    for start_match in FLOW_NODE_START_PATTERN.finditer(xml_content):
+        start_tag = start_match.group()
+        if start_match.start() < position or start_tag.endswith('/>'):
+            continue
+        id_match = ID_PATTERN.search(start_tag)
+        if not id_match:
+            continue
+        component_id = id_match.group(1)
+        # Only the first element with an id is rewritten, as ids are unique in valid documents
+        if component_id in rewritten or (component_id not in incoming and component_id not in outgoing):
+            continue
+        end_match = FLOW_NODE_END_PATTERN.search(xml_content, start_match.end())
+        if not end_match:
+            continue
+
+        rewritten.add(component_id)
+        parts.append(xml_content[position:start_match.start()])
+        parts.append(with_flow_references(
+            xml_content[start_match.start():end_match.end()],
+            incoming.get(component_id, []),
+            outgoing.get(component_id, [])
+        ))
+        position = end_match.end()
+
+    parts.append(xml_content[position:])
+    return ''.join(parts), len(rewritten)
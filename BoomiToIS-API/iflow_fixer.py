@@ -5,14 +5,14 @@ This module provides functions to fix common issues in iFlow XML files.
 It is based on the fix_iflow.py script but adapted to work with the MuleToIS-API project structure.
 """
 
-import xml.etree.ElementTree as ET
 import re
 import os
 import shutil
 import datetime
-from collections import defaultdict
 import logging
 
+from iflow_postprocess import PostProcessPipeline, FIX_STAGES, escape_xml_text
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -61,249 +61,50 @@ def preprocess_xml(xml_content):
     """
     Pre-process XML content to fix common syntax issues.
     """
-    # First fix the ampersands in OData query options
-    xml_content = escape_ampersands_in_query_options(xml_content)
-
-    # Then fix ampersands in attribute values
-    xml_content = fix_attribute_ampersands(xml_content)
-
-    # Replace remaining unescaped ampersands
-    xml_content = re.sub(r'&(?!amp;|lt;|gt;|quot;|apos;|#\d+;|#x[0-9a-fA-F]+;)', '&amp;', xml_content)
-
-    # Fix unclosed tags (this is a simple approach and might not catch all cases)
-    xml_content = re.sub(r'<([a-zA-Z0-9_:]+)([^>]*)>([^<]*)</\1>', r'<\1\2>\3</\1>', xml_content)
-
-    # Remove invalid XML characters
-    xml_content = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', xml_content)
-
-    return xml_content
+    # Escape ampersands in OData query options, attribute values and elsewhere,
+    # and remove invalid XML characters
+    return escape_xml_text(xml_content)
+
+def _log_parse_error(xml_content, error):
+    """Log a parse error with the lines around it"""
+    logger.error(f"Error parsing XML: {str(error)}")
+
+    # Extract line and column numbers if available
+    match = re.search(r'line (\d+), column (\d+)', str(error))
+    if match:
+        line_num = int(match.group(1))
+        col_num = int(match.group(2))
+        lines = xml_content.split('\n')
+        if 0 <= line_num-1 < len(lines):
+            context_start = max(0, line_num-3)
+            context_end = min(len(lines), line_num+2)
+
+            logger.error("\nXML Context:")
+            for i in range(context_start, context_end):
+                prefix = "-> " if i == line_num-1 else "   "
+                logger.error(f"{prefix}Line {i+1}: {lines[i]}")
+
+            if col_num > 0 and col_num <= len(lines[line_num-1]):
+                logger.error(f"   {' ' * (col_num+6)}^")
 
 def fix_iflow_xml(xml_content):
     """
     Post-process the iFlow XML to fix common issues with component references,
     sequence flows, and diagram elements.
+
+    Runs the fix stages of the post-processing pipeline (one parse, one
+    serialize); use iflow_postprocess.postprocess_iflow to rewire and
+    escape the XML in the same run.
     """
-    # Parse the XML
-    try:
-        # Add namespace prefixes to parse BPMN XML properly
-        namespaces = {
-            'bpmn2': 'http://www.omg.org/spec/BPMN/20100524/MODEL',
-            'bpmndi': 'http://www.omg.org/spec/BPMN/20100524/DI',
-            'ifl': 'http:///com.sap.ifl.model/Ifl.xsd',
-            'dc': 'http://www.omg.org/spec/DD/20100524/DC',
-            'di': 'http://www.omg.org/spec/DD/20100524/DI'
-        }
-
-        # Register all namespaces
-        for prefix, uri in namespaces.items():
-            ET.register_namespace(prefix, uri)
-
-        root = ET.fromstring(xml_content)
-    except Exception as e:
-        # Provide more detailed error information
-        logger.error(f"Error parsing XML: {str(e)}")
-
-        # Extract line and column numbers if available
-        match = re.search(r'line (\d+), column (\d+)', str(e))
-        if match:
-            line_num = int(match.group(1))
-            col_num = int(match.group(2))
-            lines = xml_content.split('\n')
-            if 0 <= line_num-1 < len(lines):
-                context_start = max(0, line_num-3)
-                context_end = min(len(lines), line_num+2)
-
-                logger.error("\nXML Context:")
-                for i in range(context_start, context_end):
-                    prefix = "-> " if i == line_num-1 else "   "
-                    logger.error(f"{prefix}Line {i+1}: {lines[i]}")
-
-                if col_num > 0 and col_num <= len(lines[line_num-1]):
-                    logger.error(f"   {' ' * (col_num+6)}^")
-
-        return f"Error parsing XML: {str(e)}", False, str(e)
-
-    # Track changes made
-    changes = []
-    success = True
-
-    # Collect all components and their IDs
-    component_ids = set()
-    id_mapping = {}  # Maps incorrect references to correct IDs
-    components_by_type = defaultdict(list)
-
-    # Find all process elements
-    for elem in root.findall('.//bpmn2:process//*[@id]', namespaces):
-        elem_id = elem.get('id')
-        component_ids.add(elem_id)
-        elem_type = elem.tag.split('}')[-1]
-        components_by_type[elem_type].append(elem_id)
-
-    # 1. Check for duplicate participant shapes in diagram
-    participant_shapes = defaultdict(list)
-    for shape in root.findall('.//bpmndi:BPMNShape', namespaces):
-        bpmn_elem = shape.get('bpmnElement')
-        if bpmn_elem and bpmn_elem.startswith('Participant_'):
-            participant_shapes[bpmn_elem].append(shape)
-
-    # Remove duplicate participant shapes - without using complex XPath
-    for participant_id, shapes in participant_shapes.items():
-        if len(shapes) > 1:
-            # We need to find the parent of these shapes to remove them
-            # Since we can't use getparent(), we'll rebuild the diagram plane
-            for plane in root.findall('.//bpmndi:BPMNPlane', namespaces):
-                # Collect all shapes
-                all_shapes = []
-                for child in plane:
-                    all_shapes.append(child)
-
-                # Clear the plane
-                for child in list(plane):
-                    plane.remove(child)
-
-                # Add back only the shapes we want to keep
-                kept_participants = set()
-                for shape in all_shapes:
-                    if shape.tag.endswith('BPMNShape'):
-                        bpmn_elem = shape.get('bpmnElement')
-                        if bpmn_elem and bpmn_elem.startswith('Participant_'):
-                            if bpmn_elem in kept_participants:
-                                changes.append(f"Removed duplicate shape for {bpmn_elem}")
-                                continue
-                            kept_participants.add(bpmn_elem)
-                    plane.append(shape)
-
-    # 2. Find and fix sequence flow references
-    sequence_flows = {}
-    for seq_flow in root.findall('.//bpmn2:sequenceFlow', namespaces):
-        flow_id = seq_flow.get('id')
-        source_ref = seq_flow.get('sourceRef')
-        target_ref = seq_flow.get('targetRef')
-        sequence_flows[flow_id] = (source_ref, target_ref)
-
-        # Check if source and target refs exist
-        if source_ref not in component_ids:
-            # Try to find a component with similar ID
-            for comp_id in component_ids:
-                if source_ref.lower() in comp_id.lower() or comp_id.lower() in source_ref.lower():
-                    seq_flow.set('sourceRef', comp_id)
-                    changes.append(f"Fixed sourceRef from {source_ref} to {comp_id} in {flow_id}")
-                    id_mapping[source_ref] = comp_id
-                    break
-
-        if target_ref not in component_ids:
-            # Try to find a component with similar ID
-            for comp_id in component_ids:
-                if target_ref.lower() in comp_id.lower() or comp_id.lower() in target_ref.lower():
-                    seq_flow.set('targetRef', comp_id)
-                    changes.append(f"Fixed targetRef from {target_ref} to {comp_id} in {flow_id}")
-                    id_mapping[target_ref] = comp_id
-                    break
-
-    # 3. Check for duplicate sequence flow IDs
-    seq_flow_ids = defaultdict(int)
-    for seq_flow in root.findall('.//bpmn2:sequenceFlow', namespaces):
-        flow_id = seq_flow.get('id')
-        seq_flow_ids[flow_id] += 1
-
-    # Fix duplicate sequence flow IDs
-    seq_flow_counter = 1
-    for seq_flow in root.findall('.//bpmn2:sequenceFlow', namespaces):
-        flow_id = seq_flow.get('id')
-        if seq_flow_ids[flow_id] > 1:
-            source_ref = seq_flow.get('sourceRef')
-            target_ref = seq_flow.get('targetRef')
-            new_id = f"flow_{source_ref}_to_{target_ref}_{seq_flow_counter}"
-            seq_flow.set('id', new_id)
-            changes.append(f"Renamed duplicate flow ID from {flow_id} to {new_id}")
-            seq_flow_counter += 1
-
-            # Update any diagram elements referencing this flow
-            for edge in root.findall('.//bpmndi:BPMNEdge', namespaces):
-                if edge.get('bpmnElement') == flow_id:
-                    edge.set('bpmnElement', new_id)
-                    edge.set('id', f"BPMNEdge_{new_id}")
-                    changes.append(f"Updated edge reference from {flow_id} to {new_id}")
-
-    # 4. Fix incoming/outgoing references in components
-    for tag_name in ['startEvent', 'endEvent', 'serviceTask', 'callActivity', 'exclusiveGateway', 'task']:
-        for component in root.findall(f'.//bpmn2:{tag_name}', namespaces):
-            # Fix incoming references
-            for incoming in component.findall('./bpmn2:incoming', namespaces):
-                ref = incoming.text
-                if ref and ref in id_mapping:
-                    incoming.text = id_mapping[ref]
-                    changes.append(f"Fixed incoming reference from {ref} to {id_mapping[ref]} in {component.get('id')}")
-
-            # Fix outgoing references
-            for outgoing in component.findall('./bpmn2:outgoing', namespaces):
-                ref = outgoing.text
-                if ref and ref in id_mapping:
-                    outgoing.text = id_mapping[ref]
-                    changes.append(f"Fixed outgoing reference from {ref} to {id_mapping[ref]} in {component.get('id')}")
-
-    # 5. Check for OData service tasks with missing flows
-    for task in root.findall('.//bpmn2:serviceTask', namespaces):
-        task_id = task.get('id')
-
-        # Find incoming and outgoing elements
-        incoming_elems = task.findall('./bpmn2:incoming', namespaces)
-        outgoing_elems = task.findall('./bpmn2:outgoing', namespaces)
-
-        # If the service task references non-existent sequence flows, fix them
-        for incoming in incoming_elems:
-            if incoming.text not in sequence_flows:
-                # Find sequence flows targeting this task
-                matching_flows = [(flow_id, src) for flow_id, (src, tgt) in sequence_flows.items() if tgt == task_id]
-                if matching_flows:
-                    flow_id, src = matching_flows[0]
-                    incoming.text = flow_id
-                    changes.append(f"Fixed incoming reference in {task_id} to {flow_id}")
-
-        for outgoing in outgoing_elems:
-            if outgoing.text not in sequence_flows:
-                # Find sequence flows sourced from this task
-                matching_flows = [(flow_id, tgt) for flow_id, (src, tgt) in sequence_flows.items() if src == task_id]
-                if matching_flows:
-                    flow_id, tgt = matching_flows[0]
-                    outgoing.text = flow_id
-                    changes.append(f"Fixed outgoing reference in {task_id} to {flow_id}")
-
-    # 6. Fix diagram element references
-    for shape in root.findall('.//bpmndi:BPMNShape', namespaces):
-        bpmn_elem = shape.get('bpmnElement')
-        if bpmn_elem in id_mapping:
-            shape.set('bpmnElement', id_mapping[bpmn_elem])
-            shape.set('id', f"BPMNShape_{id_mapping[bpmn_elem]}")
-            changes.append(f"Updated shape reference from {bpmn_elem} to {id_mapping[bpmn_elem]}")
-
-    for edge in root.findall('.//bpmndi:BPMNEdge', namespaces):
-        bpmn_elem = edge.get('bpmnElement')
-        if bpmn_elem in id_mapping:
-            edge.set('bpmnElement', id_mapping[bpmn_elem])
-            edge.set('id', f"BPMNEdge_{id_mapping[bpmn_elem]}")
-            changes.append(f"Updated edge reference from {bpmn_elem} to {id_mapping[bpmn_elem]}")
-
-        # Also check sourceElement and targetElement attributes
-        source_elem = edge.get('sourceElement')
-        if source_elem and source_elem.startswith('BPMNShape_') and source_elem[10:] in id_mapping:
-            edge.set('sourceElement', f"BPMNShape_{id_mapping[source_elem[10:]]}")
-            changes.append(f"Updated edge sourceElement from {source_elem} to BPMNShape_{id_mapping[source_elem[10:]]}")
-
-        target_elem = edge.get('targetElement')
-        if target_elem and target_elem.startswith('BPMNShape_') and target_elem[10:] in id_mapping:
-            edge.set('targetElement', f"BPMNShape_{id_mapping[target_elem[10:]]}")
-            changes.append(f"Updated edge targetElement from {target_elem} to BPMNShape_{id_mapping[target_elem[10:]]}")
-
-    # Convert back to string
-    fixed_xml = ET.tostring(root, encoding='utf-8').decode('utf-8')
-
-    # Add XML declaration
-    fixed_xml = '<?xml version="1.0" encoding="UTF-8"?>\n' + fixed_xml
+    result = PostProcessPipeline(FIX_STAGES).run(xml_content)
+    if not result.success:
+        if result.root is None:
+            _log_parse_error(xml_content, result.error)
+            return f"Error parsing XML: {str(result.error)}", False, str(result.error)
+        raise result.error
 
     # Return the fixed XML and a summary of changes
-    change_summary = "\n".join(changes) if changes else "No changes were needed"
-    return fixed_xml, success, change_summary
+    return result.xml, True, result.change_summary()
 
 def fix_file_directly(file_path):
     """
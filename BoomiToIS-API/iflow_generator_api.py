@@ -98,7 +98,7 @@ class IFlowGeneratorAPI:
 
         logger.info(f"Initialized IFlowGeneratorAPI with {provider} provider and {model} model")
 
-    def generate_from_markdown(self, markdown_content, output_dir=None, iflow_name=None, job_id=None):
+    def generate_from_markdown(self, markdown_content, output_dir=None, iflow_name=None, job_id=None, blueprint=None):
         """
         Generate an iFlow from markdown content
 
@@ -107,6 +107,7 @@ class IFlowGeneratorAPI:
             output_dir (str, optional): Directory to save the generated iFlow. If None, uses a temporary directory.
             iflow_name (str, optional): Name of the iFlow. If None, generates a name based on UUID.
             job_id (str, optional): Job ID for progress tracking
+            blueprint (dict, optional): Rule-based blueprint to use instead of analyzing the markdown
 
         Returns:
             dict: Dictionary with paths to generated files and other information
@@ -129,15 +130,14 @@ class IFlowGeneratorAPI:
 
             # Generate the iFlow
             logger.info(f"Generating iFlow '{iflow_name}' using {self.provider} provider")
-            zip_path = self.generator.generate_iflow(markdown_content, output_dir, iflow_name, job_id)
+            zip_path = self.generator.generate_iflow(markdown_content, output_dir, iflow_name, job_id,
+                                                     blueprint=blueprint)
 
-            # Get debug files if they exist
+            # Get this job's debug files (each job has its own artifact directory)
             debug_files = {}
-            debug_dir = os.path.join(os.getcwd(), "genai_debug")
-            if os.path.exists(debug_dir):
-                for file in os.listdir(debug_dir):
-                    if file.startswith(f"final_iflow_{iflow_name}") or file.startswith("raw_analysis_response"):
-                        debug_files[file] = os.path.join(debug_dir, file)
+            for file, path in self.generator.debug_artifacts.list_files().items():
+                if file.startswith(f"final_iflow_{iflow_name}") or file.startswith("raw_analysis_response"):
+                    debug_files[file] = os.path.abspath(path)
 
             # Return the result
             result = {
@@ -236,7 +236,7 @@ class IFlowGeneratorAPI:
             }
 
 # Function to generate iFlow from markdown content
-def generate_iflow_from_markdown(markdown_content, api_key, output_dir=None, iflow_name=None, model="claude-sonnet-4-20250514", provider="claude", job_id=None, use_converter=False):
+def generate_iflow_from_markdown(markdown_content, api_key, output_dir=None, iflow_name=None, model="claude-sonnet-4-20250514", provider="claude", job_id=None, use_converter=False, blueprint=None):
     """
     Generate an iFlow from markdown content
 
@@ -249,12 +249,13 @@ def generate_iflow_from_markdown(markdown_content, api_key, output_dir=None, ifl
         provider (str, optional): AI provider to use ('openai', 'claude', or 'local')
         job_id (str, optional): Job ID for progress tracking
         use_converter (bool, optional): If True, use JSON-to-iFlow converter; if False, use template-based approach
+        blueprint (dict, optional): Rule-based blueprint to use instead of analyzing the markdown
 
     Returns:
         dict: Dictionary with paths to generated files and other information
     """
     generator_api = IFlowGeneratorAPI(api_key=api_key, model=model, provider=provider, use_converter=use_converter)
-    return generator_api.generate_from_markdown(markdown_content, output_dir, iflow_name, job_id)
+    return generator_api.generate_from_markdown(markdown_content, output_dir, iflow_name, job_id, blueprint=blueprint)
 
 # Test function
 def test_generate_iflow():
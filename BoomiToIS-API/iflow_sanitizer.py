@@ -2,13 +2,186 @@
 """
 iFlow Post-Generation Sanitizer
 Performs cleanup and validation after iFlow generation to ensure SAP compliance
+
+The document is parsed once into an IFlowGraph (sequence flows with their
+source and target, flow node ids, diagram edges). Every rule works on the
+graph, and the changes are written back in a single pass at the end, so
+sanitizing takes linear time in the size of the iFlow.
 """
 
 import re
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Tuple, Optional
+from collections import deque
+from typing import Dict, List, Tuple, Optional, Set
 from pathlib import Path
 
+from bpmn_layout import Bounds, layout_flow_graph, node_kind, parse_shape_bounds, route_edge, edge_xml
+
+
+FLOW_START = '<bpmn2:sequenceFlow'
+FLOW_END = '</bpmn2:sequenceFlow>'
+EMPTY_SOURCE_REF_PATTERN = re.compile(r'<bpmn2:sequenceFlow[^>]*sourceRef=""')
+COMPONENT_PATTERN = re.compile(r'<bpmn2:(startEvent|endEvent|serviceTask|callActivity|exclusiveGateway|inclusiveGateway|parallelGateway|subProcess|userTask|scriptTask|businessRuleTask|manualTask|receiveTask|sendTask|task)[^>]*id="([^"]*)"')
+EDGE_PATTERN = re.compile(r'<bpmndi:BPMNEdge[^>]*>.*?</bpmndi:BPMNEdge>', re.DOTALL)
+PLANE_PATTERN = re.compile(r'(<bpmndi:BPMNPlane[^>]*>.*?)(</bpmndi:BPMNPlane>)', re.DOTALL)
+ID_PATTERN = re.compile(r'id="([^"]*)"')
+SOURCE_REF_PATTERN = re.compile(r'sourceRef="([^"]*)"')
+TARGET_REF_PATTERN = re.compile(r'targetRef="([^"]*)"')
+BPMN_ELEMENT_PATTERN = re.compile(r'bpmnElement="([^"]*)"')
+
+
+def find_flow_elements(iflow_xml: str) -> List[Tuple[int, int]]:
+    """
+    Spans of the sequence flow elements, exactly as the pattern
+    <bpmn2:sequenceFlow[^>]*(?:/>|>.*?</bpmn2:sequenceFlow>) finds them.
+
+    The pattern tries to run a flow on to the next </bpmn2:sequenceFlow>
+    before ending a self-closing flow at its />, which makes the regex scan
+    the rest of the document for every self-closing flow. Here the closing
+    tags are located once, so finding all flows takes linear time.
+    """
+    closing_tags = [m.start() for m in re.finditer(re.escape(FLOW_END), iflow_xml)]
+    spans = []
+    closing_index = 0
+    position = 0
+    while True:
+        start = iflow_xml.find(FLOW_START, position)
+        if start == -1:
+            break
+        tag_end = iflow_xml.find('>', start + len(FLOW_START))
+        if tag_end == -1:
+            break
+        while closing_index < len(closing_tags) and closing_tags[closing_index] <= tag_end:
+            closing_index += 1
+        if closing_index < len(closing_tags):
+            end = closing_tags[closing_index] + len(FLOW_END)
+        elif iflow_xml[tag_end - 1] == '/':
+            end = tag_end + 1
+        else:
+            position = start + 1
+            continue
+        spans.append((start, end))
+        position = end
+    return spans
+
+
+class _FlowElement:
+    """A sequence flow element of the document and its position"""
+    __slots__ = ('start', 'end', 'text', 'flow_id', 'source_ref', 'target_ref', 'removed', 'rewritten')
+
+    def __init__(self, start: int, end: int, text: str):
+        self.start = start
+        self.end = end
+        self.removed = False
+        self.rewritten = False
+        self._parse(text)
+
+    def rewrite(self, text: str):
+        """Replace the element with other XML"""
+        self.rewritten = True
+        self._parse(text)
+
+    def _parse(self, text: str):
+        self.text = text
+        id_match = ID_PATTERN.search(text)
+        source_match = SOURCE_REF_PATTERN.search(text)
+        target_match = TARGET_REF_PATTERN.search(text)
+        self.flow_id = id_match.group(1) if id_match else None
+        self.source_ref = source_match.group(1) if source_match else None
+        self.target_ref = target_match.group(1) if target_match else None
+
+    @property
+    def has_refs(self) -> bool:
+        return self.source_ref is not None and self.target_ref is not None
+
+
+class IFlowGraph:
+    """
+    Sequence flows, flow node ids and diagram edges of an iFlow, parsed once.
+
+    Rules remove or rewrite flows and add diagram edges on the graph;
+    serialize() applies all of it to the original XML in one pass.
+    """
+
+    def __init__(self, iflow_xml: str):
+        self.xml = iflow_xml
+        self.flows = [_FlowElement(start, end, iflow_xml[start:end]) for start, end in find_flow_elements(iflow_xml)]
+
+        # Flow node ids with their tags; StartEvent_2 and EndEvent_2 are always known
+        # (they might not match the pattern)
+        self.component_tags = {}
+        for tag, component_id in COMPONENT_PATTERN.findall(iflow_xml):
+            self.component_tags.setdefault(component_id, tag)
+        self.component_tags.setdefault("StartEvent_2", "startEvent")
+        self.component_tags.setdefault("EndEvent_2", "endEvent")
+        self.component_ids = list(self.component_tags)
+        self.component_id_set = set(self.component_ids)
+
+        edges = EDGE_PATTERN.findall(iflow_xml)
+        self.existing_edge_count = len(edges)
+        self.edge_flow_ids = set()
+        for edge in edges:
+            flow_match = BPMN_ELEMENT_PATTERN.search(edge)
+            if flow_match:
+                self.edge_flow_ids.add(flow_match.group(1))
+
+        self.plane_match = PLANE_PATTERN.search(iflow_xml)
+        self.new_edges = []
+
+    def active_flows(self) -> List[_FlowElement]:
+        """Flows not removed so far, in document order"""
+        return [flow for flow in self.flows if not flow.removed]
+
+    def remove_flows(self, texts: Set[str]):
+        """Remove every flow whose XML is one of texts, wherever it occurs"""
+        for flow in self.flows:
+            if flow.text in texts:
+                flow.removed = True
+
+    def successors(self) -> Dict[str, List[str]]:
+        """Target ids per source id over the remaining flows"""
+        graph = {}
+        for flow in self.active_flows():
+            if flow.has_refs:
+                graph.setdefault(flow.source_ref, []).append(flow.target_ref)
+        return graph
+
+    @staticmethod
+    def reachable_from(start: str, graph: Dict[str, List[str]]) -> Set[str]:
+        """Every node on a path from start, including start (breadth-first)"""
+        reachable = {start}
+        queue = deque([start])
+        while queue:
+            for neighbor in graph.get(queue.popleft(), ()):
+                if neighbor not in reachable:
+                    reachable.add(neighbor)
+                    queue.append(neighbor)
+        return reachable
+
+    def serialize(self) -> str:
+        """The original XML with all removed, rewritten and added elements applied"""
+        patches = []
+        for flow in self.flows:
+            if flow.removed:
+                patches.append((flow.start, flow.end, ''))
+            elif flow.rewritten:
+                patches.append((flow.start, flow.end, flow.text))
+        if self.new_edges and self.plane_match:
+            plane_end = self.plane_match.start(2)
+            patches.append((plane_end, plane_end, '\n' + '\n'.join(self.new_edges) + '\n'))
+        if not patches:
+            return self.xml
+
+        patches.sort(key=lambda patch: patch[0])
+        parts = []
+        position = 0
+        for start, end, text in patches:
+            parts.append(self.xml[position:start])
+            parts.append(text)
+            position = end
+        parts.append(self.xml[position:])
+        return ''.join(parts)
+
 
 class IFlowSanitizer:
     """Sanitizes generated iFlow XML to ensure SAP Integration Suite compatibility"""
@@ -25,353 +198,183 @@ class IFlowSanitizer:
         self.issues_found = []
         self.fixes_applied = []
         
-        # Apply sanitization steps
-        iflow_xml = self._remove_orphaned_flows(iflow_xml)
-        iflow_xml = self._fix_empty_flow_references(iflow_xml)
-        iflow_xml = self._remove_duplicate_flows(iflow_xml)
-        iflow_xml = self._generate_missing_bpmn_edges(iflow_xml)
-        iflow_xml = self._generate_bpmn_edges_for_flows(iflow_xml) # Added this line
-        iflow_xml = self._validate_flow_consistency(iflow_xml)
-        iflow_xml = self._cleanup_empty_lines(iflow_xml)
+        # Parse once, apply the rules on the graph, write the XML once
+        graph = IFlowGraph(iflow_xml)
+        self._remove_orphaned_flows(graph)
+        self._fix_empty_flow_references(graph)
+        self._remove_duplicate_flows(graph)
+        self._generate_missing_bpmn_edges(graph)
+        self._generate_bpmn_edges_for_flows(graph)
+        self._validate_flow_consistency(graph)
+        iflow_xml = self._cleanup_empty_lines(graph.serialize())
         
         # Report results
         self._report_sanitization_results()
         
         return iflow_xml
     
-    def _remove_orphaned_flows(self, iflow_xml: str) -> str:
+    def _remove_orphaned_flows(self, graph: IFlowGraph):
         """Remove sequence flows that reference non-existent components"""
         print("  🔍 Checking for orphaned sequence flows...")
         
-        # Find all sequence flows (both self-closing and opening/closing tags)
-        flow_pattern = r'<bpmn2:sequenceFlow[^>]*(?:/>|>.*?</bpmn2:sequenceFlow>)'
-        flows = re.findall(flow_pattern, iflow_xml, re.DOTALL)
-        
-        # Find all component IDs (StartEvent, EndEvent, serviceTask, etc.)
-        component_pattern = r'<bpmn2:(?:startEvent|endEvent|serviceTask|callActivity|exclusiveGateway|inclusiveGateway|parallelGateway|subProcess|userTask|scriptTask|businessRuleTask|manualTask|receiveTask|sendTask|task)[^>]*id="([^"]*)"'
-        component_ids = set(re.findall(component_pattern, iflow_xml))
-        
-        # Add StartEvent_2 and EndEvent_2 explicitly (they might not match the pattern)
-        component_ids.add("StartEvent_2")
-        component_ids.add("EndEvent_2")
-        
         removed_flows = []
-        
-        for flow in flows:
-            # Extract source and target references
-            source_match = re.search(r'sourceRef="([^"]*)"', flow)
-            target_match = re.search(r'targetRef="([^"]*)"', flow)
-            
-            if source_match and target_match:
-                source_ref = source_match.group(1)
-                target_ref = target_match.group(1)
-                
+        for flow in graph.active_flows():
+            if flow.has_refs:
                 # Check if both references exist
-                if source_ref not in component_ids or target_ref not in component_ids:
-                    removed_flows.append(flow)
-                    self.issues_found.append(f"Orphaned flow: {source_ref} -> {target_ref}")
-                    self.fixes_applied.append(f"Removed orphaned flow: {flow[:50]}...")
+                if flow.source_ref not in graph.component_id_set or flow.target_ref not in graph.component_id_set:
+                    removed_flows.append(flow.text)
+                    self.issues_found.append(f"Orphaned flow: {flow.source_ref} -> {flow.target_ref}")
+                    self.fixes_applied.append(f"Removed orphaned flow: {flow.text[:50]}...")
         
         # Remove orphaned flows
-        for flow in removed_flows:
-            iflow_xml = iflow_xml.replace(flow, '')
+        graph.remove_flows(set(removed_flows))
         
         if removed_flows:
             print(f"    ✅ Removed {len(removed_flows)} orphaned flows")
         else:
             print("    ✅ No orphaned flows found")
-        
-        return iflow_xml
     
-    def _fix_empty_flow_references(self, iflow_xml: str) -> str:
+    def _fix_empty_flow_references(self, graph: IFlowGraph):
         """Fix sequence flows with empty sourceRef or targetRef"""
         print("  🔍 Checking for empty flow references...")
         
-        # Find flows with empty references (both self-closing and opening/closing tags)
-        empty_ref_pattern = r'<bpmn2:sequenceFlow[^>]*sourceRef=""[^>]*(?:/>|>.*?</bpmn2:sequenceFlow>)'
-        empty_ref_flows = re.findall(empty_ref_pattern, iflow_xml, re.DOTALL)
+        empty_ref_flows = [flow.text for flow in graph.active_flows() if EMPTY_SOURCE_REF_PATTERN.match(flow.text)]
         
         if empty_ref_flows:
             print(f"    ❌ Found {len(empty_ref_flows)} flows with empty references")
             self.issues_found.append(f"Found {len(empty_ref_flows)} flows with empty references")
             
             # Remove these invalid flows
+            graph.remove_flows(set(empty_ref_flows))
             for flow in empty_ref_flows:
-                iflow_xml = iflow_xml.replace(flow, '')
                 self.fixes_applied.append(f"Removed flow with empty references: {flow[:50]}...")
             
             print(f"    ✅ Removed {len(empty_ref_flows)} invalid flows")
         else:
             print("    ✅ No empty flow references found")
-        
-        return iflow_xml
     
-    def _remove_duplicate_flows(self, iflow_xml: str) -> str:
+    def _remove_duplicate_flows(self, graph: IFlowGraph):
         """Remove duplicate sequence flows"""
         print("  🔍 Checking for duplicate flows...")
         
-        # Find all sequence flows (both self-closing and opening/closing tags)
-        flow_pattern = r'<bpmn2:sequenceFlow[^>]*(?:/>|>.*?</bpmn2:sequenceFlow>)'
-        flows = re.findall(flow_pattern, iflow_xml, re.DOTALL)
-        
         # Group flows by source and target
         flow_groups = {}
         duplicates = []
         
-        for flow in flows:
-            source_match = re.search(r'sourceRef="([^"]*)"', flow)
-            target_match = re.search(r'targetRef="([^"]*)"', flow)
-            
-            if source_match and target_match:
-                source_ref = source_match.group(1)
-                target_ref = target_match.group(1)
-                key = f"{source_ref}->{target_ref}"
+        for flow in graph.active_flows():
+            if flow.has_refs:
+                key = f"{flow.source_ref}->{flow.target_ref}"
                 
                 if key in flow_groups:
-                    duplicates.append(flow)
-                    self.issues_found.append(f"Duplicate flow: {source_ref} -> {target_ref}")
-                    self.fixes_applied.append(f"Removed duplicate flow: {flow[:50]}...")
+                    duplicates.append(flow.text)
+                    self.issues_found.append(f"Duplicate flow: {flow.source_ref} -> {flow.target_ref}")
+                    self.fixes_applied.append(f"Removed duplicate flow: {flow.text[:50]}...")
                 else:
-                    flow_groups[key] = flow
+                    flow_groups[key] = flow.text
         
-        # Remove duplicates
-        for flow in duplicates:
-            iflow_xml = iflow_xml.replace(flow, '')
+        # Remove duplicates (a first flow with the same XML as a duplicate goes as well)
+        graph.remove_flows(set(duplicates))
         
         if duplicates:
             print(f"    ✅ Removed {len(duplicates)} duplicate flows")
         else:
             print("    ✅ No duplicate flows found")
-        
-        return iflow_xml
     
-    def _generate_missing_bpmn_edges(self, iflow_xml: str) -> str:
+    def _generate_missing_bpmn_edges(self, graph: IFlowGraph):
         """Generate missing BPMN edges for sequence flows"""
         print("  🔍 Generating missing BPMN edges...")
         
-        # Find all sequence flows (both self-closing and opening/closing tags)
-        flow_pattern = r'<bpmn2:sequenceFlow[^>]*(?:/>|>.*?</bpmn2:sequenceFlow>)'
-        flows = re.findall(flow_pattern, iflow_xml, re.DOTALL)
-        
-        # Find all component IDs (StartEvent, EndEvent, serviceTask, etc.)
-        component_pattern = r'<bpmn2:(?:startEvent|endEvent|serviceTask|callActivity|exclusiveGateway|inclusiveGateway|parallelGateway|subProcess|userTask|scriptTask|businessRuleTask|manualTask|receiveTask|sendTask|task)[^>]*id="([^"]*)"'
-        component_ids = set(re.findall(component_pattern, iflow_xml))
-        
-        # Add StartEvent_2 and EndEvent_2 explicitly (they might not match the pattern)
-        component_ids.add("StartEvent_2")
-        component_ids.add("EndEvent_2")
-        
         # Find all sequence flows that reference non-existent components
         invalid_flows = []
-        for flow in flows:
-            source_match = re.search(r'sourceRef="([^"]*)"', flow)
-            target_match = re.search(r'targetRef="([^"]*)"', flow)
-            
-            if source_match and target_match:
-                source_ref = source_match.group(1)
-                target_ref = target_match.group(1)
-                
-                if source_ref not in component_ids or target_ref not in component_ids:
+        for flow in graph.active_flows():
+            if flow.has_refs:
+                if flow.source_ref not in graph.component_id_set or flow.target_ref not in graph.component_id_set:
                     invalid_flows.append(flow)
-                    self.issues_found.append(f"Invalid flow reference: {source_ref} -> {target_ref}")
-                    self.fixes_applied.append(f"Generated missing BPMN edge: {flow[:50]}...")
+                    self.issues_found.append(f"Invalid flow reference: {flow.source_ref} -> {flow.target_ref}")
+                    self.fixes_applied.append(f"Generated missing BPMN edge: {flow.text[:50]}...")
         
-        # Generate missing edges
+        # Generate missing edges: replace the flow with a new sequence flow element
         for flow in invalid_flows:
-            # Extract source and target references
-            source_match = re.search(r'sourceRef="([^"]*)"', flow)
-            target_match = re.search(r'targetRef="([^"]*)"', flow)
-            
-            if source_match and target_match:
-                source_ref = source_match.group(1)
-                target_ref = target_match.group(1)
-                
-                # Create a new sequence flow element
-                new_flow = f'<bpmn2:sequenceFlow sourceRef="{source_ref}" targetRef="{target_ref}" />'
-                
-                # Insert it into the XML
-                iflow_xml = iflow_xml.replace(flow, new_flow)
+            flow.rewrite(f'<bpmn2:sequenceFlow sourceRef="{flow.source_ref}" targetRef="{flow.target_ref}" />')
         
         if invalid_flows:
             print(f"    ✅ Generated {len(invalid_flows)} missing BPMN edges")
         else:
             print("    ✅ No missing BPMN edges found")
-        
-        return iflow_xml
     
-    def _generate_bpmn_edges_for_flows(self, iflow_xml: str) -> str:
+    def _generate_bpmn_edges_for_flows(self, graph: IFlowGraph):
         """Generate BPMN edges in the diagram section for all sequence flows"""
         print("  🔍 Generating BPMN edges for sequence flows...")
         
-        # Find all sequence flows (both self-closing and opening/closing tags)
-        flow_pattern = r'<bpmn2:sequenceFlow[^>]*(?:/>|>.*?</bpmn2:sequenceFlow>)'
-        flows = re.findall(flow_pattern, iflow_xml, re.DOTALL)
-        
-        # Find existing BPMN edges
-        edge_pattern = r'<bpmndi:BPMNEdge[^>]*>.*?</bpmndi:BPMNEdge>'
-        existing_edges = re.findall(edge_pattern, iflow_xml, re.DOTALL)
+        flows = graph.active_flows()
+        print(f"    📊 Found {len(flows)} sequence flows and {graph.existing_edge_count} existing BPMN edges")
         
-        print(f"    📊 Found {len(flows)} sequence flows and {len(existing_edges)} existing BPMN edges")
-        
-        # Extract flow IDs from existing edges
-        existing_flow_ids = set()
-        for edge in existing_edges:
-            flow_match = re.search(r'bpmnElement="([^"]*)"', edge)
-            if flow_match:
-                existing_flow_ids.add(flow_match.group(1))
-        
-        # Generate missing edges
+        # Generate missing edges, routed between the shapes of the diagram
         new_edges = []
+        shapes = parse_shape_bounds(graph.plane_match.group(1)) if graph.plane_match else {}
+        layout_shapes = None
         for flow in flows:
-            # Extract flow ID
-            flow_id_match = re.search(r'id="([^"]*)"', flow)
-            if flow_id_match:
-                flow_id = flow_id_match.group(1)
+            if flow.flow_id is not None and flow.flow_id not in graph.edge_flow_ids and flow.has_refs:
+                if flow.source_ref in shapes and flow.target_ref in shapes:
+                    flow_shapes = shapes
+                else:
+                    # Shapes are missing: route the edge on a layout of the whole process
+                    if layout_shapes is None:
+                        layout_shapes = self._layout_shapes(graph)
+                    flow_shapes = layout_shapes
+                new_edges.append(self._generate_edge_xml(flow.flow_id, flow.source_ref, flow.target_ref, flow_shapes))
                 
-                if flow_id not in existing_flow_ids:
-                    # Extract source and target
-                    source_match = re.search(r'sourceRef="([^"]*)"', flow)
-                    target_match = re.search(r'targetRef="([^"]*)"', flow)
-                    
-                    if source_match and target_match:
-                        source_ref = source_match.group(1)
-                        target_ref = target_match.group(1)
-                        
-                        # Generate edge with waypoints
-                        edge_xml = self._generate_edge_xml(flow_id, source_ref, target_ref)
-                        new_edges.append(edge_xml)
-                        
-                        self.fixes_applied.append(f"Generated BPMN edge for flow: {flow_id}")
-                        print(f"      🔧 Generating edge for flow: {flow_id} ({source_ref} -> {target_ref})")
-        
-        # Insert new edges into the BPMNPlane
+                self.fixes_applied.append(f"Generated BPMN edge for flow: {flow.flow_id}")
+                print(f"      🔧 Generating edge for flow: {flow.flow_id} ({flow.source_ref} -> {flow.target_ref})")
+        
+        # Insert new edges before the closing tag of the BPMNPlane
         if new_edges:
-            # Find the BPMNPlane section
-            plane_pattern = r'(<bpmndi:BPMNPlane[^>]*>.*?)(</bpmndi:BPMNPlane>)'
-            plane_match = re.search(plane_pattern, iflow_xml, re.DOTALL)
-            
-            if plane_match:
-                plane_start = plane_match.group(1)
-                plane_end = plane_match.group(2)
-                
-                # Insert edges before the closing tag
-                edges_xml = '\n'.join(new_edges)
-                new_plane = f"{plane_start}\n{edges_xml}\n{plane_end}"
-                
-                # Replace the entire plane section
-                iflow_xml = iflow_xml.replace(plane_match.group(0), new_plane)
-                
+            if graph.plane_match:
+                graph.new_edges.extend(new_edges)
                 print(f"    ✅ Generated {len(new_edges)} BPMN edges")
             else:
                 print("    ⚠️ Could not find BPMNPlane section")
         else:
             print("    ✅ All BPMN edges already exist")
-        
-        return iflow_xml
     
-    def _generate_edge_xml(self, flow_id: str, source_ref: str, target_ref: str) -> str:
-        """Generate BPMN edge XML with proper waypoints"""
-        
-        # Get component positions (simplified calculation)
-        # In a real implementation, you'd parse the BPMN shapes to get actual coordinates
-        
-        # Calculate waypoints based on component types
-        if source_ref == "StartEvent_2":
-            start_x, start_y = 116, 116  # Center of StartEvent (100 + 32/2, 100 + 32/2)
-        else:
-            # For other components, estimate position
-            start_x, start_y = 350, 190  # Left edge of component
-        
-        if target_ref == "EndEvent_2":
-            end_x, end_y = 316, 116  # Center of EndEvent (300 + 32/2, 100 + 32/2)
-        else:
-            # For other components, estimate position
-            end_x, end_y = 300, 190  # Left edge of component
-        
-        edge_xml = f'''      <bpmndi:BPMNEdge bpmnElement="{flow_id}" id="BPMNEdge_{flow_id}">
-        <di:waypoint x="{start_x}" y="{start_y}"/>
-        <di:waypoint x="{end_x}" y="{end_y}"/>
-      </bpmndi:BPMNEdge>'''
-        
-        return edge_xml
+    def _layout_shapes(self, graph: IFlowGraph) -> Dict[str, Bounds]:
+        """Shape bounds of a layered layout of the flow nodes and remaining flows"""
+        nodes = [(component_id, node_kind(tag)) for component_id, tag in graph.component_tags.items()]
+        flows = [(flow.flow_id, flow.source_ref, flow.target_ref) for flow in graph.active_flows() if flow.has_refs]
+        return layout_flow_graph(nodes, flows, origin_x=100, origin_y=100).shapes
+
+    def _generate_edge_xml(self, flow_id: str, source_ref: str, target_ref: str, shapes: Dict[str, Bounds]) -> str:
+        """Generate BPMN edge XML with waypoints between the source and target shapes"""
+        waypoints = route_edge(shapes[source_ref], shapes[target_ref])
+        return edge_xml(flow_id, source_ref, target_ref, waypoints, indent="      ")
     
-    def _validate_flow_consistency(self, iflow_xml: str) -> str:
+    def _validate_flow_consistency(self, graph: IFlowGraph):
         """Validate that all components have proper flow connections"""
         print("  🔍 Validating flow consistency...")
         
-        # Find all components
-        component_pattern = r'<bpmn2:(?:startEvent|endEvent|serviceTask|callActivity|exclusiveGateway|inclusiveGateway|parallelGateway|subProcess|userTask|scriptTask|businessRuleTask|manualTask|receiveTask|sendTask|task)[^>]*id="([^"]*)"'
-        component_ids = set(re.findall(component_pattern, iflow_xml))
-        
-        # Add StartEvent_2 and EndEvent_2 explicitly
-        component_ids.add("StartEvent_2")
-        component_ids.add("EndEvent_2")
-        
-        # Find all sequence flows (both self-closing and opening/closing tags)
-        flow_pattern = r'<bpmn2:sequenceFlow[^>]*(?:/>|>.*?</bpmn2:sequenceFlow>)'
-        flows = re.findall(flow_pattern, iflow_xml, re.DOTALL)
-        
         # Build flow graph
-        flow_graph = {}
-        for flow in flows:
-            source_match = re.search(r'sourceRef="([^"]*)"', flow)
-            target_match = re.search(r'targetRef="([^"]*)"', flow)
-            
-            if source_match and target_match:
-                source_ref = source_match.group(1)
-                target_ref = target_match.group(1)
-                
-                if source_ref not in flow_graph:
-                    flow_graph[source_ref] = []
-                flow_graph[source_ref].append(target_ref)
+        flow_graph = graph.successors()
+        targets = {target for target_list in flow_graph.values() for target in target_list}
         
         # Check for isolated components
-        isolated_components = []
-        for component_id in component_ids:
-            if component_id not in flow_graph and component_id != "EndEvent_2":
-                # Check if this component is a target
-                is_target = any(component_id in targets for targets in flow_graph.values())
-                if not is_target:
-                    isolated_components.append(component_id)
+        isolated_components = [
+            component_id for component_id in graph.component_ids
+            if component_id not in flow_graph and component_id != "EndEvent_2" and component_id not in targets
+        ]
         
         if isolated_components:
             print(f"    ⚠️ Found {len(isolated_components)} isolated components: {isolated_components}")
             self.issues_found.append(f"Found {len(isolated_components)} isolated components")
         
-        # Check for unreachable components
-        unreachable = []
-        for component_id in component_ids:
-            if component_id != "StartEvent_2":
-                # Check if there's a path from StartEvent_2 to this component
-                if not self._is_reachable("StartEvent_2", component_id, flow_graph):
-                    unreachable.append(component_id)
+        # Check for unreachable components: no path from StartEvent_2
+        reachable = IFlowGraph.reachable_from("StartEvent_2", flow_graph)
+        unreachable = [component_id for component_id in graph.component_ids if component_id not in reachable]
         
         if unreachable:
             print(f"    ⚠️ Found {len(unreachable)} unreachable components: {unreachable}")
             self.issues_found.append(f"Found {len(unreachable)} unreachable components")
         
         print("    ✅ Flow consistency validation completed")
-        return iflow_xml
-    
-    def _is_reachable(self, start: str, target: str, graph: Dict[str, List[str]], visited: set = None) -> bool:
-        """Check if target is reachable from start using DFS"""
-        if visited is None:
-            visited = set()
-        
-        if start == target:
-            return True
-        
-        if start in visited:
-            return False
-        
-        visited.add(start)
-        
-        if start in graph:
-            for neighbor in graph[start]:
-                if self._is_reachable(neighbor, target, graph, visited):
-                    return True
-        
-        return False
     
     def _cleanup_empty_lines(self, iflow_xml: str) -> str:
         """Clean up excessive empty lines"""
@@ -0,0 +1,428 @@
+"""
+Compiled XML templates for iFlow generation
+
+Templates are XML text with named slots, written {{name}}. Each template is
+split into literal fragments and slots once, when it is registered at import,
+and rendered by joining the fragments with the escaped slot values, so no
+template is scanned or copied again per component.
+
+Slot values are escaped for where the slot is: inside an attribute value
+(&, <, ") or in element text (&, <). Entity references already in a value are
+kept. Slots that take XML fragments are written {{name|raw}} and inserted as
+they are. A slot without a value (missing or None) is written back as
+{{name}}, so it can be filled later with fill().
+
+This module is shared by BoomiToIS-API and MuleToIS-API and kept identical in
+both. TEMPLATES holds the templates both services use; each service registers
+its own templates in the same registry.
+"""
+import re
+
+SLOT_PATTERN = re.compile(r'\{\{(\w+)(\|raw)?\}\}')
+UNESCAPED_AMPERSAND_PATTERN = re.compile(r'&(?!amp;|lt;|gt;|quot;|apos;|#\d+;|#x[0-9a-fA-F]+;)')
+
+# Slot contexts
+TEXT = 'text'
+ATTRIBUTE = 'attribute'
+RAW = 'raw'
+
+
+def escape_text(value):
+    """Escape a value for element text, keeping entity references"""
+    value = str(value)
+    if '&' in value:
+        value = UNESCAPED_AMPERSAND_PATTERN.sub('&amp;', value)
+    return value.replace('<', '&lt;') if '<' in value else value
+
+
+def escape_attribute(value):
+    """Escape a value for a double-quoted attribute, keeping entity references"""
+    value = escape_text(value)
+    return value.replace('"', '&quot;') if '"' in value else value
+
+
+ESCAPES = {
+    TEXT: escape_text,
+    ATTRIBUTE: escape_attribute,
+    RAW: str,
+}
+
+
+def _in_attribute(text):
+    """Whether the end of XML text is inside a double-quoted attribute value"""
+    tag_start = text.rfind('<')
+    if tag_start == -1 or text.rfind('>') > tag_start:
+        return False
+    return text.count('"', tag_start) % 2 == 1
+
+
+class CompiledTemplate:
+    """A template split into literal fragments and slots"""
+
+    __slots__ = ('name', 'source', 'fragments', 'slots', 'slot_names')
+
+    def __init__(self, name, source):
+        self.name = name
+        self.source = source
+        self.fragments = []  # literal text before each slot, then the text after the last one
+        self.slots = []      # (slot name, escape function, placeholder)
+        position = 0
+        for match in SLOT_PATTERN.finditer(source):
+            literal = source[position:match.start()]
+            self.fragments.append(literal)
+            if match.group(2):
+                context = RAW
+            else:
+                context = ATTRIBUTE if _in_attribute(source[:match.start()]) else TEXT
+            self.slots.append((match.group(1), ESCAPES[context], '{{%s}}' % match.group(1)))
+            position = match.end()
+        self.fragments.append(source[position:])
+        self.slot_names = frozenset(name for name, _, _ in self.slots)
+
+    def render(self, **values):
+        """
+        Template text with the slot values.
+
+        Returns:
+            str: XML; slots without a value stay as {{name}} placeholders
+        """
+        parts = []
+        for literal, (name, escape, placeholder) in zip(self.fragments, self.slots):
+            parts.append(literal)
+            value = values.get(name)
+            parts.append(placeholder if value is None else escape(value))
+        parts.append(self.fragments[-1])
+        return ''.join(parts)
+
+    def __repr__(self):
+        return f"CompiledTemplate({self.name!r}, slots={sorted(self.slot_names)})"
+
+
+class TemplateRegistry:
+    """Compiled templates by name"""
+
+    def __init__(self):
+        self._templates = {}
+
+    def register(self, name, source):
+        """Compile a template and register it under name, replacing any template of that name"""
+        template = CompiledTemplate(name, source)
+        self._templates[name] = template
+        return template
+
+    def get(self, name):
+        return self._templates[name]
+
+    def render(self, template_name, /, **values):
+        return self._templates[template_name].render(**values)
+
+    def __contains__(self, name):
+        return name in self._templates
+
+    def names(self):
+        return sorted(self._templates)
+
+
+def fill(xml, **values):
+    """
+    Fill the {{name}} placeholders of rendered XML in one pass.
+
+    Values are inserted as they are; placeholders without a value are kept.
+    """
+    if '{{' not in xml:
+        return xml
+
+    def replace(match):
+        value = values.get(match.group(1))
+        return match.group(0) if value is None else str(value)
+
+    return SLOT_PATTERN.sub(replace, xml)
+
+
+TEMPLATES = TemplateRegistry()
+
+# ===== Templates shared by the Boomi and MuleSoft generators =====
+
+TEMPLATES.register('iflow_configuration', '''<bpmn2:extensionElements>
+            <ifl:property>
+                <key>namespaceMapping</key>
+                <value>{{namespace_mapping}}</value>
+            </ifl:property>
+            <ifl:property>
+                <key>httpSessionHandling</key>
+                <value>None</value>
+            </ifl:property>
+            <ifl:property>
+                <key>returnExceptionToSender</key>
+                <value>false</value>
+            </ifl:property>
+            <ifl:property>
+                <key>log</key>
+                <value>{{log_level}}</value>
+            </ifl:property>
+            <ifl:property>
+                <key>corsEnabled</key>
+                <value>false</value>
+            </ifl:property>
+            <ifl:property>
+                <key>componentVersion</key>
+                <value>1.2</value>
+            </ifl:property>
+            <ifl:property>
+                <key>ServerTrace</key>
+                <value>false</value>
+            </ifl:property>
+            <ifl:property>
+                <key>xsrfProtection</key>
+                <value>{{csrf_protection}}</value>
+            </ifl:property>
+            <ifl:property>
+                <key>cmdVariantUri</key>
+                <value>ctype::IFlowVariant/cname::IFlowConfiguration/version::1.2.4</value>
+            </ifl:property>
+        </bpmn2:extensionElements>''')
+
+TEMPLATES.register('participant', '''<bpmn2:participant id="{{id}}" ifl:type="{{type}}" name="{{name}}">
+            <bpmn2:extensionElements>{{auth_element|raw}}
+                <ifl:property>
+                    <key>ifl:type</key>
+                    <value>{{type}}</value>
+                </ifl:property>
+            </bpmn2:extensionElements>
+        </bpmn2:participant>''')
+
+TEMPLATES.register('participant_basic_auth', '''
+                <ifl:property>
+                    <key>enableBasicAuthentication</key>
+                    <value>{{enable_basic_auth}}</value>
+                </ifl:property>''')
+
+TEMPLATES.register('integration_process_participant', '''<bpmn2:participant id="{{id}}" ifl:type="IntegrationProcess" name="{{name}}" processRef="{{process_ref}}">
+            <bpmn2:extensionElements/>
+        </bpmn2:participant>''')
+
+TEMPLATES.register('process_direct', '''<bpmn2:messageFlow id="{{id}}" name="ProcessDirect" sourceRef="{{source_ref}}" targetRef="{{target_ref}}">
+            <bpmn2:extensionElements>
+                <ifl:property>
+                    <key>ComponentType</key>
+                    <value>ProcessDirect</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>Description</key>
+                    <value/>
+                </ifl:property>
+                <ifl:property>
+                    <key>address</key>
+                    <value>{{address}}</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>ComponentNS</key>
+                    <value>sap</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>Vendor</key>
+                    <value>SAP</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>componentVersion</key>
+                    <value>1.1</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>TransportProtocolVersion</key>
+                    <value>1.1.2</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>ComponentSWCVName</key>
+                    <value>external</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>system</key>
+                    <value>{{system}}</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>TransportProtocol</key>
+                    <value>Not Applicable</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>cmdVariantUri</key>
+                    <value>ctype::AdapterVariant/cname::ProcessDirect/vendor::SAP/tp::Not Applicable/mp::Not Applicable/direction::Receiver/version::1.1.1</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>MessageProtocol</key>
+                    <value>Not Applicable</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>MessageProtocolVersion</key>
+                    <value>1.1.2</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>direction</key>
+                    <value>Receiver</value>
+                </ifl:property>
+            </bpmn2:extensionElements>
+        </bpmn2:messageFlow>''')
+
+TEMPLATES.register('enricher', '''<bpmn2:callActivity id="{{id}}" name="{{name}}">
+            <bpmn2:extensionElements>
+                <ifl:property>
+                    <key>bodyType</key>
+                    <value>{{body_type}}</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>propertyTable</key>
+                    <value>[]</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>headerTable</key>
+                    <value>[]</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>wrapContent</key>
+                    <value>{{wrap_content|raw}}</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>componentVersion</key>
+                    <value>1.5</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>activityType</key>
+                    <value>Enricher</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>cmdVariantUri</key>
+                    <value>ctype::FlowstepVariant/cname::Enricher/version::1.5.1</value>
+                </ifl:property>
+            </bpmn2:extensionElements>
+            <bpmn2:incoming>SequenceFlow_1</bpmn2:incoming>
+            <bpmn2:outgoing>SequenceFlow_2</bpmn2:outgoing>
+        </bpmn2:callActivity>''')
+
+TEMPLATES.register('content_modifier', '''<bpmn2:callActivity id="{{id}}" name="{{name}}">
+            <bpmn2:extensionElements>
+                <ifl:property>
+                    <key>bodyType</key>
+                    <value>{{body_type}}</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>propertyTable</key>
+                    <value>{{property_table|raw}}</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>headerTable</key>
+                    <value>{{header_table|raw}}</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>wrapContent</key>
+                    <value>{{wrap_content|raw}}</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>componentVersion</key>
+                    <value>1.5</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>activityType</key>
+                    <value>Enricher</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>cmdVariantUri</key>
+                    <value>ctype::FlowstepVariant/cname::Enricher/version::1.5.0</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>bodyContent</key>
+                    <value>{{content|raw}}</value>
+                </ifl:property>
+            </bpmn2:extensionElements>
+            <bpmn2:incoming>SequenceFlow_1</bpmn2:incoming>
+            <bpmn2:outgoing>SequenceFlow_2</bpmn2:outgoing>
+        </bpmn2:callActivity>''')
+
+TEMPLATES.register('content_enricher', '''<bpmn2:callActivity id="{{id}}" name="{{name}}">
+            <bpmn2:extensionElements>
+                <ifl:property>
+                    <key>bodyType</key>
+                    <value>{{body_type}}</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>propertyTable</key>
+                    <value>{{property_table|raw}}</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>headerTable</key>
+                    <value>{{header_table|raw}}</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>wrapContent</key>
+                    <value>{{wrap_content|raw}}</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>componentVersion</key>
+                    <value>1.4</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>activityType</key>
+                    <value>Enricher</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>cmdVariantUri</key>
+                    <value>ctype::FlowstepVariant/cname::Enricher/version::1.4.2</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>bodyContent</key>
+                    <value>{{body_content|raw}}</value>
+                </ifl:property>
+            </bpmn2:extensionElements>
+            <bpmn2:incoming>SequenceFlow_1</bpmn2:incoming>
+            <bpmn2:outgoing>SequenceFlow_2</bpmn2:outgoing>
+        </bpmn2:callActivity>''')
+
+TEMPLATES.register('sequence_flow', '''<bpmn2:sequenceFlow id="{{id}}" sourceRef="{{source_ref}}" targetRef="{{target_ref}}" isImmediate="{{is_immediate}}"/>''')
+
+TEMPLATES.register('bpmn_iflow', '''<?xml version="1.0" encoding="UTF-8"?>
+<bpmn2:definitions xmlns:bpmn2="http://www.omg.org/spec/BPMN/20100524/MODEL" xmlns:bpmndi="http://www.omg.org/spec/BPMN/20100524/DI" xmlns:dc="http://www.omg.org/spec/DD/20100524/DC" xmlns:di="http://www.omg.org/spec/DD/20100524/DI" xmlns:ifl="http:///com.sap.ifl.model/Ifl.xsd" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" id="Definitions_1">
+  <bpmn2:collaboration id="Collaboration_1" name="Collaboration">
+    <bpmn2:documentation id="Documentation_1671742909132" textFormat="text/plain">{{description}}</bpmn2:documentation>
+    <bpmn2:extensionElements>
+      <ifl:property>
+        <key>namespaceMapping</key>
+        <value>{{namespace_mapping}}</value>
+      </ifl:property>
+      <ifl:property>
+        <key>allowedHeaderList</key>
+        <value>{{allowed_headers}}</value>
+      </ifl:property>
+      <ifl:property>
+        <key>httpSessionHandling</key>
+        <value>{{http_session_handling}}</value>
+      </ifl:property>
+      <ifl:property>
+        <key>ServerTrace</key>
+        <value>{{server_trace}}</value>
+      </ifl:property>
+      <ifl:property>
+        <key>returnExceptionToSender</key>
+        <value>{{return_exception}}</value>
+      </ifl:property>
+      <ifl:property>
+        <key>log</key>
+        <value>{{log_level}}</value>
+      </ifl:property>
+      <ifl:property>
+        <key>componentVersion</key>
+        <value>1.1</value>
+      </ifl:property>
+      <ifl:property>
+        <key>cmdVariantUri</key>
+        <value>ctype::IFlowVariant/cname::IFlowConfiguration/version::1.1.16</value>
+      </ifl:property>
+    </bpmn2:extensionElements>
+    {{participants|raw}}
+    {{message_flows|raw}}
+  </bpmn2:collaboration>
+  {{process|raw}}
+  <bpmndi:BPMNDiagram id="BPMNDiagram_1">
+    <bpmndi:BPMNPlane bpmnElement="Collaboration_1" id="BPMNPlane_1">
+      {{shapes|raw}}
+      {{edges|raw}}
+    </bpmndi:BPMNPlane>
+  </bpmndi:BPMNDiagram>
+</bpmn2:definitions>''')
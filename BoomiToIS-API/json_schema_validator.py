@@ -2,12 +2,73 @@
 """
 JSON Schema Validator for SAP Integration Suite iFlow Generation
 Ensures JSON follows the documented schema before processing
+
+The component rules are declared in COMPONENT_SCHEMA and compiled once per
+validator into one rule object per type, so a blueprint is checked, and the
+common issues fixed, in a single pass over its endpoints, components and flows.
 """
 
-import json
-import re
+import copy
 from typing import Dict, List, Any, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+# Component types and their checks. Every entry may declare:
+#   required          fields the component must have besides type, id and name
+#   config_required   fields its config must have
+#   config_keys       config fields it knows (others get a warning)
+#   config_arrays     config fields that must be arrays
+#   config_exclusive  (field, other field, note) for config fields that should not be combined
+#   default_route     config array of routing conditions that should have a 'default' condition
+COMPONENT_SCHEMA = {
+    "content_modifier": {
+        "required": ["id", "name", "config"],
+        "config_required": ["headers"],  # Either headers or body
+        "config_keys": ["headers", "body_type", "body_content"],
+        "config_exclusive": [("headers", "body", "headers will take precedence (Content Enricher)")],
+    },
+    "gateway": {
+        "required": ["id", "name", "config"],
+        "config_required": ["routing_conditions"],
+        "config_keys": ["routing_conditions"],
+        "config_arrays": ["routing_conditions"],
+        "default_route": "routing_conditions",
+    },
+    "script": {
+        "required": ["id", "name", "config"],
+        "config_required": ["script"],
+        "config_keys": ["script"],
+    },
+    "message_mapping": {"config_keys": ["mapping_name", "source_schema", "target_schema"]},
+    "request_reply": {"config_keys": ["url", "method", "headers"]},
+    "odata": {"config_keys": ["operation", "service_url", "entity_set"]},
+    "sftp": {"config_keys": ["host", "port", "path", "username", "auth_type", "operation"]},
+    "subprocess": {
+        "required": ["id", "name", "config"],
+        "config_required": ["components"],
+        "config_keys": ["components"],
+    },
+    "exception_subprocess": {"config_keys": ["components"]},
+    "http_adapter": {},
+    "rest": {},
+    "groovy": {},
+    "mapping": {},
+    "router": {},
+}
+
+# Ids the generator adds itself, so flows may always reference them
+IMPLICIT_EVENT_IDS = ("StartEvent_2", "EndEvent_2")
+
+
+def format_path(path) -> str:
+    """Render a JSON path as endpoints[0].components[2].config"""
+    rendered = ''
+    for part in path:
+        if isinstance(part, int):
+            rendered += f'[{part}]'
+        else:
+            rendered += f'.{part}' if rendered else str(part)
+    return rendered or '<root>'
+
 
 @dataclass
 class ValidationResult:
@@ -16,287 +77,304 @@ class ValidationResult:
     errors: List[str]
     warnings: List[str]
     fixed_json: Optional[Dict[str, Any]] = None
+    # JSON path of each error, e.g. endpoints[0].components[2].config
+    error_paths: List[str] = field(default_factory=list)
+
+
+class _Report:
+    """Errors (with their paths) and warnings collected by one validation pass"""
+    __slots__ = ('errors', 'error_paths', 'warnings', 'unfixable')
+
+    def __init__(self):
+        self.errors = []
+        self.error_paths = []
+        self.warnings = []
+        # Errors the auto-fix cannot resolve
+        self.unfixable = 0
+
+    def error(self, message: str, path: Tuple, fixable: bool = False):
+        self.errors.append(message)
+        self.error_paths.append(path)
+        if not fixable:
+            self.unfixable += 1
+
+
+class _ComponentRule:
+    """The checks of one component type, compiled from its COMPONENT_SCHEMA entry"""
+    __slots__ = ('type', 'required', 'config_fixable', 'config_required', 'config_keys', 'valid_keys_hint',
+                 'config_arrays', 'config_exclusive', 'default_route')
+
+    def __init__(self, comp_type: str, schema: Dict[str, Any]):
+        self.type = comp_type
+        self.required = tuple(f for f in schema.get("required", ()) if f not in ("type", "id", "name"))
+        self.config_required = tuple(schema.get("config_required", ()))
+        # An empty config only passes if nothing is required in it
+        self.config_fixable = not self.config_required
+        self.config_keys = frozenset(schema["config_keys"]) if "config_keys" in schema else None
+        self.valid_keys_hint = ', '.join(schema.get("config_keys", ()))
+        self.config_arrays = tuple(schema.get("config_arrays", ()))
+        self.config_exclusive = tuple(schema.get("config_exclusive", ()))
+        self.default_route = schema.get("default_route")
+
+    def check(self, component: Dict[str, Any], location: str, path: Tuple, report: _Report, compliance: _Report):
+        """Type-specific checks of a component that has a type, an id and a name"""
+        comp_type = self.type
+        for required_field in self.required:
+            if required_field not in component:
+                report.error(f"{location}: Missing required field '{required_field}' for type '{comp_type}'",
+                             path, fixable=required_field == "config" and self.config_fixable)
+
+        if "config" not in component:
+            return
+        config = component["config"]
+        if not isinstance(config, dict):
+            if self.config_required:
+                report.error(f"{location}: 'config' must be an object", path + ("config",))
+            return
+
+        for config_field in self.config_required:
+            if config_field not in config:
+                report.error(f"{location}: Missing required config field '{config_field}' for type '{comp_type}'",
+                             path + ("config",))
+
+        if self.config_keys is not None:
+            for key in config:
+                if key not in self.config_keys:
+                    report.warnings.append(f"{location}: Unknown config key '{key}' for type '{comp_type}'. "
+                                           f"Valid keys: {self.valid_keys_hint}")
+
+        # SAP compliance
+        for first, second, note in self.config_exclusive:
+            if first in config and second in config:
+                compliance.warnings.append(f"{location}: Component has both '{first}' and '{second}' - {note}")
+        for array_field in self.config_arrays:
+            if array_field in config and not isinstance(config[array_field], list):
+                compliance.error(f"{location}: '{array_field}' must be an array", path + ("config", array_field))
+        if self.default_route and isinstance(config.get(self.default_route), list):
+            conditions = config[self.default_route]
+            if not any(isinstance(cond, dict) and cond.get("condition") == "default" for cond in conditions):
+                compliance.warnings.append(f"{location}: Gateway has no default route - ensure all paths are covered")
+
 
 class SAPIFlowSchemaValidator:
     """Validates JSON against SAP iFlow schema requirements"""
-    
-    def __init__(self):
+
+    def __init__(self, schema: Optional[Dict[str, Dict[str, Any]]] = None):
+        schema = COMPONENT_SCHEMA if schema is None else schema
+        self.rules = {comp_type: _ComponentRule(comp_type, rule) for comp_type, rule in schema.items()}
+
         # Valid component types from our schema
-        self.valid_component_types = {
-            "content_modifier", "script", "gateway", "message_mapping",
-            "request_reply", "odata", "sftp", "subprocess", "exception_subprocess",
-            "http_adapter", "rest", "groovy", "mapping", "router"
-        }
-        
-        # Required fields for each component type
+        self.valid_component_types = set(schema)
+        self._valid_types_hint = ', '.join(sorted(self.valid_component_types))
+
+        # Required fields and valid config keys for each component type
         self.component_requirements = {
-            "content_modifier": {
-                "required": ["id", "name", "config"],
-                "config_required": ["headers"]  # Either headers or body
-            },
-            "gateway": {
-                "required": ["id", "name", "config"],
-                "config_required": ["routing_conditions"]
-            },
-            "script": {
-                "required": ["id", "name", "config"],
-                "config_required": ["script"]
-            },
-            "subprocess": {
-                "required": ["id", "name", "config"],
-                "config_required": ["components"]
-            }
+            comp_type: {"required": list(rule["required"]), "config_required": list(rule.get("config_required", []))}
+            for comp_type, rule in schema.items() if "required" in rule
         }
-        
-        # Valid config keys for each component type
         self.valid_config_keys = {
-            "content_modifier": ["headers", "body_type", "body_content"],
-            "gateway": ["routing_conditions"],
-            "script": ["script"],
-            "message_mapping": ["mapping_name", "source_schema", "target_schema"],
-            "request_reply": ["url", "method", "headers"],
-            "odata": ["operation", "service_url", "entity_set"],
-            "sftp": ["host", "port", "path", "username", "auth_type", "operation"],
-            "subprocess": ["components"],
-            "exception_subprocess": ["components"]
+            comp_type: list(rule["config_keys"]) for comp_type, rule in schema.items() if "config_keys" in rule
         }
 
     def validate_json_schema(self, json_data: Dict[str, Any]) -> ValidationResult:
         """
         Main validation method for SAP iFlow JSON
         Returns ValidationResult with validation status and any errors
+
+        Structure, components, sequence flows and SAP compliance are checked in
+        one pass. If there are errors, the common issues found on the way are
+        fixed in a copy returned as fixed_json; when the fixes resolve every
+        error, the result is valid and carries the fixed JSON.
         """
-        errors = []
-        warnings = []
-        
-        try:
-            # Basic structure validation
-            self._validate_root_structure(json_data, errors)
-            
-            if not errors:
-                # Component validation
-                self._validate_components(json_data, errors, warnings)
-                
-                # Flow validation
-                self._validate_sequence_flows(json_data, errors, warnings)
-                
-                # SAP compliance validation
-                self._validate_sap_compliance(json_data, errors, warnings)
-            
-            # Try to fix common issues
-            fixed_json = None
-            if errors:
-                fixed_json = self._auto_fix_common_issues(json_data, errors)
-                if fixed_json:
-                    # Re-validate fixed JSON
-                    revalidation = self.validate_json_schema(fixed_json)
-                    if revalidation.is_valid:
-                        warnings.append("JSON was automatically fixed and now passes validation")
-                        return ValidationResult(True, [], warnings, fixed_json)
-            
-            return ValidationResult(
-                is_valid=len(errors) == 0,
-                errors=errors,
-                warnings=warnings,
-                fixed_json=fixed_json
-            )
-            
-        except Exception as e:
-            errors.append(f"Validation error: {str(e)}")
-            return ValidationResult(False, errors, warnings)
-
-    def _validate_root_structure(self, json_data: Dict[str, Any], errors: List[str]):
-        """Validate root JSON structure"""
+        components_report = _Report()
+        flows_report = _Report()
+        compliance = _Report()
+        # Endpoints without sequence flows, components without config, and
+        # per endpoint whether StartEvent_2 / EndEvent_2 are present
+        missing_flows = []
+        missing_config = []
+        events_present = []
+
         if not isinstance(json_data, dict):
-            errors.append("Root must be a JSON object")
+            components_report.error("Root must be a JSON object", ())
+        elif "endpoints" not in json_data:
+            components_report.error("Missing 'endpoints' array", ())
+        elif not isinstance(json_data["endpoints"], list):
+            components_report.error("'endpoints' must be an array", ("endpoints",))
+        elif len(json_data["endpoints"]) == 0:
+            components_report.error("'endpoints' array cannot be empty", ("endpoints",))
+        else:
+            try:
+                for endpoint_idx, endpoint in enumerate(json_data["endpoints"]):
+                    self._check_endpoint(endpoint, endpoint_idx, components_report, flows_report, compliance,
+                                         missing_flows, missing_config, events_present)
+            except TypeError as e:
+                # Unhashable ids or references
+                components_report.error(f"Validation error: {str(e)}", ())
+
+        errors = components_report.errors + flows_report.errors + compliance.errors
+        error_paths = [format_path(path) for path in
+                       components_report.error_paths + flows_report.error_paths + compliance.error_paths]
+        warnings = components_report.warnings + flows_report.warnings + compliance.warnings
+        if not errors:
+            return ValidationResult(True, [], warnings)
+
+        # Try to fix common issues
+        fixed_json = self._auto_fix_common_issues(json_data, missing_flows, missing_config, events_present, warnings)
+        unfixable = components_report.unfixable + flows_report.unfixable + compliance.unfixable
+        # Inserted events are not schema component types, so they keep the fixed JSON invalid
+        inserted_events = any(not (has_start and has_end) for _, has_start, has_end in events_present)
+        if fixed_json is not None and not unfixable and not inserted_events:
+            warnings.append("JSON was automatically fixed and now passes validation")
+            return ValidationResult(True, [], warnings, fixed_json)
+
+        return ValidationResult(False, errors, warnings, fixed_json, error_paths)
+
+    def _check_endpoint(self, endpoint: Any, endpoint_idx: int, report: _Report, flows_report: _Report,
+                        compliance: _Report, missing_flows: List[int], missing_config: List[Tuple[int, int]],
+                        events_present: List[Tuple[int, bool, bool]]):
+        """Check one endpoint with its components and flows, noting what the auto-fix would change"""
+        path = ("endpoints", endpoint_idx)
+        if not isinstance(endpoint, dict):
+            report.error(f"Endpoint {endpoint_idx}: Endpoint must be an object", path)
             return
-            
-        if "endpoints" not in json_data:
-            errors.append("Missing 'endpoints' array")
+
+        components = endpoint.get("components")
+        component_ids = set(IMPLICIT_EVENT_IDS)
+        if "components" not in endpoint:
+            report.error(f"Endpoint {endpoint_idx}: Missing 'components' array", path)
+        elif not isinstance(components, list):
+            report.error(f"Endpoint {endpoint_idx}: 'components' must be an array", path + ("components",))
+        else:
+            has_start = has_end = False
+            for comp_idx, component in enumerate(components):
+                self._check_component(component, endpoint_idx, comp_idx, path + ("components", comp_idx),
+                                      report, compliance)
+                if isinstance(component, dict):
+                    comp_id = component.get("id")
+                    component_ids.add(comp_id)
+                    has_start = has_start or comp_id == "StartEvent_2"
+                    has_end = has_end or comp_id == "EndEvent_2"
+                    if "config" not in component:
+                        missing_config.append((endpoint_idx, comp_idx))
+            events_present.append((endpoint_idx, has_start, has_end))
+
+        if "sequence_flows" not in endpoint:
+            flows_report.warnings.append(
+                f"Endpoint {endpoint_idx}: No sequence flows defined - will use automatic flow generation")
+            if "components" in endpoint:
+                missing_flows.append(endpoint_idx)
             return
-            
-        if not isinstance(json_data["endpoints"], list):
-            errors.append("'endpoints' must be an array")
+        flows = endpoint["sequence_flows"]
+        if not isinstance(flows, list):
+            flows_report.error(f"Endpoint {endpoint_idx}: 'sequence_flows' must be an array",
+                               path + ("sequence_flows",))
             return
-            
-        if len(json_data["endpoints"]) == 0:
-            errors.append("'endpoints' array cannot be empty")
-
-    def _validate_components(self, json_data: Dict[str, Any], errors: List[str], warnings: List[str]):
-        """Validate all components in the JSON"""
-        for endpoint_idx, endpoint in enumerate(json_data["endpoints"]):
-            if "components" not in endpoint:
-                errors.append(f"Endpoint {endpoint_idx}: Missing 'components' array")
-                continue
-                
-            if not isinstance(endpoint["components"], list):
-                errors.append(f"Endpoint {endpoint_idx}: 'components' must be an array")
-                continue
-                
-            for comp_idx, component in enumerate(endpoint["components"]):
-                self._validate_single_component(component, endpoint_idx, comp_idx, errors, warnings)
-
-    def _validate_single_component(self, component: Dict[str, Any], endpoint_idx: int, comp_idx: int, 
-                                 errors: List[str], warnings: List[str]):
-        """Validate a single component"""
-        # Check required fields
-        if "type" not in component:
-            errors.append(f"Endpoint {endpoint_idx}, Component {comp_idx}: Missing 'type'")
+        for flow_idx, flow in enumerate(flows):
+            self._check_flow(flow, endpoint_idx, flow_idx, component_ids, path + ("sequence_flows", flow_idx),
+                             flows_report)
+
+    def _check_component(self, component: Any, endpoint_idx: int, comp_idx: int, path: Tuple,
+                         report: _Report, compliance: _Report):
+        """Check a single component against the rule of its type"""
+        location = f"Endpoint {endpoint_idx}, Component {comp_idx}"
+        if not isinstance(component, dict):
+            report.error(f"{location}: Component must be an object", path)
             return
-            
-        if "id" not in component:
-            errors.append(f"Endpoint {endpoint_idx}, Component {comp_idx}: Missing 'id'")
+        comp_type = component.get("type")
+        rule = self.rules.get(comp_type) if isinstance(comp_type, str) else None
+        for required_field in ("type", "id", "name"):
+            if required_field not in component:
+                report.error(f"{location}: Missing '{required_field}'", path)
+                # The compliance checks only need the type
+                if rule is not None:
+                    rule.check(component, location, path, _Report(), compliance)
+                return
+        if rule is None:
+            report.error(f"{location}: Invalid type '{comp_type}'. Valid types: {self._valid_types_hint}",
+                         path + ("type",))
             return
-            
-        if "name" not in component:
-            errors.append(f"Endpoint {endpoint_idx}, Component {comp_idx}: Missing 'name'")
+        rule.check(component, location, path, report, compliance)
+
+    def _check_flow(self, flow: Any, endpoint_idx: int, flow_idx: int, component_ids: Optional[set],
+                    path: Tuple, report: _Report):
+        """Check a single sequence flow; references are only checked when component_ids is given"""
+        location = f"Endpoint {endpoint_idx}, Flow {flow_idx}"
+        if not isinstance(flow, dict):
+            report.error(f"{location}: Sequence flow must be an object", path)
             return
-            
-        # Validate component type
-        comp_type = component["type"]
-        if comp_type not in self.valid_component_types:
-            errors.append(f"Endpoint {endpoint_idx}, Component {comp_idx}: Invalid type '{comp_type}'. Valid types: {', '.join(sorted(self.valid_component_types))}")
+        for required_field in ("id", "source_ref", "target_ref"):
+            if required_field not in flow:
+                report.error(f"{location}: Missing '{required_field}'", path)
+        if component_ids is None:
             return
-            
-        # Validate component-specific requirements
-        if comp_type in self.component_requirements:
-            reqs = self.component_requirements[comp_type]
-            
-            # Check required fields
-            for field in reqs["required"]:
-                if field not in component:
-                    errors.append(f"Endpoint {endpoint_idx}, Component {comp_idx}: Missing required field '{field}' for type '{comp_type}'")
-                    
-            # Check config requirements
-            if "config" in component and "config_required" in reqs:
-                config = component["config"]
-                if not isinstance(config, dict):
-                    errors.append(f"Endpoint {endpoint_idx}, Component {comp_idx}: 'config' must be an object")
-                else:
-                    for config_field in reqs["config_required"]:
-                        if config_field not in config:
-                            errors.append(f"Endpoint {endpoint_idx}, Component {comp_idx}: Missing required config field '{config_field}' for type '{comp_type}'")
-                            
-        # Validate config keys
-        if "config" in component and comp_type in self.valid_config_keys:
-            config = component["config"]
-            if isinstance(config, dict):
-                valid_keys = self.valid_config_keys[comp_type]
-                for key in config.keys():
-                    if key not in valid_keys:
-                        warnings.append(f"Endpoint {endpoint_idx}, Component {comp_idx}: Unknown config key '{key}' for type '{comp_type}'. Valid keys: {', '.join(valid_keys)}")
-
-    def _validate_sequence_flows(self, json_data: Dict[str, Any], errors: List[str], warnings: List[str]):
-        """Validate sequence flows"""
-        for endpoint_idx, endpoint in enumerate(json_data["endpoints"]):
-            if "sequence_flows" not in endpoint:
-                warnings.append(f"Endpoint {endpoint_idx}: No sequence flows defined - will use automatic flow generation")
-                continue
-                
-            if not isinstance(endpoint["sequence_flows"], list):
-                errors.append(f"Endpoint {endpoint_idx}: 'sequence_flows' must be an array")
-                continue
-                
-            # Get component IDs for validation
-            component_ids = {comp["id"] for comp in endpoint.get("components", [])}
-            component_ids.add("StartEvent_2")  # Standard start event
-            component_ids.add("EndEvent_2")    # Standard end event
-            
-            for flow_idx, flow in enumerate(endpoint["sequence_flows"]):
-                self._validate_single_flow(flow, endpoint_idx, flow_idx, component_ids, errors, warnings)
-
-    def _validate_single_flow(self, flow: Dict[str, Any], endpoint_idx: int, flow_idx: int, 
-                             component_ids: set, errors: List[str], warnings: List[str]):
-        """Validate a single sequence flow"""
-        if "id" not in flow:
-            errors.append(f"Endpoint {endpoint_idx}, Flow {flow_idx}: Missing 'id'")
-            
-        if "source_ref" not in flow:
-            errors.append(f"Endpoint {endpoint_idx}, Flow {flow_idx}: Missing 'source_ref'")
-            
-        if "target_ref" not in flow:
-            errors.append(f"Endpoint {endpoint_idx}, Flow {flow_idx}: Missing 'target_ref'")
-            
-        # Check if source and target components exist
         if "source_ref" in flow and flow["source_ref"] not in component_ids:
-            errors.append(f"Endpoint {endpoint_idx}, Flow {flow_idx}: Source component '{flow['source_ref']}' not found")
-            
+            report.error(f"{location}: Source component '{flow['source_ref']}' not found", path + ("source_ref",))
         if "target_ref" in flow and flow["target_ref"] not in component_ids:
-            errors.append(f"Endpoint {endpoint_idx}, Flow {flow_idx}: Target component '{flow['target_ref']}' not found")
-
-    def _validate_sap_compliance(self, json_data: Dict[str, Any], errors: List[str], warnings: List[str]):
-        """Validate SAP-specific compliance requirements"""
-        # Check for common SAP compliance issues
-        for endpoint_idx, endpoint in enumerate(json_data["endpoints"]):
-            for comp_idx, component in enumerate(endpoint.get("components", [])):
-                comp_type = component.get("type", "")
-                
-                # Content modifier with headers should be validated
-                if comp_type == "content_modifier" and "config" in component:
-                    config = component["config"]
-                    if "headers" in config and "body" in config:
-                        warnings.append(f"Endpoint {endpoint_idx}, Component {comp_idx}: Component has both 'headers' and 'body' - headers will take precedence (Content Enricher)")
-                        
-                # Gateway validation
-                if comp_type == "gateway" and "config" in component:
-                    config = component["config"]
-                    if "routing_conditions" in config:
-                        conditions = config["routing_conditions"]
-                        if not isinstance(conditions, list):
-                            errors.append(f"Endpoint {endpoint_idx}, Component {comp_idx}: 'routing_conditions' must be an array")
-                        else:
-                            # Check for default route
-                            has_default = any(cond.get("condition") == "default" for cond in conditions)
-                            if not has_default:
-                                warnings.append(f"Endpoint {endpoint_idx}, Component {comp_idx}: Gateway has no default route - ensure all paths are covered")
-
-    def _auto_fix_common_issues(self, json_data: Dict[str, Any], errors: List[str]) -> Optional[Dict[str, Any]]:
-        """Attempt to automatically fix common JSON issues"""
-        try:
-            # Deep copy to avoid modifying original
-            import copy
-            fixed_json = copy.deepcopy(json_data)
-            
-            # Fix 1: Add missing sequence_flows if components exist but no flows
-            for endpoint in fixed_json.get("endpoints", []):
-                if "components" in endpoint and "sequence_flows" not in endpoint:
-                    endpoint["sequence_flows"] = []
-                    warnings.append("Added missing sequence_flows array")
-                    
-            # Fix 2: Ensure all components have config
-            for endpoint in fixed_json.get("endpoints", []):
-                for component in endpoint.get("components", []):
-                    if "config" not in component:
-                        component["config"] = {}
-                        
-            # Fix 3: Add standard start/end events if missing
-            for endpoint in fixed_json.get("endpoints", []):
-                components = endpoint.get("components", [])
-                component_ids = {comp.get("id", "") for comp in components}
-                
-                # Add start event if not present
-                if "StartEvent_2" not in component_ids:
-                    start_event = {
-                        "type": "start_event",
-                        "id": "StartEvent_2",
-                        "name": "Start"
-                    }
-                    components.insert(0, start_event)
-                    
-                # Add end event if not present
-                if "EndEvent_2" not in component_ids:
-                    end_event = {
-                        "type": "end_event",
-                        "id": "EndEvent_2",
-                        "name": "End"
-                    }
-                    components.append(end_event)
-                    
-            return fixed_json
-            
-        except Exception as e:
-            # If fixing fails, return None
+            report.error(f"{location}: Target component '{flow['target_ref']}' not found", path + ("target_ref",))
+
+    def validate_component(self, component: Dict[str, Any], endpoint_idx: int = 0, comp_idx: int = 0,
+                           strict: bool = True) -> Tuple[List[str], List[str]]:
+        """
+        Validate one component on its own and return (errors, warnings).
+        Used by the streaming validator to check each component as soon as it is complete;
+        the component gets the same checks, SAP compliance included, as in validate_json_schema.
+        With strict=False only a missing type/id/name is an error; type and config
+        mismatches are reported as warnings.
+        """
+        report = _Report()
+        path = ("endpoints", endpoint_idx, "components", comp_idx)
+        if not isinstance(component, dict):
+            return [f"Endpoint {endpoint_idx}, Component {comp_idx}: Component must be an object"], []
+        if not strict:
+            for required_field in ("type", "id", "name"):
+                if required_field not in component:
+                    return [f"Endpoint {endpoint_idx}, Component {comp_idx}: Missing '{required_field}'"], []
+        self._check_component(component, endpoint_idx, comp_idx, path, report, report)
+        if strict:
+            return report.errors, report.warnings
+        return [], report.errors + report.warnings
+
+    def validate_sequence_flow(self, flow: Dict[str, Any], endpoint_idx: int = 0, flow_idx: int = 0,
+                               component_ids: Optional[set] = None) -> Tuple[List[str], List[str]]:
+        """
+        Validate one sequence flow on its own and return (errors, warnings).
+        Source/target references are only checked when component_ids is given.
+        """
+        report = _Report()
+        self._check_flow(flow, endpoint_idx, flow_idx, component_ids,
+                         ("endpoints", endpoint_idx, "sequence_flows", flow_idx), report)
+        return report.errors, report.warnings
+
+    def _auto_fix_common_issues(self, json_data: Dict[str, Any], missing_flows: List[int],
+                                missing_config: List[Tuple[int, int]], events_present: List[Tuple[int, bool, bool]],
+                                warnings: List[str]) -> Optional[Dict[str, Any]]:
+        """Apply the fixes noted during validation to a copy of the JSON (None if the root is not an object)"""
+        if not isinstance(json_data, dict):
             return None
+        # Deep copy to avoid modifying original
+        fixed_json = copy.deepcopy(json_data)
+        endpoints = fixed_json.get("endpoints")
+
+        # Fix 1: Add missing sequence_flows if components exist but no flows
+        for endpoint_idx in missing_flows:
+            endpoints[endpoint_idx]["sequence_flows"] = []
+        if missing_flows:
+            warnings.append("Added missing sequence_flows array")
+
+        # Fix 2: Ensure all components have config
+        for endpoint_idx, comp_idx in missing_config:
+            endpoints[endpoint_idx]["components"][comp_idx]["config"] = {}
+
+        # Fix 3: Add standard start/end events if missing
+        for endpoint_idx, has_start, has_end in events_present:
+            components = endpoints[endpoint_idx]["components"]
+            if not has_start:
+                components.insert(0, {"type": "start_event", "id": "StartEvent_2", "name": "Start"})
+            if not has_end:
+                components.append({"type": "end_event", "id": "EndEvent_2", "name": "End"})
+
+        return fixed_json
 
     def get_schema_template(self) -> str:
         """Get a template JSON structure for guidance"""
@@ -8,6 +8,8 @@ import re
 from typing import Dict, List, Any, Optional
 from pathlib import Path
 
+from bpmn_layout import ACTIVITY, EVENT, GATEWAY, layout_flow_graph, node_kind, edge_xml
+
 # Import the schema validator
 try:
     from .json_schema_validator import validate_iflow_json, ValidationResult
@@ -26,6 +28,7 @@ class EnhancedJSONToIFlowConverter:
     
     def __init__(self):
         self.component_positions = {}
+        self.component_kinds = {}
         self.sequence_flows = []
         self.current_x_position = 150
         self.current_y_position = 150
@@ -96,6 +99,7 @@ class EnhancedJSONToIFlowConverter:
         """Generate the complete iFlow XML with proper SAP structure"""
         # Reset positions for new generation
         self.component_positions = {}
+        self.component_kinds = {}
         self.sequence_flows = []
         self.current_x_position = 300
         self.current_y_position = 150
@@ -193,65 +197,35 @@ class EnhancedJSONToIFlowConverter:
 
     def _generate_bpmn_diagram_section(self) -> str:
         """Generate the BPMN diagram section with shapes and edges"""
-        # Generate BPMN shapes for all components
-        shapes_xml = []
-        edges_xml = []
-        
+        # Lay out the start and end events, all components and the sequence flows between them
+        nodes = [("StartEvent_2", EVENT)]
+        nodes.extend((component_id, self.component_kinds.get(component_id, ACTIVITY))
+                     for component_id in self.component_positions)
+        nodes.append(("EndEvent_2", EVENT))
+        flows = [(flow['id'], flow['source_ref'], flow['target_ref']) for flow in self.sequence_flows]
+        layout = layout_flow_graph(nodes, flows, origin_x=100, origin_y=100)
+        participant = layout.container(padding=50, min_width=1200, min_height=300)
+
         # Add Integration Process participant shape (the big container)
-        shapes_xml.append('''      <bpmndi:BPMNShape bpmnElement="Process_Participant" id="BPMNShape_Process_Participant">
-        <dc:Bounds height="300.0" width="1200.0" x="50" y="50"/>
+        shapes_xml = [f'''      <bpmndi:BPMNShape bpmnElement="Process_Participant" id="BPMNShape_Process_Participant">
+        <dc:Bounds height="{participant.height}" width="{participant.width}" x="{participant.x}" y="{participant.y}"/>
         <bpmndi:BPMNLabel>
-          <dc:Bounds height="14.0" width="200.0" x="50" y="30"/>
+          <dc:Bounds height="14.0" width="200.0" x="{participant.x}" y="{participant.y - 20}"/>
         </bpmndi:BPMNLabel>
-      </bpmndi:BPMNShape>''')
-        
-        # Add start and end event shapes
-        shapes_xml.append('''      <bpmndi:BPMNShape bpmnElement="StartEvent_2" id="BPMNShape_StartEvent_2">
-        <dc:Bounds height="32.0" width="32.0" x="100" y="100"/>
-        <bpmndi:BPMNLabel>
-          <dc:Bounds height="14.0" width="32.0" x="100" y="140"/>
-        </bpmndi:BPMNLabel>
-      </bpmndi:BPMNShape>''')
-        
-        shapes_xml.append('''      <bpmndi:BPMNShape bpmnElement="EndEvent_2" id="BPMNShape_EndEvent_2">
-        <dc:Bounds height="32.0" width="32.0" x="1200" y="100"/>
-        <bpmndi:BPMNLabel>
-          <dc:Bounds height="14.0" width="32.0" x="1200" y="140"/>
-        </bpmndi:BPMNLabel>
-      </bpmndi:BPMNShape>''')
-        
-        # Add shapes for all components
-        for component_id, position in self.component_positions.items():
+      </bpmndi:BPMNShape>''']
+
+        # Add shapes for the events and all components, labelled below
+        for component_id, bounds in layout.shapes.items():
             shapes_xml.append(f'''      <bpmndi:BPMNShape bpmnElement="{component_id}" id="BPMNShape_{component_id}">
-        <dc:Bounds height="80.0" width="100.0" x="{position['x']}" y="{position['y']}"/>
+        <dc:Bounds height="{bounds.height}" width="{bounds.width}" x="{bounds.x}" y="{bounds.y}"/>
         <bpmndi:BPMNLabel>
-          <dc:Bounds height="14.0" width="100.0" x="{position['x']}" y="{position['y'] + 90}"/>
+          <dc:Bounds height="14.0" width="{bounds.width}" x="{bounds.x}" y="{bounds.bottom + 8}"/>
         </bpmndi:BPMNLabel>
       </bpmndi:BPMNShape>''')
-        
+
         # Add edges for all sequence flows
-        for flow in self.sequence_flows:
-            source_shape = f"BPMNShape_{flow['source_ref']}"
-            target_shape = f"BPMNShape_{flow['target_ref']}"
-            
-            # Calculate waypoints for better visual flow
-            source_x = self.component_positions.get(flow['source_ref'], {}).get('x', 100)
-            source_y = self.component_positions.get(flow['source_ref'], {}).get('y', 100)
-            target_x = self.component_positions.get(flow['target_ref'], {}).get('x', 200)
-            target_y = self.component_positions.get(flow['target_ref'], {}).get('y', 100)
-            
-            # Adjust coordinates for start/end events
-            if flow['source_ref'] == 'StartEvent_2':
-                source_x = 132  # StartEvent_2 center
-                source_y = 116  # StartEvent_2 center
-            if flow['target_ref'] == 'EndEvent_2':
-                target_x = 1168  # EndEvent_2 center
-                target_y = 116  # EndEvent_2 center
-            
-            edges_xml.append(f'''      <bpmndi:BPMNEdge bpmnElement="{flow['id']}" id="BPMNEdge_{flow['id']}" sourceElement="{source_shape}" targetElement="{target_shape}">
-        <di:waypoint x="{source_x + 50}" y="{source_y + 40}"/>
-        <di:waypoint x="{target_x}" y="{target_y + 40}"/>
-      </bpmndi:BPMNEdge>''')
+        edges_xml = [edge_xml(route.flow_id, route.source, route.target, route.waypoints, indent="      ")
+                     for route in layout.edges]
         
         # Combine all parts
         shapes_str = '\n'.join(shapes_xml)
@@ -302,8 +276,13 @@ class EnhancedJSONToIFlowConverter:
             component_xml = self._create_component(component, position)
             components_xml.append(component_xml)
             
-            # Store position for sequence flows
+            # Store position and shape kind for the diagram
             self.component_positions[component["id"]] = position
+            component_type = component.get("type", "")
+            if component_type in ["join", "parallel_join", "parallelGateway"]:
+                self.component_kinds[component["id"]] = GATEWAY
+            else:
+                self.component_kinds[component["id"]] = node_kind(component_type)
         
         # Update Y position for next endpoint
         self.current_y_position += 200
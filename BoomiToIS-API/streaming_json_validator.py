@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Incremental JSON Validator for streamed GenAI blueprint responses
+Parses the LLM response chunk by chunk so a broken blueprint can be rejected
+as soon as the first structural or schema error appears, instead of after the
+whole generation has finished.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from json_schema_validator import IMPLICIT_EVENT_IDS, SAPIFlowSchemaValidator, format_path
+
+# Characters allowed to terminate a bare literal or number
+_DELIMITERS = set(' \t\r\n,]}')
+_NUMBER_CHARS = set('0123456789+-.eE')
+_LITERALS = ('true', 'false', 'null')
+# Next character inside a string that needs attention
+_STRING_SPECIAL = re.compile(r'["\\\x00-\x1f]')
+
+# Code fence markers around the JSON, which are not reported as skipped text
+_FENCE_PATTERN = re.compile(r'```(?:json)?')
+
+# Container kind expected at well-known blueprint paths ('*' matches any index)
+_EXPECTED_KINDS = {
+    ('endpoints',): 'array',
+    ('endpoints', '*'): 'object',
+    ('endpoints', '*', 'components'): 'array',
+    ('endpoints', '*', 'components', '*'): 'object',
+    ('endpoints', '*', 'sequence_flows'): 'array',
+    ('endpoints', '*', 'sequence_flows', '*'): 'object',
+    ('endpoints', '*', 'flow'): 'array',
+}
+
+# Ids the generator adds itself, so flows may always reference them
+_IMPLICIT_IDS = set(IMPLICIT_EVENT_IDS)
+
+
+def _pattern(path) -> Tuple:
+    return tuple('*' if isinstance(part, int) else part for part in path)
+
+
+class StreamingValidationError(ValueError):
+    """Raised as soon as the streamed response can no longer become a valid blueprint"""
+
+    def __init__(self, message: str, offset: int, line: int, column: int, path: Tuple = ()):
+        self.message = message
+        self.offset = offset
+        self.line = line
+        self.column = column
+        self.path = tuple(path)
+        super().__init__(self.describe())
+
+    def describe(self) -> str:
+        return f"{self.message} (line {self.line}, column {self.column}, at {format_path(self.path)})"
+
+
+class _Frame:
+    """An open object or array on the parser stack"""
+    __slots__ = ('kind', 'start', 'path', 'state', 'keys', 'key', 'index')
+
+    def __init__(self, kind: str, start: int, path: Tuple):
+        self.kind = kind
+        self.start = start
+        self.path = path
+        # object: key_or_end, key, colon, value, comma_or_end
+        # array:  value_or_end, value, comma_or_end
+        self.state = 'key_or_end' if kind == 'object' else 'value_or_end'
+        self.keys = set()
+        self.key = None
+        self.index = 0
+
+
+class IncrementalBlueprintValidator:
+    """
+    Incremental JSON parser that validates an iFlow blueprint while it is being streamed.
+
+    Feed text chunks with feed(); a StreamingValidationError is raised at the first
+    structural error, wrong container type, or component/flow that fails the
+    SAPIFlowSchemaValidator checks. Once the root object closes, `complete` is True
+    and `document` holds the parsed blueprint.
+    """
+
+    def __init__(self, schema_validator: Optional[SAPIFlowSchemaValidator] = None,
+                 strict: bool = False):
+        self.schema_validator = schema_validator or SAPIFlowSchemaValidator()
+        self.strict = strict
+        self.reset()
+
+    def reset(self):
+        """Forget everything fed so far"""
+        self.buffer = ''
+        self.pos = 0
+        self.stack: List[_Frame] = []
+        self.root_start = None
+        self.root_end = None
+        self.document = None
+        self.warnings: List[str] = []
+        self.error: Optional[StreamingValidationError] = None
+        # Token state: None, 'string', 'literal'
+        self._token = None
+        self._token_start = 0
+        self._escape = False
+        self._string_is_key = False
+        # Component ids and flow references per endpoint index
+        self._component_ids: Dict[int, set] = {}
+        self._flow_refs: Dict[int, List[Tuple[int, str, str]]] = {}
+
+    @property
+    def complete(self) -> bool:
+        return self.root_end is not None
+
+    # ------------------------------------------------------------------ feeding
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Consume the next chunk of the response.
+
+        Returns:
+            bool: True once the root JSON object is complete (further text is ignored)
+        """
+        if self.error:
+            raise self.error
+        if self.complete or not chunk:
+            return self.complete
+        self.buffer += chunk
+        try:
+            self._consume()
+        except StreamingValidationError as e:
+            self.error = e
+            raise
+        return self.complete
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        Signal end of stream and return the parsed blueprint.
+
+        Raises:
+            StreamingValidationError: If the response ended before the JSON was complete
+        """
+        if self.error:
+            raise self.error
+        if not self.complete:
+            if self.root_start is None:
+                self.error = self._error("No JSON object found in response", len(self.buffer))
+            else:
+                self.error = self._error(
+                    f"Response ended before the JSON was complete ({len(self.stack)} unclosed containers)",
+                    len(self.buffer))
+            raise self.error
+        return self.document
+
+    def json_text(self) -> str:
+        """The exact JSON span of the response (only valid once complete)"""
+        return self.buffer[self.root_start:self.root_end]
+
+    # ------------------------------------------------------------------ parsing
+
+    def _consume(self):
+        buf = self.buffer
+        end = len(buf)
+        pos = self.pos
+        while pos < end and not self.complete:
+            if self.root_start is None:
+                pos = self._consume_prelude(pos)
+                if self.root_start is None:
+                    # Wait for the text after a candidate opening brace
+                    break
+                continue
+
+            if self._token == 'string':
+                if self._escape:
+                    self._escape = False
+                    pos += 1
+                    continue
+                match = _STRING_SPECIAL.search(buf, pos)
+                if not match:
+                    pos = end
+                    continue
+                pos = match.start()
+                ch = buf[pos]
+                if ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._end_string(pos)
+                elif ch < ' ' and ch not in '\n\r\t':
+                    # Raw newlines/tabs are repaired on load, other control characters are fatal
+                    raise self._error(f"Unescaped control character {ch!r} in string", pos)
+                pos += 1
+                continue
+
+            ch = buf[pos]
+            if self._token == 'literal':
+                if ch in _DELIMITERS:
+                    self._end_literal(pos)
+                    # Fall through so the delimiter itself is processed
+                elif ch.isalnum() or ch in _NUMBER_CHARS:
+                    pos += 1
+                    continue
+                else:
+                    raise self._error(f"Unexpected character {ch!r} in value", pos)
+
+            if ch in ' \t\r\n':
+                pos += 1
+                continue
+
+            self._structural(ch, pos)
+            pos += 1
+        self.pos = pos
+
+    def _consume_prelude(self, pos: int) -> int:
+        """
+        Skip prose, code fences and XML before the opening brace of the JSON object.
+        A brace followed by anything but a property name or '}' (such as the {$var}
+        of an XSLT) is part of the skipped text.
+
+        Returns:
+            int: Position after the opening brace, or of the candidate brace still
+                 waiting for the text after it
+        """
+        buf = self.buffer
+        while True:
+            brace = buf.find('{', pos)
+            if brace == -1:
+                return len(buf)
+            after = brace + 1
+            while after < len(buf) and buf[after] in ' \t\r\n':
+                after += 1
+            if after == len(buf):
+                return brace
+            if buf[after] in '"}':
+                break
+            pos = brace + 1
+        skipped = _FENCE_PATTERN.sub('', buf[:brace]).strip()
+        if skipped:
+            self.warnings.append(f"Skipped {len(skipped)} characters of text before the JSON object")
+        self.root_start = brace
+        self.stack.append(_Frame('object', brace, ()))
+        return brace + 1
+
+    def _structural(self, ch: str, pos: int):
+        frame = self.stack[-1]
+        state = frame.state
+
+        if frame.kind == 'object':
+            if state in ('key_or_end', 'key'):
+                if ch == '"':
+                    self._start_string(pos, is_key=True)
+                    return
+                if ch == '}' and state == 'key_or_end':
+                    self._close(pos)
+                    return
+                if ch == '}':
+                    raise self._error("Trailing comma before '}'", pos)
+                raise self._error(f"Expected a quoted property name, found {ch!r}", pos)
+            if state == 'colon':
+                if ch != ':':
+                    raise self._error(f"Expected ':' after property '{frame.key}', found {ch!r}", pos)
+                frame.state = 'value'
+                return
+            if state == 'value':
+                self._start_value(ch, pos, frame.path + (frame.key,))
+                return
+            # comma_or_end
+            if ch == ',':
+                frame.state = 'key'
+                return
+            if ch == '}':
+                self._close(pos)
+                return
+            raise self._error(f"Expected ',' or '}}' after property '{frame.key}', found {ch!r}", pos)
+
+        if state in ('value_or_end', 'value'):
+            if ch == ']' and state == 'value_or_end':
+                self._close(pos)
+                return
+            if ch == ']':
+                raise self._error("Trailing comma before ']'", pos)
+            self._start_value(ch, pos, frame.path + (frame.index,))
+            return
+        # comma_or_end
+        if ch == ',':
+            frame.index += 1
+            frame.state = 'value'
+            return
+        if ch == ']':
+            self._close(pos)
+            return
+        raise self._error(f"Expected ',' or ']' in array, found {ch!r}", pos)
+
+    def _start_value(self, ch: str, pos: int, path: Tuple):
+        expected = _EXPECTED_KINDS.get(_pattern(path))
+        if ch in '{[':
+            kind = 'object' if ch == '{' else 'array'
+            if expected and expected != kind:
+                raise self._error(f"'{format_path(path)}' must be an {expected}, found {kind}", pos, path)
+            self.stack.append(_Frame(kind, pos, path))
+            return
+        if expected:
+            raise self._error(f"'{format_path(path)}' must be an {expected}", pos, path)
+        if ch == '"':
+            self._start_string(pos, is_key=False)
+            return
+        if ch.isalnum() or ch in _NUMBER_CHARS:
+            self._token = 'literal'
+            self._token_start = pos
+            return
+        raise self._error(f"Unexpected character {ch!r} where a value was expected", pos, path)
+
+    def _start_string(self, pos: int, is_key: bool):
+        self._token = 'string'
+        self._token_start = pos
+        self._escape = False
+        self._string_is_key = is_key
+
+    def _end_string(self, pos: int):
+        self._token = None
+        frame = self.stack[-1]
+        if self._string_is_key:
+            raw = self.buffer[self._token_start:pos + 1]
+            try:
+                key = json.loads(raw, strict=False)
+            except json.JSONDecodeError:
+                raise self._error(f"Invalid property name {raw[:40]}", self._token_start)
+            if key in frame.keys:
+                self.warnings.append(f"Duplicate property '{key}' at {format_path(frame.path)}")
+            frame.keys.add(key)
+            frame.key = key
+            frame.state = 'colon'
+        else:
+            self._value_done(frame)
+
+    def _end_literal(self, pos: int):
+        self._token = None
+        raw = self.buffer[self._token_start:pos]
+        if raw not in _LITERALS:
+            try:
+                float(raw)
+            except ValueError:
+                raise self._error(f"Invalid literal '{raw[:40]}'", self._token_start)
+        self._value_done(self.stack[-1])
+
+    def _value_done(self, frame: _Frame):
+        frame.state = 'comma_or_end'
+
+    def _close(self, pos: int):
+        frame = self.stack.pop()
+        if not self.stack:
+            self._on_root_closed(frame, pos + 1)
+            return
+        self._on_container_closed(frame, pos + 1)
+        self._value_done(self.stack[-1])
+
+    # ------------------------------------------------------------------ schema checks
+
+    def _load(self, start: int, end: int) -> Any:
+        return json.loads(self.buffer[start:end], strict=False)
+
+    def _raise_schema_errors(self, errors: List[str], warnings: List[str], frame: _Frame):
+        self.warnings.extend(warnings)
+        if errors:
+            raise self._error(errors[0], frame.start, frame.path)
+
+    def _on_container_closed(self, frame: _Frame, end: int):
+        pattern = _pattern(frame.path)
+        if pattern == ('endpoints', '*', 'components', '*'):
+            endpoint_idx, comp_idx = frame.path[1], frame.path[3]
+            component = self._load(frame.start, end)
+            errors, warnings = self.schema_validator.validate_component(
+                component, endpoint_idx, comp_idx, strict=self.strict)
+            self._raise_schema_errors(errors, warnings, frame)
+            self._component_ids.setdefault(endpoint_idx, set()).add(component.get("id"))
+        elif pattern == ('endpoints', '*', 'sequence_flows', '*'):
+            endpoint_idx, flow_idx = frame.path[1], frame.path[3]
+            flow = self._load(frame.start, end)
+            errors, warnings = self.schema_validator.validate_sequence_flow(flow, endpoint_idx, flow_idx)
+            self._raise_schema_errors(errors, warnings, frame)
+            self._flow_refs.setdefault(endpoint_idx, []).append(
+                (flow_idx, flow.get("source_ref"), flow.get("target_ref")))
+        elif pattern == ('endpoints', '*'):
+            endpoint_idx = frame.path[1]
+            if not frame.keys & {"components", "transformations"}:
+                raise self._error(f"Endpoint {endpoint_idx}: Missing 'components' array", frame.start, frame.path)
+            known_ids = self._component_ids.get(endpoint_idx, set()) | _IMPLICIT_IDS
+            for flow_idx, source, target in self._flow_refs.get(endpoint_idx, []):
+                for ref in (source, target):
+                    if ref not in known_ids:
+                        self.warnings.append(
+                            f"Endpoint {endpoint_idx}, Flow {flow_idx}: Component '{ref}' not found")
+        elif pattern == ('endpoints',) and frame.index == 0 and frame.state == 'value_or_end':
+            # The generator adds a default endpoint
+            self.warnings.append("'endpoints' array is empty - a default endpoint is added")
+
+    def _on_root_closed(self, frame: _Frame, end: int):
+        if "endpoints" not in frame.keys:
+            raise self._error("JSON missing required 'endpoints' field", frame.start, frame.path)
+        self.document = self._load(frame.start, end)
+        self.root_end = end
+
+    # ------------------------------------------------------------------ errors
+
+    def _error(self, message: str, offset: int, path: Optional[Tuple] = None) -> StreamingValidationError:
+        if path is None:
+            path = self._current_path()
+        line = self.buffer.count('\n', 0, offset) + 1
+        column = offset - self.buffer.rfind('\n', 0, offset)
+        return StreamingValidationError(message, offset, line, column, path)
+
+    def _current_path(self) -> Tuple:
+        if not self.stack:
+            return ()
+        frame = self.stack[-1]
+        if frame.kind == 'object' and frame.key is not None and frame.state in ('colon', 'value', 'comma_or_end'):
+            return frame.path + (frame.key,)
+        if frame.kind == 'array':
+            return frame.path + (frame.index,)
+        return frame.path
+
+    def error_context(self, radius: int = 80) -> str:
+        """The response text around the error location, for retry prompts"""
+        if not self.error:
+            return ''
+        offset = self.error.offset
+        start = max(0, offset - radius)
+        return self.buffer[start:offset + radius]
@@ -0,0 +1,85 @@
+"""Tests for the iFlow post-processing pipeline, including parity with the baseline fixer"""
+import contextlib
+import io
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+import iflow_fixer
+from iflow_postprocess import (DEFAULT_STAGES, PostProcessPipeline, check_generation_issues, escape_text,
+                               postprocess_iflow, rewire_references)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SAMPLE_IFLOWS = sorted(REPO_ROOT.glob('**/*.iflw'))
+
+MINIMAL_IFLOW = """<?xml version="1.0" encoding="UTF-8"?>
+<bpmn2:definitions xmlns:bpmn2="http://www.omg.org/spec/BPMN/20100524/MODEL" xmlns:bpmndi="http://www.omg.org/spec/BPMN/20100524/DI" xmlns:ifl="http:///com.sap.ifl.model/Ifl.xsd">
+    <bpmn2:process id="Process_1">
+        <bpmn2:startEvent id="StartEvent_2"/>
+        <bpmn2:callActivity id="Step_1">
+            <ifl:property><key>queryOptions</key><value>$select=a&$filter=b</value></ifl:property>
+        </bpmn2:callActivity>
+        <bpmn2:endEvent id="EndEvent_2"/>
+        <bpmn2:sequenceFlow id="SequenceFlow_1" sourceRef="StartEvent_2" targetRef="Step_1"/>
+        <bpmn2:sequenceFlow id="SequenceFlow_2" sourceRef="Step_1" targetRef="EndEvent_2"/>
+    </bpmn2:process>
+    <bpmndi:BPMNDiagram id="BPMNDiagram_1">
+        <bpmndi:BPMNPlane bpmnElement="Collaboration_1" id="BPMNPlane_1"/>
+    </bpmndi:BPMNDiagram>
+</bpmn2:definitions>
+"""
+
+
+def canonical(xml_content):
+    # lxml keeps the carriage returns of &#13; references, ElementTree's serializer does not
+    xml_content = xml_content.split('?>', 1)[1] if xml_content.startswith('<?xml') else xml_content
+    return ET.canonicalize(xml_content, strip_text=True).replace('&#xD;', '')
+
+
+@pytest.mark.parametrize('path', SAMPLE_IFLOWS, ids=lambda path: path.relative_to(REPO_ROOT).as_posix())
+def test_fix_iflow_xml_matches_baseline(baseline, path):
+    baseline_fixer = baseline('iflow_fixer')
+    xml_content = path.read_text(encoding='utf-8')
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected_input = baseline_fixer.preprocess_xml(xml_content)
+        expected_xml, expected_success, expected_changes = baseline_fixer.fix_iflow_xml(expected_input)
+        fixed_input = iflow_fixer.preprocess_xml(xml_content)
+        fixed_xml, success, changes = iflow_fixer.fix_iflow_xml(fixed_input)
+
+    assert fixed_input == expected_input
+    assert success == expected_success
+    assert changes == expected_changes
+    assert canonical(fixed_xml) == canonical(expected_xml)
+
+
+def test_text_stages_escape_before_parsing():
+    result = postprocess_iflow(MINIMAL_IFLOW)
+    assert result.success
+    assert '$select=a&amp;$filter=b' in result.xml
+    assert [name for name, _ in result.timings][:3] == ['rewire_references', 'escape_text', 'parse']
+
+
+def test_malformed_xml_is_returned_after_the_text_stages():
+    truncated = MINIMAL_IFLOW[:MINIMAL_IFLOW.index('<bpmndi:BPMNDiagram')]
+    result = PostProcessPipeline(DEFAULT_STAGES).run(truncated)
+    assert not result.success
+    assert result.root is None
+    assert result.error is not None
+    assert result.xml == PostProcessPipeline([rewire_references, escape_text]).run(truncated).xml
+
+
+def test_fix_iflow_xml_reports_parse_errors():
+    with contextlib.redirect_stdout(io.StringIO()):
+        fixed_xml, success, changes = iflow_fixer.fix_iflow_xml('<bpmn2:definitions>')
+    assert not success
+    assert fixed_xml.startswith("Error parsing XML")
+
+
+def test_read_only_stages_do_not_serialize():
+    pipeline = PostProcessPipeline([escape_text, check_generation_issues])
+    assert not pipeline.writes_tree
+    result = pipeline.run(MINIMAL_IFLOW)
+    assert result.success
+    assert result.xml == MINIMAL_IFLOW.replace('a&$filter', 'a&amp;$filter')
+    assert [name for name, _ in result.timings] == ['escape_text', 'parse', 'check_generation_issues']
@@ -0,0 +1,58 @@
+"""Parity of IFlowSanitizer with the baseline sanitizer on the sample iFlows"""
+import contextlib
+import io
+import re
+from pathlib import Path
+
+import pytest
+
+from benchmark_iflow_sanitizer import build_iflow
+from iflow_postprocess import postprocess_iflow
+from iflow_sanitizer import IFlowSanitizer
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+EDGE_PATTERN = re.compile(r'<bpmndi:BPMNEdge[^>]*bpmnElement="([^"]*)"[^>]*>.*?</bpmndi:BPMNEdge>', re.DOTALL)
+
+
+def sample_iflows():
+    samples = [(path.relative_to(REPO_ROOT).as_posix(), path.read_text(encoding='utf-8'))
+               for path in sorted(REPO_ROOT.glob('**/*.iflw'))]
+    iflow = build_iflow(60)
+    samples.append(('synthetic', iflow))
+    samples.append(('synthetic truncated', iflow[:len(iflow) // 2]))
+    return samples
+
+
+def sanitize(sanitizer, iflow_xml):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return sanitizer.sanitize_iflow(iflow_xml)
+
+
+def without_edge_waypoints(iflow_xml):
+    # Edges the sanitizer adds are routed between the diagram shapes instead of fixed points
+    return EDGE_PATTERN.sub(lambda match: f'<BPMNEdge {match.group(1)}/>', iflow_xml)
+
+
+@pytest.mark.parametrize('name, iflow_xml', sample_iflows(), ids=lambda value: value if len(value) < 80 else '')
+def test_matches_baseline(baseline, name, iflow_xml):
+    expected_sanitizer = baseline('iflow_sanitizer').IFlowSanitizer()
+    sanitizer = IFlowSanitizer()
+    expected = sanitize(expected_sanitizer, iflow_xml)
+    result = sanitize(sanitizer, iflow_xml)
+
+    assert without_edge_waypoints(result) == without_edge_waypoints(expected)
+    assert sanitizer.issues_found == expected_sanitizer.issues_found
+    assert sanitizer.fixes_applied == expected_sanitizer.fixes_applied
+
+
+def test_postprocess_sanitize_runs_the_sanitizer():
+    iflow = build_iflow(60)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = postprocess_iflow(iflow, sanitize=True)
+    sanitizer = IFlowSanitizer()
+    sanitize(sanitizer, postprocess_iflow(iflow).xml)
+
+    assert result.success
+    assert 'id="Orphan_20"' not in result.xml
+    assert set(sanitizer.fixes_applied) <= set(result.changes)
+    assert result.timings[-1][0] == 'sanitize'
@@ -0,0 +1,114 @@
+"""Tests for SAPIFlowSchemaValidator, including parity with the baseline validator"""
+import contextlib
+import copy
+import io
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from json_schema_validator import SAPIFlowSchemaValidator
+
+SAMPLE_DIR = Path(__file__).resolve().parent / 'sample_metadata_jsons'
+
+
+def component(index):
+    kind = index % 4
+    if kind == 0:
+        return {"type": "content_modifier", "id": f"c{index}", "name": "Set",
+                "config": {"headers": {"a": "b"}, "body": "x", "extra": 1}}
+    if kind == 1:
+        return {"type": "gateway", "id": f"c{index}", "name": "Route",
+                "config": {"routing_conditions": [{"condition": "a"}]}}
+    if kind == 2:
+        return {"type": "script", "id": f"c{index}", "name": "Script", "config": {"script": "x"}}
+    return {"type": "request_reply", "id": f"c{index}", "name": "Call", "config": {"url": "u", "foo": 2}}
+
+
+def blueprint(count):
+    components = [component(index) for index in range(count)]
+    ids = ["StartEvent_2"] + [c["id"] for c in components] + ["EndEvent_2"]
+    flows = [{"id": f"f{index}", "source_ref": source, "target_ref": target}
+             for index, (source, target) in enumerate(zip(ids, ids[1:]))]
+    return {"endpoints": [{"id": "e", "components": components, "sequence_flows": flows}]}
+
+
+# Blueprints the baseline and the current validator must judge the same way
+CASES = {
+    "valid": blueprint(8),
+    "not an object": [],
+    "no endpoints": {},
+    "empty endpoints": {"endpoints": []},
+    "invalid type": {"endpoints": [{"components": [{"type": "foo", "id": "a", "name": "b"}],
+                                    "sequence_flows": []}]},
+    "missing fields": {"endpoints": [{"components": [
+        {"id": "a"},
+        {"type": "script", "id": "s", "name": "n", "config": "str"},
+        {"type": "gateway", "id": "g", "name": "n", "config": {"routing_conditions": "x"}}],
+        "sequence_flows": [{"id": "x", "source_ref": "zz"}, {}]}]},
+    "missing config": {"endpoints": [{"components": [{"type": "script", "id": "s", "name": "n"},
+                                                     {"type": "subprocess", "id": "p", "name": "n", "config": {}}],
+                                      "sequence_flows": []}]},
+    "flows not an array": {"endpoints": [{"components": [], "sequence_flows": "x"}]},
+}
+
+
+def samples():
+    cases = [(f"sample {path.name}", json.loads(path.read_text(encoding='utf-8')))
+             for path in sorted(SAMPLE_DIR.glob('*.json'))]
+    return cases + list(CASES.items())
+
+
+def validate(validator, json_data):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return validator.validate_json_schema(copy.deepcopy(json_data))
+
+
+@pytest.mark.parametrize('name, json_data', samples(), ids=[name for name, _ in samples()])
+def test_matches_baseline(baseline, name, json_data):
+    expected = validate(baseline('json_schema_validator').SAPIFlowSchemaValidator(), json_data)
+    result = validate(SAPIFlowSchemaValidator(), json_data)
+
+    assert result.is_valid == expected.is_valid
+    assert result.errors == expected.errors
+    endpoints = json_data.get("endpoints") if isinstance(json_data, dict) else None
+    # The baseline auto-fix failed on endpoints without sequence_flows and returned no fixed JSON
+    if isinstance(endpoints, list) and all("sequence_flows" in endpoint for endpoint in endpoints):
+        assert result.warnings == expected.warnings
+        assert result.fixed_json == expected.fixed_json
+
+
+def test_does_not_modify_input():
+    json_data = CASES["missing config"]
+    original = copy.deepcopy(json_data)
+    result = SAPIFlowSchemaValidator().validate_json_schema(json_data)
+    assert json_data == original
+    assert result.fixed_json["endpoints"][0]["components"][1]["type"] == "script"
+
+
+@pytest.mark.parametrize('json_data, error', [
+    ({"endpoints": ["x"]}, "Endpoint 0: Endpoint must be an object"),
+    ({"endpoints": [{"components": ["x"], "sequence_flows": []}]}, "Endpoint 0, Component 0: Component must be an object"),
+    ({"endpoints": [{"components": "x"}]}, "Endpoint 0: 'components' must be an array"),
+])
+def test_malformed_blueprints_get_plain_errors(json_data, error):
+    result = SAPIFlowSchemaValidator().validate_json_schema(json_data)
+    assert not result.is_valid
+    assert result.errors[0] == error
+
+
+def test_error_paths():
+    result = SAPIFlowSchemaValidator().validate_json_schema(CASES["missing fields"])
+    assert "endpoints[0].components[1].config" in result.error_paths
+    assert "endpoints[0].sequence_flows[0].source_ref" in result.error_paths
+
+
+def test_large_invalid_blueprint_is_fast():
+    # The baseline re-validated its fixed copy recursively up to the interpreter limit
+    json_data = blueprint(2000)
+    json_data["endpoints"][0]["components"][5]["type"] = "nope"
+    start = time.perf_counter()
+    result = SAPIFlowSchemaValidator().validate_json_schema(json_data)
+    assert not result.is_valid
+    assert time.perf_counter() - start < 2
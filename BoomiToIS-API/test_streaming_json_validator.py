@@ -0,0 +1,122 @@
+"""Tests for the incremental validation of streamed blueprint responses"""
+import json
+from pathlib import Path
+
+import pytest
+
+from streaming_json_validator import IncrementalBlueprintValidator, StreamingValidationError
+
+SAMPLE_DIR = Path(__file__).resolve().parent / 'sample_metadata_jsons'
+
+BLUEPRINT = {
+    "process_name": "Order Sync",
+    "endpoints": [{
+        "id": "order_sync",
+        "name": "Order Sync",
+        "components": [
+            {"type": "content_modifier", "id": "set_headers", "name": "Set \"Headers\"",
+             "config": {"headers": {"Content-Type": "application/json"}, "body_type": None}},
+            {"type": "request_reply", "id": "call_api", "name": "Call API",
+             "config": {"url": "https://x/{id}", "method": "GET", "headers": {"timeout": -1.5e3, "retry": True}}},
+        ],
+        "sequence_flows": [
+            {"id": "f1", "source_ref": "StartEvent_2", "target_ref": "set_headers"},
+            {"id": "f2", "source_ref": "set_headers", "target_ref": "call_api"},
+            {"id": "f3", "source_ref": "call_api", "target_ref": "EndEvent_2"},
+        ],
+    }],
+}
+
+
+def stream(text, chunk_size=7, validator=None):
+    """Feed text in chunks and return the validator once the stream ends"""
+    validator = validator or IncrementalBlueprintValidator()
+    for start in range(0, len(text), chunk_size):
+        if validator.feed(text[start:start + chunk_size]):
+            break
+    validator.finish()
+    return validator
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 4096])
+def test_parses_like_json_loads(chunk_size):
+    text = json.dumps(BLUEPRINT, indent=2)
+    validator = stream(text, chunk_size)
+    assert validator.document == json.loads(text)
+    assert validator.json_text() == text
+    assert validator.warnings == []
+
+
+@pytest.mark.parametrize('path', sorted(SAMPLE_DIR.glob('test*.json')) + [SAMPLE_DIR / 'api_gateway_rate_limiting.json'],
+                         ids=lambda path: path.name)
+def test_sample_blueprints(path):
+    text = path.read_text(encoding='utf-8')
+    assert stream(text).document == json.loads(text)
+
+
+def test_leading_text_and_fences_are_skipped():
+    text = ("Here is the blueprint. The XSLT uses {$var} and <xsl:value-of select=\"{a}\"/>.\n"
+            f"```json\n{json.dumps(BLUEPRINT)}\n```\nTrailing notes {{ ignored")
+    validator = stream(text)
+    assert validator.document == BLUEPRINT
+    assert len(validator.warnings) == 1
+    assert validator.warnings[0].startswith("Skipped")
+
+
+def test_raw_newlines_in_strings_are_repaired():
+    text = json.dumps(BLUEPRINT).replace('Order Sync', 'Order\nSync', 1)
+    assert stream(text).document["process_name"] == "Order\nSync"
+
+
+def test_empty_endpoints_is_a_warning():
+    validator = stream('{"endpoints": []}')
+    assert validator.document == {"endpoints": []}
+    assert "'endpoints' array is empty - a default endpoint is added" in validator.warnings
+
+
+def test_unknown_flow_reference_is_a_warning():
+    blueprint = json.loads(json.dumps(BLUEPRINT))
+    blueprint["endpoints"][0]["sequence_flows"][0]["target_ref"] = "missing"
+    validator = stream(json.dumps(blueprint))
+    assert "Endpoint 0, Flow 0: Component 'missing' not found" in validator.warnings
+
+
+@pytest.mark.parametrize('text, message', [
+    ('{"endpoints": [{"components": [],}]}', "Trailing comma before '}'"),
+    ('{"endpoints": [{"components": [] "x": 1}]}', "Expected ',' or '}' after property 'components'"),
+    ('{"endpoints": {"components": []}}', "'endpoints' must be an array, found object"),
+    ('{"endpoints": [{"components": [{"id": "a", "name": "b"}]}]}', "Missing 'type'"),
+    ('{"endpoints": [{"components": [], "sequence_flows": [{"id": "f"}]}]}', "Missing 'source_ref'"),
+    ('{"endpoints": [{"name": "x"}]}', "Missing 'components' array"),
+    ('{"process_name": "x"}', "missing required 'endpoints' field"),
+    ('{"endpoints": [], "retry": nul}', "Invalid literal 'nul'"),
+])
+def test_malformed_json_is_rejected(text, message):
+    validator = IncrementalBlueprintValidator()
+    with pytest.raises(StreamingValidationError) as raised:
+        stream(text, validator=validator)
+    assert message in raised.value.message
+    assert validator.error is raised.value
+    # Later chunks raise the same error
+    with pytest.raises(StreamingValidationError):
+        validator.feed('}')
+
+
+def test_error_is_raised_before_the_stream_ends():
+    validator = IncrementalBlueprintValidator()
+    validator.feed('{"endpoints": [{"components": [{"id": "a", "name": "b"')
+    with pytest.raises(StreamingValidationError) as raised:
+        validator.feed('}], "sequence_flows": []}]}')
+    assert (raised.value.line, raised.value.column) == (1, 32)
+    assert raised.value.path == ('endpoints', 0, 'components', 0)
+
+
+@pytest.mark.parametrize('text, message', [
+    ('No JSON in this response', "No JSON object found"),
+    ('{"endpoints": [{"components": [', "Response ended before the JSON was complete"),
+])
+def test_incomplete_response_fails_on_finish(text, message):
+    validator = IncrementalBlueprintValidator()
+    validator.feed(text)
+    with pytest.raises(StreamingValidationError, match=message):
+        validator.finish()
@@ -3,6 +3,8 @@ BPMN Templates for SAP Integration Suite iFlow generation.
 These templates are based on the Simple_Hello_iFlow.iflw file.
 """
 
+from iflow_template_engine import TEMPLATES
+
 class BpmnTemplates:
     """
     Class containing BPMN templates for SAP Integration Suite iFlow generation.
@@ -365,55 +367,7 @@ class BpmnTemplates:
     # Full iFlow XML Template
     def iflow_xml_template(self):
         """Generate the full iFlow XML template."""
-        return '''<?xml version="1.0" encoding="UTF-8"?>
-<bpmn2:definitions xmlns:bpmn2="http://www.omg.org/spec/BPMN/20100524/MODEL" xmlns:bpmndi="http://www.omg.org/spec/BPMN/20100524/DI" xmlns:dc="http://www.omg.org/spec/DD/20100524/DC" xmlns:di="http://www.omg.org/spec/DD/20100524/DI" xmlns:ifl="http:///com.sap.ifl.model/Ifl.xsd" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" id="Definitions_1">
-  <bpmn2:collaboration id="Collaboration_1" name="Collaboration">
-    <bpmn2:documentation id="Documentation_1671742909132" textFormat="text/plain">{{description}}</bpmn2:documentation>
-    <bpmn2:extensionElements>
-      <ifl:property>
-        <key>namespaceMapping</key>
-        <value>{{namespace_mapping}}</value>
-      </ifl:property>
-      <ifl:property>
-        <key>allowedHeaderList</key>
-        <value>{{allowed_headers}}</value>
-      </ifl:property>
-      <ifl:property>
-        <key>httpSessionHandling</key>
-        <value>{{http_session_handling}}</value>
-      </ifl:property>
-      <ifl:property>
-        <key>ServerTrace</key>
-        <value>{{server_trace}}</value>
-      </ifl:property>
-      <ifl:property>
-        <key>returnExceptionToSender</key>
-        <value>{{return_exception}}</value>
-      </ifl:property>
-      <ifl:property>
-        <key>log</key>
-        <value>{{log_level}}</value>
-      </ifl:property>
-      <ifl:property>
-        <key>componentVersion</key>
-        <value>1.1</value>
-      </ifl:property>
-      <ifl:property>
-        <key>cmdVariantUri</key>
-        <value>ctype::IFlowVariant/cname::IFlowConfiguration/version::1.1.16</value>
-      </ifl:property>
-    </bpmn2:extensionElements>
-    {{participants}}
-    {{message_flows}}
-  </bpmn2:collaboration>
-  {{process}}
-  <bpmndi:BPMNDiagram id="BPMNDiagram_1">
-    <bpmndi:BPMNPlane bpmnElement="Collaboration_1" id="BPMNPlane_1">
-      {{shapes}}
-      {{edges}}
-    </bpmndi:BPMNPlane>
-  </bpmndi:BPMNDiagram>
-</bpmn2:definitions>'''
+        return TEMPLATES.get('bpmn_iflow').source
 
 
 class TemplateBpmnGenerator:
@@ -648,18 +602,20 @@ class TemplateBpmnGenerator:
         process = self.templates.process_template().replace("{process_content}", process_content)
 
         # Create the full XML
-        xml_template = self.templates.iflow_xml_template()
-        xml = xml_template.replace("{{participants}}", "\n".join(participants))
-        xml = xml.replace("{{message_flows}}", "\n".join(message_flows))
-        xml = xml.replace("{{process}}", process)
-        xml = xml.replace("{{shapes}}", "\n".join(shapes))
-        xml = xml.replace("{{edges}}", "\n".join(edges))
-        xml = xml.replace("{{description}}", f"Generated iFlow: {iflow_name}")
-        xml = xml.replace("{{namespace_mapping}}", "")
-        xml = xml.replace("{{allowed_headers}}", "*")
-        xml = xml.replace("{{http_session_handling}}", "None")
-        xml = xml.replace("{{server_trace}}", "false")
-        xml = xml.replace("{{return_exception}}", "false")
-        xml = xml.replace("{{log_level}}", "All events")
+        xml = TEMPLATES.render(
+            'bpmn_iflow',
+            participants="\n".join(participants),
+            message_flows="\n".join(message_flows),
+            process=process,
+            shapes="\n".join(shapes),
+            edges="\n".join(edges),
+            description=f"Generated iFlow: {iflow_name}",
+            namespace_mapping="",
+            allowed_headers="*",
+            http_session_handling="None",
+            server_trace="false",
+            return_exception="false",
+            log_level="All events"
+        )
 
         return xml
\ No newline at end of file
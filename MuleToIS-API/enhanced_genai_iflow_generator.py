@@ -12,7 +12,14 @@ import re
 import zipfile
 import argparse
 import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
 from enhanced_iflow_templates import EnhancedIFlowTemplates
+from iflow_template_engine import fill
+from genai_prompt import AnalysisPrompt, CallMetrics, compact_markdown, estimate_tokens, prompt_text, user_content
+
+# Workers creating the components of the endpoints of a blueprint (1 creates them one by one)
+ENDPOINT_WORKERS = int(os.getenv('IFLOW_ENDPOINT_WORKERS', '4'))
 
 class EnhancedGenAIIFlowGenerator:
     """
@@ -44,6 +51,9 @@ class EnhancedGenAIIFlowGenerator:
         # Job status tracking for real-time updates
         self.current_job_id = None
 
+        # Tokens and latency of the most recent LLM call (CallMetrics)
+        self.last_call_metrics = None
+
         # Initialize AI providers
         self._initialize_ai_providers(provider, api_key)
 
@@ -365,7 +375,7 @@ class EnhancedGenAIIFlowGenerator:
                     attempt += 1
                     if attempt < max_retries:
                         print("Retrying with more explicit prompt...")
-                        prompt = self._create_more_explicit_prompt(markdown_content, "Invalid component structure")
+                        prompt = self._create_more_explicit_prompt(prompt, "Invalid component structure")
                     continue
 
             except Exception as e:
@@ -374,7 +384,7 @@ class EnhancedGenAIIFlowGenerator:
                 attempt += 1
                 if attempt < max_retries:
                     print("Retrying with more explicit prompt...")
-                    prompt = self._create_more_explicit_prompt(markdown_content, f"Analysis error: {e}")
+                    prompt = self._create_more_explicit_prompt(prompt, f"Analysis error: {e}")
                 continue
 
         # If all attempts fail, FAIL THE PROCESS - NO FALLBACK
@@ -403,25 +413,25 @@ class EnhancedGenAIIFlowGenerator:
 
         return True
 
-    def _create_more_explicit_prompt(self, markdown_content, error_message):
+    def _create_more_explicit_prompt(self, prompt, error_message):
         """
-        Create a more explicit prompt for retry attempts
+        Create a more explicit prompt for retry attempts.
+        The instructions and documentation of the previous prompt are kept unchanged
+        (and stay cached); only the error context is added after them.
 
         Args:
-            markdown_content (str): The markdown content
+            prompt (AnalysisPrompt): The prompt of the previous attempt
             error_message (str): The error from previous attempt
 
         Returns:
-            str: More explicit prompt
+            AnalysisPrompt: The same prompt with the error context as its retry note
         """
-        return f"""
+        return prompt.with_retry_note(f"""
 CRITICAL: Previous attempt failed with error: {error_message}
 
 You MUST generate a valid JSON response for MuleSoft to SAP Integration Suite migration.
 
-Analyze this MuleSoft documentation and create SAP Integration Suite components:
-
-{markdown_content}
+Analyze the MuleSoft documentation above and create SAP Integration Suite components.
 
 REQUIRED JSON FORMAT:
 {{
@@ -448,7 +458,7 @@ Focus on MuleSoft patterns:
 - Salesforce connectors → OData Request-Reply patterns
 
 RESPOND ONLY WITH VALID JSON. NO EXPLANATIONS.
-"""
+""")
 
     def _analyze_with_genai(self, markdown_content, max_retries=5, job_id=None):
         """
@@ -465,12 +475,17 @@ RESPOND ONLY WITH VALID JSON. NO EXPLANATIONS.
         self._update_job_status(job_id, "processing", "Analyzing integration requirements with AI...")
 
         prompt = self._create_detailed_analysis_prompt(markdown_content)
+        instruction_tokens, document_tokens, _ = prompt.estimated_tokens()
+        print(f"📏 Prompt: ~{instruction_tokens} instruction tokens (cached), ~{document_tokens} documentation tokens "
+              f"(markdown ~{estimate_tokens(markdown_content)} tokens before compaction)")
+        attempt_metrics = []
         attempt = 0
         while attempt < max_retries:
             self._update_job_status(job_id, "processing", f"AI Analysis attempt {attempt + 1}/{max_retries}...")
 
             try:
                 # Call the LLM API
+                self.last_call_metrics = None
                 response = self._call_llm_api(prompt)
 
                 # Save the raw response for debugging
@@ -479,6 +494,13 @@ RESPOND ONLY WITH VALID JSON. NO EXPLANATIONS.
                     f.write(response)
                 print(f"Saved raw analysis response attempt {attempt+1} to genai_debug/")
 
+                # Tokens and latency of every attempt
+                if self.last_call_metrics is not None:
+                    print(f"📊 Attempt {attempt+1}: {self.last_call_metrics.summary()}")
+                    attempt_metrics.append(dict(self.last_call_metrics.as_dict(), attempt=attempt + 1))
+                    with open("genai_debug/llm_metrics.json", "w", encoding="utf-8") as f:
+                        json.dump(attempt_metrics, f, indent=2)
+
                 # Parse the response to get the components
                 components = self._parse_llm_response(response)
 
@@ -498,7 +520,7 @@ RESPOND ONLY WITH VALID JSON. NO EXPLANATIONS.
                     attempt += 1
                     if attempt < max_retries:
                         print("Retrying with more explicit prompt...")
-                        prompt = self._create_more_explicit_prompt(markdown_content, "Invalid component structure")
+                        prompt = self._create_more_explicit_prompt(prompt, "Invalid component structure")
                     continue
 
             except Exception as e:
@@ -507,7 +529,7 @@ RESPOND ONLY WITH VALID JSON. NO EXPLANATIONS.
                 attempt += 1
                 if attempt < max_retries:
                     print("Retrying with more explicit prompt...")
-                    prompt = self._create_more_explicit_prompt(markdown_content, f"Analysis error: {e}")
+                    prompt = self._create_more_explicit_prompt(prompt, f"Analysis error: {e}")
                 continue
 
         # If all attempts fail, FAIL THE PROCESS - NO FALLBACK
@@ -574,8 +596,7 @@ RESPOND ONLY WITH VALID JSON. NO EXPLANATIONS.
             )
 
             endpoint_components["message_flows"].append(
-                listener_template.replace("{{source_ref}}", sender_participant_id)
-                              .replace("{{target_ref}}", "Participant_Process_1")
+                fill(listener_template, source_ref=sender_participant_id, target_ref="Participant_Process_1")
             )
 
         elif mulesoft_origin == "http:request":
@@ -596,8 +617,7 @@ RESPOND ONLY WITH VALID JSON. NO EXPLANATIONS.
             )
 
             endpoint_components["message_flows"].append(
-                request_template.replace("{{source_ref}}", "Participant_Process_1")
-                               .replace("{{target_ref}}", receiver_participant_id)
+                fill(request_template, source_ref="Participant_Process_1", target_ref=receiver_participant_id)
             )
 
         elif mulesoft_origin == "transform":
@@ -651,7 +671,7 @@ RESPOND ONLY WITH VALID JSON. NO EXPLANATIONS.
             markdown_content (str): The markdown content to analyze
 
         Returns:
-            str: The prompt for analyzing the markdown content
+            AnalysisPrompt: Static instructions and compacted documentation
         """
         prompt = """
         You are an expert in API design and SAP Integration Suite. Analyze the following markdown content
@@ -877,8 +897,8 @@ RESPOND ONLY WITH VALID JSON. NO EXPLANATIONS.
         Markdown content:
         """
 
-        # Append the markdown content to the prompt
-        return prompt + markdown_content
+        # The instructions are the same for every job; the documentation follows them as its own block
+        return AnalysisPrompt(prompt, compact_markdown(markdown_content))
 
 
     def _parse_llm_response(self, response):
@@ -1202,26 +1222,30 @@ def Message {transformation_name}(Message message) {{
 
     def _call_llm_api(self, prompt):
         """
-        Call the LLM API with the given prompt
+        Call the LLM API with the given prompt. Tokens and latency of the call
+        are kept in self.last_call_metrics.
 
         Args:
-            prompt (str): The prompt for the LLM
+            prompt (str or AnalysisPrompt): The prompt for the LLM
 
         Returns:
             str: The response from the LLM
         """
+        started = time.perf_counter()
         if self.provider == "openai":
             # Use OpenAI API
             response = self.openai.ChatCompletion.create(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are an expert in SAP Integration Suite and API design."},
-                    {"role": "user", "content": prompt}
+                    {"role": "user", "content": prompt_text(prompt)}
                 ],
                 temperature=0.2,  # Lower temperature for more deterministic output
                 max_tokens=4000
             )
 
+            self.last_call_metrics = CallMetrics.from_usage(
+                "openai", self.model, time.perf_counter() - started, getattr(response, "usage", None))
             return response.choices[0].message.content
 
         elif self.provider == "claude":
@@ -1734,18 +1758,16 @@ def Message {transformation_name}(Message message) {{
                     messages=[
                         {
                             "role": "user",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": prompt
-                                }
-                            ]
+                            # Instructions and documentation are separate, cached blocks
+                            "content": user_content(prompt)
                         }
                     ]
                 )
 
                 # Extract the text content from the response
                 response_content = message.content[0].text
+                self.last_call_metrics = CallMetrics.from_usage(
+                    "claude", self.model, time.perf_counter() - started, getattr(message, "usage", None))
 
                 # Basic validation to ensure it's XML
                 if not response_content.strip().startswith('<?xml'):
@@ -1766,7 +1788,7 @@ def Message {transformation_name}(Message message) {{
             # Use a local LLM (placeholder)
             print("Using local LLM (placeholder)")
             # This is a placeholder that returns a simple example
-            return """
+            response = """
             {
                 "api_name": "Example API",
                 "base_url": "/api/v1",
@@ -1792,7 +1814,33 @@ def Message {transformation_name}(Message message) {{
                 "parameters": []
             }
             """
+            self.last_call_metrics = CallMetrics.estimate("local", None, time.perf_counter() - started, prompt, response)
+            return response
+
+
+    def _create_all_endpoint_components(self, endpoints, templates):
+        """
+        Create the components of every endpoint, on a pool of workers.
 
+        Endpoints are independent until they are merged into the collaboration
+        and the process, so each one is created by a worker. The results are
+        returned in endpoint order and merged by the caller in that order, so the
+        generated iFlow does not depend on which endpoint finishes first.
+
+        Args:
+            endpoints (list): Endpoint information from the blueprint
+            templates (EnhancedIFlowTemplates): Templates library
+
+        Returns:
+            list: Components of each endpoint, as returned by _create_endpoint_components
+        """
+        workers = min(ENDPOINT_WORKERS, len(endpoints))
+        if workers <= 1:
+            return [self._create_endpoint_components(endpoint, templates) for endpoint in endpoints]
+
+        print(f"Creating components of {len(endpoints)} endpoints with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="iflow-endpoint") as pool:
+            return list(pool.map(lambda endpoint: self._create_endpoint_components(endpoint, templates), endpoints))
 
     def _create_endpoint_components(self, endpoint, templates):
         """
@@ -2750,13 +2798,13 @@ def Message processError(Message message) {{
                 ))
 
                 # Add the HTTPS sender
-                endpoint_components["message_flows"].append(templates.https_sender_template(
+                endpoint_components["message_flows"].append(fill(templates.https_sender_template(
                     id=component["id"],
                     name=component_name,
                     url_path=component_config.get("url_path", "/"),  # Default path to "/"
                     sender_auth=component_config.get("sender_auth", "None"),
                     user_role=component_config.get("user_role", "ESBMessaging.send")
-                ).replace("{{source_ref}}", sender_participant_id).replace("{{target_ref}}", "Participant_Process_1"))
+                ), source_ref=sender_participant_id, target_ref="Participant_Process_1"))
 
             elif component_type == "http_receiver" or component_type == "https_receiver":
                 # Add a participant for the receiver
@@ -2768,13 +2816,13 @@ def Message processError(Message message) {{
                 ))
 
                 # Add the HTTP receiver
-                endpoint_components["message_flows"].append(templates.http_receiver_template(
+                endpoint_components["message_flows"].append(fill(templates.http_receiver_template(
                     id=component["id"],
                     name=component_name,
                     address=component_config.get("address", "https://example.com"),  # Default address
                     auth_method=component_config.get("auth_method", "None"),
                     credential_name=component_config.get("credential_name", "")
-                ).replace("{{source_ref}}", "Participant_Process_1").replace("{{target_ref}}", receiver_participant_id))
+                ), source_ref="Participant_Process_1", target_ref=receiver_participant_id))
 
             elif component_type == "content_modifier":
                 # Add a content modifier to the process
@@ -3119,9 +3167,8 @@ def Message processError(Message message) {{
                     name=component_name
                 )
 
-                # Replace the incoming and outgoing flow placeholders
-                request_reply = request_reply.replace("{{incoming_flow}}", incoming_flow_id)
-                request_reply = request_reply.replace("{{outgoing_flow}}", outgoing_flow_id)
+                # Fill the incoming and outgoing flow placeholders
+                request_reply = fill(request_reply, incoming_flow=incoming_flow_id, outgoing_flow=outgoing_flow_id)
 
                 endpoint_components["process_components"].append(request_reply)
 
@@ -3891,27 +3938,25 @@ def Message processMessage(Message message) {{
         participants.append(process_participant)
 
         # Add default HTTPS message flow
-        https_flow = templates.https_sender_template(
+        https_flow = fill(templates.https_sender_template(
             id="MessageFlow_10",
             name="HTTPS",
             url_path="/test",  # Ensure URL path is not empty
             sender_auth="RoleBased",
             user_role="ESBMessaging.send"
-        ).replace("{{source_ref}}", "Participant_1").replace("{{target_ref}}", "StartEvent_2")
+        ), source_ref="Participant_1", target_ref="StartEvent_2")
         message_flows.append(https_flow)
 
         # Add start event
-        start_event = templates.message_start_event_template(
+        start_event = fill(templates.message_start_event_template(
             id="StartEvent_2",
             name="Start"
-        ).replace("{{outgoing_flow}}", "SequenceFlow_Start")
+        ), outgoing_flow="SequenceFlow_Start")
         process_components.append(start_event)
         used_ids.add("StartEvent_2")
 
-        # Process each endpoint
-        for endpoint in components.get("endpoints", []):
-            # Create components for the endpoint
-            endpoint_components = self._create_endpoint_components(endpoint, templates)
+        # Process each endpoint: create the components of all endpoints, then merge them in endpoint order
+        for endpoint_components in self._create_all_endpoint_components(components.get("endpoints", []), templates):
 
             # Add participants and message flows
             participants.extend(endpoint_components.get("participants", []))
@@ -3940,10 +3985,10 @@ def Message processMessage(Message message) {{
             sequence_flows.extend(endpoint_components.get("sequence_flows", []))
 
         # Add end event
-        end_event = templates.message_end_event_template(
+        end_event = fill(templates.message_end_event_template(
             id="EndEvent_2",
             name="End"
-        ).replace("{{incoming_flow}}", "SequenceFlow_End")
+        ), incoming_flow="SequenceFlow_End")
         process_components.append(end_event)
         used_ids.add("EndEvent_2")
 
@@ -3984,10 +4029,10 @@ def Message processMessage(Message message) {{
                 # Create a default component definition based on the ID
                 if "RequestReply" in component_id:
                     # Add a Request-Reply component
-                    new_component = templates.request_reply_template(
+                    new_component = fill(templates.request_reply_template(
                         id=component_id,
                         name=component_id
-                    ).replace("{{incoming_flow}}", "").replace("{{outgoing_flow}}", "")
+                    ), incoming_flow="", outgoing_flow="")
                     process_components.append(new_component)
                     print(f"Added missing Request-Reply component: {component_id}")
 
@@ -4298,7 +4343,7 @@ def Message processMessage(Message message) {{
         )
 
         # Replace the template placeholder with our unique placeholder
-        process_template = process_template.replace("{{process_content}}", unique_placeholder)
+        process_template = fill(process_template, process_content=unique_placeholder)
 
         # Generate the full XML by combining collaboration and process content
         template_xml = templates.generate_iflow_xml(collaboration_content, process_template)
@@ -4310,9 +4355,9 @@ def Message processMessage(Message message) {{
         else:
             print(f"Warning: Unique placeholder '{unique_placeholder}' not found in template XML")
             # As a fallback, try the original placeholder format
-            if "{process_content}" in template_xml:
-                template_xml = template_xml.replace("{process_content}", process_content_formatted)
-                print("Replaced {process_content} placeholder as fallback")
+            if "{{process_content}}" in template_xml:
+                template_xml = fill(template_xml, process_content=process_content_formatted)
+                print("Replaced {{process_content}} placeholder as fallback")
 
         # Add proper BPMN diagram layout
         final_iflow_xml = self._add_bpmn_diagram_layout(template_xml, participants, message_flows, process_components)
@@ -4368,13 +4413,13 @@ def Message processMessage(Message message) {{
             process_ref="Process_1"
         )
 
-        https_flow_example = templates.https_sender_template(
+        https_flow_example = fill(templates.https_sender_template(
             id="MessageFlow_1",
             name="HTTPS",
             url_path="/api/v1/example",
             sender_auth="RoleBased",
             user_role="ESBMessaging.send"
-        ).replace("{{source_ref}}", "Participant_1").replace("{{target_ref}}", "StartEvent_2")
+        ), source_ref="Participant_1", target_ref="StartEvent_2")
 
         # Create a complete sequence flow example
         sequence_flow_example = templates.sequence_flow_template(
@@ -4391,16 +4436,14 @@ def Message processMessage(Message message) {{
             body_type="expression",
             content="{\"status\": \"success\", \"message\": \"API is working\"}"
         )
-        content_modifier_example = content_modifier_example.replace("<bpmn2:incoming>{{incoming_flow}}</bpmn2:incoming>", "<bpmn2:incoming>SequenceFlow_1</bpmn2:incoming>")
-        content_modifier_example = content_modifier_example.replace("<bpmn2:outgoing>{{outgoing_flow}}</bpmn2:outgoing>", "<bpmn2:outgoing>SequenceFlow_2</bpmn2:outgoing>")
+        content_modifier_example = fill(content_modifier_example, incoming_flow="SequenceFlow_1", outgoing_flow="SequenceFlow_2")
 
         # Create a complete request-reply example with proper incoming/outgoing flows
         request_reply_example = templates.request_reply_template(
             id="ServiceTask_2",
             name="Request_Reply"
         )
-        request_reply_example = request_reply_example.replace("<bpmn2:incoming>{{incoming_flow}}</bpmn2:incoming>", "<bpmn2:incoming>SequenceFlow_2</bpmn2:incoming>")
-        request_reply_example = request_reply_example.replace("<bpmn2:outgoing>{{outgoing_flow}}</bpmn2:outgoing>", "<bpmn2:outgoing>SequenceFlow_3</bpmn2:outgoing>")
+        request_reply_example = fill(request_reply_example, incoming_flow="SequenceFlow_2", outgoing_flow="SequenceFlow_3")
 
         # Create a complete example of a process with all necessary components
         complete_process_example = f"""
@@ -6571,27 +6614,26 @@ def Message processMessage(Message message) {{
         participants.append(process_participant)
 
         # Add default HTTPS message flow
-        https_flow = templates.https_sender_template(
+        https_flow = fill(templates.https_sender_template(
             id="MessageFlow_10",
             name="HTTPS",
             url_path="/",  # Ensure URL path is not empty
             sender_auth="RoleBased",
             user_role="ESBMessaging.send"
-        ).replace("{{source_ref}}", "Participant_1").replace("{{target_ref}}", "StartEvent_2")
+        ), source_ref="Participant_1", target_ref="StartEvent_2")
         message_flows.append(https_flow)
 
         # Add start event
-        start_event = templates.message_start_event_template(
+        start_event = fill(templates.message_start_event_template(
             id="StartEvent_2",
             name="Start"
-        ).replace("{{outgoing_flow}}", "SequenceFlow_Start")
+        ), outgoing_flow="SequenceFlow_Start")
         process_components.append(start_event)
         used_ids.add("StartEvent_2")
 
-        # Process each endpoint
-        for i, endpoint in enumerate(components.get("endpoints", [])):
-            # Create components for the endpoint
-            endpoint_components = self._create_endpoint_components(endpoint, templates)
+        # Process each endpoint: create the components of all endpoints, then merge them in endpoint order
+        all_endpoint_components = self._create_all_endpoint_components(components.get("endpoints", []), templates)
+        for i, endpoint_components in enumerate(all_endpoint_components):
 
             # Add participants and message flows
             participants.extend(endpoint_components.get("participants", []))
@@ -6632,10 +6674,10 @@ def Message processMessage(Message message) {{
                     sequence_flows.append(flow_str)
 
         # Add end event
-        end_event = templates.message_end_event_template(
+        end_event = fill(templates.message_end_event_template(
             id="EndEvent_2",
             name="End"
-        ).replace("{{incoming_flow}}", "SequenceFlow_End")
+        ), incoming_flow="SequenceFlow_End")
         process_components.append(end_event)
         used_ids.add("EndEvent_2")
 
@@ -7162,8 +7204,8 @@ def Message processMessage(Message message) {{
             name="Integration Process"
         )
 
-        # Replace the process content placeholder - IMPORTANT: Use double curly braces to escape them in f-strings
-        process_content_with_components = process_template.replace("{{process_content}}", real_process_content)
+        # Fill the process content placeholder
+        process_content_with_components = fill(process_template, process_content=real_process_content)
 
         # Generate the complete iFlow XML
         iflow_xml = templates.generate_iflow_xml(collaboration_content, process_content_with_components)
@@ -7172,7 +7214,7 @@ def Message processMessage(Message message) {{
         if "{{process_content}}" in iflow_xml:
             print("Warning: process_content placeholder was not replaced!")
             # Try a direct replacement as a fallback
-            iflow_xml = iflow_xml.replace("{{process_content}}", real_process_content)
+            iflow_xml = fill(iflow_xml, process_content=real_process_content)
 
         # Add proper BPMN diagram layout for ALL components
         iflow_xml = self._add_bpmn_diagram_layout(iflow_xml, participants, message_flows, process_components)
@@ -7,6 +7,9 @@ Based on analysis of real-world iFlow files and MuleSoft integration patterns.
 
 Each template is parameterized with placeholders that can be replaced
 with actual values when generating the iFlow from MuleSoft applications.
+Templates are compiled once, at import, in the shared iflow_template_engine
+registry; placeholders filled later (source_ref, incoming_flow, ...) stay as
+{{name}}.
 
 Key Features:
 - MuleSoft-specific component mappings
@@ -20,6 +23,8 @@ import xml.dom.minidom
 import re
 from typing import Dict, List, Optional, Union, Any
 
+from iflow_template_engine import TEMPLATES
+
 class EnhancedIFlowTemplates:
     """
     A comprehensive collection of templates for SAP Integration Suite components
@@ -136,22 +141,7 @@ class EnhancedIFlowTemplates:
 
     # ===== MuleSoft-Specific Adapter Templates =====
 
-    def mulesoft_http_listener_template(self, id, name, path="/api/*", method="GET", enable_cors="true"):
-        """
-        Template for MuleSoft HTTP Listener equivalent in SAP Integration Suite
-        Maps to HTTP Sender adapter with appropriate configuration
-
-        Args:
-            id (str): Component ID
-            name (str): Component name
-            path (str): HTTP path pattern
-            method (str): HTTP method
-            enable_cors (str): Enable CORS support
-
-        Returns:
-            str: XML template for HTTP Sender equivalent
-        """
-        return f'''<bpmn2:messageFlow id="{id}" name="HTTP Listener" sourceRef="{{{{source_ref}}}}" targetRef="{{{{target_ref}}}}">
+    MULESOFT_HTTP_LISTENER_TEMPLATE = TEMPLATES.register('mulesoft_http_listener', '''<bpmn2:messageFlow id="{{id}}" name="HTTP Listener" sourceRef="{{source_ref}}" targetRef="{{target_ref}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>ComponentType</key>
@@ -159,19 +149,19 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>Description</key>
-                    <value>MuleSoft HTTP Listener equivalent - {name}</value>
+                    <value>MuleSoft HTTP Listener equivalent - {{name}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>address</key>
-                    <value>{path}</value>
+                    <value>{{path}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>allowedMethods</key>
-                    <value>{method}</value>
+                    <value>{{method}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>corsEnabled</key>
-                    <value>{enable_cors}</value>
+                    <value>{{enable_cors}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>componentVersion</key>
@@ -186,24 +176,27 @@ class EnhancedIFlowTemplates:
                     <value>1.9.0</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-        </bpmn2:messageFlow>'''
+        </bpmn2:messageFlow>''')
 
-    def mulesoft_http_request_template(self, id, name, url, method="GET", timeout="30000"):
+    def mulesoft_http_listener_template(self, id, name, path="/api/*", method="GET", enable_cors="true"):
         """
-        Template for MuleSoft HTTP Request equivalent in SAP Integration Suite
-        Maps to HTTP Receiver adapter
+        Template for MuleSoft HTTP Listener equivalent in SAP Integration Suite
+        Maps to HTTP Sender adapter with appropriate configuration
 
         Args:
             id (str): Component ID
             name (str): Component name
-            url (str): Target URL
+            path (str): HTTP path pattern
             method (str): HTTP method
-            timeout (str): Request timeout
+            enable_cors (str): Enable CORS support
 
         Returns:
-            str: XML template for HTTP Receiver equivalent
+            str: XML template for HTTP Sender equivalent
         """
-        return f'''<bpmn2:messageFlow id="{id}" name="HTTP Request" sourceRef="{{{{source_ref}}}}" targetRef="{{{{target_ref}}}}">
+        return self.MULESOFT_HTTP_LISTENER_TEMPLATE.render(
+            id=id, name=name, path=path, method=method, enable_cors=enable_cors)
+
+    MULESOFT_HTTP_REQUEST_TEMPLATE = TEMPLATES.register('mulesoft_http_request', '''<bpmn2:messageFlow id="{{id}}" name="HTTP Request" sourceRef="{{source_ref}}" targetRef="{{target_ref}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>ComponentType</key>
@@ -211,19 +204,19 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>Description</key>
-                    <value>MuleSoft HTTP Request equivalent - {name}</value>
+                    <value>MuleSoft HTTP Request equivalent - {{name}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>address</key>
-                    <value>{url}</value>
+                    <value>{{url}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>httpMethod</key>
-                    <value>{method}</value>
+                    <value>{{method}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>httpRequestTimeout</key>
-                    <value>{timeout}</value>
+                    <value>{{timeout}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>componentVersion</key>
@@ -238,7 +231,25 @@ class EnhancedIFlowTemplates:
                     <value>1.9.0</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-        </bpmn2:messageFlow>'''
+        </bpmn2:messageFlow>''')
+
+    def mulesoft_http_request_template(self, id, name, url, method="GET", timeout="30000"):
+        """
+        Template for MuleSoft HTTP Request equivalent in SAP Integration Suite
+        Maps to HTTP Receiver adapter
+
+        Args:
+            id (str): Component ID
+            name (str): Component name
+            url (str): Target URL
+            method (str): HTTP method
+            timeout (str): Request timeout
+
+        Returns:
+            str: XML template for HTTP Receiver equivalent
+        """
+        return self.MULESOFT_HTTP_REQUEST_TEMPLATE.render(
+            id=id, name=name, url=url, method=method, timeout=timeout)
 
     # ===== OData Templates =====
 
@@ -453,18 +464,7 @@ class EnhancedIFlowTemplates:
             <bpmn2:outgoing>{{{{outgoing_flow}}}}</bpmn2:outgoing>
         </bpmn2:callActivity>'''
 
-    def mulesoft_transform_message_template(self, id, name, transformation_script="", output_format="application/json"):
-        """
-        Template for MuleSoft Transform Message equivalent using Groovy Script
-        Maps MuleSoft DataWeave transformations to SAP Integration Suite Groovy scripts
-
-        Args:
-            id (str): Component ID
-            name (str): Component name
-            transformation_script (str): Groovy transformation script
-            output_format (str): Output format (application/json, application/xml, etc.)
-        """
-        return f'''<bpmn2:callActivity id="{id}" name="{name}">
+    MULESOFT_TRANSFORM_MESSAGE_TEMPLATE = TEMPLATES.register('mulesoft_transform_message', '''<bpmn2:callActivity id="{{id}}" name="{{name}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>scriptFunction</key>
@@ -472,7 +472,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>script</key>
-                    <value>{transformation_script}</value>
+                    <value>{{transformation_script|raw}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>componentVersion</key>
@@ -488,32 +488,36 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>outputFormat</key>
-                    <value>{output_format}</value>
+                    <value>{{output_format}}</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-            <bpmn2:incoming>{{{{incoming_flow}}}}</bpmn2:incoming>
-            <bpmn2:outgoing>{{{{outgoing_flow}}}}</bpmn2:outgoing>
-        </bpmn2:callActivity>'''
+            <bpmn2:incoming>{{incoming_flow}}</bpmn2:incoming>
+            <bpmn2:outgoing>{{outgoing_flow}}</bpmn2:outgoing>
+        </bpmn2:callActivity>''')
 
-    def json_to_xml_converter_template(self, id, name, root_element="root", suppress_json_root="false"):
+    def mulesoft_transform_message_template(self, id, name, transformation_script="", output_format="application/json"):
         """
-        Template for JSON to XML Converter - common in MuleSoft flows
+        Template for MuleSoft Transform Message equivalent using Groovy Script
+        Maps MuleSoft DataWeave transformations to SAP Integration Suite Groovy scripts
 
         Args:
             id (str): Component ID
             name (str): Component name
-            root_element (str): Root element name for XML
-            suppress_json_root (str): Suppress JSON root element
+            transformation_script (str): Groovy transformation script
+            output_format (str): Output format (application/json, application/xml, etc.)
         """
-        return f'''<bpmn2:callActivity id="{id}" name="{name}">
+        return self.MULESOFT_TRANSFORM_MESSAGE_TEMPLATE.render(
+            id=id, name=name, transformation_script=transformation_script, output_format=output_format)
+
+    JSON_TO_XML_CONVERTER_TEMPLATE = TEMPLATES.register('json_to_xml_converter', '''<bpmn2:callActivity id="{{id}}" name="{{name}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>additionalRootElementName</key>
-                    <value>{root_element}</value>
+                    <value>{{root_element}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>suppressJsonRootElement</key>
-                    <value>{suppress_json_root}</value>
+                    <value>{{suppress_json_root}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>componentVersion</key>
@@ -528,29 +532,32 @@ class EnhancedIFlowTemplates:
                     <value>ctype::FlowstepVariant/cname::JsonToXmlConverter/version::1.1.2</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-            <bpmn2:incoming>{{{{incoming_flow}}}}</bpmn2:incoming>
-            <bpmn2:outgoing>{{{{outgoing_flow}}}}</bpmn2:outgoing>
-        </bpmn2:callActivity>'''
+            <bpmn2:incoming>{{incoming_flow}}</bpmn2:incoming>
+            <bpmn2:outgoing>{{outgoing_flow}}</bpmn2:outgoing>
+        </bpmn2:callActivity>''')
 
-    def xml_to_json_converter_template(self, id, name, json_output_encoding="UTF-8", suppress_json_root="false"):
+    def json_to_xml_converter_template(self, id, name, root_element="root", suppress_json_root="false"):
         """
-        Template for XML to JSON Converter - common in MuleSoft flows
+        Template for JSON to XML Converter - common in MuleSoft flows
 
         Args:
             id (str): Component ID
             name (str): Component name
-            json_output_encoding (str): JSON output encoding
+            root_element (str): Root element name for XML
             suppress_json_root (str): Suppress JSON root element
         """
-        return f'''<bpmn2:callActivity id="{id}" name="{name}">
+        return self.JSON_TO_XML_CONVERTER_TEMPLATE.render(
+            id=id, name=name, root_element=root_element, suppress_json_root=suppress_json_root)
+
+    XML_TO_JSON_CONVERTER_TEMPLATE = TEMPLATES.register('xml_to_json_converter', '''<bpmn2:callActivity id="{{id}}" name="{{name}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>jsonOutputEncoding</key>
-                    <value>{json_output_encoding}</value>
+                    <value>{{json_output_encoding}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>suppressJsonRootElement</key>
-                    <value>{suppress_json_root}</value>
+                    <value>{{suppress_json_root}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>componentVersion</key>
@@ -565,12 +572,50 @@ class EnhancedIFlowTemplates:
                     <value>ctype::FlowstepVariant/cname::XmlToJsonConverter/version::1.1.2</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-            <bpmn2:incoming>{{{{incoming_flow}}}}</bpmn2:incoming>
-            <bpmn2:outgoing>{{{{outgoing_flow}}}}</bpmn2:outgoing>
-        </bpmn2:callActivity>'''
+            <bpmn2:incoming>{{incoming_flow}}</bpmn2:incoming>
+            <bpmn2:outgoing>{{outgoing_flow}}</bpmn2:outgoing>
+        </bpmn2:callActivity>''')
+
+    def xml_to_json_converter_template(self, id, name, json_output_encoding="UTF-8", suppress_json_root="false"):
+        """
+        Template for XML to JSON Converter - common in MuleSoft flows
+
+        Args:
+            id (str): Component ID
+            name (str): Component name
+            json_output_encoding (str): JSON output encoding
+            suppress_json_root (str): Suppress JSON root element
+        """
+        return self.XML_TO_JSON_CONVERTER_TEMPLATE.render(
+            id=id, name=name, json_output_encoding=json_output_encoding,
+            suppress_json_root=suppress_json_root)
 
     # ===== Flow Control Templates =====
 
+    MULESOFT_CHOICE_ROUTER_TEMPLATE = TEMPLATES.register('mulesoft_choice_router', '''<bpmn2:exclusiveGateway id="{{id}}" name="{{name}}">
+            <bpmn2:extensionElements>
+                <ifl:property>
+                    <key>componentVersion</key>
+                    <value>1.0</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>activityType</key>
+                    <value>Router</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>cmdVariantUri</key>
+                    <value>ctype::FlowstepVariant/cname::Router/version::1.0.0</value>
+                </ifl:property>{{conditions_xml|raw}}
+                <ifl:property>
+                    <key>otherwiseRoute</key>
+                    <value>{{otherwise_flow}}</value>
+                </ifl:property>
+            </bpmn2:extensionElements>
+            <bpmn2:incoming>{{incoming_flow}}</bpmn2:incoming>
+            <bpmn2:outgoing>{{outgoing_flow_1}}</bpmn2:outgoing>
+            <bpmn2:outgoing>{{outgoing_flow_2}}</bpmn2:outgoing>
+        </bpmn2:exclusiveGateway>''')
+
     def mulesoft_choice_router_template(self, id, name, when_conditions=None, otherwise_flow=""):
         """
         Template for MuleSoft Choice Router equivalent using Router
@@ -597,29 +642,31 @@ class EnhancedIFlowTemplates:
                     <value>{condition.get('flow', '')}</value>
                 </ifl:property>'''
 
-        return f'''<bpmn2:exclusiveGateway id="{id}" name="{name}">
+        return self.MULESOFT_CHOICE_ROUTER_TEMPLATE.render(
+            id=id, name=name, conditions_xml=conditions_xml, otherwise_flow=otherwise_flow)
+
+    MULESOFT_SCATTER_GATHER_TEMPLATE = TEMPLATES.register('mulesoft_scatter_gather', '''<bpmn2:callActivity id="{{id}}" name="{{name}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>componentVersion</key>
-                    <value>1.0</value>
+                    <value>1.2</value>
                 </ifl:property>
                 <ifl:property>
                     <key>activityType</key>
-                    <value>Router</value>
+                    <value>Multicast</value>
                 </ifl:property>
                 <ifl:property>
                     <key>cmdVariantUri</key>
-                    <value>ctype::FlowstepVariant/cname::Router/version::1.0.0</value>
-                </ifl:property>{conditions_xml}
+                    <value>ctype::FlowstepVariant/cname::Multicast/version::1.2.0</value>
+                </ifl:property>{{routes_xml|raw}}
                 <ifl:property>
-                    <key>otherwiseRoute</key>
-                    <value>{otherwise_flow}</value>
+                    <key>parallelProcessing</key>
+                    <value>true</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-            <bpmn2:incoming>{{{{incoming_flow}}}}</bpmn2:incoming>
-            <bpmn2:outgoing>{{{{outgoing_flow_1}}}}</bpmn2:outgoing>
-            <bpmn2:outgoing>{{{{outgoing_flow_2}}}}</bpmn2:outgoing>
-        </bpmn2:exclusiveGateway>'''
+            <bpmn2:incoming>{{incoming_flow}}</bpmn2:incoming>
+            <bpmn2:outgoing>{{outgoing_flow}}</bpmn2:outgoing>
+        </bpmn2:callActivity>''')
 
     def mulesoft_scatter_gather_template(self, id, name, parallel_routes=None):
         """
@@ -642,30 +689,38 @@ class EnhancedIFlowTemplates:
                     <value>{route.get('name', f'Route_{i}')}</value>
                 </ifl:property>'''
 
-        return f'''<bpmn2:callActivity id="{id}" name="{name}">
+        return self.MULESOFT_SCATTER_GATHER_TEMPLATE.render(id=id, name=name, routes_xml=routes_xml)
+
+    # ===== Error Handling Templates =====
+
+    MULESOFT_ERROR_HANDLER_TEMPLATE = TEMPLATES.register('mulesoft_error_handler', '''<bpmn2:subProcess id="{{id}}" name="{{name}}" triggeredByEvent="true">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>componentVersion</key>
-                    <value>1.2</value>
+                    <value>1.0</value>
                 </ifl:property>
                 <ifl:property>
                     <key>activityType</key>
-                    <value>Multicast</value>
+                    <value>ExceptionSubprocess</value>
                 </ifl:property>
                 <ifl:property>
                     <key>cmdVariantUri</key>
-                    <value>ctype::FlowstepVariant/cname::Multicast/version::1.2.0</value>
-                </ifl:property>{routes_xml}
+                    <value>ctype::FlowstepVariant/cname::ExceptionSubprocess/version::1.0.0</value>
+                </ifl:property>{{error_types_xml|raw}}
                 <ifl:property>
-                    <key>parallelProcessing</key>
-                    <value>true</value>
+                    <key>defaultHandler</key>
+                    <value>{{default_handler|raw}}</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-            <bpmn2:incoming>{{{{incoming_flow}}}}</bpmn2:incoming>
-            <bpmn2:outgoing>{{{{outgoing_flow}}}}</bpmn2:outgoing>
-        </bpmn2:callActivity>'''
-
-    # ===== Error Handling Templates =====
+            <bpmn2:startEvent id="{{id}}_start" name="Error Start">
+                <bpmn2:outgoing>{{id}}_flow</bpmn2:outgoing>
+                <bpmn2:errorEventDefinition/>
+            </bpmn2:startEvent>
+            <bpmn2:endEvent id="{{id}}_end" name="Error End">
+                <bpmn2:incoming>{{id}}_flow</bpmn2:incoming>
+            </bpmn2:endEvent>
+            <bpmn2:sequenceFlow id="{{id}}_flow" sourceRef="{{id}}_start" targetRef="{{id}}_end"/>
+        </bpmn2:subProcess>''')
 
     def mulesoft_error_handler_template(self, id, name, error_types=None, default_handler=""):
         """
@@ -689,34 +744,8 @@ class EnhancedIFlowTemplates:
                     <value>{error_type}</value>
                 </ifl:property>'''
 
-        return f'''<bpmn2:subProcess id="{id}" name="{name}" triggeredByEvent="true">
-            <bpmn2:extensionElements>
-                <ifl:property>
-                    <key>componentVersion</key>
-                    <value>1.0</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>activityType</key>
-                    <value>ExceptionSubprocess</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>cmdVariantUri</key>
-                    <value>ctype::FlowstepVariant/cname::ExceptionSubprocess/version::1.0.0</value>
-                </ifl:property>{error_types_xml}
-                <ifl:property>
-                    <key>defaultHandler</key>
-                    <value>{default_handler}</value>
-                </ifl:property>
-            </bpmn2:extensionElements>
-            <bpmn2:startEvent id="{id}_start" name="Error Start">
-                <bpmn2:outgoing>{id}_flow</bpmn2:outgoing>
-                <bpmn2:errorEventDefinition/>
-            </bpmn2:startEvent>
-            <bpmn2:endEvent id="{id}_end" name="Error End">
-                <bpmn2:incoming>{id}_flow</bpmn2:incoming>
-            </bpmn2:endEvent>
-            <bpmn2:sequenceFlow id="{id}_flow" sourceRef="{id}_start" targetRef="{id}_end"/>
-        </bpmn2:subProcess>'''
+        return self.MULESOFT_ERROR_HANDLER_TEMPLATE.render(
+            id=id, name=name, error_types_xml=error_types_xml, default_handler=default_handler)
 
     def groovy_script_template(self, id, name, script_name="", script_function="processData", script_content=""):
         """
@@ -794,15 +823,7 @@ class EnhancedIFlowTemplates:
             {{{{process_content}}}}
         </bpmn2:process>'''
 
-    def start_event_template(self, id, name="Start"):
-        """
-        Template for Start Event
-
-        Args:
-            id (str): Event ID
-            name (str): Event name
-        """
-        return f'''<bpmn2:startEvent id="{id}" name="{name}">
+    START_EVENT_TEMPLATE = TEMPLATES.register('start_event', '''<bpmn2:startEvent id="{{id}}" name="{{name}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>componentVersion</key>
@@ -813,19 +834,21 @@ class EnhancedIFlowTemplates:
                     <value>ctype::FlowstepVariant/cname::MessageStartEvent/version::1.0</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-            <bpmn2:outgoing>{{{{outgoing_flow}}}}</bpmn2:outgoing>
+            <bpmn2:outgoing>{{outgoing_flow}}</bpmn2:outgoing>
             <bpmn2:messageEventDefinition/>
-        </bpmn2:startEvent>'''
+        </bpmn2:startEvent>''')
 
-    def end_event_template(self, id, name="End"):
+    def start_event_template(self, id, name="Start"):
         """
-        Template for End Event
+        Template for Start Event
 
         Args:
             id (str): Event ID
             name (str): Event name
         """
-        return f'''<bpmn2:endEvent id="{id}" name="{name}">
+        return self.START_EVENT_TEMPLATE.render(id=id, name=name)
+
+    END_EVENT_TEMPLATE = TEMPLATES.register('end_event', '''<bpmn2:endEvent id="{{id}}" name="{{name}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>componentVersion</key>
@@ -836,9 +859,19 @@ class EnhancedIFlowTemplates:
                     <value>ctype::FlowstepVariant/cname::MessageEndEvent/version::1.1.0</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-            <bpmn2:incoming>{{{{incoming_flow}}}}</bpmn2:incoming>
+            <bpmn2:incoming>{{incoming_flow}}</bpmn2:incoming>
             <bpmn2:messageEventDefinition/>
-        </bpmn2:endEvent>'''
+        </bpmn2:endEvent>''')
+
+    def end_event_template(self, id, name="End"):
+        """
+        Template for End Event
+
+        Args:
+            id (str): Event ID
+            name (str): Event name
+        """
+        return self.END_EVENT_TEMPLATE.render(id=id, name=name)
 
     def sequence_flow_template(self, id, source_ref, target_ref, name=""):
         """
@@ -966,44 +999,8 @@ class EnhancedIFlowTemplates:
         Returns:
             str: XML template for iFlow configuration
         """
-        return f'''<bpmn2:extensionElements>
-            <ifl:property>
-                <key>namespaceMapping</key>
-                <value>{namespace_mapping}</value>
-            </ifl:property>
-            <ifl:property>
-                <key>httpSessionHandling</key>
-                <value>None</value>
-            </ifl:property>
-            <ifl:property>
-                <key>returnExceptionToSender</key>
-                <value>false</value>
-            </ifl:property>
-            <ifl:property>
-                <key>log</key>
-                <value>{log_level}</value>
-            </ifl:property>
-            <ifl:property>
-                <key>corsEnabled</key>
-                <value>false</value>
-            </ifl:property>
-            <ifl:property>
-                <key>componentVersion</key>
-                <value>1.2</value>
-            </ifl:property>
-            <ifl:property>
-                <key>ServerTrace</key>
-                <value>false</value>
-            </ifl:property>
-            <ifl:property>
-                <key>xsrfProtection</key>
-                <value>{csrf_protection}</value>
-            </ifl:property>
-            <ifl:property>
-                <key>cmdVariantUri</key>
-                <value>ctype::IFlowVariant/cname::IFlowConfiguration/version::1.2.4</value>
-            </ifl:property>
-        </bpmn2:extensionElements>'''
+        return TEMPLATES.render('iflow_configuration',
+            namespace_mapping=namespace_mapping, log_level=log_level, csrf_protection=csrf_protection)
 
     # ===== Participant Templates =====
 
@@ -1022,20 +1019,9 @@ class EnhancedIFlowTemplates:
         """
         auth_element = ""
         if type == "EndpointSender":
-            auth_element = f'''
-                <ifl:property>
-                    <key>enableBasicAuthentication</key>
-                    <value>{enable_basic_auth}</value>
-                </ifl:property>'''
+            auth_element = TEMPLATES.render('participant_basic_auth', enable_basic_auth=enable_basic_auth)
 
-        return f'''<bpmn2:participant id="{id}" ifl:type="{type}" name="{name}">
-            <bpmn2:extensionElements>{auth_element}
-                <ifl:property>
-                    <key>ifl:type</key>
-                    <value>{type}</value>
-                </ifl:property>
-            </bpmn2:extensionElements>
-        </bpmn2:participant>'''
+        return TEMPLATES.render('participant', id=id, type=type, name=name, auth_element=auth_element)
 
     def integration_process_participant_template(self, id, name, process_ref):
         """
@@ -1049,21 +1035,11 @@ class EnhancedIFlowTemplates:
         Returns:
             str: XML template for Integration Process Participant
         """
-        return f'''<bpmn2:participant id="{id}" ifl:type="IntegrationProcess" name="{name}" processRef="{process_ref}">
-            <bpmn2:extensionElements/>
-        </bpmn2:participant>'''
+        return TEMPLATES.render('integration_process_participant', id=id, name=name, process_ref=process_ref)
 
     # ===== Adapter Templates =====
 
-    def odata_receiver_template(self, id, name, service_url, entity_set="", auth_method="None", credential_name="", timeout="60000", system=""):
-        """
-        Template for OData Receiver Adapter with default values for empty properties
-        """
-        # Ensure serviceUrl has a default value
-        if not service_url:
-            service_url = "https://example.com/odata/service"
-
-        return f'''<bpmn2:messageFlow id="{id}" name="OData" sourceRef="{{{{source_ref}}}}" targetRef="{{{{target_ref}}}}">
+    ODATA_RECEIVER_TEMPLATE = TEMPLATES.register('odata_receiver', '''<bpmn2:messageFlow id="{{id}}" name="OData" sourceRef="{{source_ref}}" targetRef="{{target_ref}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>ComponentType</key>
@@ -1075,11 +1051,11 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>serviceUrl</key>
-                    <value>{service_url}</value>
+                    <value>{{service_url}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>entitySet</key>
-                    <value>{entity_set}</value>
+                    <value>{{entity_set}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>ComponentNS</key>
@@ -1095,15 +1071,15 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>authenticationMethod</key>
-                    <value>{auth_method}</value>
+                    <value>{{auth_method}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>credentialName</key>
-                    <value>{credential_name}</value>
+                    <value>{{credential_name}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>httpRequestTimeout</key>
-                    <value>{timeout}</value>
+                    <value>{{timeout}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>TransportProtocol</key>
@@ -1127,10 +1103,22 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>system</key>
-                    <value>{system}</value>
+                    <value>{{system}}</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-        </bpmn2:messageFlow>'''
+        </bpmn2:messageFlow>''')
+
+    def odata_receiver_template(self, id, name, service_url, entity_set="", auth_method="None", credential_name="", timeout="60000", system=""):
+        """
+        Template for OData Receiver Adapter with default values for empty properties
+        """
+        # Ensure serviceUrl has a default value
+        if not service_url:
+            service_url = "https://example.com/odata/service"
+
+        return self.ODATA_RECEIVER_TEMPLATE.render(
+            id=id, service_url=service_url, entity_set=entity_set, auth_method=auth_method,
+            credential_name=credential_name, timeout=timeout, system=system)
 
     def edmx_template(self, namespace, entity_type_name, properties):
         """
@@ -1173,26 +1161,7 @@ class EnhancedIFlowTemplates:
   </edmx:DataServices>
 </edmx:Edmx>'''
 
-    def http_receiver_template(self, id, name, address, auth_method="None", credential_name="",
-                              timeout="60000", throw_exception="true", system="", http_method="POST"):
-        """
-        Template for HTTP Receiver Adapter
-
-        Args:
-            id (str): Component ID
-            name (str): Component name
-            address (str): HTTP endpoint address
-            auth_method (str): Authentication method
-            credential_name (str): Credential name
-            timeout (str): Request timeout in milliseconds
-            throw_exception (str): Throw exception on failure ("true"/"false")
-            system (str): System name
-            http_method (str): HTTP method (GET, POST, PUT, DELETE)
-
-        Returns:
-            str: XML template for HTTP Receiver Adapter
-        """
-        return f'''<bpmn2:messageFlow id="{id}" name="HTTP" sourceRef="{{{{source_ref}}}}" targetRef="{{{{target_ref}}}}">
+    HTTP_RECEIVER_TEMPLATE = TEMPLATES.register('http_receiver', '''<bpmn2:messageFlow id="{{id}}" name="HTTP" sourceRef="{{source_ref}}" targetRef="{{target_ref}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>Description</key>
@@ -1200,7 +1169,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>httpMethod</key>
-                    <value>{http_method}</value>
+                    <value>{{http_method}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>ComponentType</key>
@@ -1208,7 +1177,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>httpRequestTimeout</key>
-                    <value>{timeout}</value>
+                    <value>{{timeout}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>TransportProtocol</key>
@@ -1216,11 +1185,11 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>authenticationMethod</key>
-                    <value>{auth_method}</value>
+                    <value>{{auth_method}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>credentialName</key>
-                    <value>{credential_name}</value>
+                    <value>{{credential_name}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>MessageProtocol</key>
@@ -1228,7 +1197,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>httpAddressWithoutQuery</key>
-                    <value>{address}</value>
+                    <value>{{address}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>direction</key>
@@ -1236,11 +1205,11 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>throwExceptionOnFailure</key>
-                    <value>{throw_exception}</value>
+                    <value>{{throw_exception}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>system</key>
-                    <value>{system}</value>
+                    <value>{{system}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>componentVersion</key>
@@ -1251,17 +1220,32 @@ class EnhancedIFlowTemplates:
                     <value>ctype::AdapterVariant/cname::sap:HTTP/tp::HTTP/mp::None/direction::Receiver/version::1.15.0</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-        </bpmn2:messageFlow>'''
+        </bpmn2:messageFlow>''')
 
-    def https_sender_template(self, id, name, url_path, sender_auth="None", user_role="ESBMessaging.send", csrf_protection="false", client_certificates=""):
+    def http_receiver_template(self, id, name, address, auth_method="None", credential_name="",
+                              timeout="60000", throw_exception="true", system="", http_method="POST"):
         """
-        Template for HTTPS Sender Adapter with default values for empty properties
+        Template for HTTP Receiver Adapter
+
+        Args:
+            id (str): Component ID
+            name (str): Component name
+            address (str): HTTP endpoint address
+            auth_method (str): Authentication method
+            credential_name (str): Credential name
+            timeout (str): Request timeout in milliseconds
+            throw_exception (str): Throw exception on failure ("true"/"false")
+            system (str): System name
+            http_method (str): HTTP method (GET, POST, PUT, DELETE)
+
+        Returns:
+            str: XML template for HTTP Receiver Adapter
         """
-        # Ensure url_path has a default value
-        if not url_path:
-            url_path = "/"
+        return self.HTTP_RECEIVER_TEMPLATE.render(
+            id=id, http_method=http_method, timeout=timeout, auth_method=auth_method,
+            credential_name=credential_name, address=address, throw_exception=throw_exception, system=system)
 
-        return f'''<bpmn2:messageFlow id="{id}" name="HTTPS" sourceRef="{{{{source_ref}}}}" targetRef="{{{{target_ref}}}}">
+    HTTPS_SENDER_TEMPLATE = TEMPLATES.register('https_sender', '''<bpmn2:messageFlow id="{{id}}" name="HTTPS" sourceRef="{{source_ref}}" targetRef="{{target_ref}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>ComponentType</key>
@@ -1285,7 +1269,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>urlPath</key>
-                    <value>{url_path}</value>
+                    <value>{{url_path}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>TransportProtocolVersion</key>
@@ -1293,7 +1277,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>xsrfProtection</key>
-                    <value>{csrf_protection}</value>
+                    <value>{{csrf_protection}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>TransportProtocol</key>
@@ -1305,11 +1289,11 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>userRole</key>
-                    <value>{user_role}</value>
+                    <value>{{user_role}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>senderAuthType</key>
-                    <value>{sender_auth}</value>
+                    <value>{{sender_auth}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>MessageProtocol</key>
@@ -1325,32 +1309,25 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>clientCertificates</key>
-                    <value>{client_certificates}</value>
+                    <value>{{client_certificates}}</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-        </bpmn2:messageFlow>'''
-
+        </bpmn2:messageFlow>''')
 
-    def soap_receiver_template(self, id, name, address, auth_method="None", credential_name="",
-                              timeout="60000", system="", compress_message="false", location_id=""):
+    def https_sender_template(self, id, name, url_path, sender_auth="None", user_role="ESBMessaging.send", csrf_protection="false", client_certificates=""):
         """
-        Template for SOAP Receiver Adapter
+        Template for HTTPS Sender Adapter with default values for empty properties
+        """
+        # Ensure url_path has a default value
+        if not url_path:
+            url_path = "/"
 
-        Args:
-            id (str): Component ID
-            name (str): Component name
-            address (str): SOAP endpoint address
-            auth_method (str): Authentication method
-            credential_name (str): Credential name
-            timeout (str): Request timeout in milliseconds
-            system (str): System name
-            compress_message (str): Compress message ("true"/"false")
-            location_id (str): Location ID
+        return self.HTTPS_SENDER_TEMPLATE.render(
+            id=id, url_path=url_path, csrf_protection=csrf_protection, user_role=user_role,
+            sender_auth=sender_auth, client_certificates=client_certificates)
 
-        Returns:
-            str: XML template for SOAP Receiver Adapter
-        """
-        return f'''<bpmn2:messageFlow id="{id}" name="SOAP" sourceRef="{{{{source_ref}}}}" targetRef="{{{{target_ref}}}}">
+
+    SOAP_RECEIVER_TEMPLATE = TEMPLATES.register('soap_receiver', '''<bpmn2:messageFlow id="{{id}}" name="SOAP" sourceRef="{{source_ref}}" targetRef="{{target_ref}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>cleanupHeaders</key>
@@ -1366,7 +1343,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>location_id</key>
-                    <value>{location_id}</value>
+                    <value>{{location_id}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>TransportProtocolVersion</key>
@@ -1378,7 +1355,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>CompressMessage</key>
-                    <value>{compress_message}</value>
+                    <value>{{compress_message}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>MessageProtocol</key>
@@ -1386,7 +1363,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>requestTimeout</key>
-                    <value>{timeout}</value>
+                    <value>{{timeout}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>direction</key>
@@ -1394,7 +1371,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>authentication</key>
-                    <value>{auth_method}</value>
+                    <value>{{auth_method}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>ComponentType</key>
@@ -1402,7 +1379,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>address</key>
-                    <value>{address}</value>
+                    <value>{{address}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>allowChunking</key>
@@ -1418,7 +1395,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>system</key>
-                    <value>{system}</value>
+                    <value>{{system}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>TransportProtocol</key>
@@ -1430,14 +1407,37 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>credentialName</key>
-                    <value>{credential_name}</value>
+                    <value>{{credential_name}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>MessageProtocolVersion</key>
                     <value>1.10.0</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-        </bpmn2:messageFlow>'''
+        </bpmn2:messageFlow>''')
+
+    def soap_receiver_template(self, id, name, address, auth_method="None", credential_name="",
+                              timeout="60000", system="", compress_message="false", location_id=""):
+        """
+        Template for SOAP Receiver Adapter
+
+        Args:
+            id (str): Component ID
+            name (str): Component name
+            address (str): SOAP endpoint address
+            auth_method (str): Authentication method
+            credential_name (str): Credential name
+            timeout (str): Request timeout in milliseconds
+            system (str): System name
+            compress_message (str): Compress message ("true"/"false")
+            location_id (str): Location ID
+
+        Returns:
+            str: XML template for SOAP Receiver Adapter
+        """
+        return self.SOAP_RECEIVER_TEMPLATE.render(
+            id=id, location_id=location_id, compress_message=compress_message, timeout=timeout,
+            auth_method=auth_method, address=address, system=system, credential_name=credential_name)
 
     def process_direct_template(self, id, name, address, system=""):
         """
@@ -1452,66 +1452,7 @@ class EnhancedIFlowTemplates:
         Returns:
             str: XML template for ProcessDirect Adapter
         """
-        return f'''<bpmn2:messageFlow id="{id}" name="ProcessDirect" sourceRef="{{{{source_ref}}}}" targetRef="{{{{target_ref}}}}">
-            <bpmn2:extensionElements>
-                <ifl:property>
-                    <key>ComponentType</key>
-                    <value>ProcessDirect</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>Description</key>
-                    <value/>
-                </ifl:property>
-                <ifl:property>
-                    <key>address</key>
-                    <value>{address}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>ComponentNS</key>
-                    <value>sap</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>Vendor</key>
-                    <value>SAP</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>componentVersion</key>
-                    <value>1.1</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>TransportProtocolVersion</key>
-                    <value>1.1.2</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>ComponentSWCVName</key>
-                    <value>external</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>system</key>
-                    <value>{system}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>TransportProtocol</key>
-                    <value>Not Applicable</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>cmdVariantUri</key>
-                    <value>ctype::AdapterVariant/cname::ProcessDirect/vendor::SAP/tp::Not Applicable/mp::Not Applicable/direction::Receiver/version::1.1.1</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>MessageProtocol</key>
-                    <value>Not Applicable</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>MessageProtocolVersion</key>
-                    <value>1.1.2</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>direction</key>
-                    <value>Receiver</value>
-                </ifl:property>
-            </bpmn2:extensionElements>
-        </bpmn2:messageFlow>'''
+        return TEMPLATES.render('process_direct', id=id, address=address, system=system)
 
     # ===== Process Component Templates =====
 
@@ -1528,40 +1469,7 @@ class EnhancedIFlowTemplates:
         Returns:
             str: XML template for Enricher
         """
-        return f'''<bpmn2:callActivity id="{id}" name="{name}">
-            <bpmn2:extensionElements>
-                <ifl:property>
-                    <key>bodyType</key>
-                    <value>{body_type}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>propertyTable</key>
-                    <value>[]</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>headerTable</key>
-                    <value>[]</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>wrapContent</key>
-                    <value>{wrap_content}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>componentVersion</key>
-                    <value>1.5</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>activityType</key>
-                    <value>Enricher</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>cmdVariantUri</key>
-                    <value>ctype::FlowstepVariant/cname::Enricher/version::1.5.1</value>
-                </ifl:property>
-            </bpmn2:extensionElements>
-            <bpmn2:incoming>SequenceFlow_1</bpmn2:incoming>
-            <bpmn2:outgoing>SequenceFlow_2</bpmn2:outgoing>
-        </bpmn2:callActivity>'''
+        return TEMPLATES.render('enricher', id=id, name=name, body_type=body_type, wrap_content=wrap_content)
 
     def content_modifier_template(self, id, name, property_table="", header_table="", body_type="expression", wrap_content="", content=""):
         """
@@ -1579,44 +1487,9 @@ class EnhancedIFlowTemplates:
         Returns:
             str: XML template for Content Modifier
         """
-        return f'''<bpmn2:callActivity id="{id}" name="{name}">
-            <bpmn2:extensionElements>
-                <ifl:property>
-                    <key>bodyType</key>
-                    <value>{body_type}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>propertyTable</key>
-                    <value>{property_table}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>headerTable</key>
-                    <value>{header_table}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>wrapContent</key>
-                    <value>{wrap_content}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>componentVersion</key>
-                    <value>1.5</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>activityType</key>
-                    <value>Enricher</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>cmdVariantUri</key>
-                    <value>ctype::FlowstepVariant/cname::Enricher/version::1.5.0</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>bodyContent</key>
-                    <value>{content}</value>
-                </ifl:property>
-            </bpmn2:extensionElements>
-            <bpmn2:incoming>SequenceFlow_1</bpmn2:incoming>
-            <bpmn2:outgoing>SequenceFlow_2</bpmn2:outgoing>
-        </bpmn2:callActivity>'''
+        return TEMPLATES.render('content_modifier',
+            id=id, name=name, body_type=body_type, property_table=property_table, header_table=header_table,
+            wrap_content=wrap_content, content=content)
 
     def content_enricher_template(self, id, name, property_table="", header_table="", body_type="expression", body_content="", wrap_content=""):
         """
@@ -1634,44 +1507,9 @@ class EnhancedIFlowTemplates:
         Returns:
             str: XML template for Content Enricher
         """
-        return f'''<bpmn2:callActivity id="{id}" name="{name}">
-            <bpmn2:extensionElements>
-                <ifl:property>
-                    <key>bodyType</key>
-                    <value>{body_type}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>propertyTable</key>
-                    <value>{property_table}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>headerTable</key>
-                    <value>{header_table}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>wrapContent</key>
-                    <value>{wrap_content}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>componentVersion</key>
-                    <value>1.4</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>activityType</key>
-                    <value>Enricher</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>cmdVariantUri</key>
-                    <value>ctype::FlowstepVariant/cname::Enricher/version::1.4.2</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>bodyContent</key>
-                    <value>{body_content}</value>
-                </ifl:property>
-            </bpmn2:extensionElements>
-            <bpmn2:incoming>SequenceFlow_1</bpmn2:incoming>
-            <bpmn2:outgoing>SequenceFlow_2</bpmn2:outgoing>
-        </bpmn2:callActivity>'''
+        return TEMPLATES.render('content_enricher',
+            id=id, name=name, body_type=body_type, property_table=property_table, header_table=header_table,
+            wrap_content=wrap_content, body_content=body_content)
 
     def router_template(self, id, name, conditions=[]):
         """
@@ -1704,23 +1542,11 @@ class EnhancedIFlowTemplates:
             <bpmn2:outgoing>SequenceFlow_2</bpmn2:outgoing>
         </bpmn2:exclusiveGateway>'''
 
-    def call_activity_template(self, id, name, activity_type):
-        """
-        Template for Call Activity (used for various component types)
-
-        Args:
-            id (str): Component ID
-            name (str): Component name
-            activity_type (str): Type of activity (e.g., "OData", "Router")
-
-        Returns:
-            str: XML template for Call Activity
-        """
-        return f'''<bpmn2:callActivity id="{id}" name="{name}">
+    CALL_ACTIVITY_TEMPLATE = TEMPLATES.register('call_activity', '''<bpmn2:callActivity id="{{id}}" name="{{name}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>componentType</key>
-                    <value>{activity_type}</value>
+                    <value>{{activity_type}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>componentVersion</key>
@@ -1729,21 +1555,23 @@ class EnhancedIFlowTemplates:
             </bpmn2:extensionElements>
             <bpmn2:incoming>SequenceFlow_1</bpmn2:incoming>
             <bpmn2:outgoing>SequenceFlow_2</bpmn2:outgoing>
-        </bpmn2:callActivity>'''
+        </bpmn2:callActivity>''')
 
-    def exception_subprocess_template(self, id, name, error_type="All"):
+    def call_activity_template(self, id, name, activity_type):
         """
-        Template for Exception Subprocess
+        Template for Call Activity (used for various component types)
 
         Args:
             id (str): Component ID
             name (str): Component name
-            error_type (str): Type of error to handle
+            activity_type (str): Type of activity (e.g., "OData", "Router")
 
         Returns:
-            str: XML template for Exception Subprocess
+            str: XML template for Call Activity
         """
-        return f'''<bpmn2:subProcess id="{id}" name="{name}" triggeredByEvent="true">
+        return self.CALL_ACTIVITY_TEMPLATE.render(id=id, name=name, activity_type=activity_type)
+
+    EXCEPTION_SUBPROCESS_TEMPLATE = TEMPLATES.register('exception_subprocess', '''<bpmn2:subProcess id="{{id}}" name="{{name}}" triggeredByEvent="true">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>componentVersion</key>
@@ -1766,26 +1594,27 @@ class EnhancedIFlowTemplates:
                 <bpmn2:incoming>SequenceFlow_3</bpmn2:incoming>
             </bpmn2:endEvent>
             <bpmn2:sequenceFlow id="SequenceFlow_3" sourceRef="StartEvent_1" targetRef="EndEvent_1"/>
-        </bpmn2:subProcess>'''
+        </bpmn2:subProcess>''')
 
-    def write_to_log_template(self, id, name, log_level="Info", message="Log message"):
+    def exception_subprocess_template(self, id, name, error_type="All"):
         """
-        Template for Write to Log
+        Template for Exception Subprocess
 
         Args:
             id (str): Component ID
             name (str): Component name
-            log_level (str): Log level (Info, Warning, Error)
-            message (str): Log message
+            error_type (str): Type of error to handle
 
         Returns:
-            str: XML template for Write to Log
+            str: XML template for Exception Subprocess
         """
-        return f'''<bpmn2:task id="{id}" name="{name}">
+        return self.EXCEPTION_SUBPROCESS_TEMPLATE.render(id=id, name=name)
+
+    WRITE_TO_LOG_TEMPLATE = TEMPLATES.register('write_to_log', '''<bpmn2:task id="{{id}}" name="{{name}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>logLevel</key>
-                    <value>{log_level}</value>
+                    <value>{{log_level}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>componentVersion</key>
@@ -1801,27 +1630,29 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>logMessage</key>
-                    <value>{message}</value>
+                    <value>{{message}}</value>
                 </ifl:property>
             </bpmn2:extensionElements>
             <bpmn2:incoming>SequenceFlow_1</bpmn2:incoming>
             <bpmn2:outgoing>SequenceFlow_2</bpmn2:outgoing>
-        </bpmn2:task>'''
+        </bpmn2:task>''')
 
-    def message_mapping_template(self, id, name, source_type="XML", target_type="XML"):
+    def write_to_log_template(self, id, name, log_level="Info", message="Log message"):
         """
-        Template for Message Mapping
+        Template for Write to Log
 
         Args:
             id (str): Component ID
             name (str): Component name
-            source_type (str): Source message type
-            target_type (str): Target message type
+            log_level (str): Log level (Info, Warning, Error)
+            message (str): Log message
 
         Returns:
-            str: XML template for Message Mapping
+            str: XML template for Write to Log
         """
-        return f'''<bpmn2:task id="{id}" name="{name}">
+        return self.WRITE_TO_LOG_TEMPLATE.render(id=id, name=name, log_level=log_level, message=message)
+
+    MESSAGE_MAPPING_TEMPLATE = TEMPLATES.register('message_mapping', '''<bpmn2:task id="{{id}}" name="{{name}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>mappinguri</key>
@@ -1829,7 +1660,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>mappingname</key>
-                    <value>{name}</value>
+                    <value>{{name}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>componentVersion</key>
@@ -1846,23 +1677,24 @@ class EnhancedIFlowTemplates:
             </bpmn2:extensionElements>
             <bpmn2:incoming>SequenceFlow_1</bpmn2:incoming>
             <bpmn2:outgoing>SequenceFlow_2</bpmn2:outgoing>
-        </bpmn2:task>'''
+        </bpmn2:task>''')
 
-    def enhanced_message_mapping_template(self, id, name, mapping_name="DataMapping", source_schema="Source.xsd", target_schema="Target.xsd"):
+    def message_mapping_template(self, id, name, source_type="XML", target_type="XML"):
         """
-        Enhanced Message Mapping template based on real SAP iFlow structure
-        
+        Template for Message Mapping
+
         Args:
-            id (str): Component ID
-            name (str): Component name
-            mapping_name (str): Name of the mapping bundle
-            source_schema (str): Source XSD file name
-            target_schema (str): Target XSD file name
-            
+            id (str): Component ID
+            name (str): Component name
+            source_type (str): Source message type
+            target_type (str): Target message type
+
         Returns:
-            str: XML template for enhanced Message Mapping
+            str: XML template for Message Mapping
         """
-        return f'''<bpmn2:callActivity id="{id}" name="{name}">
+        return self.MESSAGE_MAPPING_TEMPLATE.render(id=id, name=name)
+
+    ENHANCED_MESSAGE_MAPPING_TEMPLATE = TEMPLATES.register('enhanced_message_mapping', '''<bpmn2:callActivity id="{{id}}" name="{{name}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>componentVersion</key>
@@ -1878,7 +1710,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>mappinguri</key>
-                    <value>dir://mapping/{mapping_name}.mmap</value>
+                    <value>dir://mapping/{{mapping_name}}.mmap</value>
                 </ifl:property>
                 <ifl:property>
                     <key>mappingType</key>
@@ -1886,15 +1718,15 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>messageMappingBundleId</key>
-                    <value>{mapping_name}</value>
+                    <value>{{mapping_name}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>sourceSchema</key>
-                    <value>src/main/resources/xsd/{source_schema}</value>
+                    <value>src/main/resources/xsd/{{source_schema}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>targetSchema</key>
-                    <value>src/main/resources/xsd/{target_schema}</value>
+                    <value>src/main/resources/xsd/{{target_schema}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>customFunctions</key>
@@ -1903,15 +1735,29 @@ class EnhancedIFlowTemplates:
             </bpmn2:extensionElements>
             <bpmn2:incoming>SequenceFlow_1</bpmn2:incoming>
             <bpmn2:outgoing>SequenceFlow_2</bpmn2:outgoing>
-        </bpmn2:callActivity>'''
-
-    # ===== Event Templates =====
+        </bpmn2:callActivity>''')
 
-    def message_start_event_template(self, id, name):
+    def enhanced_message_mapping_template(self, id, name, mapping_name="DataMapping", source_schema="Source.xsd", target_schema="Target.xsd"):
         """
-        Template for Message Start Event with proper messageEventDefinition
+        Enhanced Message Mapping template based on real SAP iFlow structure
+        
+        Args:
+            id (str): Component ID
+            name (str): Component name
+            mapping_name (str): Name of the mapping bundle
+            source_schema (str): Source XSD file name
+            target_schema (str): Target XSD file name
+            
+        Returns:
+            str: XML template for enhanced Message Mapping
         """
-        return f'''<bpmn2:startEvent id="{id}" name="{name}">
+        return self.ENHANCED_MESSAGE_MAPPING_TEMPLATE.render(
+            id=id, name=name, mapping_name=mapping_name, source_schema=source_schema,
+            target_schema=target_schema)
+
+    # ===== Event Templates =====
+
+    MESSAGE_START_EVENT_TEMPLATE = TEMPLATES.register('message_start_event', '''<bpmn2:startEvent id="{{id}}" name="{{name}}">
                 <bpmn2:extensionElements>
                     <ifl:property>
                         <key>componentVersion</key>
@@ -1922,15 +1768,17 @@ class EnhancedIFlowTemplates:
                         <value>ctype::FlowstepVariant/cname::MessageStartEvent/version::1.0</value>
                     </ifl:property>
                 </bpmn2:extensionElements>
-                <bpmn2:outgoing>{{{{outgoing_flow}}}}</bpmn2:outgoing>
-                <bpmn2:messageEventDefinition id="MessageEventDefinition_{id}"/>
-            </bpmn2:startEvent>'''
+                <bpmn2:outgoing>{{outgoing_flow}}</bpmn2:outgoing>
+                <bpmn2:messageEventDefinition id="MessageEventDefinition_{{id}}"/>
+            </bpmn2:startEvent>''')
 
-    def message_end_event_template(self, id, name):
+    def message_start_event_template(self, id, name):
         """
-        Template for Message End Event with proper messageEventDefinition
+        Template for Message Start Event with proper messageEventDefinition
         """
-        return f'''<bpmn2:endEvent id="{id}" name="{name}">
+        return self.MESSAGE_START_EVENT_TEMPLATE.render(id=id, name=name)
+
+    MESSAGE_END_EVENT_TEMPLATE = TEMPLATES.register('message_end_event', '''<bpmn2:endEvent id="{{id}}" name="{{name}}">
                 <bpmn2:extensionElements>
                     <ifl:property>
                         <key>componentVersion</key>
@@ -1941,27 +1789,21 @@ class EnhancedIFlowTemplates:
                         <value>ctype::FlowstepVariant/cname::MessageEndEvent/version::1.1.0</value>
                     </ifl:property>
                 </bpmn2:extensionElements>
-                <bpmn2:incoming>{{{{incoming_flow}}}}</bpmn2:incoming>
-                <bpmn2:messageEventDefinition id="MessageEventDefinition_{id}"/>
-            </bpmn2:endEvent>'''
+                <bpmn2:incoming>{{incoming_flow}}</bpmn2:incoming>
+                <bpmn2:messageEventDefinition id="MessageEventDefinition_{{id}}"/>
+            </bpmn2:endEvent>''')
 
-    def timer_start_event_template(self, id, name, schedule_key):
+    def message_end_event_template(self, id, name):
         """
-        Template for Timer Start Event
-
-        Args:
-            id (str): Component ID
-            name (str): Component name
-            schedule_key (str): Timer schedule expression (e.g., "0 0 * * * ?")
-
-        Returns:
-            str: XML template for Timer Start Event
+        Template for Message End Event with proper messageEventDefinition
         """
-        return f'''<bpmn2:startEvent id="{id}" name="{name}">
+        return self.MESSAGE_END_EVENT_TEMPLATE.render(id=id, name=name)
+
+    TIMER_START_EVENT_TEMPLATE = TEMPLATES.register('timer_start_event', '''<bpmn2:startEvent id="{{id}}" name="{{name}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>scheduleKey</key>
-                    <value>{schedule_key}</value>
+                    <value>{{schedule_key}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>componentVersion</key>
@@ -1976,9 +1818,23 @@ class EnhancedIFlowTemplates:
                     <value>StartTimerEvent</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-            <bpmn2:outgoing>{{{{outgoing_flow}}}}</bpmn2:outgoing>
-            <bpmn2:timerEventDefinition id="TimerEventDefinition_{id}"/>
-        </bpmn2:startEvent>'''
+            <bpmn2:outgoing>{{outgoing_flow}}</bpmn2:outgoing>
+            <bpmn2:timerEventDefinition id="TimerEventDefinition_{{id}}"/>
+        </bpmn2:startEvent>''')
+
+    def timer_start_event_template(self, id, name, schedule_key):
+        """
+        Template for Timer Start Event
+
+        Args:
+            id (str): Component ID
+            name (str): Component name
+            schedule_key (str): Timer schedule expression (e.g., "0 0 * * * ?")
+
+        Returns:
+            str: XML template for Timer Start Event
+        """
+        return self.TIMER_START_EVENT_TEMPLATE.render(id=id, name=name, schedule_key=schedule_key)
 
     # ===== Processing Components =====
 
@@ -2016,18 +1872,7 @@ class EnhancedIFlowTemplates:
                 header_table += f'<row><cell id="Action">{header.get("action", "Create")}</cell><cell id="Type">{header.get("type", "constant")}</cell><cell id="Value">{header.get("value", "")}</cell><cell id="Default"></cell><cell id="Name">{header.get("name", "")}</cell><cell id="Datatype"></cell></row>'
         return header_table
 
-    def request_reply_template(self, id, name):
-        """
-        Template for Request-Reply component (External Call)
-
-        Args:
-            id (str): Component ID
-            name (str): Component name
-
-        Returns:
-            str: XML template for Request-Reply
-        """
-        return f'''<bpmn2:serviceTask id="{id}" name="{name}">
+    REQUEST_REPLY_TEMPLATE = TEMPLATES.register('request_reply', '''<bpmn2:serviceTask id="{{id}}" name="{{name}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>componentVersion</key>
@@ -2042,26 +1887,24 @@ class EnhancedIFlowTemplates:
                     <value>ctype::FlowstepVariant/cname::ExternalCall/version::1.0.4</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-            <bpmn2:incoming>{{{{incoming_flow}}}}</bpmn2:incoming>
-            <bpmn2:outgoing>{{{{outgoing_flow}}}}</bpmn2:outgoing>
-        </bpmn2:serviceTask>'''
+            <bpmn2:incoming>{{incoming_flow}}</bpmn2:incoming>
+            <bpmn2:outgoing>{{outgoing_flow}}</bpmn2:outgoing>
+        </bpmn2:serviceTask>''')
 
-    def odata_request_reply_pattern(self, service_task_id, participant_id, message_flow_id, name, service_url="https://example.com/odata/service"):
+    def request_reply_template(self, id, name):
         """
-        Template for a complete OData request-reply pattern with all required components
+        Template for Request-Reply component (External Call)
 
         Args:
-            service_task_id (str): ID for the service task
-            participant_id (str): ID for the participant
-            message_flow_id (str): ID for the message flow
-            name (str): Name for the components
-            service_url (str): URL for the OData service
+            id (str): Component ID
+            name (str): Component name
 
         Returns:
-            dict: Dictionary containing all components for the OData pattern
+            str: XML template for Request-Reply
         """
-        # 1. Create the service task (ExternalCall)
-        service_task = f'''<bpmn2:serviceTask id="{service_task_id}" name="Call_{name}">
+        return self.REQUEST_REPLY_TEMPLATE.render(id=id, name=name)
+
+    ODATA_REQUEST_REPLY_PATTERN_TEMPLATE = TEMPLATES.register('odata_request_reply_pattern', '''<bpmn2:serviceTask id="{{service_task_id}}" name="Call_{{name}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>componentVersion</key>
@@ -2076,20 +1919,18 @@ class EnhancedIFlowTemplates:
                     <value>ctype::FlowstepVariant/cname::ExternalCall/version::1.0.4</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-        </bpmn2:serviceTask>'''
+        </bpmn2:serviceTask>''')
 
-        # 2. Create the participant
-        participant = f'''<bpmn2:participant id="{participant_id}" ifl:type="EndpointReceiver" name="OData_{name}">
+    ODATA_REQUEST_REPLY_PATTERN_PARTICIPANT_TEMPLATE = TEMPLATES.register('odata_request_reply_pattern_participant', '''<bpmn2:participant id="{{participant_id}}" ifl:type="EndpointReceiver" name="OData_{{name}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>ifl:type</key>
                     <value>EndpointReceiver</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-        </bpmn2:participant>'''
+        </bpmn2:participant>''')
 
-        # 3. Create the message flow with detailed OData properties
-        message_flow = f'''<bpmn2:messageFlow id="{message_flow_id}" name="OData" sourceRef="{service_task_id}" targetRef="{participant_id}">
+    ODATA_REQUEST_REPLY_PATTERN_MESSAGE_FLOW_TEMPLATE = TEMPLATES.register('odata_request_reply_pattern_message_flow', '''<bpmn2:messageFlow id="{{message_flow_id}}" name="OData" sourceRef="{{service_task_id}}" targetRef="{{participant_id}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>Description</key>
@@ -2145,7 +1986,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>address</key>
-                    <value>{service_url}</value>
+                    <value>{{service_url}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>proxyType</key>
@@ -2180,7 +2021,33 @@ class EnhancedIFlowTemplates:
                     <value>None</value>
                 </ifl:property>
             </bpmn2:extensionElements>
-        </bpmn2:messageFlow>'''
+        </bpmn2:messageFlow>''')
+
+    def odata_request_reply_pattern(self, service_task_id, participant_id, message_flow_id, name, service_url="https://example.com/odata/service"):
+        """
+        Template for a complete OData request-reply pattern with all required components
+
+        Args:
+            service_task_id (str): ID for the service task
+            participant_id (str): ID for the participant
+            message_flow_id (str): ID for the message flow
+            name (str): Name for the components
+            service_url (str): URL for the OData service
+
+        Returns:
+            dict: Dictionary containing all components for the OData pattern
+        """
+        # 1. Create the service task (ExternalCall)
+        service_task = self.ODATA_REQUEST_REPLY_PATTERN_TEMPLATE.render(service_task_id=service_task_id, name=name)
+
+        # 2. Create the participant
+        participant = self.ODATA_REQUEST_REPLY_PATTERN_PARTICIPANT_TEMPLATE.render(
+            participant_id=participant_id, name=name)
+
+        # 3. Create the message flow with detailed OData properties
+        message_flow = self.ODATA_REQUEST_REPLY_PATTERN_MESSAGE_FLOW_TEMPLATE.render(
+            message_flow_id=message_flow_id, service_task_id=service_task_id, participant_id=participant_id,
+            service_url=service_url)
 
         return {
             "service_task": service_task,
@@ -2517,24 +2384,11 @@ class EnhancedIFlowTemplates:
             "end_component_id": end_event_id
         }
 
-    def groovy_script_template(self, id, name, script_name, script_function=""):
-        """
-        Template for Groovy Script
-
-        Args:
-            id (str): Component ID
-            name (str): Component name
-            script_name (str): Name of the Groovy script file
-            script_function (str): Name of the function to call in the script
-
-        Returns:
-            str: XML template for Groovy Script
-        """
-        return f'''<bpmn2:callActivity id="{id}" name="{name}">
+    GROOVY_SCRIPT_TEMPLATE = TEMPLATES.register('groovy_script', '''<bpmn2:callActivity id="{{id}}" name="{{name}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>scriptFunction</key>
-                    <value>{script_function}</value>
+                    <value>{{script_function}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>scriptBundleId</key>
@@ -2558,35 +2412,38 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>script</key>
-                    <value>{script_name}</value>
+                    <value>{{script_name}}</value>
                 </ifl:property>
             </bpmn2:extensionElements>
             <bpmn2:incoming>SequenceFlow_In</bpmn2:incoming>
             <bpmn2:outgoing>SequenceFlow_Out</bpmn2:outgoing>
-        </bpmn2:callActivity>'''
+        </bpmn2:callActivity>''')
 
-    def mapping_template(self, id, name, mapping_name, mapping_path):
+    def groovy_script_template(self, id, name, script_name, script_function=""):
         """
-        Template for Message Mapping
+        Template for Groovy Script
 
         Args:
             id (str): Component ID
             name (str): Component name
-            mapping_name (str): Name of the mapping
-            mapping_path (str): Path to the mapping file
+            script_name (str): Name of the Groovy script file
+            script_function (str): Name of the function to call in the script
 
         Returns:
-            str: XML template for Message Mapping
+            str: XML template for Groovy Script
         """
-        return f'''<bpmn2:callActivity id="{id}" name="{name}">
+        return self.GROOVY_SCRIPT_TEMPLATE.render(
+            id=id, name=name, script_function=script_function, script_name=script_name)
+
+    MAPPING_TEMPLATE = TEMPLATES.register('mapping', '''<bpmn2:callActivity id="{{id}}" name="{{name}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>mappinguri</key>
-                    <value>dir://{mapping_path}.mmap</value>
+                    <value>dir://{{mapping_path}}.mmap</value>
                 </ifl:property>
                 <ifl:property>
                     <key>mappingname</key>
-                    <value>{mapping_name}</value>
+                    <value>{{mapping_name}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>mappingType</key>
@@ -2598,7 +2455,7 @@ class EnhancedIFlowTemplates:
                 </ifl:property>
                 <ifl:property>
                     <key>mappingpath</key>
-                    <value>{mapping_path}</value>
+                    <value>{{mapping_path}}</value>
                 </ifl:property>
                 <ifl:property>
                     <key>componentVersion</key>
@@ -2619,14 +2476,25 @@ class EnhancedIFlowTemplates:
             </bpmn2:extensionElements>
             <bpmn2:incoming>SequenceFlow_In</bpmn2:incoming>
             <bpmn2:outgoing>SequenceFlow_Out</bpmn2:outgoing>
-        </bpmn2:callActivity>'''
+        </bpmn2:callActivity>''')
 
-    def router_template(self, id, name, conditions=[]):
+    def mapping_template(self, id, name, mapping_name, mapping_path):
         """
-        Template for Router (Exclusive Gateway) with fixed ID
+        Template for Message Mapping
+
+        Args:
+            id (str): Component ID
+            name (str): Component name
+            mapping_name (str): Name of the mapping
+            mapping_path (str): Path to the mapping file
+
+        Returns:
+            str: XML template for Message Mapping
         """
-        # Make sure this is an exclusive gateway, not a callActivity
-        return f'''<bpmn2:exclusiveGateway id="{id}" name="{name}">
+        return self.MAPPING_TEMPLATE.render(
+            id=id, name=name, mapping_path=mapping_path, mapping_name=mapping_name)
+
+    ROUTER_TEMPLATE = TEMPLATES.register('router', '''<bpmn2:exclusiveGateway id="{{id}}" name="{{name}}">
             <bpmn2:extensionElements>
                 <ifl:property>
                     <key>componentVersion</key>
@@ -2643,7 +2511,32 @@ class EnhancedIFlowTemplates:
             </bpmn2:extensionElements>
             <bpmn2:incoming>SequenceFlow_1</bpmn2:incoming>
             <bpmn2:outgoing>SequenceFlow_2</bpmn2:outgoing>
-        </bpmn2:exclusiveGateway>'''
+        </bpmn2:exclusiveGateway>''')
+
+    def router_template(self, id, name, conditions=[]):
+        """
+        Template for Router (Exclusive Gateway) with fixed ID
+        """
+        # Make sure this is an exclusive gateway, not a callActivity
+        return self.ROUTER_TEMPLATE.render(id=id, name=name)
+
+    ROUTER_CONDITION_TEMPLATE = TEMPLATES.register('router_condition', '''<bpmn2:sequenceFlow id="{{id}}" name="{{name}}" sourceRef="{{source_ref}}" targetRef="{{target_ref}}">
+            <bpmn2:extensionElements>
+                <ifl:property>
+                    <key>expressionType</key>
+                    <value>{{expression_type}}</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>componentVersion</key>
+                    <value>1.0</value>
+                </ifl:property>
+                <ifl:property>
+                    <key>cmdVariantUri</key>
+                    <value>ctype::FlowstepVariant/cname::GatewayRoute/version::1.0.0</value>
+                </ifl:property>
+            </bpmn2:extensionElements>
+            {{condition_element|raw}}
+        </bpmn2:sequenceFlow>''')
 
     def router_condition_template(self, id, name, source_ref, target_ref, expression="", expression_type="NonXML"):
         """
@@ -2664,23 +2557,9 @@ class EnhancedIFlowTemplates:
         if expression:
             condition_element = f'<bpmn2:conditionExpression id="FormalExpression_{id}" xsi:type="bpmn2:tFormalExpression">{expression}</bpmn2:conditionExpression>'
 
-        return f'''<bpmn2:sequenceFlow id="{id}" name="{name}" sourceRef="{source_ref}" targetRef="{target_ref}">
-            <bpmn2:extensionElements>
-                <ifl:property>
-                    <key>expressionType</key>
-                    <value>{expression_type}</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>componentVersion</key>
-                    <value>1.0</value>
-                </ifl:property>
-                <ifl:property>
-                    <key>cmdVariantUri</key>
-                    <value>ctype::FlowstepVariant/cname::GatewayRoute/version::1.0.0</value>
-                </ifl:property>
-            </bpmn2:extensionElements>
-            {condition_element}
-        </bpmn2:sequenceFlow>'''
+        return self.ROUTER_CONDITION_TEMPLATE.render(
+            id=id, name=name, source_ref=source_ref, target_ref=target_ref, expression_type=expression_type,
+            condition_element=condition_element)
 
     # ===== Flow Control =====
 
@@ -2699,24 +2578,11 @@ class EnhancedIFlowTemplates:
         """
         return f'''<bpmn2:sequenceFlow id="{id}" sourceRef="{source_ref}" targetRef="{target_ref}" isImmediate="{is_immediate}"/>'''
 
-    def process_template(self, id, name, transaction_timeout="30", transactional_handling="Not Required"):
-        """
-        Template for Integration Process with correct placeholder
-
-        Args:
-            id (str): Process ID
-            name (str): Process name
-            transaction_timeout (str): Transaction timeout in seconds
-            transactional_handling (str): Transactional handling mode
-
-        Returns:
-            str: XML template for Integration Process
-        """
-        return f'''<bpmn2:process id="{id}" name="{name}">
+    PROCESS_TEMPLATE = TEMPLATES.register('process', '''<bpmn2:process id="{{id}}" name="{{name}}">
         <bpmn2:extensionElements>
             <ifl:property>
                 <key>transactionTimeout</key>
-                <value>{transaction_timeout}</value>
+                <value>{{transaction_timeout}}</value>
             </ifl:property>
             <ifl:property>
                 <key>componentVersion</key>
@@ -2728,31 +2594,57 @@ class EnhancedIFlowTemplates:
             </ifl:property>
             <ifl:property>
                 <key>transactionalHandling</key>
-                <value>{transactional_handling}</value>
+                <value>{{transactional_handling}}</value>
             </ifl:property>
         </bpmn2:extensionElements>
         {{process_content}}
-    </bpmn2:process>'''
+    </bpmn2:process>''')
+
+    def process_template(self, id, name, transaction_timeout="30", transactional_handling="Not Required"):
+        """
+        Template for Integration Process with correct placeholder
+
+        Args:
+            id (str): Process ID
+            name (str): Process name
+            transaction_timeout (str): Transaction timeout in seconds
+            transactional_handling (str): Transactional handling mode
+
+        Returns:
+            str: XML template for Integration Process
+        """
+        return self.PROCESS_TEMPLATE.render(
+            id=id, name=name, transaction_timeout=transaction_timeout,
+            transactional_handling=transactional_handling)
 
     # ===== Additional Receiver Participants/Adapters (Safe Additions) =====
 
-    def sftp_receiver_participant_template(self, id="Participant_SFTP", name="SFTP_Server"):
-        """Create an SFTP receiver participant (non-breaking addition)."""
-        definition = f'''<bpmn2:participant id="{id}" ifl:type="EndpointRecevier" name="{name}">
+    SFTP_RECEIVER_PARTICIPANT_TEMPLATE = TEMPLATES.register('sftp_receiver_participant', '''<bpmn2:participant id="{{id}}" ifl:type="EndpointRecevier" name="{{name}}">
     <bpmn2:extensionElements>
         <ifl:property>
             <key>ifl:type</key>
             <value>EndpointRecevier</value>
         </ifl:property>
     </bpmn2:extensionElements>
-</bpmn2:participant>'''
+</bpmn2:participant>''')
 
-        shape = f'''<bpmndi:BPMNShape bpmnElement="{id}" id="BPMNShape_{id}">
+    SFTP_RECEIVER_PARTICIPANT_SHAPE_TEMPLATE = TEMPLATES.register('sftp_receiver_participant_shape', '''<bpmndi:BPMNShape bpmnElement="{{id}}" id="BPMNShape_{{id}}">
     <dc:Bounds height="140.0" width="100.0" x="850" y="150"/>
-</bpmndi:BPMNShape>'''
+</bpmndi:BPMNShape>''')
+
+    def sftp_receiver_participant_template(self, id="Participant_SFTP", name="SFTP_Server"):
+        """Create an SFTP receiver participant (non-breaking addition)."""
+        definition = self.SFTP_RECEIVER_PARTICIPANT_TEMPLATE.render(id=id, name=name)
+
+        shape = self.SFTP_RECEIVER_PARTICIPANT_SHAPE_TEMPLATE.render(id=id)
 
         return {"definition": definition, "shape": shape}
 
+    SFTP_RECEIVER_MESSAGE_FLOW_TEMPLATE = TEMPLATES.register('sftp_receiver_message_flow', '''<bpmndi:BPMNEdge bpmnElement="{{id}}" id="BPMNEdge_{{id}}" sourceElement="BPMNShape_{{source_ref}}" targetElement="BPMNShape_{{target_ref}}">
+    <di:waypoint x="757" xsi:type="dc:Point" y="140"/>
+    <di:waypoint x="850" xsi:type="dc:Point" y="170"/>
+</bpmndi:BPMNEdge>''')
+
     def sftp_receiver_message_flow_template(self, id="MessageFlow_SFTP", source_ref="ServiceTask_1", target_ref="Participant_SFTP",
                                             host="sftp.example.com", port="22", path="/uploads", username="${sftp_username}",
                                             auth_type="Password", operation="PUT"):
@@ -2775,66 +2667,77 @@ class EnhancedIFlowTemplates:
     </bpmn2:extensionElements>
 </bpmn2:messageFlow>'''
 
-        edge = f'''<bpmndi:BPMNEdge bpmnElement="{id}" id="BPMNEdge_{id}" sourceElement="BPMNShape_{source_ref}" targetElement="BPMNShape_{target_ref}">
-    <di:waypoint x="757" xsi:type="dc:Point" y="140"/>
-    <di:waypoint x="850" xsi:type="dc:Point" y="170"/>
-</bpmndi:BPMNEdge>'''
+        edge = self.SFTP_RECEIVER_MESSAGE_FLOW_TEMPLATE.render(
+            id=id, source_ref=source_ref, target_ref=target_ref)
 
         return {"definition": definition, "edge": edge}
 
-    def successfactors_receiver_participant_template(self, id="Participant_SuccessFactors", name="SuccessFactors"):
-        """Create a SuccessFactors receiver participant (non-breaking addition)."""
-        definition = f'''<bpmn2:participant id="{id}" ifl:type="EndpointRecevier" name="{name}">
+    SUCCESSFACTORS_RECEIVER_PARTICIPANT_TEMPLATE = TEMPLATES.register('successfactors_receiver_participant', '''<bpmn2:participant id="{{id}}" ifl:type="EndpointRecevier" name="{{name}}">
     <bpmn2:extensionElements>
         <ifl:property>
             <key>ifl:type</key>
             <value>EndpointRecevier</value>
         </ifl:property>
     </bpmn2:extensionElements>
-</bpmn2:participant>'''
+</bpmn2:participant>''')
 
-        shape = f'''<bpmndi:BPMNShape bpmnElement="{id}" id="BPMNShape_{id}">
+    SUCCESSFACTORS_RECEIVER_PARTICIPANT_SHAPE_TEMPLATE = TEMPLATES.register('successfactors_receiver_participant_shape', '''<bpmndi:BPMNShape bpmnElement="{{id}}" id="BPMNShape_{{id}}">
     <dc:Bounds height="140.0" width="100.0" x="850" y="150"/>
-</bpmndi:BPMNShape>'''
+</bpmndi:BPMNShape>''')
+
+    def successfactors_receiver_participant_template(self, id="Participant_SuccessFactors", name="SuccessFactors"):
+        """Create a SuccessFactors receiver participant (non-breaking addition)."""
+        definition = self.SUCCESSFACTORS_RECEIVER_PARTICIPANT_TEMPLATE.render(id=id, name=name)
+
+        shape = self.SUCCESSFACTORS_RECEIVER_PARTICIPANT_SHAPE_TEMPLATE.render(id=id)
 
         return {"definition": definition, "shape": shape}
 
-    def successfactors_receiver_message_flow_template(self, id="MessageFlow_SuccessFactors", source_ref="ServiceTask_1", target_ref="Participant_SuccessFactors",
-                                                      url="https://api.successfactors.com/odata/v2/User", operation="Query(GET)", auth_method="OAuth"):
-        """Create a SuccessFactors OData message flow (non-breaking addition)."""
-        definition = f'''<bpmn2:messageFlow id="{id}" name="SuccessFactors" sourceRef="{source_ref}" targetRef="{target_ref}">
+    SUCCESSFACTORS_RECEIVER_MESSAGE_FLOW_TEMPLATE = TEMPLATES.register('successfactors_receiver_message_flow', '''<bpmn2:messageFlow id="{{id}}" name="SuccessFactors" sourceRef="{{source_ref}}" targetRef="{{target_ref}}">
     <bpmn2:extensionElements>
         <ifl:property><key>ComponentType</key><value>SuccessFactors</value></ifl:property>
         <ifl:property><key>Description</key><value>SuccessFactors OData Connection</value></ifl:property>
         <ifl:property><key>ComponentNS</key><value>sap</value></ifl:property>
-        <ifl:property><key>address</key><value>{url}</value></ifl:property>
-        <ifl:property><key>operation</key><value>{operation}</value></ifl:property>
-        <ifl:property><key>authenticationMethod</key><value>{auth_method}</value></ifl:property>
+        <ifl:property><key>address</key><value>{{url}}</value></ifl:property>
+        <ifl:property><key>operation</key><value>{{operation}}</value></ifl:property>
+        <ifl:property><key>authenticationMethod</key><value>{{auth_method}}</value></ifl:property>
         <ifl:property><key>MessageProtocol</key><value>OData V2</value></ifl:property>
         <ifl:property><key>direction</key><value>Receiver</value></ifl:property>
         <ifl:property><key>TransportProtocol</key><value>HTTPS</value></ifl:property>
     </bpmn2:extensionElements>
-</bpmn2:messageFlow>'''
+</bpmn2:messageFlow>''')
 
-        edge = f'''<bpmndi:BPMNEdge bpmnElement="{id}" id="BPMNEdge_{id}" sourceElement="BPMNShape_{source_ref}" targetElement="BPMNShape_{target_ref}">
+    SUCCESSFACTORS_RECEIVER_MESSAGE_FLOW_EDGE_TEMPLATE = TEMPLATES.register('successfactors_receiver_message_flow_edge', '''<bpmndi:BPMNEdge bpmnElement="{{id}}" id="BPMNEdge_{{id}}" sourceElement="BPMNShape_{{source_ref}}" targetElement="BPMNShape_{{target_ref}}">
     <di:waypoint x="757" xsi:type="dc:Point" y="140"/>
     <di:waypoint x="850" xsi:type="dc:Point" y="170"/>
-</bpmndi:BPMNEdge>'''
+</bpmndi:BPMNEdge>''')
+
+    def successfactors_receiver_message_flow_template(self, id="MessageFlow_SuccessFactors", source_ref="ServiceTask_1", target_ref="Participant_SuccessFactors",
+                                                      url="https://api.successfactors.com/odata/v2/User", operation="Query(GET)", auth_method="OAuth"):
+        """Create a SuccessFactors OData message flow (non-breaking addition)."""
+        definition = self.SUCCESSFACTORS_RECEIVER_MESSAGE_FLOW_TEMPLATE.render(
+            id=id, source_ref=source_ref, target_ref=target_ref, url=url, operation=operation,
+            auth_method=auth_method)
+
+        edge = self.SUCCESSFACTORS_RECEIVER_MESSAGE_FLOW_EDGE_TEMPLATE.render(
+            id=id, source_ref=source_ref, target_ref=target_ref)
 
         return {"definition": definition, "edge": edge}
 
     # ===== Generic Embedded Subprocess (Safe Addition) =====
 
-    def subprocess_template(self, id, name):
-        """Create a generic embedded subprocess container."""
-        return f'''<bpmn2:subProcess id="{id}" name="{name}">
+    SUBPROCESS_TEMPLATE = TEMPLATES.register('subprocess', '''<bpmn2:subProcess id="{{id}}" name="{{name}}">
     <bpmn2:extensionElements>
         <ifl:property><key>componentVersion</key><value>1.0</value></ifl:property>
         <ifl:property><key>activityType</key><value>EmbeddedSubprocess</value></ifl:property>
         <ifl:property><key>cmdVariantUri</key><value>ctype::FlowstepVariant/cname::Subprocess/version::1.0.0</value></ifl:property>
     </bpmn2:extensionElements>
     <!-- Add internal flow elements here (start, tasks, end) as needed by generator -->
-</bpmn2:subProcess>'''
+</bpmn2:subProcess>''')
+
+    def subprocess_template(self, id, name):
+        """Create a generic embedded subprocess container."""
+        return self.SUBPROCESS_TEMPLATE.render(id=id, name=name)
     # ===== Helper Methods =====
 
     def generate_unique_id(self, prefix=""):
@@ -0,0 +1,314 @@
+"""
+Analysis prompts for the GenAI blueprint step, split for provider-side caching
+
+An AnalysisPrompt keeps the static instructions, the documentation of the job
+and the retry note apart. Claude receives them as separate content blocks with
+cache breakpoints after the instructions and after the documentation: every job
+reuses the cached instructions, and every retry of a job also reuses the cached
+documentation and only pays for the short retry note. Providers without content
+blocks get the same parts joined in the same order, which keeps the prefix
+stable for their automatic prefix caching.
+
+compact_markdown shrinks the documentation before it is sent: boilerplate
+sections are dropped, repeated tables and code blocks are replaced by a short
+note, and long code blocks are trimmed until the estimated token count fits
+the budget. CallMetrics records the tokens and latency of each LLM call.
+"""
+
+import os
+import re
+
+# Cache breakpoints on the instructions and documentation blocks sent to Claude
+PROMPT_CACHE_ENABLED = os.getenv('GENAI_PROMPT_CACHE', 'true').lower() == 'true'
+
+# Estimated tokens the documentation of one job may take up in the prompt
+DOCUMENT_TOKEN_BUDGET = int(os.getenv('GENAI_DOCUMENT_TOKEN_BUDGET', '24000'))
+
+# Rough size of a token for English text, markup and code
+CHARS_PER_TOKEN = 4
+
+# Lines kept of a code block trimmed to fit the budget, and the characters kept in
+# successive trimming rounds (0 keeps only the fences and a note)
+TRIMMED_CODE_BLOCK_LINES = 20
+TRIMMED_CODE_BLOCK_CHARS = (800, 300, 0)
+
+# Tables and code blocks shorter than this are cheaper to repeat than to reference
+MIN_DEDUPLICATED_LINES = 3
+
+# Sections that carry nothing the blueprint is built from (matched on the lowercased heading)
+BOILERPLATE_SECTIONS = {
+    'table of contents', 'contents', 'toc',
+    'revision history', 'document history', 'change history', 'change log', 'changelog',
+    'document information', 'document control', 'available documentation files',
+    'processing errors', 'glossary', 'references',
+}
+BOILERPLATE_PREFIXES = ('appendix',)
+
+EPHEMERAL_CACHE = {"type": "ephemeral"}
+
+HEADING_PATTERN = re.compile(r'^ {0,3}(#{1,6})[ \t]+(.*?)[ \t#]*$')
+HEADING_NUMBER_PATTERN = re.compile(r'^[\d.]+\s+')
+FENCE_PATTERN = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+BLANK_LINES_PATTERN = re.compile(r'\n{3,}')
+
+
+def estimate_tokens(text):
+    """Estimated token count of text, without a provider tokenizer"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _is_boilerplate(title):
+    """True for headings of sections compact_markdown drops"""
+    title = HEADING_NUMBER_PATTERN.sub('', title.strip().strip('*_').strip()).rstrip(':').lower()
+    return title in BOILERPLATE_SECTIONS or title.startswith(BOILERPLATE_PREFIXES)
+
+
+def _segments(markdown):
+    """
+    Markdown split into ('text', [line]), ('table', lines) and ('code', lines)
+    segments, without the boilerplate sections.
+    """
+    segments = []
+    skip_level = None   # heading level of the boilerplate section being dropped
+    fence = None        # closing fence of the open code block
+    block = None        # lines of the open code block or table
+
+    for line in markdown.splitlines():
+        if fence is not None:
+            block.append(line)
+            if line.strip().startswith(fence):
+                if skip_level is None:
+                    segments.append(('code', block))
+                fence = block = None
+            continue
+
+        if block is not None and not line.lstrip().startswith('|'):
+            if skip_level is None:
+                segments.append(('table', block))
+            block = None
+
+        heading = HEADING_PATTERN.match(line)
+        if heading:
+            level = len(heading.group(1))
+            if skip_level is not None and level <= skip_level:
+                skip_level = None
+            if skip_level is None and _is_boilerplate(heading.group(2)):
+                skip_level = level
+
+        fence_match = FENCE_PATTERN.match(line)
+        if fence_match:
+            fence = fence_match.group(1)
+            block = [line]
+        elif line.lstrip().startswith('|'):
+            if block is None:
+                block = []
+            block.append(line.rstrip())
+        elif skip_level is None:
+            segments.append(('text', [line.rstrip()]))
+
+    # Unterminated code block or table at the end of the document
+    if block is not None and skip_level is None:
+        segments.append(('code' if fence is not None else 'table', block))
+    return segments
+
+
+def _trimmed_code_block(lines, max_chars):
+    """Code block cut down to its first lines and characters, closed again if it had a closing fence"""
+    body_end = len(lines) - 1 if len(lines) > 1 and FENCE_PATTERN.match(lines[-1]) else len(lines)
+    kept = [lines[0]]
+    chars = 0
+    for line in lines[1:body_end]:
+        if len(kept) > TRIMMED_CODE_BLOCK_LINES or chars >= max_chars:
+            break
+        kept.append(line[:max_chars - chars])
+        chars += len(kept[-1])
+    omitted = sum(len(line) for line in lines[1:body_end]) - chars
+    if omitted <= 0:
+        return lines
+    return kept + [f"... ({omitted} more characters omitted)"] + lines[body_end:]
+
+
+def compact_markdown(markdown, token_budget=None):
+    """
+    Documentation reduced to what the blueprint analysis needs.
+
+    Boilerplate sections (table of contents, revision history, appendices, ...)
+    are dropped, tables and code blocks repeated verbatim are replaced by a
+    note pointing back to the first copy, and runs of blank lines are collapsed.
+    If the result is still over the token budget, the longest code blocks are
+    trimmed to their first lines, in rounds keeping less of each block, and as
+    a last resort the end of the document is cut off.
+
+    Args:
+        markdown (str): Documentation of the job
+        token_budget (int, optional): Estimated tokens allowed (defaults to GENAI_DOCUMENT_TOKEN_BUDGET)
+
+    Returns:
+        str: Compacted documentation
+    """
+    if token_budget is None:
+        token_budget = DOCUMENT_TOKEN_BUDGET
+    if not markdown:
+        return markdown
+
+    seen = set()
+    segments = []
+    for kind, lines in _segments(markdown):
+        if kind != 'text' and len(lines) >= MIN_DEDUPLICATED_LINES:
+            key = (kind, '\n'.join(line.strip() for line in lines))
+            if key in seen:
+                if kind == 'table':
+                    note = f"_(Same table as above: {lines[0].strip()})_"
+                else:
+                    note = "_(Same code block as above)_"
+                segments.append(('text', [note]))
+                continue
+            seen.add(key)
+        segments.append((kind, lines))
+
+    def joined():
+        text = '\n'.join(line for _, lines in segments for line in lines)
+        return BLANK_LINES_PATTERN.sub('\n\n', text).strip() + '\n'
+
+    compacted = joined()
+    if estimate_tokens(compacted) <= token_budget:
+        return compacted
+
+    # Trim the longest code blocks first until the document fits, harder in each round
+    excess_chars = (estimate_tokens(compacted) - token_budget) * CHARS_PER_TOKEN
+    code_indexes = [i for i, (kind, _) in enumerate(segments) if kind == 'code']
+    for max_chars in TRIMMED_CODE_BLOCK_CHARS:
+        code_indexes.sort(key=lambda i: -sum(len(line) + 1 for line in segments[i][1]))
+        for i in code_indexes:
+            if excess_chars <= 0:
+                break
+            lines = segments[i][1]
+            trimmed = _trimmed_code_block(lines, max_chars)
+            excess_chars -= sum(len(line) + 1 for line in lines) - sum(len(line) + 1 for line in trimmed)
+            segments[i] = ('code', trimmed)
+
+    compacted = joined()
+    max_chars = token_budget * CHARS_PER_TOKEN
+    if len(compacted) > max_chars:
+        cut = compacted.rfind('\n', 0, max_chars)
+        compacted = compacted[:cut if cut > 0 else max_chars] + "\n\n_(Documentation truncated to fit the prompt budget)_\n"
+    return compacted
+
+
+class AnalysisPrompt:
+    """Static instructions, job documentation and retry note of an analysis prompt"""
+
+    __slots__ = ('instructions', 'document', 'closing', 'retry_note')
+
+    def __init__(self, instructions, document, closing="", retry_note=""):
+        """
+        Args:
+            instructions (str): Instructions shared by all jobs (cached)
+            document (str): Documentation of the job (cached for the retries of the job)
+            closing (str): Final instruction, sent after the documentation and retry note
+            retry_note (str): Error of the previous attempt, empty on the first attempt
+        """
+        self.instructions = instructions
+        self.document = document
+        self.closing = closing
+        self.retry_note = retry_note
+
+    def with_retry_note(self, retry_note):
+        """The same prompt with a new retry note; instructions and documentation stay cached"""
+        return AnalysisPrompt(self.instructions, self.document, self.closing, retry_note)
+
+    def text(self):
+        """The whole prompt as one string, cacheable prefix first"""
+        return "\n\n".join(part for part in (self.instructions, self.document, self.retry_note, self.closing) if part)
+
+    def __str__(self):
+        return self.text()
+
+    def content_blocks(self, cache=None):
+        """
+        Anthropic user message content: one block per part, with cache breakpoints
+        after the instructions and after the documentation.
+
+        Args:
+            cache (bool, optional): Add cache breakpoints (defaults to GENAI_PROMPT_CACHE)
+        """
+        if cache is None:
+            cache = PROMPT_CACHE_ENABLED
+        blocks = []
+        for part in (self.instructions, self.document):
+            if part:
+                block = {"type": "text", "text": part}
+                if cache:
+                    block["cache_control"] = EPHEMERAL_CACHE
+                blocks.append(block)
+        tail = "\n\n".join(part for part in (self.retry_note, self.closing) if part)
+        if tail:
+            blocks.append({"type": "text", "text": tail})
+        return blocks
+
+    def estimated_tokens(self):
+        """Estimated tokens of the prompt as (instructions, documentation, rest)"""
+        return (estimate_tokens(self.instructions), estimate_tokens(self.document),
+                estimate_tokens(self.retry_note) + estimate_tokens(self.closing))
+
+
+def prompt_text(prompt):
+    """Text of a prompt given as an AnalysisPrompt or a plain string"""
+    return prompt.text() if isinstance(prompt, AnalysisPrompt) else prompt
+
+
+def user_content(prompt):
+    """Anthropic user message content of a prompt given as an AnalysisPrompt or a plain string"""
+    if isinstance(prompt, AnalysisPrompt):
+        return prompt.content_blocks()
+    return [{"type": "text", "text": prompt}]
+
+
+class CallMetrics:
+    """Tokens and latency of one LLM call"""
+
+    __slots__ = ('provider', 'model', 'input_tokens', 'output_tokens',
+                 'cache_read_tokens', 'cache_write_tokens', 'latency', 'estimated')
+
+    def __init__(self, provider, model, latency, input_tokens=0, output_tokens=0,
+                 cache_read_tokens=0, cache_write_tokens=0, estimated=False):
+        self.provider = provider
+        self.model = model
+        self.latency = latency
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.cache_read_tokens = cache_read_tokens
+        self.cache_write_tokens = cache_write_tokens
+        self.estimated = estimated
+
+    @classmethod
+    def from_usage(cls, provider, model, latency, usage):
+        """
+        Metrics from the usage of an Anthropic message or an OpenAI completion.
+        For Anthropic, input_tokens counts only the uncached part of the prompt.
+        """
+        return cls(
+            provider, model, latency,
+            input_tokens=getattr(usage, 'input_tokens', None) or getattr(usage, 'prompt_tokens', 0) or 0,
+            output_tokens=getattr(usage, 'output_tokens', None) or getattr(usage, 'completion_tokens', 0) or 0,
+            cache_read_tokens=getattr(usage, 'cache_read_input_tokens', 0) or 0,
+            cache_write_tokens=getattr(usage, 'cache_creation_input_tokens', 0) or 0,
+        )
+
+    @classmethod
+    def estimate(cls, provider, model, latency, prompt, response):
+        """Metrics estimated from the prompt and response text, for calls without usage data"""
+        return cls(provider, model, latency,
+                   input_tokens=estimate_tokens(prompt_text(prompt)),
+                   output_tokens=estimate_tokens(response or ""),
+                   estimated=True)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def summary(self):
+        """One-line description for the log"""
+        approx = "~" if self.estimated else ""
+        return (f"{self.provider} {self.latency:.2f}s, input {approx}{self.input_tokens} tokens "
+                f"(cache read {self.cache_read_tokens}, cache write {self.cache_write_tokens}), "
+                f"output {approx}{self.output_tokens} tokens")
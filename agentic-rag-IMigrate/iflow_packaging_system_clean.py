@@ -25,6 +25,8 @@ from datetime import datetime
 from typing import Dict, List, Any, Optional
 import xml.etree.ElementTree as ET
 
+from bpmn_layout import Bounds, layout_flow_graph, node_kind, route_edge, shape_xml, edge_xml
+
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s:%(name)s:%(message)s')
 logger = logging.getLogger(__name__)
@@ -854,195 +856,78 @@ class IFlowPackager:
                               participants: list, process_elements: list, 
                               sequence_flows: list, message_flows: list) -> str:
         """Generate BPMN diagram section for visual representation."""
-        import uuid
+        import re
         
         diagram_xml = f'''<bpmndi:BPMNDiagram id="BPMNDiagram_1" name="Default Collaboration Diagram">
         <bpmndi:BPMNPlane bpmnElement="{collaboration_id}" id="BPMNPlane_1">'''
         
-        # Generate shapes for ALL process elements - CRITICAL for SAP Integration Suite import!
-        call_activity_shapes = []
-        service_task_shapes = []
-        gateway_shapes = []
-        start_event_shapes = []
-        end_event_shapes = []
-
+        # Lay out ALL process elements - every one needs a shape for SAP Integration Suite import!
+        nodes = []
         for element_id, element_xml in process_elements:
-            lowered_xml = element_xml.lower()
-            if '<bpmn2:callactivity' in lowered_xml:
-                call_activity_shapes.append((element_id, element_xml))
-            elif '<bpmn2:servicetask' in lowered_xml:
-                service_task_shapes.append((element_id, element_xml))
-            elif '<bpmn2:exclusivegateway' in lowered_xml or '<bpmn2:parallelgateway' in lowered_xml or '<bpmn2:inclusivegateway' in lowered_xml:
-                gateway_shapes.append((element_id, element_xml))
-            elif '<bpmn2:startevent' in lowered_xml:
-                start_event_shapes.append((element_id, element_xml))
-            elif '<bpmn2:endevent' in lowered_xml:
-                end_event_shapes.append((element_id, element_xml))
-
-        # Shapes positions (space callActivities horizontally so they don't overlap)
-        call_positions = {}
-        gateway_positions = {}
-        service_positions = {}
-        for idx, (element_id, _) in enumerate(call_activity_shapes):
-            x = 415.0 + (166.0 * idx)
-            y = 131.0
-            diagram_xml += f'''
-            <bpmndi:BPMNShape bpmnElement="{element_id}" id="BPMNShape_{element_id}">
-                <dc:Bounds height="60.0" width="100.0" x="{x}" y="{y}"/>
-            </bpmndi:BPMNShape>'''
-            call_positions[element_id] = (x, y, 100.0, 60.0)
-
-        for idx, (element_id, _) in enumerate(service_task_shapes):
-            x = 415.0 + (166.0 * idx)
-            y = 200.0
-            diagram_xml += f'''
-            <bpmndi:BPMNShape bpmnElement="{element_id}" id="BPMNShape_{element_id}">
-                <dc:Bounds height="60.0" width="100.0" x="{x}" y="{y}"/>
-            </bpmndi:BPMNShape>'''
-            service_positions[element_id] = (x, y, 100.0, 60.0)
-
-        for idx, (element_id, _) in enumerate(gateway_shapes):
-            x = 465.0 + (166.0 * idx)
-            y = 160.0
-            diagram_xml += f'''
-            <bpmndi:BPMNShape bpmnElement="{element_id}" id="BPMNShape_{element_id}">
-                <dc:Bounds height="50.0" width="50.0" x="{x}" y="{y}"/>
-            </bpmndi:BPMNShape>'''
-            gateway_positions[element_id] = (x, y, 50.0, 50.0)
-        
-        # Process participant shape (MUST be added before individual elements!)
-        diagram_xml += f'''
-            <bpmndi:BPMNShape bpmnElement="Participant_Process_1" id="BPMNShape_Participant_Process_1">
-                <dc:Bounds height="225.0" width="540.0" x="250.0" y="60.0"/>
-            </bpmndi:BPMNShape>'''
-            
-        # Add StartEvent shapes (positioned at 299, 140)
-        start_positions = {}
-        for element_id, element_xml in start_event_shapes:
-            diagram_xml += f'''
-            <bpmndi:BPMNShape bpmnElement="{element_id}" id="BPMNShape_{element_id}">
-                <dc:Bounds height="32.0" width="32.0" x="299.0" y="140.0"/>
-            </bpmndi:BPMNShape>'''
-            start_positions[element_id] = (299.0, 140.0, 32.0, 32.0)
-        
-        # Add EndEvent shapes (positioned at 626, 140)
-        end_positions = {}
-        for element_id, element_xml in end_event_shapes:
-            diagram_xml += f'''
-            <bpmndi:BPMNShape bpmnElement="{element_id}" id="BPMNShape_{element_id}">
-                <dc:Bounds height="32.0" width="32.0" x="626.0" y="140.0"/>
-            </bpmndi:BPMNShape>'''
-            end_positions[element_id] = (626.0, 140.0, 32.0, 32.0)
-        
-        # External participants (both Sender and Receiver)
-        sender_y = 103
-        receiver_y = 103
+            tag_match = re.search(r'<bpmn2:(\w+)', element_xml)
+            nodes.append((element_id, node_kind(tag_match.group(1) if tag_match else element_id)))
+        
+        flows = []
+        for seq_flow in sequence_flows:
+            seq_id_match = re.search(r'id="([^"]+)"', seq_flow)
+            source_match = re.search(r'sourceRef="([^"]+)"', seq_flow)
+            target_match = re.search(r'targetRef="([^"]+)"', seq_flow)
+            if seq_id_match and source_match and target_match:
+                flows.append((seq_id_match.group(1), source_match.group(1), target_match.group(1)))
+        
+        layout = layout_flow_graph(nodes, flows, origin_x=290.0, origin_y=100.0)
+        shapes = dict(layout.shapes)
+        
+        # Process participant shape around the layout (MUST be added before individual elements!)
+        layout_box = layout.container(padding=40.0)
+        process_bounds = Bounds(250.0, 60.0, max(540.0, layout_box.right - 250.0), max(225.0, layout_box.bottom - 60.0))
+        diagram_xml += '\n' + shape_xml("Participant_Process_1", process_bounds, indent="            ")
+        
+        for element_id, bounds in layout.shapes.items():
+            diagram_xml += '\n' + shape_xml(element_id, bounds, indent="            ")
+        
+        # External participants: senders on the left of the process, receivers on the right
+        sender_y = receiver_y = process_bounds.y + 43.0
         for participant in participants:
-            # Extract participant ID
-            import re
             participant_id_match = re.search(r'id="([^"]+)"', participant)
             if participant_id_match:
                 participant_id = participant_id_match.group(1)
                 
                 if 'EndpointSender' in participant:
-                    diagram_xml += f'''
-            <bpmndi:BPMNShape bpmnElement="{participant_id}" id="BPMNShape_{participant_id}">
-                <dc:Bounds height="140.0" width="100.0" x="93.0" y="{sender_y}"/>
-            </bpmndi:BPMNShape>'''
+                    bounds = Bounds(93.0, sender_y, 100.0, 140.0)
                     sender_y += 150  # Space multiple senders vertically
-                    
                 elif 'EndpointRecevier' in participant or 'EndpointReceiver' in participant:
-                    diagram_xml += f'''
-            <bpmndi:BPMNShape bpmnElement="{participant_id}" id="BPMNShape_{participant_id}">
-                <dc:Bounds height="140.0" width="100.0" x="750.0" y="{receiver_y}"/>
-            </bpmndi:BPMNShape>'''
+                    bounds = Bounds(process_bounds.right + 60.0, receiver_y, 100.0, 140.0)
                     receiver_y += 150  # Space multiple receivers vertically
-        
-        # Generate edges for sequence flows
-        for seq_flow in sequence_flows:
-            # Extract sequence flow details
-            import re
-            seq_id_match = re.search(r'id="([^"]+)"', seq_flow)
-            source_match = re.search(r'sourceRef="([^"]+)"', seq_flow)
-            target_match = re.search(r'targetRef="([^"]+)"', seq_flow)
-            
-            if seq_id_match and source_match and target_match:
-                seq_id = seq_id_match.group(1)
-                source_id = source_match.group(1)
-                target_id = target_match.group(1)
-                
-                diagram_xml += f'''
-            <bpmndi:BPMNEdge bpmnElement="{seq_id}" id="BPMNEdge_{seq_id}" sourceElement="BPMNShape_{source_id}" targetElement="BPMNShape_{target_id}">'''
-
-                # Compute waypoints using positions if known
-                def center_right(pos):
-                    x, y, w, h = pos
-                    return (x + w, y + h/2.0)
-                def center_left(pos):
-                    x, y, w, h = pos
-                    return (x, y + h/2.0)
-
-                pos_map = {}
-                pos_map.update(call_positions)
-                pos_map.update(service_positions)
-                pos_map.update(gateway_positions)
-                pos_map.update(start_positions)
-                pos_map.update(end_positions)
-                
-                if source_id in pos_map and target_id in pos_map:
-                    sx, sy = center_right(pos_map[source_id])
-                    tx, ty = center_left(pos_map[target_id])
-                    diagram_xml += f'''
-                <di:waypoint x="{sx}" xsi:type="dc:Point" y="{sy}"/>
-                <di:waypoint x="{tx}" xsi:type="dc:Point" y="{ty}"/>'''
                 else:
-                    # Fallback to prior constants
-                    diagram_xml += f'''
-                <di:waypoint x="315.0" xsi:type="dc:Point" y="158.5"/>
-                <di:waypoint x="415.5" xsi:type="dc:Point" y="158.5"/>'''
-                
-                diagram_xml += '''
-            </bpmndi:BPMNEdge>'''
+                    continue
+                shapes[participant_id] = bounds
+                diagram_xml += '\n' + shape_xml(participant_id, bounds, indent="            ")
+        
+        # Generate edges for sequence flows, as routed by the layout
+        routes = {route.flow_id: route for route in layout.edges}
+        for flow_id, source_id, target_id in flows:
+            if flow_id in routes:
+                waypoints = routes[flow_id].waypoints
+            else:
+                # Fallback to prior constants
+                waypoints = [(315.0, 158.5), (415.5, 158.5)]
+            diagram_xml += '\n' + edge_xml(flow_id, source_id, target_id, waypoints, indent="            ")
         
-        # Generate edges for message flows
+        # Generate edges for message flows between the participants and the process elements
         for msg_flow in message_flows:
-            import re
             msg_id_match = re.search(r'id="([^"]+)"', msg_flow)
             source_match = re.search(r'sourceRef="([^"]+)"', msg_flow)
             target_match = re.search(r'targetRef="([^"]+)"', msg_flow)
-            
             if msg_id_match and source_match and target_match:
                 msg_id = msg_id_match.group(1)
                 source_id = source_match.group(1)
                 target_id = target_match.group(1)
-                
-                # Calculate proper waypoints based on element positions
-                def get_center_position(element_id):
-                    # Check if it's a process element (serviceTask, etc.)
-                    for eid, _ in process_elements:
-                        if eid == element_id:
-                            # ServiceTask is typically at x=415, y=200
-                            return (465.0, 230.0)  # Center of serviceTask
-                    
-                    # Check if it's an external participant
-                    for participant in participants:
-                        if element_id in participant:
-                            if 'EndpointSender' in participant:
-                                return (143.0, 173.0)  # Left side sender
-                            elif 'EndpointRecevier' in participant or 'EndpointReceiver' in participant:
-                                return (800.0, 173.0)  # Right side receiver
-                    
-                    # Default fallback
-                    return (465.0, 230.0)
-                
-                source_x, source_y = get_center_position(source_id)
-                target_x, target_y = get_center_position(target_id)
-                
-                diagram_xml += f'''
-            <bpmndi:BPMNEdge bpmnElement="{msg_id}" id="BPMNEdge_{msg_id}" sourceElement="BPMNShape_{source_id}" targetElement="BPMNShape_{target_id}">
-                <di:waypoint x="{source_x}" xsi:type="dc:Point" y="{source_y}"/>
-                <di:waypoint x="{target_x}" xsi:type="dc:Point" y="{target_y}"/>
-            </bpmndi:BPMNEdge>'''
+                if source_id in shapes and target_id in shapes:
+                    waypoints = route_edge(shapes[source_id], shapes[target_id])
+                else:
+                    waypoints = [(465.0, 230.0), (465.0, 230.0)]
+                diagram_xml += '\n' + edge_xml(msg_id, source_id, target_id, waypoints, indent="            ")
         
         diagram_xml += '''
         </bpmndi:BPMNPlane>
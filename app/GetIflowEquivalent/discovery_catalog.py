@@ -0,0 +1,445 @@
+"""
+Offline catalog of SAP integration content for SAPDiscoverySearcher
+
+The catalog is built once from the SAP/apibusinesshub-integration-recipes
+GitHub repository and saved as a single versioned snapshot file. Searches run
+against the snapshot only, so no GitHub requests are made while a user's
+iFlow match job is running.
+
+Snapshot layout:
+    line 1   magic and format version, e.g. b"SAPCAT 1"
+    line 2   header JSON (source commit, ETag, README offsets and blob SHAs)
+    line 3   JSON array of catalog items
+    rest     zlib-compressed README files, addressed by the header offsets
+
+The loader memory-maps the file and only decompresses a README when its
+details are requested. A refresh is incremental: an unchanged branch head
+(ETag / commit SHA) skips the build, and READMEs whose blob SHA did not change
+are copied from the previous snapshot without downloading them.
+
+Usage:
+    python discovery_catalog.py build [--output PATH] [--token TOKEN]
+    python discovery_catalog.py info [--output PATH]
+"""
+import os
+import sys
+import json
+import re
+import math
+import mmap
+import time
+import zlib
+import heapq
+import threading
+from collections import defaultdict
+from datetime import datetime
+
+import requests
+
+CATALOG_MAGIC = b'SAPCAT'
+CATALOG_FORMAT_VERSION = 1
+
+DISCOVERY_CATALOG_PATH = os.getenv(
+    'DISCOVERY_CATALOG_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'discovery_catalog.idx'))
+
+REPO_OWNER = "SAP"
+REPO_NAME = "apibusinesshub-integration-recipes"
+REPO_BRANCH = os.getenv('DISCOVERY_CATALOG_BRANCH', 'master')
+RECIPES_README_PATH = "Recipes/readme.md"
+
+# Delay between README downloads while building (seconds)
+FETCH_DELAY = float(os.getenv('DISCOVERY_CATALOG_FETCH_DELAY', '0.1'))
+
+# Field weights for BM25 scoring of catalog searches
+FIELD_WEIGHTS = {"Name": 3.0, "Tags": 2.0, "Categories": 1.5, "Description": 1.0}
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Bonus for the whole query phrase appearing in a field, as a share of the field weight
+PHRASE_BONUS = 2.0
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+_catalog_lock = threading.Lock()
+_catalog_cache = {}
+
+
+def tokenize(text):
+    """Lowercase alphanumeric tokens of a text"""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class CatalogSearchIndex:
+    """
+    Inverted index with per-field BM25 scoring over catalog items.
+
+    Postings are built once per item list; a query only touches the items
+    that contain one of its tokens instead of scanning the whole catalog.
+    """
+
+    def __init__(self, items):
+        self.items = items
+        self.content_types = [item.get("ContentType") for item in items]
+        # field -> token -> [(item index, term frequency)]
+        self.postings = {field: defaultdict(list) for field in FIELD_WEIGHTS}
+        self.field_lengths = {field: [0] * len(items) for field in FIELD_WEIGHTS}
+        # Lowercased field text for phrase matching of multi-word queries
+        self.field_text = {field: [""] * len(items) for field in FIELD_WEIGHTS}
+
+        for index, item in enumerate(items):
+            for field in FIELD_WEIGHTS:
+                value = item.get(field, "")
+                text = " ".join(value) if isinstance(value, list) else (value or "")
+                tokens = tokenize(text)
+                self.field_lengths[field][index] = len(tokens)
+                self.field_text[field][index] = " ".join(tokens)
+                counts = defaultdict(int)
+                for token in tokens:
+                    counts[token] += 1
+                for token, count in counts.items():
+                    self.postings[field][token].append((index, count))
+
+        count = max(len(items), 1)
+        self.avg_lengths = {field: (sum(lengths) / count) or 1.0 for field, lengths in self.field_lengths.items()}
+        self.idf = {
+            field: {token: math.log(1 + (len(items) - len(posting) + 0.5) / (len(posting) + 0.5))
+                    for token, posting in postings.items()}
+            for field, postings in self.postings.items()
+        }
+
+    def score(self, query):
+        """
+        BM25 scores of all items matching a query.
+
+        Returns:
+            dict: Item index -> score, only for items with a positive score
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        scores = defaultdict(float)
+        for field, weight in FIELD_WEIGHTS.items():
+            postings = self.postings[field]
+            lengths = self.field_lengths[field]
+            avg_length = self.avg_lengths[field]
+            for token in tokens:
+                idf = self.idf[field].get(token)
+                if idf is None:
+                    continue
+                for index, tf in postings[token]:
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[index] / avg_length)
+                    scores[index] += weight * idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        # Whole-phrase matches of multi-word queries rank above scattered tokens
+        if len(tokens) > 1:
+            phrase = " ".join(tokens)
+            for index in scores:
+                for field, weight in FIELD_WEIGHTS.items():
+                    if phrase in self.field_text[field][index]:
+                        scores[index] += PHRASE_BONUS * weight
+        return scores
+
+    def search(self, query, content_type=None, limit=20, skip=0):
+        """
+        Top matching items for one query.
+
+        Returns:
+            list: (item index, score) pairs, best first
+        """
+        scores = self.score(query)
+        if content_type:
+            scores = {i: s for i, s in scores.items() if self.content_types[i] == content_type}
+        ranked = heapq.nlargest(skip + limit, scores.items(), key=lambda pair: (pair[1], -pair[0]))
+        return ranked[skip:]
+
+    def search_batch(self, queries, content_types=None, limit=20):
+        """
+        Run several queries in one pass; each query is scored once for all content types.
+
+        Args:
+            queries (list): Query strings
+            content_types (list, optional): Content types to rank separately (None for all items)
+            limit (int): Results per query and content type
+
+        Returns:
+            dict: query -> {content_type: [(item index, score), ...]}
+        """
+        results = {}
+        for query in dict.fromkeys(queries):
+            scores = self.score(query)
+            by_type = defaultdict(list)
+            for index, value in scores.items():
+                by_type[self.content_types[index]].append((index, value))
+            per_type = {}
+            for content_type in (content_types or [None]):
+                candidates = scores.items() if content_type is None else by_type.get(content_type, [])
+                per_type[content_type] = heapq.nlargest(limit, candidates, key=lambda pair: (pair[1], -pair[0]))
+            results[query] = per_type
+        return results
+
+
+class DiscoveryCatalog:
+    """Read-only, memory-mapped catalog snapshot"""
+
+    def __init__(self, path, header, items, mapped, blob_start):
+        self.path = path
+        self.header = header
+        self.items = items
+        self._mapped = mapped
+        self._blob_start = blob_start
+        self._search_index = None
+        self._index_lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=DISCOVERY_CATALOG_PATH):
+        """
+        Load a snapshot file.
+
+        Returns:
+            DiscoveryCatalog, or None if the file is missing or has another format version
+        """
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return None
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic = mapped.readline().split()
+            if len(magic) != 2 or magic[0] != CATALOG_MAGIC or int(magic[1]) != CATALOG_FORMAT_VERSION:
+                print(f"Ignoring discovery catalog {path}: unsupported format")
+                mapped.close()
+                return None
+            header = json.loads(mapped.readline())
+            items = json.loads(mapped.readline())
+        except (ValueError, IndexError) as e:
+            print(f"Ignoring discovery catalog {path}: {e}")
+            mapped.close()
+            return None
+        return cls(path, header, items, mapped, mapped.tell())
+
+    @property
+    def search_index(self):
+        """Inverted index over the catalog items, built on first use and shared by all searchers"""
+        if self._search_index is None:
+            with self._index_lock:
+                if self._search_index is None:
+                    self._search_index = CatalogSearchIndex(self.items)
+        return self._search_index
+
+    @property
+    def commit_sha(self):
+        return self.header.get('commit_sha')
+
+    def readme(self, content_id):
+        """README text of a catalog item, or None if the snapshot has none"""
+        entry = self.header.get('readmes', {}).get(content_id)
+        if not entry:
+            return None
+        return zlib.decompress(self.compressed_readme(entry)).decode('utf-8')
+
+    def compressed_readme(self, entry):
+        """Compressed README bytes for a header entry [offset, length, blob_sha]"""
+        offset, length = entry[0], entry[1]
+        start = self._blob_start + offset
+        return self._mapped[start:start + length]
+
+    def close(self):
+        self._mapped.close()
+
+
+def get_catalog(path=DISCOVERY_CATALOG_PATH):
+    """
+    Shared catalog for a snapshot path, loaded once per process.
+    A rebuilt snapshot file is picked up on the next call without a restart.
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    with _catalog_lock:
+        cached = _catalog_cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        catalog = DiscoveryCatalog.load(path)
+        _catalog_cache[path] = (mtime, catalog)
+        if catalog:
+            catalog.search_index  # build the inverted index together with the catalog
+            print(f"Loaded discovery catalog with {len(catalog.items)} items "
+                  f"(commit {str(catalog.commit_sha)[:10]}, built {catalog.header.get('built_at')})")
+        return catalog
+
+
+class CatalogBuilder:
+    """Crawls the recipes repository and writes catalog snapshots"""
+
+    def __init__(self, github_token=None, repo_owner=REPO_OWNER, repo_name=REPO_NAME, branch=REPO_BRANCH):
+        self.repo_owner = repo_owner
+        self.repo_name = repo_name
+        self.branch = branch
+        self.headers = {'Accept': 'application/vnd.github+json'}
+        if github_token:
+            self.headers['Authorization'] = f'token {github_token}'
+
+    def _api(self, path, etag=None):
+        headers = dict(self.headers)
+        if etag:
+            headers['If-None-Match'] = etag
+        url = f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}/{path}"
+        return requests.get(url, headers=headers, timeout=60)
+
+    def _fetch_raw(self, commit_sha, path):
+        url = f"https://raw.githubusercontent.com/{self.repo_owner}/{self.repo_name}/{commit_sha}/{path}"
+        response = requests.get(url, timeout=60)
+        if response.status_code != 200:
+            print(f"Error fetching {path}: {response.status_code}")
+            return None
+        return response.text
+
+    def build(self, output_path=DISCOVERY_CATALOG_PATH, force=False):
+        """
+        Build or refresh the snapshot at output_path.
+
+        Args:
+            output_path (str): Snapshot file to write
+            force (bool): Rebuild even if the branch head did not change
+
+        Returns:
+            DiscoveryCatalog: The current snapshot
+        """
+        previous = None if force else DiscoveryCatalog.load(output_path)
+
+        # The branch head ETag answers "anything new?" with a 304 that does not count against the rate limit
+        response = self._api(f"commits/{self.branch}", etag=previous.header.get('etag') if previous else None)
+        if response.status_code == 304 and previous:
+            print(f"Discovery catalog is up to date (commit {previous.commit_sha})")
+            return previous
+        response.raise_for_status()
+        commit_sha = response.json()['sha']
+        etag = response.headers.get('ETag')
+        if previous and previous.commit_sha == commit_sha:
+            print(f"Discovery catalog is up to date (commit {commit_sha})")
+            return previous
+
+        tree_response = self._api(f"git/trees/{commit_sha}?recursive=1")
+        tree_response.raise_for_status()
+        tree = tree_response.json()
+        if tree.get('truncated'):
+            print("Warning: repository tree is truncated; READMEs outside it are downloaded on every build")
+        tree_complete = not tree.get('truncated')
+        blob_shas = {entry['path'].lower(): (entry['path'], entry['sha'])
+                     for entry in tree.get('tree', []) if entry.get('type') == 'blob'}
+
+        # Recipe list
+        recipes_readme = blob_shas.get(RECIPES_README_PATH.lower())
+        recipes_sha = recipes_readme[1] if recipes_readme else None
+        if previous and recipes_sha and previous.header.get('recipes_readme_sha') == recipes_sha:
+            items = previous.items
+        else:
+            readme_content = self._fetch_raw(commit_sha, RECIPES_README_PATH)
+            if not readme_content:
+                raise RuntimeError(f"Could not fetch {RECIPES_README_PATH}")
+            from search_discovery import SAPDiscoverySearcher
+            items = SAPDiscoverySearcher(catalog_path=None).parse_recipes_readme(readme_content)
+
+        # Recipe READMEs, reused from the previous snapshot when the blob is unchanged
+        previous_readmes = previous.header.get('readmes', {}) if previous else {}
+        blobs = []
+        readmes = {}
+        offset = 0
+        fetched = reused = 0
+        for item in items:
+            readme_path, blob_sha = self._find_readme(item.get('Path', ''), blob_shas, tree_complete)
+            if not readme_path:
+                continue
+            old = previous_readmes.get(item['Id'])
+            if old and blob_sha and len(old) > 2 and old[2] == blob_sha:
+                compressed = bytes(previous.compressed_readme(old))
+                reused += 1
+            else:
+                content = self._fetch_raw(commit_sha, readme_path)
+                if content is None:
+                    continue
+                compressed = zlib.compress(content.encode('utf-8'), 9)
+                fetched += 1
+                time.sleep(FETCH_DELAY)
+            readmes[item['Id']] = [offset, len(compressed), blob_sha]
+            blobs.append(compressed)
+            offset += len(compressed)
+
+        header = {
+            'format_version': CATALOG_FORMAT_VERSION,
+            'repo': f"{self.repo_owner}/{self.repo_name}",
+            'branch': self.branch,
+            'commit_sha': commit_sha,
+            'etag': etag,
+            'recipes_readme_sha': recipes_sha,
+            'built_at': datetime.now().isoformat(),
+            'item_count': len(items),
+            'readmes': readmes,
+        }
+        if previous:
+            previous.close()
+        self._write(output_path, header, items, blobs)
+        print(f"Wrote discovery catalog with {len(items)} items to {output_path} "
+              f"({fetched} READMEs downloaded, {reused} reused)")
+        return DiscoveryCatalog.load(output_path)
+
+    def _find_readme(self, item_path, blob_shas, tree_complete=True):
+        """Locate an item's README in the repository tree: (path, blob_sha) or (None, None)"""
+        item_path = item_path.strip().strip('/')
+        if item_path.startswith('./'):
+            item_path = item_path[2:]
+        if not item_path or item_path.startswith('http'):
+            return None, None
+        for candidate in (item_path, f"Recipes/{item_path}"):
+            match = blob_shas.get(f"{candidate}/readme.md".lower())
+            if match:
+                return match
+        if not tree_complete:
+            # Not in the partial tree: fall back to the conventional location, downloaded every build
+            return f"{item_path}/README.md", None
+        return None, None
+
+    def _write(self, output_path, header, items, blobs):
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        temp_path = f"{output_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(CATALOG_MAGIC + f" {CATALOG_FORMAT_VERSION}\n".encode('ascii'))
+            f.write(json.dumps(header, separators=(',', ':')).encode('utf-8') + b'\n')
+            f.write(json.dumps(items, separators=(',', ':'), ensure_ascii=False).encode('utf-8') + b'\n')
+            for blob in blobs:
+                f.write(blob)
+        os.replace(temp_path, output_path)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or inspect the offline SAP integration content catalog")
+    parser.add_argument("command", choices=["build", "info"], help="build/refresh the snapshot, or show its header")
+    parser.add_argument("--output", "-o", default=DISCOVERY_CATALOG_PATH, help="Snapshot file")
+    parser.add_argument("--token", "-t", default=os.environ.get("GITHUB_TOKEN"), help="GitHub token for API access")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the repository did not change")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        catalog = CatalogBuilder(github_token=args.token).build(args.output, force=args.force)
+        try:
+            # Prefit the TF-IDF model used by ContentSimilarityScorer for this snapshot
+            from similarity_model import get_similarity_model
+            get_similarity_model(args.output)
+        except ImportError as e:
+            print(f"Skipping TF-IDF model: {e}")
+        return 0 if catalog else 1
+
+    catalog = DiscoveryCatalog.load(args.output)
+    if not catalog:
+        print(f"No discovery catalog at {args.output}")
+        return 1
+    header = dict(catalog.header)
+    header['readmes'] = len(header.get('readmes', {}))
+    print(json.dumps(header, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Multi-keyword substring matching with an Aho-Corasick automaton
+
+The automaton is built once from a fixed keyword list and then finds every
+keyword occurring in a text in a single left-to-right pass, regardless of how
+many keywords there are. Matching is case-sensitive; build it from lowercase
+keywords and feed it lowercase text for case-insensitive matching.
+"""
+import re
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over a fixed set of keywords"""
+
+    def __init__(self, keywords):
+        """
+        Args:
+            keywords (iterable): Keywords to find; duplicates and empty strings are ignored
+        """
+        self.keywords = list(dict.fromkeys(k for k in keywords if k))
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        terminal = set()
+
+        for keyword in self.keywords:
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                state = next_state
+            self._output[state] += (keyword,)
+            terminal.add(state)
+
+        # Breadth-first pass sets failure links and merges the outputs of suffix states
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+        # The trie is also compiled to one regular expression so find() scans in C.
+        # At each position it matches the longest keyword starting there; the keywords
+        # contained in that match are then exactly those ending inside it.
+        self._pattern = re.compile(f'(?=({self._trie_pattern(0, terminal)}))') if self.keywords else None
+        self._contained = {keyword: frozenset(k for _, k in self.iter_matches(keyword))
+                           for keyword in self.keywords}
+
+    def _trie_pattern(self, state, terminal):
+        children = sorted(self._goto[state].items())
+        if not children:
+            return ''
+        alternatives = '|'.join(re.escape(char) + self._trie_pattern(child, terminal)
+                                for char, child in children)
+        if state in terminal:
+            # A keyword ends here; longer keywords through this state are tried first
+            return f'(?:{alternatives})?'
+        return f'(?:{alternatives})' if len(children) > 1 else alternatives
+
+    def iter_matches(self, chunks):
+        """
+        Yield (end_offset, keyword) for every keyword occurrence.
+
+        Args:
+            chunks (str or iterable): Text, or pieces of one text fed in order;
+                matches may span piece boundaries
+
+        Yields:
+            tuple: Offset just past the match in the whole text, matched keyword
+        """
+        if isinstance(chunks, str):
+            chunks = (chunks,)
+        goto, fail, output = self._goto, self._fail, self._output
+        root = goto[0]
+        state = 0
+        offset = 0
+        for chunk in chunks:
+            for char in chunk:
+                offset += 1
+                if state == 0:
+                    # Fast path: most characters do not start a keyword
+                    state = root.get(char, 0)
+                else:
+                    while state and char not in goto[state]:
+                        state = fail[state]
+                    state = goto[state].get(char, 0)
+                if output[state]:
+                    for keyword in output[state]:
+                        yield offset, keyword
+
+    def find(self, text):
+        """Set of keywords that occur in the text"""
+        if self._pattern is None or not text:
+            return set()
+        found = set()
+        for longest in set(self._pattern.findall(text)):
+            found |= self._contained[longest]
+        return found
@@ -1,4 +0,0 @@
-import nltk
-
-nltk.download('punkt')
-nltk.download('stopwords')
\ No newline at end of file
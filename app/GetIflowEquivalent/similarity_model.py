@@ -0,0 +1,200 @@
+"""
+Prefit TF-IDF model for ContentSimilarityScorer
+
+The model is fitted once over the whole discovery catalog (item name and
+description) and saved next to the catalog snapshot as sparse matrices. Scoring
+a query against any number of candidates is then a single sparse
+matrix-vector product; candidates that are not in the catalog are transformed
+with the same vocabulary instead of refitting.
+
+The transform mirrors TfidfVectorizer defaults (lowercase, \\w\\w+ tokens,
+smoothed IDF, L2 norm), so saved models need only numpy and scipy to load.
+"""
+import os
+import re
+import json
+import threading
+
+import numpy as np
+from scipy import sparse
+
+from discovery_catalog import DISCOVERY_CATALOG_PATH, get_catalog
+from text_tokenizer import word_tokenize, stopwords
+
+MODEL_FORMAT_VERSION = 2
+
+# Same default token pattern as sklearn's TfidfVectorizer
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+_model_lock = threading.Lock()
+_model_cache = {}
+
+
+def preprocess_text(text):
+    """Lowercase, tokenize and drop stopwords and punctuation"""
+    if not text:
+        return ""
+    stop_words = stopwords('english')
+    tokens = word_tokenize(text.lower())
+    return ' '.join(word for word in tokens if word.isalnum() and word not in stop_words)
+
+
+def item_text(item):
+    """Text of a catalog item used for content similarity"""
+    return f"{item.get('Name', '')} {item.get('Description', '')}"
+
+
+class CatalogSimilarityModel:
+    """TF-IDF vectors of all catalog items with the vocabulary to transform queries"""
+
+    def __init__(self, vocabulary, idf, item_matrix, item_ids, catalog_sha=None):
+        """
+        Args:
+            vocabulary (dict): Token -> column index
+            idf (numpy.ndarray): IDF weight per column
+            item_matrix (scipy.sparse.csr_matrix): L2-normalized TF-IDF rows, one per item
+            item_ids (list): Item Id per row
+            catalog_sha (str, optional): Commit of the catalog snapshot the model was fitted on
+        """
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.item_matrix = item_matrix
+        self.item_ids = item_ids
+        self.catalog_sha = catalog_sha
+        self.rows = {item_id: row for row, item_id in enumerate(item_ids)}
+
+    @classmethod
+    def fit(cls, items, catalog_sha=None):
+        """Fit the model over catalog items"""
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        vectorizer = TfidfVectorizer()
+        item_matrix = vectorizer.fit_transform([preprocess_text(item_text(item)) for item in items])
+        vocabulary = {token: int(column) for token, column in vectorizer.vocabulary_.items()}
+        return cls(vocabulary, np.asarray(vectorizer.idf_, dtype=np.float64), item_matrix.tocsr(),
+                   [item.get('Id') for item in items], catalog_sha)
+
+    def transform(self, texts):
+        """
+        TF-IDF vectors for preprocessed texts with the fitted vocabulary.
+
+        Returns:
+            scipy.sparse.csr_matrix: L2-normalized rows, one per text
+        """
+        data, indices, indptr = [], [], [0]
+        for text in texts:
+            counts = {}
+            for token in TOKEN_PATTERN.findall(text.lower()):
+                column = self.vocabulary.get(token)
+                if column is not None:
+                    counts[column] = counts.get(column, 0) + 1
+            columns = sorted(counts)
+            values = np.array([counts[c] for c in columns], dtype=np.float64) * self.idf[columns]
+            norm = np.linalg.norm(values)
+            if norm > 0:
+                values /= norm
+            indices.extend(columns)
+            data.extend(values.tolist())
+            indptr.append(len(indices))
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(texts), len(self.vocabulary)))
+
+    def similarities(self, query_text, items):
+        """
+        Cosine similarity of a preprocessed query to each candidate item.
+
+        Args:
+            query_text (str): Preprocessed query document
+            items (list): Candidate items; catalog items use their precomputed rows
+
+        Returns:
+            numpy.ndarray: Similarity per item, in order
+        """
+        if not items:
+            return np.zeros(0)
+        query_vector = self.transform([query_text])
+
+        rows = [self.rows.get(item.get('Id')) for item in items]
+        missing = [i for i, row in enumerate(rows) if row is None]
+        if not missing:
+            candidates = self.item_matrix[rows]
+        else:
+            # Items outside the catalog are transformed with the fitted vocabulary, not refitted
+            extra = self.transform([preprocess_text(item_text(items[i])) for i in missing])
+            stacked = sparse.vstack([self.item_matrix, extra]).tocsr()
+            extra_rows = iter(range(self.item_matrix.shape[0], stacked.shape[0]))
+            rows = [row if row is not None else next(extra_rows) for row in rows]
+            candidates = stacked[rows]
+        return np.asarray((candidates @ query_vector.T).todense()).ravel()
+
+    def save(self, base_path):
+        """Save as <base_path>.npz (sparse matrix, IDF) and <base_path>.json (vocabulary, ids)"""
+        matrix = self.item_matrix.tocsr()
+        temp_npz = f"{base_path}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(temp_npz, data=matrix.data, indices=matrix.indices, indptr=matrix.indptr,
+                            shape=np.array(matrix.shape), idf=self.idf)
+        os.replace(temp_npz, f"{base_path}.npz")
+
+        meta = {
+            'format_version': MODEL_FORMAT_VERSION,
+            'catalog_sha': self.catalog_sha,
+            'item_ids': self.item_ids,
+            'vocabulary': self.vocabulary,
+        }
+        temp_json = f"{base_path}.{os.getpid()}.tmp.json"
+        with open(temp_json, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, separators=(',', ':'), ensure_ascii=False)
+        os.replace(temp_json, f"{base_path}.json")
+
+    @classmethod
+    def load(cls, base_path):
+        """Load a saved model, or None if it is missing or has another format version"""
+        try:
+            with open(f"{base_path}.json", 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('format_version') != MODEL_FORMAT_VERSION:
+                return None
+            arrays = np.load(f"{base_path}.npz")
+            matrix = sparse.csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']),
+                                       shape=tuple(arrays['shape']))
+            return cls(meta['vocabulary'], arrays['idf'], matrix, meta['item_ids'], meta.get('catalog_sha'))
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+def model_path(catalog_path=DISCOVERY_CATALOG_PATH):
+    """Base path of the model saved next to a catalog snapshot"""
+    return f"{catalog_path}.tfidf"
+
+
+def build_similarity_model(catalog):
+    """Fit and save the model for a catalog snapshot"""
+    model = CatalogSimilarityModel.fit(catalog.items, catalog.commit_sha)
+    model.save(model_path(catalog.path))
+    print(f"Wrote TF-IDF model for {len(catalog.items)} catalog items ({len(model.vocabulary)} terms)")
+    return model
+
+
+def get_similarity_model(catalog_path=DISCOVERY_CATALOG_PATH):
+    """
+    Shared model for the current catalog snapshot, loaded once per process.
+    Fitted and saved on first use if the snapshot has no matching saved model.
+
+    Returns:
+        CatalogSimilarityModel, or None if there is no catalog snapshot
+    """
+    catalog = get_catalog(catalog_path)
+    if catalog is None:
+        return None
+    with _model_lock:
+        cached = _model_cache.get(catalog_path)
+        if cached and cached.catalog_sha == catalog.commit_sha:
+            return cached
+        model = CatalogSimilarityModel.load(model_path(catalog_path))
+        if model is None or model.catalog_sha != catalog.commit_sha:
+            try:
+                model = build_similarity_model(catalog)
+            except OSError as e:
+                print(f"Could not save TF-IDF model: {e}")
+                model = CatalogSimilarityModel.fit(catalog.items, catalog.commit_sha)
+        _model_cache[catalog_path] = model
+        return model
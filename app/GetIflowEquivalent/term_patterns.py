@@ -0,0 +1,194 @@
+"""
+Precompiled patterns and keyword sets for term extraction and scoring
+
+Everything here is compiled once at import and reused by every call: the
+markdown structure patterns, one keyword automaton per fixed term category of
+extract_terms, and TermMatcher, which finds all of a document's terms in a
+catalog item with one scan instead of one substring test per term.
+"""
+import re
+from collections import Counter
+from functools import lru_cache
+
+from keyword_matcher import KeywordAutomaton
+
+# Markdown structure
+ENDPOINT_PATTERN = re.compile(r'(GET|POST|PATCH|DELETE|PUT) (/\w+(?:/{\w+})?(?:/\w+)*)')
+ATX_HEADER_PATTERN = re.compile(r'^ {0,3}(#{1,6})[ \t]+(.*?)(?:[ \t]+#+)?[ \t]*$')
+SETEXT_UNDERLINE_PATTERN = re.compile(r'^ {0,3}(=+|-+)[ \t]*$')
+RULE_PATTERN = re.compile(r'^ {0,3}(?:(?:-[ \t]*){3,}|(?:\*[ \t]*){3,}|(?:_[ \t]*){3,}|\|?[ \t]*:?-+:?[ \t]*(?:\|[ \t]*:?-+:?[ \t]*)+\|?)$')
+FENCE_PATTERN = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+BLOCK_PREFIX_PATTERN = re.compile(r'^ {0,3}(?:>[ \t]?)*(?:(?:[-*+]|\d+[.)])[ \t]+)?')
+LIST_ITEM_PATTERN = re.compile(r'^ {0,3}(?:>[ \t]?)*(?:[-*+]|\d+[.)])[ \t]+')
+INLINE_CODE_PATTERN = re.compile(r'(`+)(.+?)\1')
+LINK_PATTERN = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+HTML_TAG_PATTERN = re.compile(r'</?[A-Za-z][^>]*>')
+EMPHASIS_PATTERN = re.compile(r'(?<!\\)(?:\*+|~~|(?<!\w)_+|_+(?!\w))')
+ESCAPE_PATTERN = re.compile(r'\\([\\`*_{}\[\]()#+\-.!])')
+JSON_BLOCK_PATTERN = re.compile(r'```json\n([\s\S]*?)\n```')
+
+# Key terms of free text
+CAPITALIZED_PATTERN = re.compile(r'\b[A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*\b')
+BULLET_PATTERN = re.compile(r'[-*]\s+([^.\n]+)')
+
+# MuleSoft flow logic sections
+FLOW_TRIGGER_PATTERN = re.compile(r'\*\*Trigger\*\*: \w+ request to `([^`]+)`')
+DATAWEAVE_FILE_PATTERN = re.compile(r'`([^`]+\.dwl)`')
+PROCESSING_STEPS_PATTERN = re.compile(r'\*\*Processing Steps\*\*:([\s\S]*?)(?:\n\n|$)')
+NUMBERED_STEP_PATTERN = re.compile(r'\d+\.\s*(.*?)(?:\n|$)')
+CODE_SPAN_PATTERN = re.compile(r'`([^`]+)`')
+PATH_PARAMETER_PATTERN = re.compile(r'{[^}]+}')
+
+
+class KeywordSet:
+    """Fixed keywords of one category, all found case-insensitively in one pass"""
+
+    def __init__(self, keywords):
+        self.keywords = list(keywords)
+        self._automaton = KeywordAutomaton(keyword.lower() for keyword in self.keywords)
+
+    def find(self, text_lower):
+        """Keywords occurring in lowercased text, in category order"""
+        found = self._automaton.find(text_lower)
+        return [keyword for keyword in self.keywords if keyword.lower() in found]
+
+
+DOMAIN_KEYWORDS = KeywordSet([
+    'Financial Services', 'Wealth Management', 'Investment', 'Account',
+    'Beneficiary', 'Customer', 'Payment', 'Profile', 'Standing Order',
+    'ACATS', 'RMD', 'Transaction', 'API', 'Investment Account'
+])
+
+TECHNICAL_KEYWORDS = KeywordSet([
+    'REST', 'API', 'JSON', 'ID Generation', 'Transformation', 'DataWeave',
+    'HTTP', 'HTTPS', 'Authentication', 'Error Handling', 'Flow'
+])
+
+OPERATION_KEYWORDS = KeywordSet([
+    'Create', 'Read', 'Update', 'Delete', 'Initiate', 'Process', 'Retrieve',
+    'Transfer', 'Cancel', 'GET', 'POST', 'PATCH', 'DELETE', 'PUT'
+])
+
+
+# Below this many distinct terms one substring test per term is faster than a scan
+# with the automaton (catalog names and descriptions are short)
+AUTOMATON_MIN_TERMS = 40
+
+
+class TermMatcher:
+    """
+    Query terms matched against many texts.
+
+    With many terms the lowercased terms are compiled into one automaton, so
+    each text is scanned once however many terms there are. Duplicate terms
+    are kept as counts so weighted scores stay the same as testing every term.
+    """
+
+    def __init__(self, terms):
+        self.counts = Counter(term.lower() for term in terms)
+        self._terms = list(self.counts)
+        # An empty term is contained in every text
+        self._matches_empty = '' in self.counts
+        self._automaton = KeywordAutomaton(self._terms) if len(self._terms) >= AUTOMATON_MIN_TERMS else None
+
+    def find(self, text_lower):
+        """Set of lowercased terms occurring in lowercased text"""
+        if self._automaton is None:
+            return {term for term in self._terms if term in text_lower}
+        found = self._automaton.find(text_lower)
+        if self._matches_empty:
+            found.add('')
+        return found
+
+
+def combined_pattern(patterns, flags=0):
+    """One regex matching wherever any of the patterns matches, or None for no patterns"""
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), flags)
+
+
+@lru_cache(maxsize=64)
+def section_pattern(section_name, level=2):
+    """Content of a markdown section up to the next heading of the same level"""
+    heading_marker = '#' * level
+    return re.compile(f"{heading_marker} {section_name}([\\s\\S]*?)(?:{heading_marker} |$)")
+
+
+@lru_cache(maxsize=64)
+def between_headers_pattern(start_header, end_header):
+    """Content between two markdown headers"""
+    return re.compile(f"# {start_header}([\\s\\S]*?)# {end_header}")
+
+
+def plain_inline_text(line, code_blocks=None):
+    """Text of a markdown line without inline markup; optionally collects inline code spans"""
+    def keep_code(match):
+        code = match.group(2).strip()
+        if code_blocks is not None:
+            code_blocks.append(code)
+        return code
+
+    line = INLINE_CODE_PATTERN.sub(keep_code, line)
+    line = LINK_PATTERN.sub(r'\1', line)
+    line = HTML_TAG_PATTERN.sub('', line)
+    line = EMPHASIS_PATTERN.sub('', line)
+    return ESCAPE_PATTERN.sub(r'\1', line)
+
+
+def markdown_text(markdown_content):
+    """
+    Headers and plain text of markdown, read line by line without rendering HTML.
+
+    Returns:
+        tuple: Level 1-3 header texts, text content with markup removed
+    """
+    headers = []
+    lines = []
+    fence = None
+    previous_text = None
+    for line in markdown_content.splitlines():
+        if fence is not None:
+            if line.strip().startswith(fence):
+                fence = None
+            else:
+                lines.append(line)
+            continue
+
+        fence_match = FENCE_PATTERN.match(line)
+        if fence_match:
+            fence = fence_match.group(1)
+            # The info string (e.g. "json") stays part of the text
+            lines.append(line[fence_match.end():].strip())
+            previous_text = None
+            continue
+
+        if not line.strip():
+            lines.append('')
+            previous_text = None
+            continue
+
+        # "Title" followed by "===" or "---" is a level 1 or 2 header
+        if previous_text is not None and SETEXT_UNDERLINE_PATTERN.match(line):
+            headers.append(previous_text.strip())
+            previous_text = None
+            continue
+
+        if RULE_PATTERN.match(line):
+            previous_text = None
+            continue
+
+        header_match = ATX_HEADER_PATTERN.match(line)
+        if header_match:
+            text = plain_inline_text(header_match.group(2))
+            if len(header_match.group(1)) <= 3:
+                headers.append(text.strip())
+            lines.append(text)
+            previous_text = None
+            continue
+
+        text = plain_inline_text(BLOCK_PREFIX_PATTERN.sub('', line, count=1))
+        lines.append(text)
+        previous_text = text
+
+    return headers, '\n'.join(lines)
@@ -0,0 +1,82 @@
+"""
+Lightweight word and sentence tokenizer with a bundled English stopword list
+
+Drop-in replacement for the parts of NLTK used by the matchers
+(word_tokenize, sent_tokenize, stopwords.words('english')). It needs no
+downloaded data and no network access, and importing it only compiles a few
+regular expressions, so workers start without touching nltk_data.
+
+Tokens follow NLTK's Treebank conventions closely enough for keyword and
+TF-IDF matching: punctuation is split off, hyphenated and dotted words are
+kept together and clitics are separate tokens ("don't" -> "do", "n't").
+"""
+import re
+
+# NLTK English stopword list (nltk_data corpora/stopwords/english)
+ENGLISH_STOPWORDS = frozenset((
+    'a', 'about', 'above', 'after', 'again', 'against', 'ain', 'all', 'am', 'an', 'and', 'any',
+    'are', 'aren', "aren't", 'as', 'at', 'be', 'because', 'been', 'before', 'being', 'below',
+    'between', 'both', 'but', 'by', 'can', 'couldn', "couldn't", 'd', 'did', 'didn', "didn't",
+    'do', 'does', 'doesn', "doesn't", 'doing', 'don', "don't", 'down', 'during', 'each', 'few',
+    'for', 'from', 'further', 'had', 'hadn', "hadn't", 'has', 'hasn', "hasn't", 'have',
+    'haven', "haven't", 'having', 'he', "he'd", "he'll", 'her', 'here', 'hers', 'herself',
+    "he's", 'him', 'himself', 'his', 'how', 'i', "i'd", 'if', "i'll", "i'm", 'in', 'into',
+    'is', 'isn', "isn't", 'it', "it'd", "it'll", "it's", 'its', 'itself', "i've", 'just', 'll',
+    'm', 'ma', 'me', 'mightn', "mightn't", 'more', 'most', 'mustn', "mustn't", 'my', 'myself',
+    'needn', "needn't", 'no', 'nor', 'not', 'now', 'o', 'of', 'off', 'on', 'once', 'only',
+    'or', 'other', 'our', 'ours', 'ourselves', 'out', 'over', 'own', 're', 's', 'same', 'shan',
+    "shan't", 'she', "she'd", "she'll", "she's", 'should', 'shouldn', "shouldn't", "should've",
+    'so', 'some', 'such', 't', 'than', 'that', "that'll", 'the', 'their', 'theirs', 'them',
+    'themselves', 'then', 'there', 'these', 'they', "they'd", "they'll", "they're", "they've",
+    'this', 'those', 'through', 'to', 'too', 'under', 'until', 'up', 've', 'very', 'was',
+    'wasn', "wasn't", 'we', "we'd", "we'll", "we're", 'were', 'weren', "weren't", "we've",
+    'what', 'when', 'where', 'which', 'while', 'who', 'whom', 'why', 'will', 'with', 'won',
+    "won't", 'wouldn', "wouldn't", 'y', 'you', "you'd", "you'll", 'your', "you're", 'yours',
+    'yourself', 'yourselves', "you've",
+))
+
+WORD_TOKEN_PATTERN = re.compile(r"""
+      \w+(?=n't\b)                  # "do" of "don't"
+    | n't\b                         # negation clitic
+    | '(?:s|m|d|ll|re|ve)\b         # other clitics
+    | \w+(?:[-.&]\w+)*              # words, hyphenated words, dotted numbers
+    | \.\.\.|--                     # ellipsis and dashes
+    | [^\w\s]                       # any other punctuation
+""", re.VERBOSE | re.IGNORECASE)
+
+SENTENCE_BREAK_PATTERN = re.compile(r'(?<=[.!?])["\')\]]*\s+(?=["\'(\[]*[A-Z0-9])|\n\s*\n')
+
+# Abbreviations that end with a period without ending the sentence
+ABBREVIATIONS = frozenset(('e.g', 'i.e', 'etc', 'vs', 'mr', 'mrs', 'ms', 'dr', 'no', 'fig', 'approx', 'inc', 'ltd'))
+ABBREVIATION_PATTERN = re.compile(r'([\w.]+)\.["\')\]]*$')
+
+
+def stopwords(language='english'):
+    """Stopword set for a language (only English is bundled)"""
+    if language != 'english':
+        raise ValueError(f"No bundled stopwords for language: {language}")
+    return ENGLISH_STOPWORDS
+
+
+def word_tokenize(text):
+    """Split text into word and punctuation tokens"""
+    return WORD_TOKEN_PATTERN.findall(text) if text else []
+
+
+def sent_tokenize(text):
+    """Split text into sentences at terminal punctuation and blank lines"""
+    if not text:
+        return []
+    sentences = []
+    start = 0
+    for match in SENTENCE_BREAK_PATTERN.finditer(text):
+        candidate = text[start:match.start()]
+        abbreviation = ABBREVIATION_PATTERN.search(candidate)
+        if abbreviation and abbreviation.group(1).lower() in ABBREVIATIONS:
+            continue
+        if candidate.strip():
+            sentences.append(candidate.strip())
+        start = match.end()
+    if text[start:].strip():
+        sentences.append(text[start:].strip())
+    return sentences
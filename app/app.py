@@ -114,20 +114,6 @@ except Exception as e:
 
 
 
-# Set up NLTK data
-
-try:
-
-    import nltk_setup
-
-    print("NLTK setup completed")
-
-except Exception as e:
-
-    print(f"Warning: NLTK setup failed: {str(e)}")
-
-
-
 # Run startup checks
 
 try:
@@ -300,7 +286,7 @@ sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__f
 
 try:
 
-    from enhanced_doc_generator import generate_enhanced_documentation
+    from enhanced_doc_generator import generate_enhanced_documentation, generate_enhanced_sections
 
 except ImportError:
 
@@ -506,13 +492,51 @@ class CustomLLMDocumentationEnhancer:
 
 
 
+    def enhance_sections(self, document, platform: str = 'boomi') -> str:
+
+        """Enhance only the sections of a sectioned document that have no enhanced text yet.
+
+        Args:
+
+            document: doc_sections.SectionedDocument, with unchanged sections reused from a previous run
+
+            platform: The platform type ('boomi' or 'mulesoft')
+
+        Returns:
+
+            Enhanced documentation
+
+        """
+
+        if self.enhancer is None:
+
+            logging.error("No enhancer available. Returning original documentation.")
+
+            return document.to_markdown()
+
+        try:
+
+            logging.info(f"Starting section-level LLM enhancement with {self.service} service")
+
+            return self.enhancer.enhance_sections(document, platform=platform)
+
+        except Exception as e:
+
+            logging.error(f"Error during section-level LLM enhancement: {str(e)}")
+
+            return document.to_markdown(enhanced=True)
+
+
+
 # Import the documentation generators
 
 try:
 
     from mule_flow_documentation import MuleFlowParser, HTMLGenerator, FlowDocumentationGenerator
 
-    from md_to_html_with_mermaid import convert_markdown_to_html
+    from doc_renderer import doc_renderer
+
+    from doc_sections import INCREMENTAL_SECTIONS_ENABLED, split_markdown_sections, find_previous_manifest, save_section_manifest
 
     # Use our custom enhancer instead of the original
 
@@ -1382,6 +1406,31 @@ def process_documentation(job_id, input_dir, enhance=False, platform='mulesoft')
 
 
 
+def collect_boomi_xml(job_id):
+
+    """Boomi XML files uploaded for a job, as [{"name", "content"}] (names relative to the job folder)"""
+
+    job_folder = os.path.join(app.config['UPLOAD_FOLDER'], job_id)
+
+    files = []
+
+    for root, _, names in os.walk(job_folder):
+
+        for name in sorted(names):
+
+            if name.lower().endswith('.xml'):
+
+                path = os.path.join(root, name)
+
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+
+                    files.append({'name': os.path.relpath(path, job_folder), 'content': f.read()})
+
+    return files
+
+
+
+
 def generate_boomi_iflow_metadata(job_id, documentation, processing_results):
 
     """Generate iFlow metadata JSON files from Boomi documentation"""
@@ -1416,7 +1465,11 @@ def generate_boomi_iflow_metadata(job_id, documentation, processing_results):
 
             "iflow_name": f"BoomiFlow_{job_id[:8]}",
 
-            "job_id": job_id
+            "job_id": job_id,
+
+            # Simple processes are converted from the XML without the LLM
+
+            "boomi_xml": collect_boomi_xml(job_id)
 
         }
 
@@ -1544,6 +1597,24 @@ def process_boomi_documentation(job_id, input_dir, enhance=False):
 
         documentation = boomi_generator.generate_documentation(processing_results)
 
+        # Split into fingerprinted sections and reuse unchanged ones from an earlier run of the same project
+
+        sectioned_doc = None
+
+        previous_manifest = None
+
+        if INCREMENTAL_SECTIONS_ENABLED:
+
+            sectioned_doc = split_markdown_sections(documentation)
+
+            previous_manifest = find_previous_manifest(app.config['RESULTS_FOLDER'], 'boomi', sectioned_doc.section_ids, exclude_job_id=job_id)
+
+            changed_sections = sectioned_doc.reuse(previous_manifest)
+
+            if previous_manifest:
+
+                logging.info(f"Job {job_id}: {len(changed_sections)} of {len(sectioned_doc.sections)} documentation sections changed since job {previous_manifest['job_id']}")
+
 
 
         # Enhance documentation with LLM if requested
@@ -1581,7 +1652,23 @@ def process_boomi_documentation(job_id, input_dir, enhance=False):
 
                     try:
 
-                        enhanced_content = llm_enhancer.enhance_documentation(documentation, platform='boomi')
+                        # Section by section only when an earlier run left enhanced sections to reuse;
+
+                        # a first run gets the whole-document prompt of the platform
+
+                        if previous_manifest:
+
+                            enhanced_content = llm_enhancer.enhance_sections(sectioned_doc, platform='boomi')
+
+                        else:
+
+                            enhanced_content = llm_enhancer.enhance_documentation(documentation, platform='boomi')
+
+                            # Keep the enhanced text of each section for the next run (not the base text returned on failure)
+
+                            if enhanced_content and enhanced_content != documentation and sectioned_doc is not None:
+
+                                sectioned_doc.take_enhanced(enhanced_content)
 
                         if enhanced_content:
 
@@ -1671,13 +1758,25 @@ def process_boomi_documentation(job_id, input_dir, enhance=False):
 
             f.write(documentation)
 
+        # Keep section fingerprints with the job outputs for the next run
+
+        if sectioned_doc is not None:
+
+            try:
+
+                save_section_manifest(job_result_dir, job_id, 'boomi', sectioned_doc)
+
+            except Exception as manifest_error:
 
+                logging.warning(f"Job {job_id}: Could not save section manifest: {str(manifest_error)}")
 
-        # Convert to HTML (pass file path, not content)
+
+
+        # Render HTML in a worker process; the job does not wait for it (PDF is rendered on first download)
 
         html_file = os.path.join(job_result_dir, 'boomi_documentation.html')
 
-        convert_markdown_to_html(doc_file, html_file)
+        doc_renderer.render_html_in_background(doc_file, html_file)
 
 
 
@@ -1733,7 +1832,9 @@ def process_boomi_documentation(job_id, input_dir, enhance=False):
 
                 'markdown': os.path.join('results', job_id, 'boomi_documentation.md'),
 
-                'html': os.path.join('results', job_id, 'boomi_documentation.html')
+                'html': os.path.join('results', job_id, 'boomi_documentation.html'),
+
+                'pdf': os.path.join('results', job_id, 'boomi_documentation.pdf')
 
             },
 
@@ -2021,6 +2122,10 @@ def process_mulesoft_documentation(job_id, input_dir, enhance=False):
 
             # Generate base documentation (either standard or enhanced)
 
+            sectioned_doc = None
+
+            previous_manifest = None
+
             if use_enhanced:
 
                 logging.info(f"Job {job_id}: Using enhanced documentation generator to include additional file types")
@@ -2031,12 +2136,36 @@ def process_mulesoft_documentation(job_id, input_dir, enhance=False):
 
                 })
 
-                doc_content = generate_enhanced_documentation(input_dir, include_additional_files=True)
+                if INCREMENTAL_SECTIONS_ENABLED:
+
+                    sectioned_doc = generate_enhanced_sections(input_dir, include_additional_files=True, parsed_data=parsed_data)
+
+                else:
+
+                    doc_content = generate_enhanced_documentation(input_dir, include_additional_files=True)
 
             else:
 
                 doc_content = doc_gen.generate_documentation(parsed_data)
 
+                if INCREMENTAL_SECTIONS_ENABLED:
+
+                    sectioned_doc = split_markdown_sections(doc_content)
+
+            # Reuse unchanged sections from an earlier run; only changed sections are rendered
+
+            if sectioned_doc is not None:
+
+                previous_manifest = find_previous_manifest(app.config['RESULTS_FOLDER'], 'mulesoft', sectioned_doc.section_ids, exclude_job_id=job_id)
+
+                changed_sections = sectioned_doc.reuse(previous_manifest)
+
+                if previous_manifest:
+
+                    logging.info(f"Job {job_id}: {len(changed_sections)} of {len(sectioned_doc.sections)} documentation sections changed since job {previous_manifest['job_id']}")
+
+                doc_content = sectioned_doc.to_markdown()
+
 
 
             # Enhance documentation with LLM if requested
@@ -2070,7 +2199,23 @@ def process_mulesoft_documentation(job_id, input_dir, enhance=False):
 
                         try:
 
-                            enhanced_content = llm_enhancer.enhance_documentation(doc_content, platform='mulesoft')
+                            # Section by section only when an earlier run left enhanced sections to reuse;
+
+                            # a first run gets the whole-document prompt of the platform
+
+                            if previous_manifest:
+
+                                enhanced_content = llm_enhancer.enhance_sections(sectioned_doc, platform='mulesoft')
+
+                            else:
+
+                                enhanced_content = llm_enhancer.enhance_documentation(doc_content, platform='mulesoft')
+
+                                # Keep the enhanced text of each section for the next run (not the base text returned on failure)
+
+                                if enhanced_content and enhanced_content != doc_content and sectioned_doc is not None:
+
+                                    sectioned_doc.take_enhanced(enhanced_content)
 
                             if enhanced_content:
 
@@ -2156,13 +2301,25 @@ def process_mulesoft_documentation(job_id, input_dir, enhance=False):
 
                 f.write(doc_content)
 
+            # Keep section fingerprints with the job outputs for the next run
 
+            if sectioned_doc is not None:
 
-            # Convert markdown to HTML with Mermaid diagrams
+                try:
+
+                    save_section_manifest(job_result_dir, job_id, 'mulesoft', sectioned_doc)
+
+                except Exception as manifest_error:
+
+                    logging.warning(f"Job {job_id}: Could not save section manifest: {str(manifest_error)}")
+
+
+
+            # Render HTML with Mermaid diagrams in a worker process; PDF is rendered on first download
 
             html_output = os.path.join(job_result_dir, "flow_documentation_with_mermaid.html")
 
-            convert_markdown_to_html(md_file, html_output)
+            doc_renderer.render_html_in_background(md_file, html_output)
 
 
 
@@ -2176,6 +2333,8 @@ def process_mulesoft_documentation(job_id, input_dir, enhance=False):
 
                     'html': os.path.join('results', job_id, "flow_documentation_with_mermaid.html"),
 
+                    'pdf': os.path.join('results', job_id, "flow_documentation_with_mermaid.pdf"),
+
                     'visualization': os.path.join('results', job_id, "flow_visualization.html")
 
                 },
@@ -4445,6 +4604,20 @@ def get_documentation(job_id, file_type):
 
 
 
+    elif file_type == 'boomi_xml':
+
+        # Boomi XML of the job, for the rule-based iFlow generation in BoomiToIS-API
+
+        files = collect_boomi_xml(job_id) if job.get('platform') == 'boomi' else []
+
+        if not files:
+
+            return jsonify({'error': 'No Boomi XML files for this job'}), 404
+
+        return jsonify({'files': files})
+
+
+
     elif file_type == 'markdown':
 
         # For uploaded documentation, serve the AI-enhanced markdown from documentation.json
@@ -4499,6 +4672,34 @@ def get_documentation(job_id, file_type):
 
 
 
+    # HTML and PDF are derived from the markdown lazily and cached on disk
+
+    if file_type in ('html', 'pdf') and 'markdown' in job['files']:
+
+        app_dir = os.path.dirname(os.path.abspath(__file__))
+
+        markdown_path = os.path.join(app_dir, job['files']['markdown'])
+
+        html_path = os.path.join(app_dir, job['files']['html'])
+
+        try:
+
+            if file_type == 'html':
+
+                doc_renderer.ensure_html(markdown_path, html_path)
+
+            else:
+
+                doc_renderer.ensure_pdf(markdown_path, html_path, file_path)
+
+        except Exception as e:
+
+            logging.error(f"Error rendering {file_type} for job {job_id}: {str(e)}")
+
+            return jsonify({'error': f'Could not render {file_type}: {str(e)}'}), 500
+
+
+
     if not os.path.exists(file_path):
 
         return jsonify({'error': 'File not found on server'}), 404
@@ -4593,6 +4794,14 @@ def get_iflow_match_file(job_id, file_type):
 
 
 
+    # Chart entries are routes to charts that are drawn on first request
+
+    if file_type.startswith('chart_'):
+
+        return get_iflow_match_chart(job_id, os.path.basename(job['iflow_match_files'][file_type]))
+
+
+
     file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), job['iflow_match_files'][file_type])
 
 
@@ -4653,11 +4862,15 @@ def get_iflow_match_chart(job_id, chart_name):
 
     charts_dir = os.path.join(report_dir, 'charts')
 
-    chart_path = os.path.join(charts_dir, chart_name)
+    # Charts are drawn on first request and cached by the hash of their data
 
+    from chart_renderer import ensure_chart
 
+    chart_path = ensure_chart(charts_dir, chart_name)
 
-    if not os.path.exists(chart_path):
+
+
+    if chart_path is None:
 
         return jsonify({'error': f'Chart {chart_name} not found'}), 404
 
@@ -5023,7 +5236,7 @@ def process_iflow_match(job_id, markdown_file_path):
 
 
 
-            # Add chart files if they exist
+            # Add the charts; they are drawn when their route is first requested
 
             if "charts" in result["files"]:
 
@@ -5033,13 +5246,13 @@ def process_iflow_match(job_id, markdown_file_path):
 
                     for chart_name, chart_path in chart_files.items():
 
-                        files_dict[f'chart_{chart_name}'] = os.path.relpath(chart_path, os.path.dirname(os.path.abspath(__file__)))
+                        files_dict[f'chart_{chart_name}'] = f'/api/iflow-match/{job_id}/charts/{os.path.basename(chart_path)}'
 
                 elif isinstance(chart_files, list):
 
                     for i, chart_path in enumerate(chart_files):
 
-                        files_dict[f'chart_{i}'] = os.path.relpath(chart_path, os.path.dirname(os.path.abspath(__file__)))
+                        files_dict[f'chart_{i}'] = f'/api/iflow-match/{job_id}/charts/{os.path.basename(chart_path)}'
 
 
 
@@ -5098,6 +5311,413 @@ def process_iflow_match(job_id, markdown_file_path):
 
 
 
+# Portfolio matches (many jobs or documents at once), by portfolio ID
+
+portfolios = {}
+
+
+
+@app.route('/api/portfolio-match', methods=['POST'])
+
+def generate_portfolio_match():
+
+    """
+
+    Find SAP Integration Suite equivalents for many projects at once
+
+
+    Request JSON:
+
+        job_ids: Job IDs whose documentation is ready
+
+        documents: Document name -> markdown text, for documents without a job;
+            names must stay distinct once made file-safe and differ from job_ids
+
+        top_k: Similar iFlows per document (default 10)
+
+    """
+
+    try:
+
+        data = request.get_json(silent=True) or {}
+
+        job_ids = data.get('job_ids') or []
+
+        documents = data.get('documents') or {}
+
+        top_k = int(data.get('top_k', 10))
+
+
+        if not job_ids and not documents:
+
+            return jsonify({'error': 'Provide job_ids and/or documents'}), 400
+
+
+        # Results are keyed by document id, so names must stay distinct once made file-safe
+
+        document_ids = {}
+
+        for name in documents:
+
+            document_id = secure_filename(name) or str(uuid.uuid4())
+
+            if document_id in job_ids:
+
+                return jsonify({'error': f"Document name '{name}' is the same as a submitted job ID"}), 400
+
+            if document_id in document_ids:
+
+                return jsonify({'error': f"Document names '{document_ids[document_id]}' and '{name}' are the same once made file-safe ({document_id})"}), 400
+
+            document_ids[document_id] = name
+
+
+        portfolio_id = str(uuid.uuid4())
+
+        portfolio_dir = os.path.join(app.config['RESULTS_FOLDER'], 'portfolios', portfolio_id)
+
+        os.makedirs(portfolio_dir, exist_ok=True)
+
+
+        # Markdown file per document, and where each document's own report goes
+
+        markdown_files = {}
+
+        document_output_dirs = {}
+
+        skipped = {}
+
+        for job_id in job_ids:
+
+            job = jobs.get(job_id)
+
+            if job is None:
+
+                skipped[job_id] = 'Job not found'
+
+            elif job['status'] not in ['completed', 'documentation_ready', 'documentation_completed']:
+
+                skipped[job_id] = f"Documentation not ready ({job['status']})"
+
+            elif 'files' not in job or 'markdown' not in job['files']:
+
+                skipped[job_id] = 'Markdown file not available'
+
+            else:
+
+                markdown_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), job['files']['markdown'])
+
+                if not os.path.exists(markdown_file_path):
+
+                    skipped[job_id] = 'Markdown file not found on server'
+
+                    continue
+
+                markdown_files[job_id] = markdown_file_path
+
+                document_output_dirs[job_id] = os.path.join(app.config['RESULTS_FOLDER'], job_id, 'iflow_match')
+
+
+        for document_id, name in document_ids.items():
+
+            markdown_text = documents[name]
+
+            markdown_file_path = os.path.join(portfolio_dir, 'documents', f'{document_id}.md')
+
+            os.makedirs(os.path.dirname(markdown_file_path), exist_ok=True)
+
+            with open(markdown_file_path, 'w', encoding='utf-8') as f:
+
+                f.write(markdown_text)
+
+            markdown_files[document_id] = markdown_file_path
+
+
+        if not markdown_files:
+
+            return jsonify({'error': 'No documents to match', 'skipped': skipped}), 400
+
+
+        for job_id in document_output_dirs:
+
+            update_job(job_id, {
+
+                'iflow_match_status': 'processing',
+
+                'iflow_match_message': 'Matching as part of a portfolio to find SAP Integration Suite equivalents...'
+
+            })
+
+
+        portfolios[portfolio_id] = {
+
+            'status': 'processing',
+
+            'message': f'Matching {len(markdown_files)} documents against SAP Integration Suite iFlows...',
+
+            'document_count': len(markdown_files),
+
+            'skipped': skipped,
+
+            'created': datetime.now().isoformat()
+
+        }
+
+
+        # Start processing in background
+
+        thread = threading.Thread(
+
+            target=process_portfolio_match,
+
+            args=(portfolio_id, markdown_files, document_output_dirs, top_k)
+
+        )
+
+        thread.daemon = True
+
+        thread.start()
+
+
+        return jsonify({
+
+            'status': 'processing',
+
+            'portfolio_id': portfolio_id,
+
+            'document_count': len(markdown_files),
+
+            'skipped': skipped,
+
+            'message': 'Portfolio SAP Integration Suite equivalent search started'
+
+        }), 202
+
+
+    except Exception as e:
+
+        logging.error(f"Error starting portfolio match processing: {str(e)}")
+
+        return jsonify({'error': str(e)}), 500
+
+
+
+def process_portfolio_match(portfolio_id, markdown_files, document_output_dirs, top_k):
+
+    """
+
+    Match a portfolio in a background thread and record each job's results
+
+    as process_iflow_match does
+
+
+    Args:
+
+        portfolio_id: Portfolio ID
+
+        markdown_files: Document ID (job ID or document name) -> markdown file path
+
+        document_output_dirs: Job ID -> iflow_match directory of the job
+
+        top_k: Similar iFlows per document
+
+    """
+
+    app_dir = os.path.dirname(os.path.abspath(__file__))
+
+    try:
+
+        from iflow_matcher import process_portfolio_for_iflow
+
+
+        result = process_portfolio_for_iflow(
+
+            documents=markdown_files,
+
+            output_dir=os.path.join(app.config['RESULTS_FOLDER'], 'portfolios', portfolio_id),
+
+            top_k=top_k,
+
+            document_output_dirs=document_output_dirs
+
+        )
+
+
+        if result["status"] != "success":
+
+            raise RuntimeError(result["message"])
+
+
+        for job_id, error in result["failed_documents"].items():
+
+            if job_id in document_output_dirs:
+
+                update_job(job_id, {
+
+                    'iflow_match_status': 'failed',
+
+                    'iflow_match_message': f'SAP Integration Suite equivalent search failed: {error}'
+
+                })
+
+
+
+        for document_id, document_result in result["documents"].items():
+
+            if document_id not in document_output_dirs:
+
+                continue
+
+            iflow_count = document_result.get("iflow_count", 0)
+
+            update_job(document_id, {
+
+                'iflow_match_status': 'completed',
+
+                'iflow_match_message': f'Found {iflow_count} similar iFlows - SAP Integration Suite equivalent search completed!',
+
+                'iflow_match_files': {
+
+                    'report': os.path.relpath(document_result["files"]["report"], app_dir),
+
+                    'summary': os.path.relpath(document_result["files"]["summary"], app_dir)
+
+                },
+
+                'iflow_match_result': {
+
+                    'message': document_result["message"],
+
+                    'iflow_count': iflow_count,
+
+                    'top_match': document_result.get("top_match"),
+
+                    'top_matches': document_result.get("top_matches", []),
+
+                    'portfolio_id': portfolio_id
+
+                }
+
+            })
+
+
+        portfolios[portfolio_id].update({
+
+            'status': 'completed',
+
+            'message': result["message"],
+
+            'documents_per_minute': result["documents_per_minute"],
+
+            'failed_documents': result["failed_documents"],
+
+            'files': {
+
+                'report': os.path.relpath(result["files"]["report"], app_dir),
+
+                'summary': os.path.relpath(result["files"]["summary"], app_dir)
+
+            },
+
+            'documents': {
+
+                document_id: {
+
+                    'iflow_count': document_result["iflow_count"],
+
+                    'top_match': document_result["top_match"],
+
+                    'top_components': document_result["top_components"]
+
+                }
+
+                for document_id, document_result in result["documents"].items()
+
+            }
+
+        })
+
+
+    except Exception as e:
+
+        logging.error(f"Error processing portfolio match: {str(e)}")
+
+        portfolios[portfolio_id].update({
+
+            'status': 'failed',
+
+            'message': f'Error processing portfolio match: {str(e)}'
+
+        })
+
+        for job_id in document_output_dirs:
+
+            update_job(job_id, {
+
+                'iflow_match_status': 'failed',
+
+                'iflow_match_message': f'Error processing iFlow match: {str(e)}'
+
+            })
+
+
+
+@app.route('/api/portfolio-match/<portfolio_id>', methods=['GET'])
+
+def get_portfolio_match_status(portfolio_id):
+
+    """Get the status and per-document results of a portfolio match"""
+
+    if portfolio_id not in portfolios:
+
+        return jsonify({'error': 'Portfolio not found'}), 404
+
+
+    return jsonify(portfolios[portfolio_id])
+
+
+
+@app.route('/api/portfolio-match/<portfolio_id>/<file_type>', methods=['GET'])
+
+def get_portfolio_match_file(portfolio_id, file_type):
+
+    """Get the combined report or summary of a portfolio match"""
+
+    portfolio = portfolios.get(portfolio_id)
+
+    if portfolio is None:
+
+        return jsonify({'error': 'Portfolio not found'}), 404
+
+
+    if portfolio['status'] != 'completed':
+
+        return jsonify({
+
+            'error': 'Portfolio match not completed',
+
+            'status': portfolio['status']
+
+        }), 404
+
+
+    if file_type not in portfolio.get('files', {}):
+
+        return jsonify({'error': 'Requested file not available'}), 404
+
+
+    file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), portfolio['files'][file_type])
+
+
+    if not os.path.exists(file_path):
+
+        return jsonify({'error': 'File not found on server'}), 404
+
+
+    return send_file(file_path)
+
+
+
 if __name__ == '__main__':
 
     # Set up stdout logger for better visibility
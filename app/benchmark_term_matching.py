@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for term extraction and term scoring of the iFlow match stage
+
+Times extract_terms.extract_terms_from_markdown, generate_search_terms and
+the per-item ContentSimilarityScorer term and endpoint scores over a corpus
+of generated documentation. Items are taken from the discovery catalog
+snapshot when there is one, otherwise they are built from the corpus
+headings and paragraphs.
+
+Usage:
+    python benchmark_term_matching.py [markdown files or directories...] [--repeat N]
+
+Without paths the corpus is GetIflowEquivalent/sample.md plus every
+markdown file under results/.
+"""
+import os
+import re
+import sys
+import glob
+import time
+import argparse
+
+from extract_terms import extract_terms_from_markdown, generate_search_terms
+from score_results import ContentSimilarityScorer
+from discovery_catalog import get_catalog
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_CORPUS = [
+    os.path.join(APP_DIR, 'GetIflowEquivalent', 'sample.md'),
+    os.path.join(APP_DIR, 'results'),
+]
+
+
+def find_documents(paths):
+    """Markdown files given directly or found under directories"""
+    documents = []
+    for path in paths:
+        if os.path.isdir(path):
+            documents.extend(sorted(glob.glob(os.path.join(path, '**', '*.md'), recursive=True)))
+        elif os.path.exists(path):
+            documents.append(path)
+    return documents
+
+
+def corpus_items(documents):
+    """Catalog-like items from the headings and first paragraphs of the corpus"""
+    items = []
+    for path in documents:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        for match in re.finditer(r'^#+\s+(.+)\n+([^#\n][^\n]*)', content, re.MULTILINE):
+            items.append({
+                'Id': f'{os.path.basename(path)}:{len(items)}',
+                'Name': match.group(1).strip(),
+                'Description': match.group(2).strip(),
+                'ContentType': 'IntegrationFlow',
+                'Categories': [],
+                'Tags': [],
+            })
+    return items
+
+
+def timed(function, repeat):
+    """Best wall time of repeat runs, in milliseconds, and the last result"""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark term extraction and term scoring')
+    parser.add_argument('paths', nargs='*', help='Markdown files or directories (default: sample and results)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement, best is reported')
+    args = parser.parse_args()
+
+    documents = find_documents(args.paths or DEFAULT_CORPUS)
+    if not documents:
+        print("No markdown documents found")
+        return 1
+
+    catalog = get_catalog()
+    items = catalog.items if catalog is not None else corpus_items(documents)
+    print(f"Corpus: {len(documents)} documents, {len(items)} items "
+          f"({'catalog snapshot' if catalog is not None else 'built from corpus'})")
+    print(f"{'document':40} {'extract':>10} {'search':>10} {'terms':>10} {'endpoints':>10}")
+
+    totals = [0.0, 0.0, 0.0, 0.0]
+    for path in documents:
+        extract_ms, extracted_terms = timed(lambda: extract_terms_from_markdown(path), args.repeat)
+        search_ms, _ = timed(lambda: generate_search_terms(extracted_terms), args.repeat)
+
+        scorer = ContentSimilarityScorer(extracted_terms)
+        terms_ms, _ = timed(lambda: [scorer.calculate_term_match_score(item) for item in items], args.repeat)
+        endpoints_ms, _ = timed(lambda: [scorer.calculate_endpoint_match_score(item) for item in items], args.repeat)
+
+        for i, value in enumerate((extract_ms, search_ms, terms_ms, endpoints_ms)):
+            totals[i] += value
+        print(f"{os.path.basename(path)[:40]:40} {extract_ms:9.2f}ms {search_ms:9.2f}ms "
+              f"{terms_ms:9.2f}ms {endpoints_ms:9.2f}ms")
+
+    print(f"{'total':40} {totals[0]:9.2f}ms {totals[1]:9.2f}ms {totals[2]:9.2f}ms {totals[3]:9.2f}ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
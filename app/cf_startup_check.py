@@ -5,12 +5,47 @@ This script is run when the application starts in Cloud Foundry to verify that a
 
 import os
 import sys
+import time
 import logging
+import subprocess
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Seconds a worker may spend importing the text-matching modules at startup
+IMPORT_TIME_BUDGET = float(os.getenv('IMPORT_TIME_BUDGET', '0.5'))
+
+# Modules imported by the matching endpoints; none of them may load NLTK data
+BUDGETED_MODULES = ['text_tokenizer', 'keyword_matcher', 'iflow_matcher', 'extract_terms', 'score_results']
+
+def measure_import_time(module_name):
+    """Import a module in a fresh interpreter and return the seconds it took"""
+    code = (f"import time; start = time.perf_counter(); import {module_name}; "
+            "print(time.perf_counter() - start)")
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:
+        raise ImportError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else module_name)
+    return float(result.stdout.strip().splitlines()[-1])
+
+def check_import_budget(modules=None, budget=IMPORT_TIME_BUDGET):
+    """Check that each module imports cold within the import-time budget"""
+    within_budget = True
+    for module_name in modules or BUDGETED_MODULES:
+        try:
+            seconds = measure_import_time(module_name)
+        except ImportError as e:
+            logger.error(f"Could not import {module_name}: {e}")
+            within_budget = False
+            continue
+        if seconds > budget:
+            logger.warning(f"Importing {module_name} took {seconds * 1000:.0f} ms (budget {budget * 1000:.0f} ms)")
+            within_budget = False
+        else:
+            logger.info(f"Imported {module_name} in {seconds * 1000:.0f} ms (budget {budget * 1000:.0f} ms)")
+    return within_budget
+
 def check_imports():
     """Check that all required modules can be imported"""
     logger.info("Starting import checks...")
@@ -35,8 +70,12 @@ def check_imports():
     # Try to import iflow_matcher
     try:
         logger.info("Trying to import iflow_matcher...")
+        start = time.perf_counter()
         import iflow_matcher
-        logger.info("Successfully imported iflow_matcher module")
+        elapsed = time.perf_counter() - start
+        logger.info(f"Successfully imported iflow_matcher module in {elapsed * 1000:.0f} ms")
+        if elapsed > IMPORT_TIME_BUDGET:
+            logger.warning(f"iflow_matcher import exceeded the {IMPORT_TIME_BUDGET * 1000:.0f} ms budget")
         logger.info(f"Module file: {iflow_matcher.__file__}")
         
         # Try to import process_markdown_for_iflow
@@ -57,4 +96,5 @@ def check_imports():
         return False
 
 if __name__ == "__main__":
-    check_imports()
+    if not (check_imports() and check_import_budget()):
+        sys.exit(1)
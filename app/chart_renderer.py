@@ -0,0 +1,243 @@
+"""
+Lightweight charts for iFlow match results
+
+The match job only saves the chart data (chart_data.json) next to its report.
+Charts are drawn when they are first requested, as plain SVG without
+matplotlib, and cached by the hash of their data so the same scored results
+are never drawn twice. The data is also served as JSON for client-side charts.
+"""
+import os
+import json
+import html
+import math
+import hashlib
+
+CHART_CACHE_DIR = os.getenv(
+    'CHART_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'chart_cache'))
+
+CHART_DATA_FILE = 'chart_data.json'
+
+# Bump when the drawing code changes so old cache entries are not reused
+RENDER_VERSION = 'v1'
+
+CHART_FORMATS = ('.svg', '.json', '.html')
+
+WIDTH = 900
+HEIGHT = 480
+MARGIN = {'top': 50, 'right': 30, 'bottom': 150, 'left': 70}
+FONT = 'font-family="Arial, sans-serif"'
+
+
+def save_chart_data(output_dir, charts):
+    """
+    Save chart specifications for lazy rendering.
+
+    Args:
+        output_dir (str): Charts directory of the job
+        charts (dict): Chart name -> specification
+
+    Returns:
+        dict: Chart name -> path of its SVG once rendered
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, CHART_DATA_FILE), 'w', encoding='utf-8') as f:
+        json.dump({'charts': charts}, f, indent=2)
+    return {name: os.path.join(output_dir, f'{name}.svg') for name in charts}
+
+
+def chart_key(spec):
+    """Cache key of a chart: hash of its data"""
+    payload = json.dumps([RENDER_VERSION, spec], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _text(x, y, content, size=12, anchor='middle', extra=''):
+    return (f'<text x="{x:.1f}" y="{y:.1f}" {FONT} font-size="{size}" text-anchor="{anchor}"{extra}>'
+            f'{html.escape(str(content))}</text>')
+
+
+def _nice_max(value):
+    """Round the axis maximum up to 1, 2 or 5 times a power of ten"""
+    if value <= 0:
+        return 1
+    magnitude = 10 ** math.floor(math.log10(value))
+    for step in (1, 2, 5, 10):
+        if value <= step * magnitude:
+            return step * magnitude
+    return 10 * magnitude
+
+
+def _axes(spec, max_value):
+    """Title, axis labels, y gridlines; returns (svg parts, plot box, y scale)"""
+    left, top = MARGIN['left'], MARGIN['top']
+    plot_width = WIDTH - MARGIN['left'] - MARGIN['right']
+    plot_height = HEIGHT - MARGIN['top'] - MARGIN['bottom']
+    axis_max = _nice_max(max_value)
+
+    parts = [_text(WIDTH / 2, 28, spec.get('title', ''), size=16, extra=' font-weight="bold"')]
+    for i in range(6):
+        value = axis_max * i / 5
+        y = top + plot_height - plot_height * i / 5
+        parts.append(f'<line x1="{left}" y1="{y:.1f}" x2="{left + plot_width}" y2="{y:.1f}" stroke="#e0e0e0"/>')
+        parts.append(_text(left - 8, y + 4, f'{value:g}', size=11, anchor='end'))
+    parts.append(f'<line x1="{left}" y1="{top}" x2="{left}" y2="{top + plot_height}" stroke="#333"/>')
+    parts.append(f'<line x1="{left}" y1="{top + plot_height}" x2="{left + plot_width}" y2="{top + plot_height}" stroke="#333"/>')
+    parts.append(_text(left + plot_width / 2, HEIGHT - 10, spec.get('x_label', ''), size=13))
+    parts.append(_text(18, top + plot_height / 2, spec.get('y_label', ''), size=13,
+                       extra=f' transform="rotate(-90 18 {top + plot_height / 2:.1f})"'))
+    return parts, (left, top, plot_width, plot_height), plot_height / axis_max
+
+
+def _category_labels(labels, left, top, plot_height, slot):
+    parts = []
+    for i, label in enumerate(labels):
+        x = left + slot * (i + 0.5)
+        y = top + plot_height + 14
+        parts.append(_text(x, y, label, size=11, anchor='end', extra=f' transform="rotate(-45 {x:.1f} {y:.1f})"'))
+    return parts
+
+
+def _bar_chart(spec):
+    values = spec.get('values', [])
+    parts, (left, top, plot_width, plot_height), scale = _axes(spec, max(values, default=0))
+    slot = plot_width / max(len(values), 1)
+    for i, (value, color) in enumerate(zip(values, spec.get('colors', []))):
+        height = max(value, 0) * scale
+        x = left + slot * i + slot * 0.15
+        parts.append(f'<rect x="{x:.1f}" y="{top + plot_height - height:.1f}" width="{slot * 0.7:.1f}" '
+                     f'height="{height:.1f}" fill="{color}"><title>{html.escape(str(value))}</title></rect>')
+    parts += _category_labels(spec.get('labels', []), left, top, plot_height, slot)
+    return parts
+
+
+def _grouped_bar_chart(spec):
+    series = spec.get('series', [])
+    max_value = max((value for s in series for value in s.get('values', [])), default=0)
+    parts, (left, top, plot_width, plot_height), scale = _axes(spec, max_value)
+    labels = spec.get('labels', [])
+    slot = plot_width / max(len(labels), 1)
+    bar_width = slot * 0.8 / max(len(series), 1)
+    for s_index, s in enumerate(series):
+        for i, value in enumerate(s.get('values', [])):
+            height = max(value, 0) * scale
+            x = left + slot * i + slot * 0.1 + bar_width * s_index
+            parts.append(f'<rect x="{x:.1f}" y="{top + plot_height - height:.1f}" width="{bar_width:.1f}" '
+                         f'height="{height:.1f}" fill="{s["color"]}"><title>{html.escape(s["name"])}: {value:g}</title></rect>')
+        # Legend in the top right corner
+        y = top + 8 + s_index * 18
+        parts.append(f'<rect x="{left + plot_width - 190}" y="{y}" width="12" height="12" fill="{s["color"]}"/>')
+        parts.append(_text(left + plot_width - 172, y + 10, s['name'], size=11, anchor='start'))
+    parts += _category_labels(labels, left, top, plot_height, slot)
+    return parts
+
+
+def _pie_chart(spec):
+    values = spec.get('values', [])
+    total = sum(values)
+    cx, cy, radius = WIDTH / 2, HEIGHT / 2 + 15, 170
+    parts = [_text(WIDTH / 2, 28, spec.get('title', ''), size=16, extra=' font-weight="bold"')]
+    if not total:
+        return parts + [_text(cx, cy, 'No results', size=14)]
+
+    angle = -math.pi / 2
+    for label, value, color in zip(spec.get('labels', []), values, spec.get('colors', [])):
+        if not value:
+            continue
+        sweep = 2 * math.pi * value / total
+        if value == total:
+            parts.append(f'<circle cx="{cx}" cy="{cy}" r="{radius}" fill="{color}" stroke="white"/>')
+        else:
+            x1, y1 = cx + radius * math.cos(angle), cy + radius * math.sin(angle)
+            x2, y2 = cx + radius * math.cos(angle + sweep), cy + radius * math.sin(angle + sweep)
+            large_arc = 1 if sweep > math.pi else 0
+            parts.append(f'<path d="M{cx},{cy} L{x1:.1f},{y1:.1f} A{radius},{radius} 0 {large_arc} 1 {x2:.1f},{y2:.1f} Z" '
+                         f'fill="{color}" stroke="white" stroke-width="2"/>')
+        middle = angle + sweep / 2
+        parts.append(_text(cx + radius * 0.6 * math.cos(middle), cy + radius * 0.6 * math.sin(middle) + 4,
+                           f'{100 * value / total:.1f}%', size=13, extra=' fill="white" font-weight="bold"'))
+        parts.append(_text(cx + (radius + 30) * math.cos(middle), cy + (radius + 30) * math.sin(middle) + 4,
+                           label, size=12, anchor='start' if math.cos(middle) >= 0 else 'end'))
+        angle += sweep
+    return parts
+
+
+CHART_TYPES = {
+    'bar': _bar_chart,
+    'grouped_bar': _grouped_bar_chart,
+    'pie': _pie_chart,
+}
+
+
+def render_svg(spec):
+    """Draw a chart specification as an SVG document"""
+    parts = CHART_TYPES[spec['type']](spec)
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{HEIGHT}" '
+            f'viewBox="0 0 {WIDTH} {HEIGHT}"><rect width="100%" height="100%" fill="white"/>'
+            + ''.join(parts) + '</svg>')
+
+
+def render_chart(spec, extension):
+    """Chart in one of CHART_FORMATS"""
+    if extension == '.json':
+        return json.dumps(spec, indent=2)
+    svg = render_svg(spec)
+    if extension == '.html':
+        title = html.escape(spec.get('title', 'Chart'))
+        return (f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title}</title></head>'
+                f'<body style="margin: 20px; text-align: center;">{svg}</body></html>')
+    return svg
+
+
+def _load_specs(charts_dir):
+    try:
+        with open(os.path.join(charts_dir, CHART_DATA_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f).get('charts', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def ensure_chart(charts_dir, file_name, cache_dir=CHART_CACHE_DIR):
+    """
+    Path of a chart file, drawing it on first request.
+
+    Files already in the charts directory (e.g. PNGs of older jobs) are
+    returned as they are; otherwise the chart is drawn from chart_data.json
+    into the cache, keyed by the hash of its data.
+
+    Args:
+        charts_dir (str): Charts directory of the job
+        file_name (str): Requested file, e.g. 'top_matches.svg'
+
+    Returns:
+        str: Path of the chart file, or None if there is no such chart
+    """
+    existing_path = os.path.join(charts_dir, file_name)
+    if os.path.exists(existing_path):
+        return existing_path
+
+    name, extension = os.path.splitext(file_name)
+    spec = _load_specs(charts_dir).get(name)
+    if spec is None or extension not in CHART_FORMATS:
+        return None
+
+    key = chart_key(spec)
+    cache_path = os.path.join(cache_dir, key[:2], f'{key}{extension}')
+    if not os.path.exists(cache_path):
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_path = f'{cache_path}.{os.getpid()}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(render_chart(spec, extension))
+        os.replace(temp_path, cache_path)
+    return cache_path
+
+
+def render_all(charts_dir, extension='.svg'):
+    """Draw every chart of a charts directory into it (for command-line runs)"""
+    paths = []
+    for name, spec in _load_specs(charts_dir).items():
+        path = os.path.join(charts_dir, f'{name}{extension}')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(render_chart(spec, extension))
+        paths.append(path)
+    return paths
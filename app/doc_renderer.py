@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Background HTML and PDF rendering for generated documentation
+
+Markdown is the primary output of a documentation job. HTML and PDF are derived
+from it in separate worker processes so the job thread never waits for them:
+HTML is started in the background as soon as the markdown is saved, PDF is only
+rendered when it is first downloaded. Rendered files are cached next to the
+markdown and reused until the source changes.
+"""
+
+import os
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Number of worker processes for markdown -> HTML conversion
+HTML_RENDER_WORKERS = int(os.getenv('DOC_RENDER_WORKERS', '2'))
+
+# Seconds a download request waits for a render before giving up
+RENDER_TIMEOUT = int(os.getenv('DOC_RENDER_TIMEOUT', '300'))
+
+
+def _warm_pdf_worker():
+    """Import WeasyPrint once when the PDF worker starts so each render skips the import cost"""
+    try:
+        import weasyprint  # noqa: F401
+    except ImportError:
+        logging.warning("WeasyPrint not installed - PDF rendering will fail")
+
+
+def _render_html(markdown_path, html_path):
+    """Worker: convert a markdown file to HTML with Mermaid support"""
+    from md_to_html_with_mermaid import convert_markdown_to_html
+    return convert_markdown_to_html(markdown_path, html_path)
+
+
+def _render_pdf(html_path, pdf_path):
+    """Worker: convert an HTML file to PDF with WeasyPrint"""
+    from html_to_pdf_converter import HTMLToPDFConverter
+    return HTMLToPDFConverter().convert_with_weasyprint(html_path, pdf_path)
+
+
+def _is_fresh(output_path, source_path):
+    """True if output exists and is at least as new as its source"""
+    return (os.path.exists(output_path) and os.path.exists(source_path)
+            and os.path.getmtime(output_path) >= os.path.getmtime(source_path))
+
+
+class DocumentRenderer:
+    """Renders documentation HTML/PDF in worker processes with on-disk caching"""
+
+    def __init__(self, html_workers=HTML_RENDER_WORKERS):
+        self.html_workers = html_workers
+        self._html_pool = None
+        self._pdf_pool = None
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, kind):
+        # Pools are created on first use so importing this module stays cheap
+        with self._lock:
+            if kind == 'html':
+                if self._html_pool is None:
+                    self._html_pool = ProcessPoolExecutor(max_workers=self.html_workers)
+                return self._html_pool
+            if self._pdf_pool is None:
+                # A single long-lived process keeps WeasyPrint warm between renders
+                self._pdf_pool = ProcessPoolExecutor(max_workers=1, initializer=_warm_pdf_worker)
+            return self._pdf_pool
+
+    def _submit(self, kind, func, source_path, output_path):
+        """Start a render unless the output is cached or already being rendered"""
+        with self._lock:
+            future = self._in_flight.get(output_path)
+            if future is not None and not future.done():
+                return future
+
+        pool = self._pool(kind)
+        with self._lock:
+            future = self._in_flight.get(output_path)
+            if future is not None and not future.done():
+                return future
+            future = pool.submit(func, source_path, output_path)
+            self._in_flight[output_path] = future
+        future.add_done_callback(lambda f: self._forget(output_path, f))
+        return future
+
+    def _forget(self, output_path, future):
+        with self._lock:
+            if self._in_flight.get(output_path) is future:
+                del self._in_flight[output_path]
+        if future.exception() is not None:
+            logging.error(f"Rendering {output_path} failed: {future.exception()}")
+
+    def render_html_in_background(self, markdown_path, html_path):
+        """
+        Start converting markdown to HTML without waiting for it.
+
+        Args:
+            markdown_path (str): Source markdown file
+            html_path (str): HTML file to produce
+        """
+        if _is_fresh(html_path, markdown_path):
+            return
+        try:
+            self._submit('html', _render_html, markdown_path, html_path)
+        except Exception as e:
+            logging.warning(f"Could not start background HTML render for {markdown_path}: {e}")
+
+    def ensure_html(self, markdown_path, html_path, timeout=RENDER_TIMEOUT):
+        """
+        Return the HTML file for a markdown file, rendering it if it is missing or stale.
+
+        Returns:
+            str: Path to the HTML file
+        """
+        if not os.path.exists(markdown_path) and os.path.exists(html_path):
+            # Older jobs may only have the HTML file
+            return html_path
+        if _is_fresh(html_path, markdown_path) and html_path not in self._in_flight:
+            return html_path
+        self._submit('html', _render_html, markdown_path, html_path).result(timeout=timeout)
+        return html_path
+
+    def ensure_pdf(self, markdown_path, html_path, pdf_path, timeout=RENDER_TIMEOUT):
+        """
+        Return the PDF for a markdown file, rendering HTML and PDF on first request.
+
+        Returns:
+            str: Path to the PDF file
+        """
+        self.ensure_html(markdown_path, html_path, timeout=timeout)
+        if _is_fresh(pdf_path, html_path) and pdf_path not in self._in_flight:
+            return pdf_path
+        self._submit('pdf', _render_pdf, html_path, pdf_path).result(timeout=timeout)
+        return pdf_path
+
+
+# Shared renderer used by the API
+doc_renderer = DocumentRenderer()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Section fingerprints for incremental documentation regeneration
+
+A generated document is split into sections (one per flow, process, map,
+configuration block or DWL file). Each section carries a fingerprint of its
+source. The sections of a job are saved with its outputs in
+section_manifest.json; when the same project is documented again, sections
+whose fingerprint did not change are taken from the previous run (base and
+AI-enhanced text) and only the changed ones are regenerated and re-enhanced.
+"""
+
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+from datetime import datetime
+
+# Set to 'false' to always regenerate and enhance whole documents
+INCREMENTAL_SECTIONS_ENABLED = os.getenv('DOC_INCREMENTAL_SECTIONS', 'true').lower() == 'true'
+
+# Number of previous jobs considered when looking for an earlier run of a project
+SECTION_HISTORY = int(os.getenv('DOC_SECTION_HISTORY', '200'))
+
+# Minimum share of section ids two runs must have in common to be the same project
+MIN_SECTION_OVERLAP = float(os.getenv('DOC_SECTION_MIN_OVERLAP', '0.5'))
+
+SECTION_MANIFEST_FILE = 'section_manifest.json'
+SECTION_INDEX_FILE = 'section_index.json'
+
+# Bump when generated section markdown changes so old sections are not reused
+SECTION_FORMAT_VERSION = 1
+
+HEADING_PATTERN = re.compile(r'^(#{1,3}) +(.+?)\s*#*\s*$')
+NUMBERED_ITEM_PATTERN = re.compile(r'^\d+\.\s+')
+
+_index_lock = threading.Lock()
+
+
+def fingerprint(source):
+    """Stable fingerprint of a section's source data (any JSON-serializable value)"""
+    payload = json.dumps([SECTION_FORMAT_VERSION, source], sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _slug(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-') or 'section'
+
+
+class DocumentSection:
+    """One independently regenerated part of a document"""
+
+    def __init__(self, section_id, title, source_fingerprint, markdown=None, render=None, enhance=True):
+        """
+        Args:
+            section_id (str): Id that identifies the section across runs
+            title (str): Human readable title, used as outline for the LLM
+            source_fingerprint (str): Fingerprint of the section's source
+            markdown (str, optional): Generated markdown, if already known
+            render (callable, optional): Produces the markdown when it is needed
+            enhance (bool): Whether the section is sent for AI enhancement
+        """
+        self.id = section_id
+        self.title = title
+        self.fingerprint = source_fingerprint
+        self._markdown = markdown
+        self._render = render
+        self.enhance = enhance
+        self.enhanced = None
+        self.changed = True
+        self.previous = None     # (markdown, enhanced) of a previous run, kept if rendering fails
+        self.failed = False
+
+    @property
+    def markdown(self):
+        """
+        Generated markdown, rendered on first access. A section that fails to
+        render keeps its text of the previous run, or gets an error note.
+        """
+        if self._markdown is None:
+            try:
+                self._markdown = self._render() if self._render else ''
+            except Exception as e:
+                logging.error(f"Error generating documentation section {self.id}: {str(e)}")
+                self.failed = True
+                if self.previous is not None:
+                    self._markdown, self.enhanced = self.previous
+                else:
+                    self._markdown = f"## {self.title}\n\nAn error occurred while generating this section: {str(e)}\n\n"
+        return self._markdown
+
+    @markdown.setter
+    def markdown(self, value):
+        self._markdown = value
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'fingerprint': self.fingerprint,
+            'markdown': self.markdown,
+            'enhanced': self.enhanced,
+            'failed': self.failed,
+        }
+
+
+class SectionedDocument:
+    """A document made of a fixed preamble and fingerprinted sections"""
+
+    def __init__(self, preamble='', sections=None):
+        self.preamble = preamble
+        self.sections = sections or []
+
+    def add(self, section):
+        self.sections.append(section)
+        return section
+
+    @property
+    def section_ids(self):
+        return [section.id for section in self.sections]
+
+    def reuse(self, manifest):
+        """
+        Take unchanged sections from a previous run.
+
+        Args:
+            manifest (dict): Manifest of the previous run, or None
+
+        Returns:
+            list: Ids of the sections that changed or are new
+        """
+        previous = {s['id']: s for s in (manifest or {}).get('sections', [])}
+        changed = []
+        for section in self.sections:
+            old = previous.get(section.id)
+            if old and old.get('markdown') is not None and not old.get('failed') and \
+                    old.get('fingerprint') == section.fingerprint:
+                section.markdown = old['markdown']
+                section.enhanced = old.get('enhanced')
+                section.changed = False
+            else:
+                if old and old.get('markdown') is not None:
+                    section.previous = (old['markdown'], old.get('enhanced'))
+                section.changed = True
+                changed.append(section.id)
+        return changed
+
+    def to_markdown(self, enhanced=False):
+        """
+        Assemble the document.
+
+        Args:
+            enhanced (bool): Use the AI-enhanced text of sections that have one
+        """
+        parts = [self.preamble]
+        for section in self.sections:
+            text = section.enhanced if enhanced and section.enhanced else section.markdown
+            if enhanced and section.enhanced and not text.endswith('\n\n'):
+                text = text.rstrip('\n') + '\n\n'
+            parts.append(text)
+        return ''.join(parts)
+
+    def take_enhanced(self, enhanced_markdown):
+        """
+        Record the enhanced text of each section from a whole enhanced document.
+
+        Sections are matched by id, i.e. by heading. A section whose heading
+        the enhancement did not keep gets no enhanced text and is enhanced on
+        its own in the next run.
+
+        Args:
+            enhanced_markdown (str): AI-enhanced markdown of the whole document
+
+        Returns:
+            int: Number of sections that got enhanced text
+        """
+        enhanced = {}
+        for section in split_markdown_sections(enhanced_markdown).sections:
+            enhanced.setdefault(section.id, section.markdown)
+        taken = 0
+        for section in self.sections:
+            text = enhanced.get(section.id)
+            if section.enhance and text and text.strip():
+                section.enhanced = text
+                taken += 1
+        return taken
+
+
+def split_markdown_sections(markdown):
+    """
+    Split generated markdown into sections at its headings.
+
+    Level 1 and 2 headings start a section. Numbered level 3 headings
+    ("### 2. Process Name") are items of their parent section and become
+    sections of their own; the parent then only keeps its heading and intro.
+    Text before the first level 2 heading is the preamble. Fingerprints are
+    taken from the section text, so joining the sections gives back the
+    original markdown exactly.
+
+    Returns:
+        SectionedDocument
+    """
+    lines = markdown.splitlines(keepends=True)
+    chunks = []  # (level, title, lines)
+    preamble = []
+    current = None
+    in_fence = False
+
+    for line in lines:
+        if line.lstrip().startswith('```'):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING_PATTERN.match(line)
+        if match:
+            level, title = len(match.group(1)), match.group(2)
+            # The document title stays in the preamble
+            starts_section = level <= 2 if chunks else level == 2
+            if level == 3 and current is not None and NUMBERED_ITEM_PATTERN.match(title):
+                starts_section = True
+            if starts_section:
+                current = (level, title, [line])
+                chunks.append(current)
+                continue
+        if current is None:
+            preamble.append(line)
+        else:
+            current[2].append(line)
+
+    document = SectionedDocument(''.join(preamble))
+    parent_slug = ''
+    seen = {}
+    for index, (level, title, chunk_lines) in enumerate(chunks):
+        text = ''.join(chunk_lines)
+        if level < 3:
+            parent_slug = _slug(title)
+            section_id = parent_slug
+            has_items = index + 1 < len(chunks) and chunks[index + 1][0] == 3
+            enhance = level == 2 and not has_items
+        else:
+            section_id = f"{parent_slug}/{_slug(NUMBERED_ITEM_PATTERN.sub('', title))}"
+            enhance = True
+        # Keep ids unique when a heading repeats
+        seen[section_id] = seen.get(section_id, 0) + 1
+        if seen[section_id] > 1:
+            section_id = f"{section_id}~{seen[section_id]}"
+        document.add(DocumentSection(section_id, title, fingerprint(text), markdown=text, enhance=enhance))
+    return document
+
+
+def save_section_manifest(job_result_dir, job_id, platform, document, results_dir=None):
+    """
+    Save a job's sections with its outputs and register them for later runs.
+
+    Args:
+        job_result_dir (str): Output directory of the job
+        job_id (str): Job ID
+        platform (str): 'boomi' or 'mulesoft'
+        document (SectionedDocument): Sections of the generated document
+        results_dir (str, optional): Root of all job directories (default: parent of job_result_dir)
+    """
+    manifest = {
+        'version': SECTION_FORMAT_VERSION,
+        'job_id': job_id,
+        'platform': platform,
+        'created': datetime.now().isoformat(),
+        'sections': [section.to_dict() for section in document.sections],
+    }
+    manifest_path = os.path.join(job_result_dir, SECTION_MANIFEST_FILE)
+    _write_json(manifest_path, manifest)
+
+    results_dir = results_dir or os.path.dirname(os.path.abspath(job_result_dir))
+    index_path = os.path.join(results_dir, SECTION_INDEX_FILE)
+    with _index_lock:
+        index = _read_json(index_path) or []
+        index = [entry for entry in index if entry.get('job_id') != job_id]
+        index.append({
+            'job_id': job_id,
+            'platform': platform,
+            'created': manifest['created'],
+            'section_ids': document.section_ids,
+        })
+        _write_json(index_path, index[-SECTION_HISTORY:])
+    return manifest_path
+
+
+def find_previous_manifest(results_dir, platform, section_ids, exclude_job_id=None):
+    """
+    Find the manifest of the most recent earlier run of the same project.
+
+    Runs are matched by the share of section ids they have in common, so a
+    project is recognized after flows or processes were added or removed.
+
+    Returns:
+        dict: The previous manifest, or None if there is no earlier run
+    """
+    if not INCREMENTAL_SECTIONS_ENABLED or not section_ids:
+        return None
+
+    with _index_lock:
+        index = _read_json(os.path.join(results_dir, SECTION_INDEX_FILE)) or []
+
+    current = set(section_ids)
+    best, best_overlap = None, MIN_SECTION_OVERLAP
+    for entry in reversed(index):
+        if entry.get('platform') != platform or entry.get('job_id') == exclude_job_id:
+            continue
+        ids = set(entry.get('section_ids', []))
+        overlap = len(current & ids) / max(len(current | ids), 1)
+        if overlap > best_overlap or (best is None and overlap >= best_overlap):
+            best, best_overlap = entry, overlap
+            if overlap == 1.0:
+                break
+
+    if best is None:
+        return None
+    manifest = _read_json(os.path.join(results_dir, best['job_id'], SECTION_MANIFEST_FILE))
+    if not manifest or manifest.get('version') != SECTION_FORMAT_VERSION:
+        return None
+    logging.info(f"Reusing documentation sections of job {best['job_id']} ({best_overlap:.0%} section overlap)")
+    return manifest
+
+
+def _read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.warning(f"Could not read {path}: {e}")
+        return None
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, path)
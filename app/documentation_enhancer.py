@@ -5,6 +5,7 @@ import logging
 import json
 from typing import Optional
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
 # Add parent directory to path for imports
@@ -21,6 +22,9 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Number of documentation sections enhanced in parallel
+SECTION_ENHANCE_WORKERS = int(os.getenv("DOC_SECTION_ENHANCE_WORKERS", "4"))
+
 # Try to import OpenAI and Anthropic, but don't fail if not installed
 try:
     import openai
@@ -832,15 +836,107 @@ class DocumentationEnhancer:
             final_content = enhanced_content
 
         # Validate and fix Mermaid diagrams
+        final_content = self._fix_mermaid_diagrams(final_content)
+
+        # Normalize markdown tables and improve overall UX (Table of Contents)
+        final_content = self._finalize_markdown(final_content)
+
+        # Generate JSON components if requested
+        if generate_json and output_dir and enhancement_successful:
+            try:
+                self._generate_json_components(final_content, output_dir)
+            except Exception as e:
+                logger.warning(f"Failed to generate JSON components: {e}")
+
+        return final_content
+
+    def enhance_sections(self, document, platform: str = 'boomi') -> str:
+        """Enhance a sectioned document, sending only sections without enhanced text to the LLM.
+
+        Sections reused from a previous run (see doc_sections.SectionedDocument.reuse)
+        keep their enhanced text, so the cost of a re-run is proportional to what changed.
+        Enhanced text is stored on each section for the job's section manifest.
+
+        Args:
+            document: doc_sections.SectionedDocument
+            platform: The platform type ('boomi' or 'mulesoft')
+
+        Returns:
+            Enhanced documentation; sections that fail to enhance keep their base text
+        """
+        outline = [section.title for section in document.sections]
+        pending = [section for section in document.sections
+                   if section.enhance and section.enhanced is None and section.markdown.strip()]
+        logger.info(f"Enhancing {len(pending)} of {len(document.sections)} documentation sections")
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(SECTION_ENHANCE_WORKERS, len(pending))) as pool:
+                futures = {pool.submit(self._enhance_section, section, outline, platform): section
+                           for section in pending}
+                for future in as_completed(futures):
+                    section = futures[future]
+                    try:
+                        section.enhanced = future.result()
+                    except Exception as e:
+                        logger.warning(f"Enhancement of section '{section.title}' failed: {e}")
+
+        return self._finalize_markdown(document.to_markdown(enhanced=True))
+
+    def _enhance_section(self, section, outline, platform: str) -> Optional[str]:
+        """Enhance a single section; returns None if the LLM call fails."""
+        prompt = self._create_section_enhancement_prompt(section, outline, platform)
+        if self.selected_service == 'openai':
+            enhanced_content = self.enhance_with_openai(prompt)
+        elif self.selected_service in ['anthropic', 'claude']:
+            enhanced_content = self.enhance_with_anthropic(prompt)
+        else:
+            enhanced_content = None
+
+        if not enhanced_content or not enhanced_content.strip():
+            return None
+        return self._fix_mermaid_diagrams(enhanced_content.strip() + "\n\n")
+
+    def _create_section_enhancement_prompt(self, section, outline, platform: str) -> str:
+        """Create the prompt that enhances one section of a larger document."""
+        platform_name = 'MuleSoft' if platform == 'mulesoft' else 'Dell Boomi'
+        outline_text = "\n".join(f"- {title}" for title in outline)
+        heading = section.markdown.lstrip().splitlines()[0] if section.markdown.strip() else section.title
+        return f"""You are a {platform_name} and SAP Integration Suite specialist. The text below is ONE section
+    of a larger technical document about a {platform_name} integration. The other sections are documented
+    separately; their titles are listed only for context.
+
+    DOCUMENT OUTLINE:
+{outline_text}
+
+    Rewrite the section "{section.title}" as comprehensive documentation that explains its purpose,
+    logic and configuration, and how it maps to SAP Integration Suite components.
+
+    IMPORTANT:
+    1. Start with exactly this heading line and keep its level: {heading}
+    2. Document ONLY this section. Do not add a document title, table of contents or content from other sections.
+    3. Do NOT make assumptions about adapters or systems not explicitly mentioned in the section.
+    4. PRESERVE ALL TECHNICAL EXPRESSIONS EXACTLY AS WRITTEN (endpoints, field mappings, properties,
+       DataWeave/Groovy code, connector parameters). Do not simplify or summarize them.
+    5. If the section describes a flow or process, include one Mermaid flowchart of the SAP Integration Suite
+       equivalent that follows the exact order of the original steps.
+    6. Return only the markdown of the section.
+
+    SECTION:
+{section.markdown}"""
+
+    def _fix_mermaid_diagrams(self, content: str) -> str:
+        """Validate Mermaid diagrams and let the LLM fix the ones that remain invalid."""
+        if "```mermaid" not in content:
+            return content
         try:
             # First try basic validation
-            final_content = validate_mermaid_in_documentation(final_content)
+            content = validate_mermaid_in_documentation(content)
             logger.info("Basic Mermaid diagram validation completed")
 
             # If basic validation doesn't work well, try LLM fixing
-            if "```mermaid" in final_content:
+            if "```mermaid" in content:
                 logger.info("Attempting LLM-powered Mermaid fixing for better results")
-                final_content = fix_documentation_with_llm(final_content)
+                content = fix_documentation_with_llm(content)
                 logger.info("LLM Mermaid fixing completed")
 
         except Exception as e:
@@ -848,26 +944,20 @@ class DocumentationEnhancer:
             # Try LLM fixing as fallback
             try:
                 logger.info("Attempting LLM Mermaid fixing as fallback")
-                final_content = fix_documentation_with_llm(final_content)
+                content = fix_documentation_with_llm(content)
                 logger.info("LLM Mermaid fixing fallback completed")
             except Exception as llm_e:
                 logger.warning(f"LLM Mermaid fixing also failed: {llm_e}")
+        return content
 
-        # Normalize markdown tables and improve overall UX (Table of Contents)
+    def _finalize_markdown(self, content: str) -> str:
+        """Normalize markdown tables and add a table of contents."""
         try:
-            final_content = self._fix_table_formatting(final_content)
-            final_content = self._ensure_table_of_contents(final_content)
+            content = self._fix_table_formatting(content)
+            content = self._ensure_table_of_contents(content)
         except Exception as e:
             logger.warning(f"Post-processing (tables/ToC) failed: {e}")
-
-        # Generate JSON components if requested
-        if generate_json and output_dir and enhancement_successful:
-            try:
-                self._generate_json_components(final_content, output_dir)
-            except Exception as e:
-                logger.warning(f"Failed to generate JSON components: {e}")
-
-        return final_content
+        return content
 
     def _fix_table_formatting(self, text: str) -> str:
         """Convert markdown tables that were wrapped in code fences into real tables.
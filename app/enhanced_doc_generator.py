@@ -13,6 +13,7 @@ sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__f
 try:
     from mule_flow_documentation import FlowDocumentationGenerator, MuleFlowParser
     from additional_file_parser import AdditionalFileParser
+    from doc_sections import DocumentSection, SectionedDocument, fingerprint
 except ImportError as e:
     logging.error(f"Error importing required modules: {str(e)}")
     sys.exit(1)
@@ -78,6 +79,104 @@ class EnhancedDocumentationGenerator(FlowDocumentationGenerator):
             logging.error(f"Error generating enhanced documentation: {e}")
             return doc + f"\n\n## Error Adding Additional Resources\n\nAn error occurred while adding additional resources to the documentation: {str(e)}\n"
     
+    def generate_sections(self, parsed_data: Dict, additional_files: Dict = None, project_dir: str = None) -> SectionedDocument:
+        """
+        Plan the documentation as fingerprinted sections for incremental regeneration.
+        
+        Produces the same content as generate_documentation, with one section per
+        flow, subflow, DWL file and per group of configurations and other resources.
+        Section markdown is only rendered when it is needed, so sections taken from
+        a previous run (SectionedDocument.reuse) are never regenerated.
+        
+        Args:
+            parsed_data: Dictionary with parsed Mule flows and components from MuleFlowParser
+            additional_files: Dictionary with parsed additional files (DWL, YAML, RAML)
+            project_dir: Root directory of the project; file paths are made relative to it
+            
+        Returns:
+            SectionedDocument with lazily rendered sections
+        """
+        document = SectionedDocument(
+            "# MuleSoft Application Documentation\n\n"
+            "## Overview\n\n"
+            "This document provides a comprehensive overview of the MuleSoft "
+            "application's flows, subflows, configurations, and error handling strategies.\n\n"
+        )
+        
+        def add_group(section_id, markdown):
+            document.add(DocumentSection(section_id, markdown.strip().lstrip('# '), fingerprint(markdown),
+                                         markdown=markdown, enhance=False))
+        
+        # Flows and subflows, one section each
+        add_group('group:flows', "# Flows\n\n")
+        for flow_name, flow_data in parsed_data.get('flows', {}).items():
+            document.add(DocumentSection(
+                f"flow:{flow_name}", f"Flow: {flow_name}", fingerprint(flow_data),
+                render=lambda name=flow_name, data=flow_data: self.generate_flow_description(name, data) + "\n"))
+        
+        subflows = parsed_data.get('subflows', {})
+        if subflows:
+            add_group('group:subflows', "# Subflows\n\n")
+            for subflow_name, subflow_data in subflows.items():
+                document.add(DocumentSection(
+                    f"subflow:{subflow_name}", f"Flow: {subflow_name}", fingerprint(subflow_data),
+                    render=lambda name=subflow_name, data=subflow_data: self.generate_flow_description(name, data) + "\n"))
+        
+        configs = parsed_data.get('configs', {})
+        if configs:
+            document.add(DocumentSection('configurations', 'Configurations', fingerprint(configs),
+                                         render=lambda: self.generate_config_description(configs)))
+        
+        error_handlers = parsed_data.get('error_handlers', {})
+        if error_handlers:
+            document.add(DocumentSection('error-handling', 'Error Handling', fingerprint(error_handlers),
+                                         render=lambda: self.generate_error_handling_description(error_handlers)))
+        
+        if additional_files:
+            # Upload directories differ between runs, so paths are made relative to the project
+            if project_dir:
+                additional_files = {
+                    group: {os.path.relpath(path, project_dir): data for path, data in files.items()}
+                    for group, files in additional_files.items() if isinstance(files, dict)
+                }
+            
+            add_group('group:additional-resources',
+                      "\n\n# Additional Resources\n\n"
+                      "This section contains documentation for additional resources used in the Mule application.\n\n")
+            
+            raml_files = additional_files.get('raml_files', {})
+            if raml_files:
+                document.add(DocumentSection('raml', 'API Definitions (RAML)', fingerprint(raml_files),
+                                             render=lambda: self._generate_raml_documentation(raml_files)))
+            
+            dwl_files = additional_files.get('dwl_files', {})
+            if dwl_files:
+                dwl_summary = self._generate_dwl_summary(dwl_files)
+                add_group('dwl', dwl_summary)
+                for file_path, file_data in self._sorted_dwl_files(dwl_files):
+                    document.add(DocumentSection(
+                        f"dwl:{file_path}", f"DataWeave: {os.path.basename(file_path)}", fingerprint(file_data),
+                        render=lambda path=file_path, data=file_data: self._generate_dwl_file_documentation(path, data)))
+            
+            for group, title, generate in (
+                ('yaml_files', 'YAML Configurations', self._generate_yaml_documentation),
+                ('properties_files', 'Properties Files', self._generate_properties_documentation),
+                ('json_files', 'JSON Files', self._generate_json_documentation),
+            ):
+                files = additional_files.get(group, {})
+                if files:
+                    document.add(DocumentSection(group.replace('_files', ''), title, fingerprint(files),
+                                                 render=lambda files=files, generate=generate: generate(files)))
+        
+        if project_dir:
+            # Cheap to build, so the section is fingerprinted by its content
+            existing_docs = self._include_existing_markdown_files("", project_dir)
+            if existing_docs:
+                document.add(DocumentSection('existing-docs', 'Existing Project Documentation',
+                                             fingerprint(existing_docs), markdown=existing_docs, enhance=False))
+        
+        return document
+    
     def _include_existing_markdown_files(self, doc: str, project_dir: str) -> str:
         """
         Find and include existing markdown files from the project's documentation folders.
@@ -191,6 +290,20 @@ class EnhancedDocumentationGenerator(FlowDocumentationGenerator):
         if not dwl_files:
             return ""
         
+        doc = self._generate_dwl_summary(dwl_files)
+        
+        # Add detailed section for each file
+        for file_path, file_data in self._sorted_dwl_files(dwl_files):
+            doc += self._generate_dwl_file_documentation(file_path, file_data)
+        
+        return doc
+    
+    def _sorted_dwl_files(self, dwl_files: Dict) -> List:
+        """DataWeave files sorted by name for consistent output."""
+        return sorted(dwl_files.items(), key=lambda x: os.path.basename(x[0]).lower())
+    
+    def _generate_dwl_summary(self, dwl_files: Dict) -> str:
+        """Generate the DataWeave section heading and summary table."""
         doc = "## DataWeave Transformations\n\n"
         doc += f"The application includes {len(dwl_files)} DataWeave transformation files.\n\n"
         
@@ -198,9 +311,7 @@ class EnhancedDocumentationGenerator(FlowDocumentationGenerator):
         doc += "| # | File Name | DataWeave Version | Type | Size |\n"
         doc += "|---|-----------|-------------------|------|------|\n"
         
-        # Sort files by name for consistent output
-        sorted_files = sorted(dwl_files.items(), key=lambda x: os.path.basename(x[0]).lower())
-        for i, (file_path, file_data) in enumerate(sorted_files, 1):
+        for i, (file_path, file_data) in enumerate(self._sorted_dwl_files(dwl_files), 1):
             file_name = os.path.basename(file_path)
             version = file_data.get('dw_version', 'Unknown')
             type_hints = ", ".join(file_data.get('type_hints', ['']))[:30] + ("..." if len(", ".join(file_data.get('type_hints', ['']))) > 30 else "")
@@ -210,43 +321,45 @@ class EnhancedDocumentationGenerator(FlowDocumentationGenerator):
         
         doc += "\n### Individual DataWeave Files\n\n"
         
-        # Add detailed section for each file
-        for file_path, file_data in sorted_files:
-            doc += f"#### {os.path.basename(file_path)}\n\n"
-            
-            # Add metadata about the transformation
-            doc += f"**Path:** `{file_path}`\n\n"
-            
-            if 'dw_version' in file_data:
-                doc += f"**DataWeave Version:** {file_data['dw_version']}\n\n"
-            
-            if 'type_hints' in file_data and file_data['type_hints']:
-                doc += f"**Type:** {', '.join(file_data['type_hints'])}\n\n"
-            
-            if 'functions' in file_data and file_data['functions']:
-                doc += "**Functions:**\n"
-                for func in file_data['functions']:
-                    doc += f"- `{func}`\n"
-                doc += "\n"
-            
-            if 'variables' in file_data and file_data['variables']:
-                doc += "**Variables:**\n"
-                for var in file_data['variables']:
-                    doc += f"- `{var}`\n"
-                doc += "\n"
-            
-            # Add content with syntax highlighting
-            if 'content' in file_data and file_data['content'] and not isinstance(file_data['content'], dict):
-                # Limit content length to prevent extremely large files
-                content = file_data['content']
-                if len(content) > 2000:
-                    content = content[:2000] + "\n\n... (content truncated) ..."
-                
-                doc += "**Source:**\n\n```dataweave\n"
-                doc += content
-                doc += "\n```\n\n"
+        return doc
+    
+    def _generate_dwl_file_documentation(self, file_path: str, file_data: Dict) -> str:
+        """Generate documentation for a single DataWeave file."""
+        doc = f"#### {os.path.basename(file_path)}\n\n"
+        
+        # Add metadata about the transformation
+        doc += f"**Path:** `{file_path}`\n\n"
+        
+        if 'dw_version' in file_data:
+            doc += f"**DataWeave Version:** {file_data['dw_version']}\n\n"
+        
+        if 'type_hints' in file_data and file_data['type_hints']:
+            doc += f"**Type:** {', '.join(file_data['type_hints'])}\n\n"
+        
+        if 'functions' in file_data and file_data['functions']:
+            doc += "**Functions:**\n"
+            for func in file_data['functions']:
+                doc += f"- `{func}`\n"
+            doc += "\n"
+        
+        if 'variables' in file_data and file_data['variables']:
+            doc += "**Variables:**\n"
+            for var in file_data['variables']:
+                doc += f"- `{var}`\n"
+            doc += "\n"
+        
+        # Add content with syntax highlighting
+        if 'content' in file_data and file_data['content'] and not isinstance(file_data['content'], dict):
+            # Limit content length to prevent extremely large files
+            content = file_data['content']
+            if len(content) > 2000:
+                content = content[:2000] + "\n\n... (content truncated) ..."
             
-            doc += "---\n\n"
+            doc += "**Source:**\n\n```dataweave\n"
+            doc += content
+            doc += "\n```\n\n"
+        
+        doc += "---\n\n"
         
         return doc
     
@@ -633,6 +746,33 @@ def generate_enhanced_documentation(mule_dir: str, include_additional_files: boo
         logging.error(f"Error generating enhanced documentation: {str(e)}")
         return f"# Error Generating Documentation\n\nAn error occurred: {str(e)}\n"
 
+def generate_enhanced_sections(mule_dir: str, include_additional_files: bool = True, parsed_data: Dict = None) -> SectionedDocument:
+    """
+    Plan enhanced documentation for a directory as fingerprinted sections.
+    
+    Args:
+        mule_dir: Directory containing MuleSoft XML files
+        include_additional_files: Whether to include additional file types
+        parsed_data: Already parsed Mule flows, to avoid parsing the XML files again
+        
+    Returns:
+        SectionedDocument; call reuse() with a previous manifest before to_markdown().
+        Sections that fail to render keep their previous text or get an error note.
+    """
+    try:
+        if parsed_data is None:
+            parsed_data = MuleFlowParser().parse_mule_files(mule_dir)
+        
+        additional_files = None
+        if include_additional_files:
+            additional_files = AdditionalFileParser().parse_directory(mule_dir)
+        
+        return EnhancedDocumentationGenerator().generate_sections(parsed_data, additional_files, mule_dir)
+        
+    except Exception as e:
+        logging.error(f"Error generating enhanced documentation: {str(e)}")
+        return SectionedDocument(f"# Error Generating Documentation\n\nAn error occurred: {str(e)}\n")
+
 if __name__ == "__main__":
     # Test documentation generation if run directly
     if len(sys.argv) > 1:
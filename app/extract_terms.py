@@ -1,15 +1,16 @@
-import re
-import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize
-from nltk.corpus import stopwords
 from collections import Counter
-import markdown
-from bs4 import BeautifulSoup
 import json
 
-# You may need to download NLTK resources
-# nltk.download('punkt')
-# nltk.download('stopwords')
+from text_tokenizer import word_tokenize, sent_tokenize, stopwords
+from term_patterns import (
+    ENDPOINT_PATTERN, JSON_BLOCK_PATTERN, CAPITALIZED_PATTERN, BULLET_PATTERN,
+    FLOW_TRIGGER_PATTERN, DATAWEAVE_FILE_PATTERN, PROCESSING_STEPS_PATTERN, NUMBERED_STEP_PATTERN,
+    CODE_SPAN_PATTERN, DOMAIN_KEYWORDS, TECHNICAL_KEYWORDS, OPERATION_KEYWORDS,
+    section_pattern, between_headers_pattern, markdown_text
+)
+
+# Words skipped when long search terms are broken into words
+SEARCH_TERM_SKIP_WORDS = frozenset(['with', 'that', 'this', 'from', 'into'])
 
 def extract_terms_from_markdown(markdown_file):
     """
@@ -25,11 +26,8 @@ def extract_terms_from_markdown(markdown_file):
     with open(markdown_file, 'r', encoding='utf-8') as f:
         markdown_content = f.read()
     
-    # Convert markdown to HTML
-    html_content = markdown.markdown(markdown_content)
-    
-    # Parse HTML
-    soup = BeautifulSoup(html_content, 'html.parser')
+    # Headers and plain text, read line by line without rendering HTML
+    headers, text_content = markdown_text(markdown_content)
     
     # Initialize categories for terms
     terms = {
@@ -50,88 +48,23 @@ def extract_terms_from_markdown(markdown_file):
         # Add overview terms to domain terms for better matching
         terms['domain_terms'].extend(overview_terms)
     
-    # Extract headers (h1, h2, h3) for main concepts
-    headers = []
-    for h_tag in soup.find_all(['h1', 'h2', 'h3']):
-        headers.append(h_tag.text.strip())
-    
     # Extract API endpoints
-    endpoint_patterns = re.findall(r'(GET|POST|PATCH|DELETE|PUT) (/\w+(?:/{\w+})?(?:/\w+)*)', markdown_content)
-    endpoint_paths = [path for _, path in endpoint_patterns]
-    terms['endpoint_paths'] = endpoint_paths
+    terms['endpoint_paths'] = [path for _, path in ENDPOINT_PATTERN.findall(markdown_content)]
     
     # Extract JSON structures
-    json_blocks = re.findall(r'```json\n([\s\S]*?)\n```', markdown_content)
-    terms['data_structures'] = json_blocks
-    
-    # Extract domain-specific terms
-    domain_specific_keywords = [
-        'Financial Services', 'Wealth Management', 'Investment', 'Account', 
-        'Beneficiary', 'Customer', 'Payment', 'Profile', 'Standing Order',
-        'ACATS', 'RMD', 'Transaction', 'API', 'Investment Account'
-    ]
-    
-    # Extract technical patterns
-    technical_patterns = [
-        'REST', 'API', 'JSON', 'ID Generation', 'Transformation', 'DataWeave',
-        'HTTP', 'HTTPS', 'Authentication', 'Error Handling', 'Flow'
-    ]
-    
-    # Extract operation terms
-    operation_terms = [
-        'Create', 'Read', 'Update', 'Delete', 'Initiate', 'Process', 'Retrieve',
-        'Transfer', 'Cancel', 'GET', 'POST', 'PATCH', 'DELETE', 'PUT'
-    ]
-    
-    # Process text content
-    text_content = soup.get_text()
-    
-    # Tokenize and remove stopwords
-    stop_words = set(stopwords.words('english'))
-    tokens = word_tokenize(text_content.lower())
-    filtered_tokens = [word for word in tokens if word.isalnum() and word not in stop_words]
-    
-    # Count word frequency
-    word_freq = Counter(filtered_tokens)
-    
-    # Extract ngrams (for multi-word terms)
-    sentences = sent_tokenize(text_content)
-    ngrams = []
+    terms['data_structures'] = JSON_BLOCK_PATTERN.findall(markdown_content)
     
-    for sentence in sentences:
-        words = word_tokenize(sentence)
-        # Create bigrams and trigrams
-        for i in range(len(words) - 1):
-            ngrams.append(f"{words[i]} {words[i+1]}")
-        for i in range(len(words) - 2):
-            ngrams.append(f"{words[i]} {words[i+1]} {words[i+2]}")
+    # Each keyword category is matched in one pass over the lowercased text
+    text_lower = text_content.lower()
+    domain_terms = DOMAIN_KEYWORDS.find(text_lower)
+    terms['domain_terms'].extend(domain_terms)
     
-    ngram_freq = Counter(ngrams)
+    # Multi-word domain keywords may still occur split by line breaks or markup
+    missing = [keyword for keyword in DOMAIN_KEYWORDS.keywords if keyword not in domain_terms]
+    terms['domain_terms'].extend(_find_in_ngrams(text_content, text_lower, missing))
     
-    # Match domain keywords
-    for keyword in domain_specific_keywords:
-        keyword_lower = keyword.lower()
-        # Check exact matches
-        if keyword_lower in text_content.lower():
-            terms['domain_terms'].append(keyword)
-        # Check partial matches in ngrams
-        else:
-            for ngram, _ in ngram_freq.most_common(100):
-                if keyword_lower in ngram.lower():
-                    terms['domain_terms'].append(keyword)
-                    break
-    
-    # Match technical patterns
-    for pattern in technical_patterns:
-        pattern_lower = pattern.lower()
-        if pattern_lower in text_content.lower():
-            terms['technical_terms'].append(pattern)
-    
-    # Match operation terms
-    for op in operation_terms:
-        op_lower = op.lower()
-        if op_lower in text_content.lower():
-            terms['operation_terms'].append(op)
+    terms['technical_terms'].extend(TECHNICAL_KEYWORDS.find(text_lower))
+    terms['operation_terms'].extend(OPERATION_KEYWORDS.find(text_lower))
     
     # Remove duplicates
     for category in terms:
@@ -150,6 +83,32 @@ def extract_terms_from_markdown(markdown_file):
     terms['header_terms'] = headers
     
     return terms
+
+def _find_in_ngrams(text_content, text_lower, keywords):
+    """
+    Keywords occurring in the 100 most common bigrams and trigrams of the text
+    
+    A keyword missing from the text can only occur in an n-gram if it spans
+    tokens, so the n-grams are only built when a multi-word keyword has all
+    of its words in the text.
+    """
+    candidates = [keyword.lower() for keyword in keywords
+                  if ' ' in keyword and all(word in text_lower for word in keyword.lower().split())]
+    if not candidates:
+        return []
+    
+    ngrams = []
+    for sentence in sent_tokenize(text_content):
+        words = word_tokenize(sentence)
+        # Create bigrams and trigrams
+        for i in range(len(words) - 1):
+            ngrams.append(f"{words[i]} {words[i+1]}")
+        for i in range(len(words) - 2):
+            ngrams.append(f"{words[i]} {words[i+1]} {words[i+2]}")
+    
+    common_ngrams = '\n'.join(ngram for ngram, _ in Counter(ngrams).most_common(100)).lower()
+    return [keyword for keyword in keywords if keyword.lower() in candidates and keyword.lower() in common_ngrams]
+
 def extract_section_content(markdown_content, section_name, level=2):
     """
     Extract content from a specific section in the markdown
@@ -162,11 +121,8 @@ def extract_section_content(markdown_content, section_name, level=2):
     Returns:
         str: The section content or None if not found
     """
-    # Create the heading pattern based on level
-    heading_marker = '#' * level
-    pattern = f"{heading_marker} {section_name}([\\s\\S]*?)(?:{heading_marker} |$)"
-    
-    match = re.search(pattern, markdown_content)
+    # Heading patterns are compiled once per section name and level
+    match = section_pattern(section_name, level).search(markdown_content)
     if match:
         return match.group(1).strip()
     return None
@@ -181,35 +137,29 @@ def extract_key_terms_from_text(text):
     Returns:
         list: List of key terms
     """
-    # Tokenize and remove stopwords
-    stop_words = set(stopwords.words('english'))
-    words = word_tokenize(text.lower())
-    filtered_words = [word for word in words if word.isalnum() and word not in stop_words]
+    stop_words = stopwords('english')
     
     # Extract noun phrases and important terms
     key_terms = []
     
     # Look for capitalized terms (often important concepts)
-    capitalized_pattern = r'\b[A-Z][a-zA-Z]+(?:\s+[A-Z][a-zA-Z]+)*\b'
-    capitalized_terms = re.findall(capitalized_pattern, text)
-    key_terms.extend(capitalized_terms)
+    key_terms.extend(CAPITALIZED_PATTERN.findall(text))
     
     # Look for terms in bullet points
-    bullet_pattern = r'[-*]\s+([^.\n]+)'
-    bullet_points = re.findall(bullet_pattern, text)
-    key_terms.extend(bullet_points)
+    key_terms.extend(BULLET_PATTERN.findall(text))
     
     # Extract bigrams and trigrams that appear meaningful
     words = word_tokenize(text)
+    alnum = [word.isalnum() for word in words]
     bigrams = []
     trigrams = []
     
     for i in range(len(words) - 1):
-        if words[i].isalnum() and words[i+1].isalnum():
+        if alnum[i] and alnum[i+1]:
             bigrams.append(f"{words[i]} {words[i+1]}")
     
     for i in range(len(words) - 2):
-        if words[i].isalnum() and words[i+1].isalnum() and words[i+2].isalnum():
+        if alnum[i] and alnum[i+1] and alnum[i+2]:
             trigrams.append(f"{words[i]} {words[i+1]} {words[i+2]}")
     
     # Add most common meaningful bigrams and trigrams
@@ -230,8 +180,7 @@ def extract_key_terms_from_text(text):
 
 def extract_sections(markdown_content, start_header, end_header):
     """Extract a section from markdown between two headers"""
-    pattern = f"# {start_header}([\\s\\S]*?)# {end_header}"
-    match = re.search(pattern, markdown_content)
+    match = between_headers_pattern(start_header, end_header).search(markdown_content)
     if match:
         return match.group(1).strip()
     return None
@@ -239,17 +188,15 @@ def extract_sections(markdown_content, start_header, end_header):
 def extract_technical_details(section_text):
     """Extract technical implementation details from section text"""
     # Look for flow identifiers
-    flow_names = re.findall(r'\*\*Trigger\*\*: \w+ request to `([^`]+)`', section_text)
+    flow_names = FLOW_TRIGGER_PATTERN.findall(section_text)
     
     # Look for transformation functions
-    transformations = re.findall(r'`([^`]+\.dwl)`', section_text)
+    transformations = DATAWEAVE_FILE_PATTERN.findall(section_text)
     
     # Look for processing steps
     processing_steps = []
-    step_blocks = re.findall(r'\*\*Processing Steps\*\*:([\s\S]*?)(?:\n\n|$)', section_text)
-    for block in step_blocks:
-        steps = re.findall(r'\d+\.\s*(.*?)(?:\n|$)', block)
-        processing_steps.extend(steps)
+    for block in PROCESSING_STEPS_PATTERN.findall(section_text):
+        processing_steps.extend(NUMBERED_STEP_PATTERN.findall(block))
     
     return {
         'flow_names': flow_names,
@@ -287,7 +234,7 @@ def generate_search_terms(extracted_terms):
                 
                 # Also add individual important words
                 for word in words:
-                    if len(word) > 4 and word not in ['with', 'that', 'this', 'from', 'into']:
+                    if len(word) > 4 and word not in SEARCH_TERM_SKIP_WORDS:
                         if word not in search_terms['primary']:
                             search_terms['primary'].append(word)
             else:
@@ -307,7 +254,7 @@ def generate_search_terms(extracted_terms):
             
             # Add individual words from domain terms
             for word in words:
-                if len(word) > 4 and word not in ['with', 'that', 'this', 'from', 'into']:
+                if len(word) > 4 and word not in SEARCH_TERM_SKIP_WORDS:
                     if word not in search_terms['secondary']:
                         search_terms['secondary'].append(word)
         else:
@@ -352,7 +299,7 @@ def generate_search_terms(extracted_terms):
     if 'technical_details' in extracted_terms and 'flow_names' in extracted_terms['technical_details']:
         for flow_name in extracted_terms['technical_details']['flow_names']:
             # Extract endpoint part from flow name
-            endpoint_match = re.search(r'`([^`]+)`', flow_name)
+            endpoint_match = CODE_SPAN_PATTERN.search(flow_name)
             if endpoint_match:
                 endpoint = endpoint_match.group(1)
                 parts = endpoint.split('/')
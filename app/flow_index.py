@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Local vector index mirroring the integration_flows table
+
+Similarity searches are answered in-process from a local copy of the
+integration_flows embeddings instead of calling the Supabase
+search_similar_flows RPC for every query. The mirror is saved next to the
+app and kept in sync incrementally: new rows are fetched and deleted rows
+dropped on every refresh, and the whole table is reloaded periodically to
+pick up edited rows.
+
+Queries use an HNSW graph when hnswlib is installed and exact cosine
+similarity with numpy otherwise, which is fast enough for tables of tens of
+thousands of flows. Scores match the RPC (cosine similarity, same threshold).
+"""
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    import hnswlib
+    HNSW_AVAILABLE = True
+except ImportError:
+    HNSW_AVAILABLE = False
+
+# Set to 'false' to always use the Supabase RPC
+LOCAL_FLOW_INDEX_ENABLED = os.getenv('LOCAL_FLOW_INDEX', 'true').lower() == 'true'
+
+LOCAL_FLOW_INDEX_PATH = os.getenv(
+    'LOCAL_FLOW_INDEX_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'flow_index'))
+
+# Seconds between incremental refreshes (new and deleted rows)
+LOCAL_FLOW_INDEX_REFRESH = int(os.getenv('LOCAL_FLOW_INDEX_REFRESH', '300'))
+
+# Seconds between full reloads, which also pick up edited rows
+LOCAL_FLOW_INDEX_FULL_REFRESH = int(os.getenv('LOCAL_FLOW_INDEX_FULL_REFRESH', '86400'))
+
+# Below this many flows exact search is used even when hnswlib is installed
+HNSW_MIN_FLOWS = int(os.getenv('LOCAL_FLOW_INDEX_HNSW_MIN', '5000'))
+
+FLOWS_TABLE = 'integration_flows'
+PAGE_SIZE = 1000
+# Ids per 'in' filter, kept small so request URLs stay short
+ID_BATCH_SIZE = 200
+INDEX_FORMAT_VERSION = 1
+
+
+def _parse_embedding(value):
+    """pgvector columns arrive as '[0.1,0.2,...]' strings through PostgREST"""
+    if isinstance(value, str):
+        value = json.loads(value)
+    return value
+
+
+def _normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class FlowVectorIndex:
+    """In-process copy of integration_flows (id, name, description, embedding)"""
+
+    def __init__(self, path: str = LOCAL_FLOW_INDEX_PATH):
+        self.path = path
+        self.ids = []
+        self.names = []
+        self.descriptions = []
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self.synced_at = 0.0
+        self.full_synced_at = 0.0
+        self._ann = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def ready(self):
+        return len(self.ids) > 0
+
+    def load(self):
+        """Load the saved mirror; returns False if there is none"""
+        try:
+            with open(f"{self.path}.json", 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('format_version') != INDEX_FORMAT_VERSION:
+                return False
+            matrix = np.load(f"{self.path}.npy")
+        except (OSError, ValueError):
+            return False
+        self._swap(meta['ids'], meta['names'], meta['descriptions'], matrix)
+        self.synced_at = meta.get('synced_at', 0.0)
+        self.full_synced_at = meta.get('full_synced_at', 0.0)
+        print(f"✅ Loaded local flow index with {len(self.ids)} flows")
+        return True
+
+    def save(self):
+        with self._lock:
+            ids, names, descriptions, matrix = self.ids, self.names, self.descriptions, self.matrix
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temp_npy = f"{self.path}.{os.getpid()}.tmp.npy"
+        np.save(temp_npy, matrix)
+        os.replace(temp_npy, f"{self.path}.npy")
+        meta = {
+            'format_version': INDEX_FORMAT_VERSION,
+            'synced_at': self.synced_at,
+            'full_synced_at': self.full_synced_at,
+            'ids': ids,
+            'names': names,
+            'descriptions': descriptions,
+        }
+        temp_json = f"{self.path}.{os.getpid()}.tmp.json"
+        with open(temp_json, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(temp_json, f"{self.path}.json")
+
+    def _swap(self, ids, names, descriptions, matrix):
+        """Replace the contents atomically so searches never see a half-built index"""
+        matrix = _normalize(np.asarray(matrix, dtype=np.float32)) if len(ids) else np.zeros((0, 0), dtype=np.float32)
+        ann = None
+        if HNSW_AVAILABLE and len(ids) >= HNSW_MIN_FLOWS:
+            ann = hnswlib.Index(space='ip', dim=matrix.shape[1])
+            ann.init_index(max_elements=len(ids), ef_construction=200, M=16)
+            ann.add_items(matrix, np.arange(len(ids)))
+        with self._lock:
+            self.ids, self.names, self.descriptions, self.matrix, self._ann = ids, names, descriptions, matrix, ann
+
+    def _fetch(self, supabase, columns, ids=None):
+        """Page through integration_flows, optionally only the given ids"""
+        rows = []
+        if ids is not None:
+            ids = list(ids)
+            for start in range(0, len(ids), ID_BATCH_SIZE):
+                response = supabase.table(FLOWS_TABLE).select(columns)\
+                    .in_('id', ids[start:start + ID_BATCH_SIZE])\
+                    .execute()
+                rows.extend(response.data or [])
+            return rows
+        offset = 0
+        while True:
+            response = supabase.table(FLOWS_TABLE).select(columns)\
+                .order('id')\
+                .range(offset, offset + PAGE_SIZE - 1)\
+                .execute()
+            batch = response.data or []
+            rows.extend(batch)
+            if len(batch) < PAGE_SIZE:
+                return rows
+            offset += PAGE_SIZE
+
+    def sync(self, supabase, full: bool = False):
+        """
+        Bring the mirror up to date with integration_flows.
+
+        Args:
+            supabase: Supabase client
+            full: Reload every row instead of only new ones
+        """
+        columns = 'id,name,description,embedding'
+        if full or not self.ready:
+            rows = self._fetch(supabase, columns)
+            kept = {}
+        else:
+            current_ids = [row['id'] for row in self._fetch(supabase, 'id')]
+            current = set(current_ids)
+            with self._lock:
+                positions = {flow_id: i for i, flow_id in enumerate(self.ids)}
+                kept = {flow_id: (self.names[i], self.descriptions[i], self.matrix[i])
+                        for flow_id, i in positions.items() if flow_id in current}
+            new_ids = [flow_id for flow_id in current_ids if flow_id not in positions]
+            rows = self._fetch(supabase, columns, new_ids) if new_ids else []
+            if not rows and len(kept) == len(positions):
+                self.synced_at = time.time()
+                return 0
+
+        ids, names, descriptions, vectors = [], [], [], []
+        for flow_id, (name, description, vector) in kept.items():
+            ids.append(flow_id)
+            names.append(name)
+            descriptions.append(description)
+            vectors.append(vector)
+        for row in rows:
+            embedding = _parse_embedding(row.get('embedding'))
+            if not embedding:
+                continue
+            ids.append(row['id'])
+            names.append(row.get('name'))
+            descriptions.append(row.get('description'))
+            vectors.append(np.asarray(embedding, dtype=np.float32))
+
+        self._swap(ids, names, descriptions, np.vstack(vectors) if vectors else [])
+        self.synced_at = time.time()
+        if full or not kept:
+            self.full_synced_at = self.synced_at
+        self.save()
+        print(f"🔄 Local flow index synced: {len(ids)} flows ({len(rows)} fetched)")
+        return len(rows)
+
+    def refresh_in_background(self, supabase):
+        """Start a refresh if the mirror is stale; searches keep using the current contents"""
+        now = time.time()
+        if now - self.synced_at < LOCAL_FLOW_INDEX_REFRESH:
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.sync(supabase, full=now - self.full_synced_at >= LOCAL_FLOW_INDEX_FULL_REFRESH)
+            except Exception as e:
+                print(f"⚠️  Local flow index refresh failed: {e}")
+                self.synced_at = time.time()
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=run, name='flow-index-refresh', daemon=True).start()
+
+    def search(self, query_embeddings: List[List[float]], match_count: int = 10,
+               match_threshold: float = 0.1) -> List[List[Dict]]:
+        """
+        Most similar flows for each query, like the search_similar_flows RPC.
+
+        Args:
+            query_embeddings: One embedding per query
+            match_count: Results per query
+            match_threshold: Minimum cosine similarity
+
+        Returns:
+            Per query, rows with id, name, description and similarity, best first
+        """
+        with self._lock:
+            ids, names, descriptions, matrix, ann = self.ids, self.names, self.descriptions, self.matrix, self._ann
+        if not ids or not query_embeddings:
+            return [[] for _ in query_embeddings]
+
+        queries = _normalize(np.asarray(query_embeddings, dtype=np.float32))
+        count = min(match_count, len(ids))
+        if ann is not None:
+            ann.set_ef(max(50, count * 2))
+            labels, distances = ann.knn_query(queries, k=count)
+            candidates = [(row_labels, 1.0 - row_distances) for row_labels, row_distances in zip(labels, distances)]
+        else:
+            # One matrix product scores every query against every flow
+            scores = queries @ matrix.T
+            top = np.argpartition(-scores, count - 1, axis=1)[:, :count]
+            candidates = [(row_top, scores[i, row_top]) for i, row_top in enumerate(top)]
+
+        results = []
+        for positions, similarities in candidates:
+            order = np.argsort(-similarities)
+            results.append([
+                {
+                    'id': ids[positions[i]],
+                    'name': names[positions[i]],
+                    'description': descriptions[positions[i]],
+                    'similarity': float(similarities[i]),
+                }
+                for i in order if similarities[i] > match_threshold
+            ])
+        return results
+
+
+_flow_index = None
+_flow_index_lock = threading.Lock()
+
+
+def get_flow_index(supabase=None) -> Optional[FlowVectorIndex]:
+    """
+    Shared local index, loaded from disk and refreshed in the background.
+
+    Without a saved mirror the first refresh downloads the table in the
+    background; until it finishes callers fall back to the RPC.
+
+    Returns:
+        FlowVectorIndex, or None if the local index is disabled or not built yet
+    """
+    global _flow_index
+    if not LOCAL_FLOW_INDEX_ENABLED:
+        return None
+    with _flow_index_lock:
+        if _flow_index is None:
+            _flow_index = FlowVectorIndex()
+            _flow_index.load()
+    if supabase is not None:
+        _flow_index.refresh_in_background(supabase)
+    return _flow_index if _flow_index.ready else None
@@ -7,16 +7,20 @@ appropriate SAP Integration Suite components.
 import os
 import json
 import logging
-import markdown
-from bs4 import BeautifulSoup
 import re
-import requests
+import time
 from datetime import datetime
 from collections import Counter
-import nltk
-from nltk.tokenize import word_tokenize, sent_tokenize
+from concurrent.futures import ProcessPoolExecutor
 import random  # For generating random scores in demo mode
 
+from keyword_matcher import KeywordAutomaton
+from term_patterns import (
+    ENDPOINT_PATTERN, ATX_HEADER_PATTERN, SETEXT_UNDERLINE_PATTERN, RULE_PATTERN, FENCE_PATTERN,
+    BLOCK_PREFIX_PATTERN, LIST_ITEM_PATTERN, plain_inline_text
+)
+from text_tokenizer import ENGLISH_STOPWORDS
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -67,37 +71,11 @@ SAP_COMPONENTS = [
     }
 ]
 
-# Try to download NLTK data if not already present
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    try:
-        nltk.download('punkt', quiet=True)
-        nltk.download('stopwords', quiet=True)
-        logger.info("Downloaded NLTK data")
-    except Exception as e:
-        logger.warning(f"Could not download NLTK data: {str(e)}")
-
-# Try to get stopwords, with fallback
-try:
-    from nltk.corpus import stopwords
-    STOPWORDS = set(stopwords.words('english'))
-except:
-    # Fallback stopwords if NLTK data is not available
-    STOPWORDS = set([
-        'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 'your', 'yours',
-        'yourself', 'yourselves', 'he', 'him', 'his', 'himself', 'she', 'her', 'hers',
-        'herself', 'it', 'its', 'itself', 'they', 'them', 'their', 'theirs', 'themselves',
-        'what', 'which', 'who', 'whom', 'this', 'that', 'these', 'those', 'am', 'is', 'are',
-        'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'having', 'do', 'does',
-        'did', 'doing', 'a', 'an', 'the', 'and', 'but', 'if', 'or', 'because', 'as', 'until',
-        'while', 'of', 'at', 'by', 'for', 'with', 'about', 'against', 'between', 'into',
-        'through', 'during', 'before', 'after', 'above', 'below', 'to', 'from', 'up', 'down',
-        'in', 'out', 'on', 'off', 'over', 'under', 'again', 'further', 'then', 'once', 'here',
-        'there', 'when', 'where', 'why', 'how', 'all', 'any', 'both', 'each', 'few', 'more',
-        'most', 'other', 'some', 'such', 'no', 'nor', 'not', 'only', 'own', 'same', 'so',
-        'than', 'too', 'very', 's', 't', 'can', 'will', 'just', 'don', 'should', 'now'
-    ])
+# Bundled stopwords, no NLTK data or download needed
+STOPWORDS = ENGLISH_STOPWORDS
+
+# Worker processes for term extraction when matching a portfolio of documents
+PORTFOLIO_WORKERS = int(os.getenv('PORTFOLIO_WORKERS', str(min(8, os.cpu_count() or 1))))
 
 # Configure logging
 logging.basicConfig(
@@ -106,10 +84,161 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Technical terms reported when they occur in the document
+TECHNICAL_TERMS = [
+    "REST", "API", "JSON", "HTTP", "HTTPS", "Authentication", "Flow",
+    "Integration", "Connector", "Endpoint", "Payload", "Transform",
+    "Mapping", "Protocol", "Service", "Message", "Queue", "Event",
+    "Synchronous", "Asynchronous", "XML", "SOAP", "Gateway", "Proxy"
+]
+TECHNICAL_TERM_KEYS = frozenset(term.lower() for term in TECHNICAL_TERMS)
+
+# Integration patterns and the keywords that indicate them
+PATTERN_KEYWORDS = {
+    "Request-Response": ["request", "response", "synchronous"],
+    "Publish-Subscribe": ["publish", "subscribe", "event", "topic"],
+    "Message Queue": ["queue", "message", "jms", "amqp"],
+    "File Transfer": ["file", "transfer", "ftp", "sftp"],
+    "Database Integration": ["database", "sql", "jdbc", "query"],
+    "API-Led": ["api", "experience", "process", "system"],
+    "Event-Driven": ["event", "trigger", "notification"],
+    "Batch Processing": ["batch", "bulk", "scheduled"]
+}
+
+URL_PATTERN = re.compile(r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+')
+WORD_PATTERN = re.compile(r'[^\W_]+')
+SENTENCE_END_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
+# Built once: every technical term and pattern keyword is found in one pass over the text
+_TERM_AUTOMATON = KeywordAutomaton(
+    [term.lower() for term in TECHNICAL_TERMS]
+    + [keyword for keywords in PATTERN_KEYWORDS.values() for keyword in keywords])
+
+# Built once: every component keyword and name is found in one pass over the extracted terms
+_COMPONENT_AUTOMATON = KeywordAutomaton(
+    [keyword for component in SAP_COMPONENTS for keyword in component["keywords"]]
+    + [component["name"].lower() for component in SAP_COMPONENTS])
+
+SUMMARY_LENGTH = 1000
+
+
+class _MarkdownTermScanner:
+    """Collects headers, code, words, sentences and keyword hits while the markdown is read once"""
+
+    def __init__(self):
+        self.headers = []
+        self.endpoints = []
+        self.urls = []
+        self.code_blocks = []
+        self.word_freq = Counter()
+        self.keyword_hits = set()
+        self.technical_sentences = []
+        self.summary = []
+        self.summary_length = 0
+        self._paragraph = []
+        self._code = []
+        self._previous_text = None
+
+    def _add_text(self, text, sentences=True):
+        """Feed block text: summary, word counts, keyword hits and sentence buffer"""
+        if self.summary_length < SUMMARY_LENGTH:
+            self.summary.append(text)
+            self.summary_length += len(text) + 1
+        lowered = text.lower()
+        self.word_freq.update(word for word in WORD_PATTERN.findall(lowered) if word not in STOPWORDS)
+        if sentences:
+            self._paragraph.append(text)
+        else:
+            self.keyword_hits |= _TERM_AUTOMATON.find(lowered)
+
+    def _flush_paragraph(self):
+        """Split the buffered paragraph into sentences and keep those with technical terms"""
+        if not self._paragraph:
+            return
+        paragraph = ' '.join(part.strip() for part in self._paragraph)
+        self._paragraph = []
+        for sentence in SENTENCE_END_PATTERN.split(paragraph):
+            hits = _TERM_AUTOMATON.find(sentence.lower())
+            if not hits:
+                continue
+            self.keyword_hits |= hits
+            if TECHNICAL_TERM_KEYS & hits:
+                self.technical_sentences.append(sentence)
+
+    def scan(self, markdown_content):
+        fence = None
+        for line in markdown_content.splitlines():
+            # Endpoints and URLs never span lines, so they are matched on the raw line
+            self.endpoints.extend(path for _, path in ENDPOINT_PATTERN.findall(line))
+            self.urls.extend(URL_PATTERN.findall(line))
+
+            if fence is not None:
+                if line.strip().startswith(fence):
+                    fence = None
+                    self.code_blocks.append('\n'.join(self._code).strip())
+                else:
+                    self._code.append(line)
+                    self._add_text(line, sentences=False)
+                continue
+
+            fence_match = FENCE_PATTERN.match(line)
+            if fence_match:
+                self._flush_paragraph()
+                fence = fence_match.group(1)
+                self._code = []
+                self._previous_text = None
+                continue
+
+            if not line.strip():
+                self._flush_paragraph()
+                self._previous_text = None
+                continue
+
+            # "Title" followed by "===" or "---" is a level 1 or 2 header
+            if self._previous_text is not None and SETEXT_UNDERLINE_PATTERN.match(line):
+                self._paragraph.pop()
+                self._flush_paragraph()
+                self.headers.append(self._previous_text.strip())
+                self._previous_text = None
+                continue
+
+            if RULE_PATTERN.match(line):
+                self._flush_paragraph()
+                self._previous_text = None
+                continue
+
+            header_match = ATX_HEADER_PATTERN.match(line)
+            if header_match:
+                self._flush_paragraph()
+                text = plain_inline_text(header_match.group(2), self.code_blocks)
+                if len(header_match.group(1)) <= 3:
+                    self.headers.append(text.strip())
+                self._add_text(text)
+                self._flush_paragraph()
+                self._previous_text = None
+                continue
+
+            if LIST_ITEM_PATTERN.match(line):
+                self._flush_paragraph()
+            text = plain_inline_text(BLOCK_PREFIX_PATTERN.sub('', line, count=1), self.code_blocks)
+            self._add_text(text)
+            self._previous_text = text
+
+        if fence is not None:
+            self.code_blocks.append('\n'.join(self._code).strip())
+        self._flush_paragraph()
+        return self
+
+
+
 def extract_terms_from_markdown(markdown_file_path):
     """
     Extract key terms and information from a markdown file.
 
+    The markdown is read in a single pass: headers, endpoints, URLs, code, word
+    frequencies, technical sentences and keyword hits are collected line by line,
+    and all technical terms and pattern keywords are matched by one automaton.
+
     Args:
         markdown_file_path (str): Path to the markdown file
 
@@ -120,107 +249,24 @@ def extract_terms_from_markdown(markdown_file_path):
     with open(markdown_file_path, 'r', encoding='utf-8') as f:
         markdown_content = f.read()
 
-    # Convert markdown to HTML
-    html_content = markdown.markdown(markdown_content)
+    scanner = _MarkdownTermScanner().scan(markdown_content)
+    hits = scanner.keyword_hits
 
-    # Parse HTML
-    soup = BeautifulSoup(html_content, 'html.parser')
-
-    # Extract text content
-    text_content = soup.get_text()
-
-    # Extract headers
-    headers = []
-    for h_tag in soup.find_all(['h1', 'h2', 'h3']):
-        headers.append(h_tag.text.strip())
-
-    # Extract API endpoints
-    endpoint_patterns = re.findall(r'(GET|POST|PATCH|DELETE|PUT) (/\w+(?:/{\w+})?(?:/\w+)*)', markdown_content)
-    endpoint_paths = [path for _, path in endpoint_patterns]
-
-    # Extract URLs
-    url_pattern = r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+'
-    urls = re.findall(url_pattern, markdown_content)
-
-    # Extract code blocks
-    code_blocks = []
-    for code_tag in soup.find_all('code'):
-        code_blocks.append(code_tag.text.strip())
-
-    # Extract technical terms using NLP
-    try:
-        # Tokenize text
-        words = word_tokenize(text_content.lower())
-
-        # Remove stopwords and punctuation
-        words = [word for word in words if word.isalnum() and word not in STOPWORDS]
-
-        # Count word frequencies
-        word_freq = Counter(words)
-
-        # Get most common words
-        common_words = word_freq.most_common(30)
-
-        # Extract sentences containing technical terms
-        sentences = sent_tokenize(text_content)
-        technical_sentences = []
-
-        # Technical terms to look for
-        technical_terms = [
-            "REST", "API", "JSON", "HTTP", "HTTPS", "Authentication", "Flow",
-            "Integration", "Connector", "Endpoint", "Payload", "Transform",
-            "Mapping", "Protocol", "Service", "Message", "Queue", "Event",
-            "Synchronous", "Asynchronous", "XML", "SOAP", "Gateway", "Proxy"
-        ]
-
-        # Find sentences containing technical terms
-        for sentence in sentences:
-            for term in technical_terms:
-                if term.lower() in sentence.lower():
-                    technical_sentences.append(sentence)
-                    break
-
-        # Find technical terms in the text
-        found_technical_terms = []
-        for term in technical_terms:
-            if term.lower() in text_content.lower():
-                found_technical_terms.append(term)
-    except Exception as e:
-        logger.warning(f"Error in NLP processing: {str(e)}")
-        common_words = []
-        technical_sentences = []
-        found_technical_terms = ["REST", "API", "Integration"]  # Fallback
-
-    # Extract integration patterns
-    integration_patterns = []
-    pattern_keywords = {
-        "Request-Response": ["request", "response", "synchronous"],
-        "Publish-Subscribe": ["publish", "subscribe", "event", "topic"],
-        "Message Queue": ["queue", "message", "jms", "amqp"],
-        "File Transfer": ["file", "transfer", "ftp", "sftp"],
-        "Database Integration": ["database", "sql", "jdbc", "query"],
-        "API-Led": ["api", "experience", "process", "system"],
-        "Event-Driven": ["event", "trigger", "notification"],
-        "Batch Processing": ["batch", "bulk", "scheduled"]
-    }
-
-    for pattern, keywords in pattern_keywords.items():
-        for keyword in keywords:
-            if keyword in text_content.lower():
-                integration_patterns.append(pattern)
-                break
+    found_technical_terms = [term for term in TECHNICAL_TERMS if term.lower() in hits]
+    integration_patterns = [pattern for pattern, keywords in PATTERN_KEYWORDS.items()
+                            if any(keyword in hits for keyword in keywords)]
 
     # Return extracted terms
     return {
-        "headers": headers,
-        "endpoints": endpoint_paths,
-        "urls": urls,
-        "code_blocks": code_blocks,
-        "common_words": [word for word, count in common_words],
+        "headers": scanner.headers,
+        "endpoints": scanner.endpoints,
+        "urls": scanner.urls,
+        "code_blocks": scanner.code_blocks,
+        "common_words": [word for word, count in scanner.word_freq.most_common(30)],
         "technical_terms": found_technical_terms,
-        "technical_sentences": technical_sentences[:5],  # Limit to 5 sentences
-        "integration_patterns": list(set(integration_patterns)),  # Remove duplicates
-        "text_content": text_content[:1000]  # First 1000 chars for summary
+        "technical_sentences": scanner.technical_sentences[:5],  # Limit to 5 sentences
+        "integration_patterns": integration_patterns,
+        "text_content": '\n'.join(scanner.summary)[:SUMMARY_LENGTH]  # First 1000 chars for summary
     }
 
 def calculate_component_scores(extracted_terms):
@@ -245,6 +291,9 @@ def calculate_component_scores(extracted_terms):
         " ".join(extracted_terms.get("technical_sentences", []))
     ]).lower()
 
+    # All component keywords and names found in one pass
+    found = _COMPONENT_AUTOMATON.find(all_terms)
+
     # Calculate score for each component
     for component in SAP_COMPONENTS:
         score = 0
@@ -252,12 +301,12 @@ def calculate_component_scores(extracted_terms):
 
         # Check for keyword matches
         for keyword in component["keywords"]:
-            if keyword in all_terms:
+            if keyword in found:
                 score += 10
                 matches.append(keyword)
 
         # Check for name match
-        if component["name"].lower() in all_terms:
+        if component["name"].lower() in found:
             score += 15
             matches.append(component["name"])
 
@@ -380,6 +429,259 @@ def process_markdown_for_iflow(markdown_file_path, output_dir=None, github_token
             "message": f"Error processing markdown with RAG: {str(e)}"
         }
 
+def _extract_document_terms(markdown_file_path):
+    """Worker: extracted terms and SAP component scores of one document"""
+    extracted_terms = extract_terms_from_markdown(markdown_file_path)
+    return extracted_terms, calculate_component_scores(extracted_terms)
+
+
+def _extract_portfolio_terms(markdown_file_paths):
+    """Extract terms of many documents in worker processes; None for documents that failed"""
+    def safe_extract(path):
+        try:
+            return _extract_document_terms(path)
+        except Exception as e:
+            logger.warning(f"Could not extract terms from {path}: {str(e)}")
+            return None
+
+    workers = min(PORTFOLIO_WORKERS, len(markdown_file_paths))
+    if workers <= 1:
+        return [safe_extract(path) for path in markdown_file_paths]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_extract_document_terms, path) for path in markdown_file_paths]
+        for path, future in zip(markdown_file_paths, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.warning(f"Could not extract terms from {path}: {str(e)}")
+                results.append(None)
+    return results
+
+
+def process_portfolio_for_iflow(documents, output_dir, top_k=10, document_output_dirs=None):
+    """
+    Find SAP Integration Suite (iFlow) equivalents for many documents at once.
+
+    Terms are extracted in parallel worker processes, all documents are
+    embedded in batched calls and ranked against the integration flows in
+    one pass, and every document gets the same report and summary as
+    process_markdown_for_iflow, plus one combined portfolio report.
+
+    Args:
+        documents (dict): Document id (e.g. job ID) -> path to its markdown file
+        output_dir (str): Directory for the combined portfolio report
+        top_k (int): Similar iFlows per document
+        document_output_dirs (dict, optional): Document id -> directory for its own
+            report (default: output_dir/<document id>)
+
+    Returns:
+        dict: Status, combined report files, per-document results and throughput
+    """
+    start_time = time.perf_counter()
+    document_ids = list(documents)
+    logger.info(f"🔍 Processing portfolio of {len(document_ids)} documents with RAG search")
+
+    try:
+        from rag_similarity_search import get_rag_search
+
+        os.makedirs(output_dir, exist_ok=True)
+        document_output_dirs = document_output_dirs or {}
+
+        # Unreadable documents are reported without failing the rest of the portfolio
+        markdown_contents = []
+        failed_documents = {}
+        for document_id in list(document_ids):
+            try:
+                with open(documents[document_id], 'r', encoding='utf-8') as f:
+                    markdown_contents.append(f.read())
+            except OSError as e:
+                logger.warning(f"Could not read {documents[document_id]}: {str(e)}")
+                failed_documents[document_id] = str(e)
+                document_ids.remove(document_id)
+        if not document_ids:
+            raise ValueError("None of the documents could be read")
+
+        # Terms and SAP component scores, extracted concurrently
+        extracted = _extract_portfolio_terms([documents[document_id] for document_id in document_ids])
+
+        # All documents ranked together: batched embeddings, one similarity pass
+        rag_search = get_rag_search()
+        ranked, failures = rag_search.rank_documents(markdown_contents, top_k=top_k)
+        for index, error in failures.items():
+            logger.warning(f"Could not search iFlows for {document_ids[index]}: {error}")
+            failed_documents[document_ids[index]] = error
+        if len(failures) == len(document_ids):
+            raise ValueError(f"None of the documents could be searched: {next(iter(failures.values()))}")
+
+        document_results = {}
+        for document_id, similar_iflows, terms in zip(document_ids, ranked, extracted):
+            if similar_iflows is None:
+                continue
+            document_dir = document_output_dirs.get(document_id) or os.path.join(output_dir, document_id)
+            os.makedirs(document_dir, exist_ok=True)
+
+            match_report = rag_search.generate_match_report(similar_iflows)
+            report_html_path = os.path.join(document_dir, "iflow_similarity_report.html")
+            _generate_rag_report_html(similar_iflows, match_report, report_html_path)
+            summary_json_path = os.path.join(document_dir, "iflow_similarity_summary.json")
+            _generate_rag_summary_json(similar_iflows, match_report, summary_json_path)
+
+            document_results[document_id] = {
+                "status": "success",
+                "message": f"Found {len(similar_iflows)} similar iFlows using RAG search",
+                "files": {
+                    "report": report_html_path,
+                    "summary": summary_json_path
+                },
+                "iflow_count": len(similar_iflows),
+                "top_match": similar_iflows[0] if similar_iflows else None,
+                "top_matches": similar_iflows[:5],
+                "top_components": [
+                    {"name": component["name"], "score": component["score"]}
+                    for component in (terms[1] if terms else [])[:3]
+                ],
+                "technical_terms": terms[0]["technical_terms"] if terms else [],
+                "integration_patterns": terms[0]["integration_patterns"] if terms else []
+            }
+
+        elapsed = time.perf_counter() - start_time
+        documents_per_minute = len(document_results) / elapsed * 60 if elapsed > 0 else 0.0
+
+        portfolio_summary = _portfolio_summary(document_results, elapsed, documents_per_minute)
+        summary_json_path = os.path.join(output_dir, "portfolio_summary.json")
+        with open(summary_json_path, 'w', encoding='utf-8') as f:
+            json.dump(portfolio_summary, f, indent=2)
+        report_html_path = os.path.join(output_dir, "portfolio_report.html")
+        _generate_portfolio_report_html(portfolio_summary, report_html_path)
+
+        logger.info(f"✅ Portfolio of {len(document_results)} documents matched in {elapsed:.1f}s "
+                    f"({documents_per_minute:.0f} documents/minute)")
+
+        return {
+            "status": "success",
+            "message": f"Matched {len(document_results)} documents against SAP Integration Suite iFlows",
+            "files": {
+                "report": report_html_path,
+                "summary": summary_json_path
+            },
+            "documents": document_results,
+            "failed_documents": failed_documents,
+            "documents_per_minute": round(documents_per_minute, 1)
+        }
+
+    except Exception as e:
+        logger.error(f"❌ Error in portfolio RAG search: {str(e)}")
+        import traceback
+        traceback.print_exc()
+
+        return {
+            "status": "failed",
+            "message": f"Error processing portfolio with RAG: {str(e)}"
+        }
+
+
+def _portfolio_summary(document_results, elapsed, documents_per_minute):
+    """Combined view of a portfolio: per-document best matches and iFlows shared across documents"""
+    shared_iflows = {}
+    component_counts = Counter()
+    for document_id, result in document_results.items():
+        for match in result["top_matches"]:
+            entry = shared_iflows.setdefault(match["id"], {
+                "id": match["id"],
+                "name": match["name"],
+                "documents": [],
+                "best_similarity": 0.0
+            })
+            entry["documents"].append(document_id)
+            entry["best_similarity"] = max(entry["best_similarity"], match["similarity_score"])
+        if result["top_components"]:
+            component_counts[result["top_components"][0]["name"]] += 1
+
+    shared = sorted(shared_iflows.values(), key=lambda e: (-len(e["documents"]), -e["best_similarity"]))
+    return {
+        "search_method": "RAG (Retrieval Augmented Generation)",
+        "document_count": len(document_results),
+        "elapsed_seconds": round(elapsed, 2),
+        "documents_per_minute": round(documents_per_minute, 1),
+        "documents": [
+            {
+                "id": document_id,
+                "iflow_count": result["iflow_count"],
+                "top_match": result["top_match"],
+                "top_components": result["top_components"],
+                "integration_patterns": result["integration_patterns"]
+            }
+            for document_id, result in document_results.items()
+        ],
+        "shared_iflows": [dict(entry, document_count=len(entry["documents"])) for entry in shared[:20]],
+        "primary_components": dict(component_counts.most_common())
+    }
+
+
+def _generate_portfolio_report_html(portfolio_summary, output_path):
+    """Generate the combined HTML report of a portfolio"""
+    from html import escape
+
+    rows = []
+    for document in portfolio_summary["documents"]:
+        top_match = document["top_match"]
+        match_cell = (f'{escape(str(top_match["name"]))} ({top_match["similarity_score"] * 100:.1f}%)'
+                      if top_match else 'No match')
+        components = ', '.join(escape(c["name"]) for c in document["top_components"]) or '-'
+        rows.append(f'<tr><td>{escape(str(document["id"]))}</td><td>{match_cell}</td>'
+                    f'<td>{document["iflow_count"]}</td><td>{components}</td></tr>')
+
+    shared_rows = [
+        f'<tr><td>{escape(str(entry["name"]))}</td><td>{entry["document_count"]}</td>'
+        f'<td>{entry["best_similarity"] * 100:.1f}%</td></tr>'
+        for entry in portfolio_summary["shared_iflows"]
+    ]
+
+    html = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>SAP Integration Flow Portfolio Report</title>
+    <style>
+        body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0; padding: 20px; background: #f5f7fa; }}
+        .container {{ max-width: 1200px; margin: 0 auto; background: white; border-radius: 16px; overflow: hidden;
+                      box-shadow: 0 10px 30px rgba(0,0,0,0.15); }}
+        .header {{ background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%); color: white; padding: 30px 40px; }}
+        .content {{ padding: 30px 40px; }}
+        table {{ width: 100%; border-collapse: collapse; margin-bottom: 30px; }}
+        th, td {{ text-align: left; padding: 10px 12px; border-bottom: 1px solid #e5e7eb; }}
+        th {{ background: #f0f4ff; color: #1e3c72; }}
+        h2 {{ color: #1e3c72; margin: 10px 0 15px; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>SAP Integration Flow Portfolio Report</h1>
+            <p>{portfolio_summary["document_count"]} documents matched in {portfolio_summary["elapsed_seconds"]}s
+               ({portfolio_summary["documents_per_minute"]} documents/minute)</p>
+        </div>
+        <div class="content">
+            <h2>Best Match per Document</h2>
+            <table>
+                <tr><th>Document</th><th>Top iFlow Match</th><th>Matches</th><th>SAP Components</th></tr>
+                {''.join(rows)}
+            </table>
+            <h2>iFlows Shared Across Documents</h2>
+            <table>
+                <tr><th>iFlow</th><th>Documents</th><th>Best Similarity</th></tr>
+                {''.join(shared_rows)}
+            </table>
+        </div>
+    </div>
+</body>
+</html>
+"""
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(html)
+
 def _generate_rag_report_html(similar_iflows, match_report, output_path):
     """Generate professional HTML report for RAG search results"""
     
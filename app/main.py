@@ -3,6 +3,7 @@ from extract_terms import extract_terms_from_markdown, generate_search_terms
 from search_discovery import SAPDiscoverySearcher
 from score_results import ContentSimilarityScorer
 from present_findings import ResultsPresenter
+from chart_renderer import render_all
 import os
 import logging
 import json
@@ -148,6 +149,12 @@ def main():
         print(f"\nProcess completed successfully!")
         print(f"Report: {result['files']['report']}")
         print(f"Summary: {result['files']['summary']}")
+
+        # The API draws charts when they are first requested; command-line runs draw them now
+        charts = result['files'].get('charts') or {}
+        if charts:
+            render_all(os.path.dirname(next(iter(charts.values()))))
+            print(f"Charts: {', '.join(charts.values())}")
     else:
         print(f"\nProcess failed: {result['message']}")
 
@@ -209,6 +209,13 @@ def convert_markdown_to_html(markdown_file, output_file=None):
         except Exception as fallback_e:
             print(f"Warning: Fallback Mermaid fixes also failed: {fallback_e}")
 
+    # Replace the validated Mermaid blocks with cached server-side SVG where possible
+    try:
+        from mermaid_svg_renderer import prerender_mermaid_file
+        prerender_mermaid_file(output_file)
+    except Exception as e:
+        print(f"Warning: Could not pre-render Mermaid diagrams: {e}")
+
     print(f"HTML file generated successfully: {output_file}")
     return output_file
 
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+"""
+Server-side Mermaid rendering for HTML documentation.
+
+Replaces <pre class="mermaid"> blocks with inline SVG produced by the offline
+mermaid-cli renderer (mmdc), so the browser does no diagram layout and the PDF
+export contains real diagrams. SVGs are cached on disk by diagram hash, so a
+diagram that appears in many documents is rendered only once.
+"""
+import os
+import re
+import html
+import shutil
+import hashlib
+import logging
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+# mmdc executable (npm install -g @mermaid-js/mermaid-cli)
+MERMAID_CLI = os.getenv('MERMAID_CLI', 'mmdc')
+
+# Optional puppeteer config, e.g. {"args": ["--no-sandbox"]} inside containers
+MERMAID_PUPPETEER_CONFIG = os.getenv('MERMAID_PUPPETEER_CONFIG')
+
+MERMAID_SVG_CACHE_DIR = os.getenv(
+    'MERMAID_SVG_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mermaid_svg_cache'))
+
+MERMAID_RENDER_TIMEOUT = int(os.getenv('MERMAID_RENDER_TIMEOUT', '60'))
+MERMAID_RENDER_WORKERS = int(os.getenv('MERMAID_RENDER_WORKERS', '4'))
+
+# Bump when renderer options change so old cache entries are not reused
+RENDER_VERSION = 'v1'
+
+MERMAID_BLOCK_PATTERN = re.compile(r'<pre class="mermaid">\s*(.*?)\s*</pre>', re.DOTALL)
+MERMAID_SCRIPT_PATTERN = re.compile(r'<script type="module">\s*import mermaid\b.*?</script>\s*', re.DOTALL)
+XML_DECLARATION_PATTERN = re.compile(r'^\s*<\?xml[^>]*\?>\s*')
+
+
+def diagram_hash(diagram):
+    """Cache key for a diagram's source text"""
+    normalized = '\n'.join(line.rstrip() for line in diagram.strip().splitlines())
+    return hashlib.sha256(f'{RENDER_VERSION}\n{normalized}'.encode('utf-8')).hexdigest()
+
+
+class MermaidSVGRenderer:
+    """Renders Mermaid diagrams to SVG with mmdc and caches them by diagram hash"""
+
+    def __init__(self, cache_dir=MERMAID_SVG_CACHE_DIR, mmdc_path=None, timeout=MERMAID_RENDER_TIMEOUT):
+        self.cache_dir = cache_dir
+        self.mmdc_path = mmdc_path or shutil.which(MERMAID_CLI)
+        self.timeout = timeout
+
+    @property
+    def available(self):
+        """True if the offline renderer is installed"""
+        return bool(self.mmdc_path)
+
+    def _cache_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f'{key}.svg')
+
+    def render(self, diagram):
+        """
+        Render one diagram to SVG markup.
+
+        Args:
+            diagram: Mermaid source text
+
+        Returns:
+            SVG markup, or None if the diagram could not be rendered
+        """
+        key = diagram_hash(diagram)
+        cache_path = self._cache_path(key)
+        if os.path.exists(cache_path):
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return f.read()
+
+        if not self.available:
+            return None
+
+        with tempfile.TemporaryDirectory(prefix='mermaid_') as tmp_dir:
+            input_path = os.path.join(tmp_dir, 'diagram.mmd')
+            output_path = os.path.join(tmp_dir, 'diagram.svg')
+            with open(input_path, 'w', encoding='utf-8') as f:
+                f.write(diagram)
+
+            # Unique SVG id per diagram so the embedded styles of several diagrams do not clash
+            command = [self.mmdc_path, '-i', input_path, '-o', output_path,
+                       '-b', 'white', '-I', f'mermaid-{key[:12]}', '-q']
+            if MERMAID_PUPPETEER_CONFIG:
+                command += ['-p', MERMAID_PUPPETEER_CONFIG]
+
+            try:
+                result = subprocess.run(command, capture_output=True, text=True, timeout=self.timeout)
+            except (OSError, subprocess.TimeoutExpired) as e:
+                logging.warning(f"Mermaid rendering failed: {e}")
+                return None
+
+            if result.returncode != 0 or not os.path.exists(output_path):
+                logging.warning(f"Mermaid rendering failed: {result.stderr.strip()[:500]}")
+                return None
+
+            with open(output_path, 'r', encoding='utf-8') as f:
+                svg = XML_DECLARATION_PATTERN.sub('', f.read())
+
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        temp_cache_path = f'{cache_path}.{os.getpid()}.tmp'
+        with open(temp_cache_path, 'w', encoding='utf-8') as f:
+            f.write(svg)
+        os.replace(temp_cache_path, cache_path)
+        return svg
+
+    def render_many(self, diagrams):
+        """Render several diagrams in parallel; returns SVG or None for each, in order"""
+        if not diagrams:
+            return []
+        with ThreadPoolExecutor(max_workers=min(MERMAID_RENDER_WORKERS, len(diagrams))) as pool:
+            return list(pool.map(self.render, diagrams))
+
+
+def prerender_mermaid_html(html_content, renderer=None):
+    """
+    Replace Mermaid blocks in an HTML document with inline SVG.
+
+    Blocks that cannot be rendered are left for client-side Mermaid. The Mermaid
+    script is removed once no client-side blocks remain.
+
+    Args:
+        html_content: HTML document
+        renderer: MermaidSVGRenderer to use (default renderer if None)
+
+    Returns:
+        tuple: (html_content, rendered_count, total_count)
+    """
+    renderer = renderer or MermaidSVGRenderer()
+    matches = list(MERMAID_BLOCK_PATTERN.finditer(html_content))
+    if not matches:
+        return html_content, 0, 0
+
+    diagrams = [html.unescape(match.group(1)) for match in matches]
+    unique_diagrams = list(dict.fromkeys(diagrams))
+    svgs = dict(zip(unique_diagrams, renderer.render_many(unique_diagrams)))
+
+    parts = []
+    last_end = 0
+    rendered = 0
+    for match, diagram in zip(matches, diagrams):
+        parts.append(html_content[last_end:match.start()])
+        svg = svgs.get(diagram)
+        if svg:
+            parts.append(f'<div class="mermaid-diagram" style="text-align: center; overflow-x: auto;">{svg}</div>')
+            rendered += 1
+        else:
+            parts.append(match.group(0))
+        last_end = match.end()
+    parts.append(html_content[last_end:])
+    html_content = ''.join(parts)
+
+    if rendered == len(matches):
+        html_content = MERMAID_SCRIPT_PATTERN.sub('', html_content)
+
+    return html_content, rendered, len(matches)
+
+
+def prerender_mermaid_file(html_file, renderer=None):
+    """
+    Pre-render the Mermaid blocks of an HTML file in place.
+
+    Returns:
+        tuple: (rendered_count, total_count)
+    """
+    renderer = renderer or MermaidSVGRenderer()
+    with open(html_file, 'r', encoding='utf-8') as f:
+        html_content = f.read()
+
+    if 'class="mermaid"' not in html_content:
+        return 0, 0
+    if not renderer.available:
+        print("Mermaid CLI (mmdc) not found - diagrams will render client-side")
+
+    html_content, rendered, total = prerender_mermaid_html(html_content, renderer)
+    if rendered:
+        with open(html_file, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+    print(f"Pre-rendered {rendered}/{total} Mermaid diagrams to SVG in {html_file}")
+    return rendered, total
@@ -1,15 +0,0 @@
-import nltk
-import os
-
-# Create a directory for NLTK data
-nltk_data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nltk_data')
-os.makedirs(nltk_data_dir, exist_ok=True)
-
-# Set NLTK data path
-nltk.data.path.append(nltk_data_dir)
-
-# Download required NLTK data
-print("Downloading NLTK data...")
-nltk.download('punkt', download_dir=nltk_data_dir)
-nltk.download('stopwords', download_dir=nltk_data_dir)
-print("NLTK data download complete.")
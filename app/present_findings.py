@@ -1,14 +1,10 @@
 import json
-import os
 import datetime
 from tabulate import tabulate
-# Set matplotlib backend to Agg (non-interactive) to avoid Tkinter issues
-import matplotlib
-matplotlib.use('Agg')  # This must be done before importing pyplot
-import matplotlib.pyplot as plt
-import numpy as np
 from termcolor import colored
 
+from chart_renderer import save_chart_data
+
 class ResultsPresenter:
     """
     Present the search results and recommendations in a useful format
@@ -517,99 +513,31 @@ class ResultsPresenter:
 
         return output_path
 
-    def create_charts(self, output_dir="charts"):
+    def chart_data(self):
         """
-        Create visualization charts for the results
-
-        Args:
-            output_dir (str): Directory to save the charts
+        Data of the visualization charts for the results
 
         Returns:
-            list: List of paths to generated chart files
+            dict: Chart name -> chart specification (see chart_renderer)
         """
-        if not self.scored_results:
-            return []
-
-        # Create output directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
-
-        chart_files = []
-
-        # 1. Top matches bar chart
-        plt.figure(figsize=(12, 6))
-
         # Get top 10 results
         top_results = self.scored_results[:10]
         names = [result.get('Name', '')[:20] + '...' if len(result.get('Name', '')) > 20 else result.get('Name', '') for result in top_results]
         scores = [result.get('_scores', {}).get('combined_score', 0) for result in top_results]
 
-        # Create bars
-        bars = plt.bar(names, scores, color='skyblue')
-
         # Color bars based on score
-        for i, bar in enumerate(bars):
-            if scores[i] >= self.high_quality_threshold:
-                bar.set_color('green')
-            elif scores[i] >= self.medium_quality_threshold:
-                bar.set_color('orange')
+        colors = []
+        for score in scores:
+            if score >= self.high_quality_threshold:
+                colors.append('green')
+            elif score >= self.medium_quality_threshold:
+                colors.append('orange')
             else:
-                bar.set_color('red')
-
-        plt.xlabel('Integration Content')
-        plt.ylabel('Match Score')
-        plt.title('Top 10 Integration Matches')
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-
-        # Save chart
-        chart_path = os.path.join(output_dir, 'top_matches.png')
-        plt.savefig(chart_path)
-        plt.close()
-        chart_files.append(chart_path)
-
-        # 2. Score breakdown for top 5 matches
-        plt.figure(figsize=(12, 8))
+                colors.append('red')
 
         # Get top 5 results
         top_5_results = self.scored_results[:5]
-        names = [result.get('Name', '')[:15] + '...' if len(result.get('Name', '')) > 15 else result.get('Name', '') for result in top_5_results]
-
-        # Get score components
-        term_match_scores = [result.get('_scores', {}).get('term_match', 0) for result in top_5_results]
-        endpoint_match_scores = [result.get('_scores', {}).get('endpoint_match', 0) for result in top_5_results]
-        content_similarity_scores = [result.get('_scores', {}).get('content_similarity', 0) * 20 for result in top_5_results]  # Scale for visibility
-        search_priority_scores = [result.get('_scores', {}).get('search_priority', 0) for result in top_5_results]
-
-        # Set bar width
-        bar_width = 0.2
-
-        # Set positions
-        r1 = np.arange(len(names))
-        r2 = [x + bar_width for x in r1]
-        r3 = [x + bar_width for x in r2]
-        r4 = [x + bar_width for x in r3]
-
-        # Create grouped bars
-        plt.bar(r1, term_match_scores, width=bar_width, label='Term Match', color='royalblue')
-        plt.bar(r2, endpoint_match_scores, width=bar_width, label='Endpoint Match', color='seagreen')
-        plt.bar(r3, content_similarity_scores, width=bar_width, label='Content Similarity (x20)', color='gold')
-        plt.bar(r4, search_priority_scores, width=bar_width, label='Search Priority', color='gray')
-
-        plt.xlabel('Integration Content')
-        plt.ylabel('Score Component Value')
-        plt.title('Score Breakdown for Top 5')
-        plt.xticks([r + bar_width * 1.5 for r in range(len(names))], names, rotation=45, ha='right')
-        plt.legend()
-        plt.tight_layout()
-
-        # Save chart
-        chart_path = os.path.join(output_dir, 'score_breakdown.png')
-        plt.savefig(chart_path)
-        plt.close()
-        chart_files.append(chart_path)
-
-        # 3. Quality distribution pie chart
-        plt.figure(figsize=(8, 8))
+        top_5_names = [result.get('Name', '')[:15] + '...' if len(result.get('Name', '')) > 15 else result.get('Name', '') for result in top_5_results]
 
         # Count results by quality
         high_quality = 0
@@ -625,20 +553,59 @@ class ResultsPresenter:
             else:
                 low_quality += 1
 
-        # Create pie chart
-        labels = ['High Quality', 'Medium Quality', 'Low Quality']
-        sizes = [high_quality, medium_quality, low_quality]
-        colors = ['green', 'orange', 'red']
-        explode = (0.1, 0, 0)  # Explode high quality slice
+        return {
+            # 1. Top matches bar chart
+            'top_matches': {
+                'type': 'bar',
+                'title': 'Top 10 Integration Matches',
+                'x_label': 'Integration Content',
+                'y_label': 'Match Score',
+                'labels': names,
+                'values': scores,
+                'colors': colors
+            },
+            # 2. Score breakdown for top 5 matches
+            'score_breakdown': {
+                'type': 'grouped_bar',
+                'title': 'Score Breakdown for Top 5',
+                'x_label': 'Integration Content',
+                'y_label': 'Score Component Value',
+                'labels': top_5_names,
+                'series': [
+                    {'name': 'Term Match', 'color': 'royalblue',
+                     'values': [result.get('_scores', {}).get('term_match', 0) for result in top_5_results]},
+                    {'name': 'Endpoint Match', 'color': 'seagreen',
+                     'values': [result.get('_scores', {}).get('endpoint_match', 0) for result in top_5_results]},
+                    {'name': 'Content Similarity (x20)', 'color': 'gold',  # Scale for visibility
+                     'values': [result.get('_scores', {}).get('content_similarity', 0) * 20 for result in top_5_results]},
+                    {'name': 'Search Priority', 'color': 'gray',
+                     'values': [result.get('_scores', {}).get('search_priority', 0) for result in top_5_results]}
+                ]
+            },
+            # 3. Quality distribution pie chart
+            'quality_distribution': {
+                'type': 'pie',
+                'title': 'Quality Distribution of Matches',
+                'labels': ['High Quality', 'Medium Quality', 'Low Quality'],
+                'values': [high_quality, medium_quality, low_quality],
+                'colors': ['green', 'orange', 'red']
+            }
+        }
+
+    def create_charts(self, output_dir="charts"):
+        """
+        Save the chart data for the results.
+
+        Charts are not drawn here: chart_renderer draws them as SVG (or serves
+        the data as JSON) when they are first requested.
 
-        plt.pie(sizes, explode=explode, labels=labels, colors=colors, autopct='%1.1f%%', shadow=True, startangle=140)
-        plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
-        plt.title('Quality Distribution of Matches')
+        Args:
+            output_dir (str): Directory to save the charts
 
-        # Save chart
-        chart_path = os.path.join(output_dir, 'quality_distribution.png')
-        plt.savefig(chart_path)
-        plt.close()
-        chart_files.append(chart_path)
+        Returns:
+            dict: Chart name -> path of the chart's SVG file
+        """
+        if not self.scored_results:
+            return {}
 
-        return chart_files
+        return save_chart_data(output_dir, self.chart_data())
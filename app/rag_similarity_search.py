@@ -74,17 +74,7 @@ class RAGSimilaritySearch:
             similar_flows = self.search_system.search_similar_flows(query_text, top_k)
             
             # Format results for agent usage
-            formatted_results = []
-            for flow in similar_flows:
-                formatted_results.append({
-                    'rank': flow['rank'],
-                    'id': flow['id'],
-                    'name': flow['name'],
-                    'description': flow['description'],
-                    'similarity_score': flow['similarity_score'],
-                    'quality': self._determine_quality(flow['similarity_score']),
-                    'type': 'SAP_Integration_Flow'
-                })
+            formatted_results = self._format_results(similar_flows)
             
             print(f"✅ Found {len(formatted_results)} similar iFlows")
             return formatted_results
@@ -93,6 +83,56 @@ class RAGSimilaritySearch:
             print(f"❌ Error searching similar flows: {e}")
             return []
     
+    def rank_documents(self, documents: List[str], top_k: int = 10):
+        """
+        Search similar integration flows for many documents at once
+        
+        Embeds all documents in batched calls and scores them together, for
+        batch migrations of many projects. Documents that cannot be searched
+        are reported as failed rather than as having no matches.
+        
+        Args:
+            documents: Documentation texts, one per project
+            top_k: Number of results per document
+            
+        Returns:
+            tuple: (similar iFlows per document in order, None for failed documents;
+                    document index -> error of the failed documents)
+        """
+        def all_failed(error):
+            return [None] * len(documents), {i: error for i in range(len(documents))}
+        
+        if not RAG_AVAILABLE:
+            print("❌ RAG system not available")
+            return all_failed("RAG system not available")
+            
+        if not self.initialized:
+            if not self.initialize():
+                return all_failed("RAG search could not be initialized")
+        
+        try:
+            ranked, failures = self.search_system.rank_documents(documents, top_k)
+            return [None if similar_flows is None else self._format_results(similar_flows)
+                    for similar_flows in ranked], failures
+        except Exception as e:
+            print(f"❌ Error ranking documents: {e}")
+            return all_failed(str(e))
+    
+    def _format_results(self, similar_flows: List[Dict]) -> List[Dict]:
+        """Format search results for agent usage"""
+        formatted_results = []
+        for flow in similar_flows:
+            formatted_results.append({
+                'rank': flow['rank'],
+                'id': flow['id'],
+                'name': flow['name'],
+                'description': flow['description'],
+                'similarity_score': flow['similarity_score'],
+                'quality': self._determine_quality(flow['similarity_score']),
+                'type': 'SAP_Integration_Flow'
+            })
+        return formatted_results
+    
     def process_documentation(self, documentation_text: str, top_k: int = 10) -> Dict:
         """
         Process documentation and find similar iFlows
@@ -271,6 +311,20 @@ def search_similar_iflows(documentation: str, top_k: int = 10) -> List[Dict]:
     rag_search = get_rag_search()
     return rag_search.search_similar_flows(documentation, top_k)
 
+def rank_documents(documents: List[str], top_k: int = 10):
+    """
+    Convenience function to search similar iFlows for many documents at once
+    
+    Args:
+        documents: Documentation texts
+        top_k: Number of results per document
+        
+    Returns:
+        tuple: (similar iFlows per document, None for failed documents; index -> error)
+    """
+    rag_search = get_rag_search()
+    return rag_search.rank_documents(documents, top_k)
+
 if __name__ == "__main__":
     # Test the RAG similarity search
     print("="*60)
@@ -1,22 +1,22 @@
 import re
 import json
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 
+from similarity_model import get_similarity_model, preprocess_text
+from term_patterns import PATH_PARAMETER_PATTERN, TermMatcher, combined_pattern
+
 class ContentSimilarityScorer:
     """
     Score and rank integration content based on similarity to Mulesoft implementation
     """
     
-    def __init__(self, extracted_terms):
+    def __init__(self, extracted_terms, model=None):
         """
         Initialize with extracted terms from Mulesoft documentation
         
         Args:
             extracted_terms (dict): Dictionary with categorized terms from Mulesoft documentation
+            model (CatalogSimilarityModel, optional): Prefit TF-IDF model (default: model of the catalog snapshot)
         """
         self.extracted_terms = extracted_terms
         
@@ -34,28 +34,49 @@ class ContentSimilarityScorer:
         if 'endpoint_paths' in extracted_terms:
             for path in extracted_terms['endpoint_paths']:
                 # Replace path parameters with wildcards
-                pattern = re.sub(r'{[^}]+}', '.*', path)
+                pattern = PATH_PARAMETER_PATTERN.sub('.*', path)
                 self.endpoint_patterns.append(pattern)
         
-        # Prepare TF-IDF vectorizer for content similarity
+        # Compiled once: all terms are found in an item with one scan, and one combined
+        # regex rules out items that match no endpoint pattern
+        self.term_matcher = TermMatcher(self.all_terms)
+        self.endpoint_regexes = [re.compile(pattern, re.IGNORECASE) for pattern in self.endpoint_patterns]
+        self.any_endpoint_regex = combined_pattern(self.endpoint_patterns, re.IGNORECASE)
+        
+        # TF-IDF model fitted once over the whole catalog; None falls back to fitting per call
+        self.model = model if model is not None else get_similarity_model()
         self.vectorizer = None
+        self._item_fields = {}
     
     def preprocess_text(self, text):
         """Preprocess text for similarity comparison"""
         if not text:
             return ""
         
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Tokenize
-        tokens = word_tokenize(text)
-        
-        # Remove stopwords
-        stop_words = set(stopwords.words('english'))
-        filtered_tokens = [word for word in tokens if word.isalnum() and word not in stop_words]
-        
-        return ' '.join(filtered_tokens)
+        return preprocess_text(text)
+    
+    def _get_item_fields(self, item):
+        """Lowercased field texts of an item, computed once per item"""
+        key = item.get('Id') or id(item)
+        fields = self._item_fields.get(key)
+        if fields is None:
+            categories = item.get('Categories', [])
+            tags = item.get('Tags', [])
+            
+            # Convert lists to strings
+            categories_text = ' '.join(categories) if isinstance(categories, list) else str(categories)
+            tags_text = ' '.join(tags) if isinstance(tags, list) else str(tags)
+            
+            name = item.get('Name', '').lower()
+            description = item.get('Description', '').lower()
+            categories_text = categories_text.lower()
+            tags_text = tags_text.lower()
+            
+            # Categories and tags are separated so a term cannot match across them
+            labels = f"{categories_text}\n{tags_text}"
+            fields = (name, description, labels, f"{name} {description} {categories_text} {tags_text}")
+            self._item_fields[key] = fields
+        return fields
     
     def calculate_term_match_score(self, item):
         """
@@ -69,38 +90,27 @@ class ContentSimilarityScorer:
         """
         score = 0
         
-        # Extract text from relevant fields
-        name = item.get('Name', '')
-        description = item.get('Description', '')
-        categories = item.get('Categories', [])
-        tags = item.get('Tags', [])
-        
-        # Convert lists to strings
-        categories_text = ' '.join(categories) if isinstance(categories, list) else str(categories)
-        tags_text = ' '.join(tags) if isinstance(tags, list) else str(tags)
-        
-        # Combine all text
-        all_text = f"{name} {description} {categories_text} {tags_text}".lower()
+        name, description, labels, all_text = self._get_item_fields(item)
         
-        # Score term matches with different weights
-        for term in self.all_terms:
-            term_lower = term.lower()
+        # Terms absent from the item text cannot match any field
+        for term_lower in self.term_matcher.find(all_text):
+            # Partial match anywhere
+            term_score = 1
             
             # Exact match in name (highest weight)
-            if term_lower in name.lower():
-                score += 10
+            if term_lower in name:
+                term_score += 10
             
             # Exact match in description
-            if term_lower in description.lower():
-                score += 5
+            if term_lower in description:
+                term_score += 5
             
             # Match in categories or tags
-            if term_lower in categories_text.lower() or term_lower in tags_text.lower():
-                score += 3
+            if term_lower in labels:
+                term_score += 3
             
-            # Partial match anywhere
-            if term_lower in all_text:
-                score += 1
+            # Repeated terms count every time
+            score += term_score * self.term_matcher.counts[term_lower]
         
         return score
     
@@ -124,9 +134,13 @@ class ContentSimilarityScorer:
         # Extract API information from description or other fields
         description = item.get('Description', '')
         
+        # Most items match no pattern at all
+        if self.any_endpoint_regex is None or not self.any_endpoint_regex.search(description):
+            return score
+        
         # Look for endpoint patterns
-        for pattern in self.endpoint_patterns:
-            if re.search(pattern, description, re.IGNORECASE):
+        for regex in self.endpoint_regexes:
+            if regex.search(description):
                 score += 5
                 
         return score
@@ -144,6 +158,12 @@ class ContentSimilarityScorer:
         if not items:
             return {}
         
+        if self.model is not None:
+            # One sparse matrix-vector product against the prefit catalog vectors
+            similarities = self.model.similarities(self.mulesoft_document, items)
+            return {item.get('Id'): float(score) for item, score in zip(items, similarities) if item.get('Id')}
+        
+        # No catalog model: fit over the query and candidates
         # Prepare corpus for TF-IDF
         corpus = [self.mulesoft_document]  # Start with Mulesoft document
         
@@ -155,6 +175,10 @@ class ContentSimilarityScorer:
             preprocessed = self.preprocess_text(text)
             corpus.append(preprocessed)
         
+        # Only needed without a catalog model, so scikit-learn is not imported at startup
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.metrics.pairwise import cosine_similarity
+
         # Create and fit TF-IDF vectorizer
         self.vectorizer = TfidfVectorizer()
         tfidf_matrix = self.vectorizer.fit_transform(corpus)
@@ -255,11 +279,8 @@ class ContentSimilarityScorer:
         scores = item.get('_scores', {})
         
         # Find matching terms
-        matching_terms = []
-        for term in self.all_terms:
-            term_lower = term.lower()
-            if term_lower in (name + ' ' + description).lower():
-                matching_terms.append(term)
+        found = self.term_matcher.find((name + ' ' + description).lower())
+        matching_terms = [term for term in self.all_terms if term.lower() in found]
         
         # Limit to top terms
         matching_terms = matching_terms[:5]
@@ -1,3 +1,4 @@
+import os
 import requests
 import json
 import time
@@ -5,23 +6,39 @@ import re
 import base64
 from collections import defaultdict
 
+from discovery_catalog import DISCOVERY_CATALOG_PATH, CatalogSearchIndex, get_catalog
+
+# Crawl GitHub when no catalog snapshot exists. The snapshot is the fast path
+# (build it with: python discovery_catalog.py build); without one, searches
+# fall back to a live scan unless DISCOVERY_ALLOW_LIVE_SCAN=false
+ALLOW_LIVE_SCAN = os.getenv('DISCOVERY_ALLOW_LIVE_SCAN', 'true').lower() == 'true'
+
 class SAPDiscoverySearcher:
     """
-    Class to search for SAP integration content using GitHub API
+    Class to search for SAP integration content from the offline catalog snapshot
     """
     
-    def __init__(self, github_token=None):
+    def __init__(self, github_token=None, catalog_path=DISCOVERY_CATALOG_PATH, allow_live_scan=ALLOW_LIVE_SCAN):
         """
         Initialize with GitHub token for API access
         
         Args:
             github_token (str, optional): GitHub personal access token
+            catalog_path (str, optional): Catalog snapshot to search; None to start without one
+            allow_live_scan (bool): Crawl GitHub if there is no snapshot
         """
         self.repo_owner = "SAP"
         self.repo_name = "apibusinesshub-integration-recipes"
         self.github_token = github_token
         self.results_cache = {}  # Cache search results
         self.integration_content = []
+        self.allow_live_scan = allow_live_scan
+        self._search_index = None
+        
+        # Searches run against the memory-mapped snapshot; no network in the request path
+        self.catalog = get_catalog(catalog_path) if catalog_path else None
+        if self.catalog:
+            self.integration_content = self.catalog.items
         
         # Base headers for GitHub API
         self.headers = {
@@ -182,6 +199,22 @@ class SAPDiscoverySearcher:
             print(f"Error: Could not find main README at {readme_path}")
             return []
         
+        all_content = self.parse_recipes_readme(readme_content)
+        
+        self.integration_content = all_content
+        print(f"Scanned repository and found {len(all_content)} integration recipes")
+        return all_content
+    
+    def parse_recipes_readme(self, readme_content):
+        """
+        Parse the recipe tables of the main README into catalog items
+        
+        Args:
+            readme_content (str): Content of Recipes/readme.md
+            
+        Returns:
+            list: Integration content items
+        """
         all_content = []
         
         # Parse recipe tables from the README
@@ -227,8 +260,6 @@ class SAPDiscoverySearcher:
                         all_content.append(content_item)
                         print(f"Found recipe: {recipe_name}")
         
-        self.integration_content = all_content
-        print(f"Scanned repository and found {len(all_content)} integration recipes")
         return all_content
 
     def _extract_current_topic(self, readme_content, current_row):
@@ -291,6 +322,18 @@ class SAPDiscoverySearcher:
                 # Rate limiting
                 time.sleep(1)
     
+    def _ensure_content(self):
+        """Make sure catalog content is loaded; only scans GitHub if live scans are allowed"""
+        if self.integration_content:
+            return
+        if self.allow_live_scan:
+            print("WARNING: No discovery catalog snapshot found - falling back to a live GitHub scan; "
+                  "run 'python discovery_catalog.py build' to create the snapshot")
+            self._scan_primary_directories()
+        else:
+            print("WARNING: No discovery catalog snapshot found and live scans are disabled - discovery "
+                  "searches will return no matches; run 'python discovery_catalog.py build' to create it")
+    
     def search_discovery_content(self, search_term, content_type=None, page_size=20, skip=0):
         """
         Search for content in the integration content data
@@ -304,96 +347,40 @@ class SAPDiscoverySearcher:
         Returns:
             dict: The search results
         """
-        # Check if we need to scan the repository
-        if not self.integration_content:
-            print("Scanning repository for content...")
-            self._scan_primary_directories()
+        self._ensure_content()
         
         # Check if this search is in cache
         cache_key = f"{search_term}_{content_type}_{page_size}_{skip}"
         if cache_key in self.results_cache:
             return self.results_cache[cache_key]
         
-        print(f"Searching for: {search_term} with content type: {content_type}")
-        
-        # Ensure search term is lowercase for case-insensitive matching
-        search_term_lower = search_term.lower()
-        search_terms = search_term_lower.split()
-        
-        matching_results = []
-        
-        for item in self.integration_content:
-            # Skip if content type doesn't match
-            if content_type and item.get("ContentType") != content_type:
-                continue
-            
-            # Calculate a match score
-            score = 0
-            
-            # Get lowercase versions of item fields for case-insensitive matching
-            name_lower = item.get("Name", "").lower()
-            desc_lower = item.get("Description", "").lower()
-            tags_lower = [tag.lower() for tag in item.get("Tags", [])]
-            categories_lower = [cat.lower() for cat in item.get("Categories", [])]
-            
-            # Check exact phrase in name (highest weight)
-            if search_term_lower in name_lower:
-                score += 10
-            
-            # Check for individual terms in name
-            for term in search_terms:
-                if term in name_lower:
-                    score += 5
-            
-            # Check exact phrase in description
-            if search_term_lower in desc_lower:
-                score += 7
-                    
-            # Check for individual terms in description
-            for term in search_terms:
-                if term in desc_lower:
-                    score += 3
-            
-            # Check tags
-            for tag in tags_lower:
-                if search_term_lower in tag:
-                    score += 5
-                for term in search_terms:
-                    if term in tag:
-                        score += 2
-            
-            # Check categories
-            for category in categories_lower:
-                if search_term_lower in category:
-                    score += 4
-                for term in search_terms:
-                    if term in category:
-                        score += 2
-            
-            # Add to results if there's any match
-            if score > 0:
-                result_item = item.copy()
-                result_item["_match_score"] = score
-                matching_results.append(result_item)
-        
-        # Sort by match score
-        matching_results.sort(key=lambda x: x["_match_score"], reverse=True)
-        
-        # Apply pagination
-        paginated_results = matching_results[skip:skip + page_size]
+        # BM25 over the inverted index; only items containing a query token are scored
+        ranked = self._get_search_index().search(search_term, content_type, limit=page_size, skip=skip)
         
         # Format the response
         response = {
-            "value": paginated_results
+            "value": [self._result_item(index, score) for index, score in ranked]
         }
         
         # Cache the result
         self.results_cache[cache_key] = response
         
-        print(f"Found {len(paginated_results)} matches for '{search_term}' with content type '{content_type}'")
-        
         return response
     
+    def _get_search_index(self):
+        """Inverted index for the current content (shared with the catalog when loaded from a snapshot)"""
+        if self.catalog and self.integration_content is self.catalog.items:
+            return self.catalog.search_index
+        if self._search_index is None or self._search_index.items is not self.integration_content:
+            self._search_index = CatalogSearchIndex(self.integration_content)
+        return self._search_index
+    
+    def _result_item(self, index, score):
+        """Copy of a catalog item with its match score"""
+        result_item = self.integration_content[index].copy()
+        result_item["_match_score"] = round(score, 4)
+        return result_item
+    
     def get_content_details(self, content_id):
         """
         Get detailed information about a specific integration content
@@ -404,10 +391,7 @@ class SAPDiscoverySearcher:
         Returns:
             dict: The content details
         """
-        # Check if we need to scan the repository
-        if not self.integration_content:
-            print("Scanning repository for content...")
-            self._scan_primary_directories()
+        self._ensure_content()
         
         # Check if this content is in cache
         cache_key = f"details_{content_id}"
@@ -417,11 +401,15 @@ class SAPDiscoverySearcher:
         # Find the content by ID
         for item in self.integration_content:
             if item.get("Id") == content_id:
-                # Get the README content
+                # Get the README content, from the snapshot when it has one
                 try:
-                    path = item.get("Path")
-                    readme_path = f"{path}/README.md"
-                    readme_content = self._fetch_file_content(readme_path)
+                    readme_content = self.catalog.readme(content_id) if self.catalog else None
+                    if readme_content is None:
+                        if not self.allow_live_scan:
+                            return item
+                        path = item.get("Path")
+                        readme_path = f"{path}/README.md"
+                        readme_content = self._fetch_file_content(readme_path)
                     
                     # Add the README content to the item
                     detailed_item = item.copy()
@@ -450,61 +438,39 @@ class SAPDiscoverySearcher:
         """
         if content_types is None:
             content_types = ["IntegrationFlow", "IntegrationPattern", "Adapter"]
-            
+        
+        self._ensure_content()
+        index = self._get_search_index()
+        
         all_results = {}
         result_sources = {}  # Track which search term found each result
         
-        # Search with primary terms (most specific)
-        for term in search_terms.get('primary', []):
-            for content_type in content_types:
-                results = self.search_discovery_content(term, content_type)
-                if results and 'value' in results and results['value']:
-                    for item in results['value']:
+        def collect(terms, priority, max_results=None):
+            # All terms of a priority level are scored in one batched query
+            batch = index.search_batch(terms, content_types, limit=20)
+            for term in terms:
+                for content_type in content_types:
+                    for item_index, score in batch[term][content_type]:
+                        item = self.integration_content[item_index]
                         content_id = item.get('Id')
                         if content_id not in all_results:
-                            all_results[content_id] = item
-                            result_sources[content_id] = {'term': term, 'priority': 'primary'}
-                            
-            # Rate limiting to avoid overwhelming the API
-            time.sleep(0.1)
-        
-        # If we have few results, search with secondary terms
-        if len(all_results) < 10:
-            for term in search_terms.get('secondary', []):
-                for content_type in content_types:
-                    results = self.search_discovery_content(term, content_type)
-                    if results and 'value' in results and results['value']:
-                        for item in results['value']:
-                            content_id = item.get('Id')
-                            if content_id not in all_results:
-                                all_results[content_id] = item
-                                result_sources[content_id] = {'term': term, 'priority': 'secondary'}
-                                
-                # Rate limiting
-                time.sleep(0.1)
+                            all_results[content_id] = self._result_item(item_index, score)
+                            result_sources[content_id] = {'term': term, 'priority': priority}
                 
                 # Stop if we have enough results
-                if len(all_results) >= 20:
+                if max_results and len(all_results) >= max_results:
                     break
         
+        # Search with primary terms (most specific)
+        collect(search_terms.get('primary', []), 'primary')
+        
+        # If we have few results, search with secondary terms
+        if len(all_results) < 10:
+            collect(search_terms.get('secondary', []), 'secondary', max_results=20)
+        
         # If we still have few results, search with tertiary terms
         if len(all_results) < 5:
-            for term in search_terms.get('tertiary', [])[:5]:  # Only use top 5 tertiary terms
-                for content_type in content_types:
-                    results = self.search_discovery_content(term, content_type)
-                    if results and 'value' in results and results['value']:
-                        for item in results['value']:
-                            content_id = item.get('Id')
-                            if content_id not in all_results:
-                                all_results[content_id] = item
-                                result_sources[content_id] = {'term': term, 'priority': 'tertiary'}
-                                
-                # Rate limiting
-                time.sleep(0.1)
-                
-                # Stop if we have enough results
-                if len(all_results) >= 20:
-                    break
+            collect(search_terms.get('tertiary', [])[:5], 'tertiary', max_results=20)  # Only use top 5 tertiary terms
         
         return {
             'results': list(all_results.values()),
@@ -0,0 +1,73 @@
+"""Tests for documentation sections and their reuse across runs"""
+from doc_sections import find_previous_manifest, save_section_manifest, split_markdown_sections
+
+BASE = """# Integration Documentation
+
+Generated for the project.
+
+## Overview
+
+Base overview.
+
+## Flows
+
+### 1. Main Flow
+
+Step A.
+
+### 2. Sub Flow
+
+Step B.
+"""
+
+ENHANCED = """# Integration Documentation
+
+## Table of Contents
+
+- [Overview](#overview)
+
+## Overview
+
+Enhanced overview.
+
+## Flows
+
+### 1. Main Flow
+
+Enhanced step A.
+
+## Appendix
+
+Added by the enhancement.
+"""
+
+
+def test_split_gives_back_the_markdown():
+    document = split_markdown_sections(BASE)
+    assert document.section_ids == ['overview', 'flows', 'flows/main-flow', 'flows/sub-flow']
+    assert document.to_markdown() == BASE
+
+
+def test_take_enhanced_matches_sections_by_heading():
+    document = split_markdown_sections(BASE)
+    assert document.take_enhanced(ENHANCED) == 2
+    enhanced = {section.id: section.enhanced for section in document.sections}
+    assert enhanced == {
+        'overview': '## Overview\n\nEnhanced overview.\n\n',
+        'flows': None,
+        'flows/main-flow': '### 1. Main Flow\n\nEnhanced step A.\n\n',
+        'flows/sub-flow': None,
+    }
+
+
+def test_first_run_manifest_is_reused(tmp_path):
+    first = split_markdown_sections(BASE)
+    first.take_enhanced(ENHANCED)
+    save_section_manifest(str(tmp_path / 'job-1'), 'job-1', 'boomi', first)
+
+    second = split_markdown_sections(BASE.replace('Step B.', 'Step B, changed.'))
+    manifest = find_previous_manifest(str(tmp_path), 'boomi', second.section_ids, exclude_job_id='job-2')
+    assert manifest['job_id'] == 'job-1'
+    assert second.reuse(manifest) == ['flows/sub-flow']
+    assert [section.id for section in second.sections if section.enhance and section.enhanced is None] == \
+        ['flows/sub-flow']
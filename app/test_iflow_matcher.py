@@ -0,0 +1,106 @@
+"""Tests for term extraction, component scoring and portfolio matching"""
+import contextlib
+import io
+import json
+import subprocess
+import types
+from pathlib import Path
+
+import pytest
+
+import iflow_matcher
+import rag_similarity_search
+from rag_similarity_search import RAGSimilaritySearch
+
+APP_DIR = Path(__file__).resolve().parent
+SAMPLE_DOCUMENTS = sorted(APP_DIR.glob('**/*.md'))
+
+
+@pytest.fixture(scope='module')
+def baseline_matcher():
+    """iflow_matcher as of the baseline commit, which rendered markdown with BeautifulSoup and NLTK"""
+    for module in ('markdown', 'bs4', 'nltk'):
+        pytest.importorskip(module)
+    try:
+        source = subprocess.run(['git', 'show', '91a9791:app/iflow_matcher.py'], cwd=APP_DIR,
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        pytest.skip("baseline iflow_matcher is not available from git")
+    module = types.ModuleType('baseline_iflow_matcher')
+    exec(compile(source, 'baseline_iflow_matcher.py', 'exec'), module.__dict__)
+    return module
+
+
+@pytest.mark.parametrize('path', SAMPLE_DOCUMENTS, ids=lambda path: path.relative_to(APP_DIR).as_posix())
+def test_terms_and_scores_match_baseline(baseline_matcher, path):
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        expected_terms = baseline_matcher.extract_terms_from_markdown(str(path))
+        terms = iflow_matcher.extract_terms_from_markdown(str(path))
+        expected_scores = baseline_matcher.calculate_component_scores(terms)
+
+    assert terms['endpoints'] == expected_terms['endpoints']
+    assert terms['urls'] == expected_terms['urls']
+    assert iflow_matcher.calculate_component_scores(terms) == expected_scores
+
+
+def test_component_scores_with_every_keyword(baseline_matcher):
+    keywords = [keyword for component in iflow_matcher.SAP_COMPONENTS for keyword in component['keywords']]
+    terms = {'technical_terms': keywords, 'integration_patterns': ['API-Led', 'Event-Driven'],
+             'headers': [component['name'] for component in iflow_matcher.SAP_COMPONENTS[::2]]}
+    assert iflow_matcher.calculate_component_scores(terms) == baseline_matcher.calculate_component_scores(terms)
+
+
+def test_extract_terms_from_malformed_markdown(tmp_path):
+    path = tmp_path / 'broken.md'
+    path.write_text("# Orders API\n\n```json\n# not a header\n{ unclosed\n\n- POST /orders [link(http://x\n"
+                    "Setext Header\n---\n**unclosed emphasis `code\n", encoding='utf-8')
+    terms = iflow_matcher.extract_terms_from_markdown(str(path))
+    assert terms['headers'] == ['Orders API']
+    assert terms['endpoints'] == ['/orders']
+
+
+class PartialRankSearch(RAGSimilaritySearch):
+    """RAG search whose embedding fails for documents mentioning 'oversized'"""
+
+    def __init__(self):
+        super().__init__()
+        self.initialized = True
+
+    def rank_documents(self, documents, top_k=10):
+        flow = {'rank': 1, 'id': 'f1', 'name': 'Order Sync', 'description': 'Orders',
+                'similarity_score': 0.8, 'quality': 'Good', 'type': 'SAP_Integration_Flow'}
+        ranked = [None if 'oversized' in document else [flow] for document in documents]
+        failures = {i: 'input too long' for i, document in enumerate(documents) if 'oversized' in document}
+        return ranked, failures
+
+
+@pytest.fixture
+def documents(tmp_path):
+    paths = {}
+    for name, text in (('small', '# Orders\n\nSync orders to S/4HANA.\n'),
+                       ('huge', '# Oversized\n\n' + 'oversized ' * 5000)):
+        path = tmp_path / f'{name}.md'
+        path.write_text(text, encoding='utf-8')
+        paths[name] = str(path)
+    return paths
+
+
+def test_document_that_cannot_be_searched_is_failed(tmp_path, documents, monkeypatch):
+    monkeypatch.setattr(rag_similarity_search, 'get_rag_search', PartialRankSearch)
+    monkeypatch.setattr(iflow_matcher, 'PORTFOLIO_WORKERS', 1)
+    result = iflow_matcher.process_portfolio_for_iflow(documents, str(tmp_path / 'out'), top_k=1)
+    assert result['status'] == 'success'
+    assert list(result['documents']) == ['small']
+    assert result['documents']['small']['iflow_count'] == 1
+    assert result['failed_documents'] == {'huge': 'input too long'}
+    with open(result['files']['summary'], encoding='utf-8') as f:
+        assert json.load(f)['document_count'] == 1
+
+
+def test_portfolio_fails_when_no_document_can_be_searched(tmp_path, documents, monkeypatch):
+    monkeypatch.setattr(rag_similarity_search, 'RAG_AVAILABLE', False)
+    monkeypatch.setattr(rag_similarity_search, 'get_rag_search', RAGSimilaritySearch)
+    monkeypatch.setattr(iflow_matcher, 'PORTFOLIO_WORKERS', 1)
+    result = iflow_matcher.process_portfolio_for_iflow(documents, str(tmp_path / 'out'), top_k=1)
+    assert result['status'] == 'failed'
+    assert 'RAG system not available' in result['message']
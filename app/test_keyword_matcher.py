@@ -0,0 +1,44 @@
+"""Tests for the keyword automaton and the term matcher built on it"""
+import random
+
+from keyword_matcher import KeywordAutomaton
+from term_patterns import AUTOMATON_MIN_TERMS, TermMatcher
+
+
+def brute_force(keywords, text):
+    return {keyword for keyword in keywords if keyword and keyword in text}
+
+
+def test_find_matches_substring_search():
+    rng = random.Random(7)
+    keywords = [''.join(rng.choice('ab.(') for _ in range(rng.randint(1, 6))) for _ in range(200)]
+    text = ''.join(rng.choice('ab.( ') for _ in range(3000))
+    assert KeywordAutomaton(keywords).find(text) == brute_force(keywords, text)
+
+
+def test_iter_matches_spans_chunks():
+    automaton = KeywordAutomaton(['order', 'der'])
+    assert list(automaton.iter_matches(['or', 'der'])) == [(5, 'order'), (5, 'der')]
+
+
+def test_keyword_longer_than_recursion_limit():
+    long_term = 'customer order ' * 80
+    automaton = KeywordAutomaton(['order', long_term.strip()])
+    assert automaton.find(f"new {long_term}done") == {'order', long_term.strip()}
+
+
+def test_deeply_nested_trie_falls_back_to_automaton_scan():
+    keywords = ['a' * length for length in range(1, 600)]
+    automaton = KeywordAutomaton(keywords)
+    assert automaton._pattern is None
+    text = 'b' + 'a' * 50 + 'b'
+    assert automaton.find(text) == brute_force(keywords, text)
+
+
+def test_term_matcher_with_long_bullet_term():
+    # An API Overview bullet becomes one domain term; with enough terms the automaton is used
+    long_term = 'The API receives employee records from the HR system and ' * 20
+    terms = [f'Term {i}' for i in range(AUTOMATON_MIN_TERMS + 25)] + [long_term]
+    matcher = TermMatcher(terms)
+    text = f"catalog entry for term 3 and {long_term.lower()}"
+    assert matcher.find(text) == {'term 3', long_term.lower()}
@@ -0,0 +1,34 @@
+"""Tests for discovery search when no catalog snapshot is available"""
+from search_discovery import SAPDiscoverySearcher
+
+RECIPES_README = """## Recipes
+
+Recipe|Description|Author
+---|---|---
+[Employee Replication](Recipes/for/EmployeeReplication)|Replicate employees from SuccessFactors|SAP
+
+"""
+
+
+def test_missing_snapshot_falls_back_to_live_scan(tmp_path, monkeypatch, capsys):
+    searcher = SAPDiscoverySearcher(catalog_path=str(tmp_path / 'missing.idx'))
+    fetched = []
+
+    def fetch_file_content(path):
+        fetched.append(path)
+        return RECIPES_README
+
+    monkeypatch.setattr(searcher, '_fetch_file_content', fetch_file_content)
+    results = searcher.search_discovery_content('employee')
+
+    assert fetched == ['Recipes/readme.md']
+    assert [item['Name'] for item in results['value']] == ['Employee Replication']
+    assert 'falling back to a live GitHub scan' in capsys.readouterr().out
+
+
+def test_missing_snapshot_without_live_scan_warns(tmp_path, monkeypatch, capsys):
+    searcher = SAPDiscoverySearcher(catalog_path=str(tmp_path / 'missing.idx'), allow_live_scan=False)
+    monkeypatch.setattr(searcher, '_fetch_file_content', lambda path: RECIPES_README)
+
+    assert searcher.search_discovery_content('employee') == {'value': []}
+    assert 'live scans are disabled' in capsys.readouterr().out
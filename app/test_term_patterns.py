@@ -0,0 +1,64 @@
+"""Tests for the precompiled term patterns and matchers"""
+import random
+
+import pytest
+
+from term_patterns import (AUTOMATON_MIN_TERMS, DOMAIN_KEYWORDS, OPERATION_KEYWORDS, TermMatcher, markdown_text,
+                           plain_inline_text)
+
+
+def substring_matches(terms, text_lower):
+    return {term.lower() for term in terms if term.lower() in text_lower}
+
+
+@pytest.mark.parametrize('term_count', [AUTOMATON_MIN_TERMS - 1, AUTOMATON_MIN_TERMS, 300])
+def test_term_matcher_matches_substring_tests(term_count):
+    rng = random.Random(term_count)
+    words = ['order', 'Customer', 'sync', 'API', 'S/4HANA', '(v2)', 'id', 'Payment']
+    terms = [' '.join(rng.sample(words, rng.randint(1, 3))) for _ in range(term_count)]
+    matcher = TermMatcher(terms)
+    for _ in range(20):
+        text_lower = ' '.join(rng.choice(words) for _ in range(30)).lower()
+        assert matcher.find(text_lower) == substring_matches(terms, text_lower)
+
+
+def test_term_matcher_counts_duplicates_and_empty_terms():
+    terms = ['Order', 'order', ''] + [f'term {i}' for i in range(AUTOMATON_MIN_TERMS)]
+    matcher = TermMatcher(terms)
+    assert matcher.counts['order'] == 2
+    assert matcher.find('new order') == {'order', ''}
+
+
+def test_term_matcher_with_very_long_terms():
+    long_term = 'replicate employee master data ' * 60
+    terms = [f'term {i}' for i in range(AUTOMATON_MIN_TERMS)] + [long_term, long_term[:-40]]
+    matcher = TermMatcher(terms)
+    assert matcher.find(f'term 7 {long_term}'.lower()) == {'term 7', long_term.lower(), long_term[:-40].lower()}
+
+
+def test_keyword_sets_keep_category_order():
+    assert DOMAIN_KEYWORDS.find('investment account for the customer') == ['Investment', 'Account', 'Customer',
+                                                                           'Investment Account']
+    assert OPERATION_KEYWORDS.find('post and get') == ['GET', 'POST']
+
+
+def test_markdown_text_headers():
+    markdown = ("# Title\n\nSetext Header\n-------------\n\n```\n# inside a fence\n```\n\n"
+                "#### Too deep\n\n## **Bold** `code` [link](http://x) #\n\n---\n\n> - quoted *item*\n")
+    headers, text = markdown_text(markdown)
+    assert headers == ['Title', 'Setext Header', 'Bold code link']
+    assert '# inside a fence' in text
+    assert 'quoted item' in text
+
+
+def test_markdown_text_unclosed_fence():
+    headers, text = markdown_text("# Title\n```python\n# comment\nx = {\n")
+    assert headers == ['Title']
+    assert text.splitlines() == ['Title', 'python', '# comment', 'x = {']
+
+
+def test_plain_inline_text_collects_code():
+    code_blocks = []
+    assert plain_inline_text(r'Call `GET /orders` with \*care\* and <b>html</b>', code_blocks) == \
+        'Call GET /orders with *care* and html'
+    assert code_blocks == ['GET /orders']
@@ -0,0 +1,66 @@
+"""Tests for batched embedding generation"""
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("supabase")
+pytest.importorskip("bs4")
+
+import unified_semantic_search
+from unified_semantic_search import (EMBEDDING_MAX_INPUT_CHARS, EmbeddingCache, UnifiedSemanticSearch,
+                                     embedding_batches)
+
+
+class FakeEmbeddings:
+    """Embeddings endpoint that rejects requests containing a 'bad' input"""
+
+    def __init__(self):
+        self.requests = []
+
+    def create(self, model, input):
+        self.requests.append(list(input))
+        if any('bad' in text for text in input):
+            raise ValueError("input too long")
+        return SimpleNamespace(data=[SimpleNamespace(index=i, embedding=[float(len(text))])
+                                     for i, text in enumerate(input)])
+
+
+@pytest.fixture
+def search(tmp_path):
+    search = UnifiedSemanticSearch(embedding_cache=EmbeddingCache(str(tmp_path)))
+    search.openai_client = SimpleNamespace(embeddings=FakeEmbeddings())
+    return search
+
+
+def test_inputs_are_cut_to_the_input_budget(search):
+    embedding, = search.generate_embeddings(['x' * (EMBEDDING_MAX_INPUT_CHARS * 3)])
+    assert embedding == [float(EMBEDDING_MAX_INPUT_CHARS)]
+
+
+def test_batches_respect_count_and_character_budgets():
+    pending = [(i, 'x' * 40) for i in range(7)]
+    assert [len(batch) for batch in embedding_batches(pending, max_count=3, max_chars=1000)] == [3, 3, 1]
+    assert [len(batch) for batch in embedding_batches(pending, max_count=100, max_chars=100)] == [2, 2, 2, 1]
+
+
+def test_failed_batch_is_retried_per_text(search):
+    failures = {}
+    embeddings = search.generate_embeddings(['one', 'bad one', 'three'], failures=failures)
+    assert embeddings == [[3.0], None, [5.0]]
+    assert list(failures) == [1]
+
+
+def test_failure_is_raised_without_a_failures_dict(search):
+    with pytest.raises(RuntimeError):
+        search.generate_embeddings(['bad'])
+
+
+def test_rank_documents_reports_failed_documents(search, monkeypatch):
+    monkeypatch.setattr(unified_semantic_search, 'get_flow_index', lambda supabase: None)
+    monkeypatch.setattr(search, '_search_rpc', lambda embedding, top_k: [
+        {'id': 'f1', 'name': 'Flow', 'description': '', 'similarity': 0.5}])
+    results, failures = search.rank_documents(['good', 'bad'], top_k=1)
+    assert results[0][0]['id'] == 'f1'
+    assert results[1] is None
+    assert list(failures) == [1]
@@ -26,25 +26,114 @@ except ImportError as e:
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 from pathlib import Path
 import hashlib
+import threading
+import time
+from array import array
 from typing import List, Dict, Optional
 
+from flow_index import get_flow_index
+
 # Embedding model - text-embedding-ada-002 (1536 dimensions)
 EMBEDDING_MODEL = "text-embedding-ada-002"
 
+# Embeddings are cached on disk by model and text hash, so identical text is embedded only once
+EMBEDDING_CACHE_DIR = os.getenv(
+    'EMBEDDING_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'embedding_cache'))
+
+# Texts sent per embeddings API call
+EMBEDDING_BATCH_SIZE = int(os.getenv('EMBEDDING_BATCH_SIZE', '100'))
+
+# text-embedding-ada-002 takes up to 8191 tokens per input and 300k tokens per request;
+# at no less than ~3 characters per token these character budgets stay under both
+EMBEDDING_MAX_INPUT_CHARS = int(os.getenv('EMBEDDING_MAX_INPUT_CHARS', '24000'))
+EMBEDDING_MAX_BATCH_CHARS = int(os.getenv('EMBEDDING_MAX_BATCH_CHARS', '600000'))
+
+# Minimum similarity of search_similar_flows results
+MATCH_THRESHOLD = 0.1  # Lowered from 0.3 to get more results
+
+# Seconds search_similar_flows results are reused for the same query embedding
+SIMILAR_FLOWS_CACHE_TTL = int(os.getenv('SIMILAR_FLOWS_CACHE_TTL', '3600'))
+SIMILAR_FLOWS_CACHE_SIZE = int(os.getenv('SIMILAR_FLOWS_CACHE_SIZE', '256'))
+
+def embedding_input(text: str) -> str:
+    """Text as sent to the embeddings API: cut to the per-input budget"""
+    return text[:EMBEDDING_MAX_INPUT_CHARS]
+
+def embedding_batches(pending: List, max_count: int = EMBEDDING_BATCH_SIZE,
+                      max_chars: int = EMBEDDING_MAX_BATCH_CHARS) -> List[List]:
+    """Split (key, text) pairs into batches within the count and character budgets of one call"""
+    batches = []
+    batch, batch_chars = [], 0
+    for key, text in pending:
+        if batch and (len(batch) >= max_count or batch_chars + len(text) > max_chars):
+            batches.append(batch)
+            batch, batch_chars = [], 0
+        batch.append((key, text))
+        batch_chars += len(text)
+    if batch:
+        batches.append(batch)
+    return batches
+
+def embedding_cache_key(text: str, model: str = EMBEDDING_MODEL) -> str:
+    """Cache key of a text's embedding for a model"""
+    return hashlib.sha256(f"{model}\n{text}".encode('utf-8')).hexdigest()
+
+class EmbeddingCache:
+    """Embeddings stored on disk as float64 arrays, one file per model and text hash"""
+    
+    def __init__(self, cache_dir: str = EMBEDDING_CACHE_DIR):
+        self.cache_dir = cache_dir
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.bin")
+    
+    def get(self, key: str) -> Optional[List[float]]:
+        try:
+            with open(self._path(key), 'rb') as f:
+                return array('d', f.read()).tolist()
+        except OSError:
+            return None
+    
+    def put(self, key: str, embedding: List[float]):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(array('d', embedding).tobytes())
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠️  Could not cache embedding: {e}")
+
 class UnifiedSemanticSearch:
-    def __init__(self):
+    def __init__(self, embedding_cache: Optional[EmbeddingCache] = None):
         """Initialize the unified semantic search system"""
         self.supabase: Client = None
+        self.openai_client = None
+        self.embedding_cache = embedding_cache or EmbeddingCache()
         self.uploaded_documents = {}  # Temporary memory for documents
         self.uploaded_metadata = {}   # Temporary memory for metadata
+        self._client_lock = threading.Lock()
+        self._search_cache = {}  # (embedding hash, top_k) -> (expires at, results)
+        self._search_cache_lock = threading.Lock()
         
     def initialize_clients(self):
         """Initialize OpenAI and Supabase clients"""
         print("🔧 Initializing RAG search clients...")
         openai.api_key = OPENAI_API_KEY
+        self._get_openai_client()
         self.supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
         print("✅ RAG search clients initialized!")
     
+    def _get_openai_client(self):
+        """OpenAI client shared by all embedding calls, created on first use"""
+        with self._client_lock:
+            if self.openai_client is None:
+                from openai import OpenAI
+                self.openai_client = OpenAI(api_key=OPENAI_API_KEY)
+            return self.openai_client
+    
     def extract_text_from_html(self, html_content: str) -> str:
         """Extract text content from HTML"""
         soup = BeautifulSoup(html_content, 'html.parser')
@@ -193,23 +282,110 @@ class UnifiedSemanticSearch:
     
     def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for text using OpenAI text-embedding-ada-002 (1536 dimensions)"""
-        try:
-            from openai import OpenAI
-            client = OpenAI(api_key=OPENAI_API_KEY)
-            response = client.embeddings.create(
-                model=EMBEDDING_MODEL,
-                input=[text]
-                # Note: text-embedding-ada-002 always returns 1536 dimensions (no dimensions parameter)
-            )
-            return response.data[0].embedding
-        except Exception as e:
-            print(f"❌ Error generating embedding: {e}")
-            raise
+        return self.generate_embeddings([text])[0]
+    
+    def generate_embeddings(self, texts: List[str], failures: Optional[Dict[int, str]] = None) -> List[Optional[List[float]]]:
+        """
+        Generate embeddings for several texts.
+        
+        Each text is cut to EMBEDDING_MAX_INPUT_CHARS. Cached embeddings are
+        reused; the remaining distinct texts are embedded in batches of at most
+        EMBEDDING_BATCH_SIZE texts and EMBEDDING_MAX_BATCH_CHARS characters per
+        API call and added to the cache. When a batch is rejected its texts are
+        embedded one by one, so one bad text does not fail the others.
+        
+        Args:
+            texts: Texts to embed
+            failures: Collects text index -> error for texts that could not be
+                embedded; without it the first such error is raised
+            
+        Returns:
+            One embedding per text, in order (None for texts in failures)
+        """
+        inputs = [embedding_input(text) for text in texts]
+        keys = [embedding_cache_key(text) for text in inputs]
+        embeddings = {}
+        errors = {}
+        missing = {}
+        for key, text in zip(keys, inputs):
+            if key in embeddings or key in missing:
+                continue
+            cached = self.embedding_cache.get(key)
+            if cached is not None:
+                embeddings[key] = cached
+            else:
+                missing[key] = text
+        
+        if missing:
+            client = self._get_openai_client()
+            for batch in embedding_batches(list(missing.items())):
+                try:
+                    self._embed_batch(client, batch, embeddings)
+                except Exception as e:
+                    if len(batch) == 1:
+                        print(f"❌ Error generating embedding: {e}")
+                        errors[batch[0][0]] = str(e)
+                        continue
+                    print(f"⚠️ Embedding batch of {len(batch)} texts failed, embedding them one by one: {e}")
+                    for item in batch:
+                        try:
+                            self._embed_batch(client, [item], embeddings)
+                        except Exception as item_error:
+                            print(f"❌ Error generating embedding: {item_error}")
+                            errors[item[0]] = str(item_error)
+        
+        if errors:
+            if failures is None:
+                raise RuntimeError(next(iter(errors.values())))
+            for i, key in enumerate(keys):
+                if key in errors:
+                    failures[i] = errors[key]
+        return [embeddings.get(key) for key in keys]
+    
+    def _embed_batch(self, client, batch, embeddings):
+        """Embed (key, text) pairs in one API call and cache the results"""
+        response = client.embeddings.create(
+            model=EMBEDDING_MODEL,
+            input=[text for _, text in batch]
+            # Note: text-embedding-ada-002 always returns 1536 dimensions (no dimensions parameter)
+        )
+        for item in response.data:
+            key = batch[item.index][0]
+            embeddings[key] = item.embedding
+            self.embedding_cache.put(key, item.embedding)
+    
+    def _cached_search(self, cache_key):
+        with self._search_cache_lock:
+            entry = self._search_cache.get(cache_key)
+            if entry is None:
+                return None
+            expires_at, results = entry
+            if expires_at < time.monotonic():
+                del self._search_cache[cache_key]
+                return None
+            return [dict(result) for result in results]
+    
+    def _store_search(self, cache_key, results):
+        with self._search_cache_lock:
+            if len(self._search_cache) >= SIMILAR_FLOWS_CACHE_SIZE:
+                # Drop expired entries first, then the oldest ones
+                now = time.monotonic()
+                for key in [k for k, (expires_at, _) in self._search_cache.items() if expires_at < now]:
+                    del self._search_cache[key]
+                while len(self._search_cache) >= SIMILAR_FLOWS_CACHE_SIZE:
+                    del self._search_cache[next(iter(self._search_cache))]
+            self._search_cache[cache_key] = (time.monotonic() + SIMILAR_FLOWS_CACHE_TTL,
+                                             [dict(result) for result in results])
+    
+    def clear_search_cache(self):
+        """Forget memoized search results, e.g. after integration_flows changed"""
+        with self._search_cache_lock:
+            self._search_cache.clear()
     
     def search_similar_flows(self, query_text: str, top_k: int = 10) -> List[Dict]:
         """
         Search for similar integration flows using RAG
-        Uses existing integration_flows table and search_similar_flows() function
+        Uses the local integration_flows mirror, or the search_similar_flows() RPC without one
         
         Args:
             query_text: Text to search for
@@ -227,6 +403,77 @@ class UnifiedSemanticSearch:
             print(f"❌ Error generating query embedding: {e}")
             raise
         
+        similar_flows = self._search_embeddings([query_embedding], top_k)[0]
+        print(f"✅ Found {len(similar_flows)} similar iFlows")
+        return similar_flows
+    
+    def rank_documents(self, texts: List[str], top_k: int = 10):
+        """
+        Search similar integration flows for many documents at once,
+        e.g. every project of a batch migration.
+        
+        All texts are embedded in batched API calls and scored against the
+        local index in one matrix product. A document that cannot be embedded
+        is reported without failing the others.
+        
+        Args:
+            texts: Documents to search for
+            top_k: Number of results per document
+            
+        Returns:
+            tuple: (similar iFlows per document in order, None for failed documents;
+                    document index -> error of the failed documents)
+        """
+        print(f"🔍 RAG Search: ranking {len(texts)} documents")
+        failures = {}
+        embeddings = self.generate_embeddings(texts, failures=failures)
+        embedded = [i for i, embedding in enumerate(embeddings) if embedding is not None]
+        results = [None] * len(texts)
+        for i, similar_flows in zip(embedded, self._search_embeddings([embeddings[i] for i in embedded], top_k)):
+            results[i] = similar_flows
+        if failures:
+            print(f"❌ {len(failures)} of {len(texts)} documents could not be embedded")
+        return results, failures
+    
+    def _search_embeddings(self, query_embeddings: List[List[float]], top_k: int) -> List[List[Dict]]:
+        """Similar flows per query embedding: memoized results, then the local index, then the RPC"""
+        results = [None] * len(query_embeddings)
+        cache_keys = []
+        pending = []
+        for i, embedding in enumerate(query_embeddings):
+            # Reuse results for the same query embedding within the TTL
+            embedding_hash = hashlib.sha256(array('d', embedding).tobytes()).hexdigest()
+            cache_keys.append((embedding_hash, top_k))
+            results[i] = self._cached_search(cache_keys[i])
+            if results[i] is None:
+                pending.append(i)
+        if len(pending) < len(query_embeddings):
+            print(f"   {len(query_embeddings) - len(pending)} search result(s) reused from cache")
+        if not pending:
+            return results
+        
+        flow_index = get_flow_index(self.supabase)
+        if flow_index is not None:
+            rows_per_query = flow_index.search([query_embeddings[i] for i in pending], top_k, MATCH_THRESHOLD)
+        else:
+            rows_per_query = [self._search_rpc(query_embeddings[i], top_k) for i in pending]
+        
+        for i, rows in zip(pending, rows_per_query):
+            similar_flows = []
+            for row in rows:
+                similar_flows.append({
+                    'rank': len(similar_flows) + 1,
+                    'id': row['id'],
+                    'name': row['name'],
+                    'description': row['description'],
+                    'similarity_score': round(row['similarity'], 4)
+                })
+            self._store_search(cache_keys[i], similar_flows)
+            results[i] = similar_flows
+        return results
+    
+    def _search_rpc(self, query_embedding: List[float], top_k: int) -> List[Dict]:
+        """Rows of the Supabase search_similar_flows RPC for one query embedding"""
         # Search integration flows using existing Supabase RPC function
         # Table: integration_flows (id, name, description, embedding)
         try:
@@ -234,7 +481,7 @@ class UnifiedSemanticSearch:
                 'search_similar_flows',
                 {
                     'query_embedding': query_embedding,
-                    'match_threshold': 0.1,  # Lowered from 0.3 to get more results
+                    'match_threshold': MATCH_THRESHOLD,
                     'match_count': top_k
                 }
             ).execute()
@@ -243,18 +490,7 @@ class UnifiedSemanticSearch:
             if iflow_results.data:
                 print(f"   Sample result keys: {list(iflow_results.data[0].keys()) if len(iflow_results.data) > 0 else 'None'}")
             
-            similar_flows = []
-            for row in iflow_results.data if iflow_results.data else []:
-                similar_flows.append({
-                    'rank': len(similar_flows) + 1,
-                    'id': row['id'],
-                    'name': row['name'],
-                    'description': row['description'],
-                    'similarity_score': round(row['similarity'], 4)
-                })
-            
-            print(f"✅ Found {len(similar_flows)} similar iFlows")
-            return similar_flows
+            return iflow_results.data if iflow_results.data else []
             
         except Exception as e:
             print(f"❌ Error searching integration flows: {e}")